@@ -0,0 +1,13 @@
+"""Analytics over combat events and sessions."""
+
+from .columnar import Categorical, CombatEventBatch
+from .rollups import AttackCounts, CombatRollup, QuantileSketch, Summary
+
+__all__ = [
+    "AttackCounts",
+    "Categorical",
+    "CombatEventBatch",
+    "CombatRollup",
+    "QuantileSketch",
+    "Summary",
+]
@@ -0,0 +1,337 @@
+"""Columnar CombatEvent batches for vectorized analytics.
+
+A ``CombatEventBatch`` holds one NumPy array per numeric field and a
+dictionary-encoded ``Categorical`` per ID/enum field, so balance queries such
+as "damage per player per room" run as a handful of array operations instead
+of a Python loop over models.
+
+Missing optional numbers are stored as NaN, missing categoricals as code -1.
+Timestamps are ``datetime64[us]`` in UTC; input timestamps may be datetimes,
+ISO-8601 strings or numbers of epoch milliseconds (as ``EpochCombatEvent``
+and its JSON use).
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from models import CombatEvent
+from storage.dynamodb_codec import codec_for
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+CATEGORICAL_FIELDS = (
+    "room_id",
+    "event_type",
+    "source_player_id",
+    "source_enemy_id",
+    "target_player_id",
+    "target_enemy_id",
+    "ability_id",
+    "item_id",
+)
+FLOAT_FIELDS = (
+    "damage_amount",
+    "item_quantity",
+    "position_x",
+    "position_y",
+    "position_z",
+)
+TIME_FIELDS = ("timestamp", "created_at")
+
+AGGREGATIONS = ("sum", "count", "mean", "min", "max")
+
+
+@dataclass
+class Categorical:
+    """Dictionary-encoded string column.
+
+    Attributes:
+        codes: int32 index into ``categories`` per row, -1 for missing
+        categories: Distinct values in first-seen order
+    """
+
+    codes: np.ndarray
+    categories: List[str]
+
+    @classmethod
+    def encode(cls, values: Iterable[Optional[str]]) -> "Categorical":
+        """Dictionary-encode a sequence of optional strings."""
+        lookup: Dict[str, int] = {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(-1)
+                continue
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+            codes.append(code)
+        return cls(np.asarray(codes, dtype=np.int32), list(lookup))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code_of(self, value: Optional[str]) -> int:
+        """Return the code for ``value``; unknown values map to -2 (matches nothing)."""
+        if value is None:
+            return -1
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -2
+
+    def decode(self) -> List[Optional[str]]:
+        """Return the column as a list of strings."""
+        categories = self.categories
+        return [categories[c] if c >= 0 else None for c in self.codes.tolist()]
+
+    def take(self, index: np.ndarray) -> "Categorical":
+        """Return the rows selected by a boolean mask or integer index."""
+        return Categorical(self.codes[index], self.categories)
+
+
+class CombatEventBatch:
+    """Column-oriented batch of combat events."""
+
+    def __init__(
+        self,
+        event_ids: np.ndarray,
+        categoricals: Dict[str, Categorical],
+        floats: Dict[str, np.ndarray],
+        is_critical: np.ndarray,
+        times: Dict[str, np.ndarray],
+        metadata: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        self.event_ids = event_ids
+        self.categoricals = categoricals
+        self.floats = floats
+        self.is_critical = is_critical
+        self.times = times
+        self.metadata = metadata
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def __getitem__(self, name: str) -> Union[np.ndarray, Categorical]:
+        """Return a column by field name."""
+        if name in self.categoricals:
+            return self.categoricals[name]
+        if name in self.floats:
+            return self.floats[name]
+        if name in self.times:
+            return self.times[name]
+        if name == "is_critical":
+            return self.is_critical
+        if name == "event_id":
+            return self.event_ids
+        raise KeyError(name)
+
+    # Construction
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "CombatEventBatch":
+        """Build a batch from plain field->value mappings.
+
+        Timestamps may be datetimes, ISO-8601 strings or epoch milliseconds.
+        """
+        return cls._build(rows, lambda row, name: row.get(name))
+
+    @classmethod
+    def from_models(cls, events: Iterable[CombatEvent]) -> "CombatEventBatch":
+        """Build a batch from ``CombatEvent`` models (or any objects with the fields)."""
+        return cls._build(events, getattr)
+
+    @classmethod
+    def from_ndjson(cls, lines: Iterable[Union[str, bytes]]) -> "CombatEventBatch":
+        """Build a batch from newline-delimited ``CombatEvent`` JSON."""
+        return cls.from_rows(json.loads(line) for line in lines if line.strip())
+
+    @classmethod
+    def from_dynamodb_pages(
+        cls, pages: Iterable[Mapping[str, Any]]
+    ) -> "CombatEventBatch":
+        """Build a batch from low-level DynamoDB ``Query``/``Scan`` response pages."""
+        codec = codec_for("CombatEvent")
+        return cls.from_rows(
+            codec.decode_values(item)
+            for page in pages
+            for item in page.get("Items", ())
+        )
+
+    @classmethod
+    def _build(
+        cls,
+        rows: Iterable[Any],
+        get: Callable[[Any, str], Any],
+    ) -> "CombatEventBatch":
+        rows = list(rows)
+        categoricals = {
+            name: Categorical.encode(get(row, name) for row in rows)
+            for name in CATEGORICAL_FIELDS
+        }
+        floats = {
+            name: np.array(
+                [_float_or_nan(get(row, name)) for row in rows], dtype=np.float64
+            )
+            for name in FLOAT_FIELDS
+        }
+        times = {
+            name: np.array(
+                [_epoch_us(get(row, name)) for row in rows], dtype=np.int64
+            ).astype("datetime64[us]")
+            for name in TIME_FIELDS
+        }
+        return cls(
+            event_ids=np.array([get(row, "event_id") for row in rows], dtype=object),
+            categoricals=categoricals,
+            floats=floats,
+            is_critical=np.array(
+                [bool(get(row, "is_critical")) for row in rows], dtype=np.bool_
+            ),
+            times=times,
+            metadata=[get(row, "metadata") for row in rows],
+        )
+
+    # Filtering
+
+    def mask(self, **equals: Any) -> np.ndarray:
+        """Return a boolean mask of rows whose fields equal the given values.
+
+        Categorical fields accept a single value or a collection of values.
+        """
+        result = np.ones(len(self), dtype=np.bool_)
+        for name, expected in equals.items():
+            column = self[name]
+            if isinstance(column, Categorical):
+                if isinstance(expected, (list, tuple, set, frozenset)):
+                    codes = [column.code_of(value) for value in expected]
+                    result &= np.isin(column.codes, codes)
+                else:
+                    result &= column.codes == column.code_of(expected)
+            else:
+                result &= column == expected
+        return result
+
+    def filter(self, mask: np.ndarray) -> "CombatEventBatch":
+        """Return a new batch with only the rows selected by ``mask``."""
+        index = np.flatnonzero(mask)
+        return CombatEventBatch(
+            event_ids=self.event_ids[index],
+            categoricals={k: c.take(index) for k, c in self.categoricals.items()},
+            floats={k: v[index] for k, v in self.floats.items()},
+            is_critical=self.is_critical[index],
+            times={k: v[index] for k, v in self.times.items()},
+            metadata=[self.metadata[i] for i in index.tolist()],
+        )
+
+    def where(self, **equals: Any) -> "CombatEventBatch":
+        """Shorthand for ``filter(mask(**equals))``."""
+        return self.filter(self.mask(**equals))
+
+    # Aggregation
+
+    def group_by(
+        self,
+        keys: Sequence[str],
+        value: Optional[str] = None,
+        agg: str = "sum",
+    ) -> Dict[Tuple[Optional[str], ...], float]:
+        """Aggregate a numeric column grouped by one or more categorical columns.
+
+        Args:
+            keys: Categorical field names to group by
+            value: Numeric field to aggregate (ignored for ``count``)
+            agg: One of ``sum``, ``count``, ``mean``, ``min``, ``max``
+
+        Returns:
+            Mapping of decoded key tuple to aggregate. NaN values are skipped.
+        """
+        if agg not in AGGREGATIONS:
+            raise ValueError(
+                f"Unknown aggregation '{agg}', expected one of {AGGREGATIONS}"
+            )
+        columns = [self.categoricals[k] for k in keys]
+        if len(self) == 0:
+            return {}
+
+        shifted = [c.codes.astype(np.int64) + 1 for c in columns]
+        dims = [len(c.categories) + 1 for c in columns]
+        flat = np.ravel_multi_index(shifted, dims)
+        groups, inverse = np.unique(flat, return_inverse=True)
+
+        if agg == "count":
+            result = np.bincount(inverse, minlength=len(groups)).astype(np.float64)
+        else:
+            if value is None:
+                raise ValueError(f"Aggregation '{agg}' requires a value column")
+            values = self.floats[value]
+            present = ~np.isnan(values)
+            counts = np.bincount(inverse[present], minlength=len(groups))
+            if agg in ("sum", "mean"):
+                result = np.bincount(
+                    inverse[present], weights=values[present], minlength=len(groups)
+                )
+                if agg == "mean":
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        result = result / counts
+            else:
+                fill = np.inf if agg == "min" else -np.inf
+                result = np.full(len(groups), fill)
+                ufunc = np.minimum if agg == "min" else np.maximum
+                ufunc.at(result, inverse[present], values[present])
+                result[counts == 0] = np.nan
+
+        decoded_keys = np.unravel_index(groups, dims)
+        # Codes were shifted by one, so label 0 is the "missing" group.
+        labels = [[None] + list(column.categories) for column in columns]
+        return {
+            tuple(labels[i][code] for i, code in enumerate(codes)): float(total)
+            for codes, total in zip(
+                zip(*(k.tolist() for k in decoded_keys)), result.tolist()
+            )
+        }
+
+    def damage_by_player_room(self) -> Dict[Tuple[Optional[str], ...], float]:
+        """Total ``damage_dealt`` per (room_id, source_player_id)."""
+        return self.where(event_type="damage_dealt").group_by(
+            ("room_id", "source_player_id"), "damage_amount"
+        )
+
+    def crit_rate_by_player(self) -> Dict[Tuple[Optional[str], ...], float]:
+        """Fraction of ``damage_dealt`` events that were critical, per player."""
+        hits = self.where(event_type="damage_dealt")
+        totals = hits.group_by(("source_player_id",), agg="count")
+        crits = hits.filter(hits.is_critical).group_by(
+            ("source_player_id",), agg="count"
+        )
+        return {key: crits.get(key, 0.0) / count for key, count in totals.items()}
+
+
+def _float_or_nan(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _epoch_us(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return round(value * 1000)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
@@ -0,0 +1,299 @@
+"""Partitioned Parquet export of DynamoDB items and stream records.
+
+``ParquetExporter`` turns low-level DynamoDB items of one generated model
+(``Query``/``Scan`` pages, DynamoDB Streams records or models) into a
+Hive-partitioned Parquet dataset on a local directory::
+
+    <root>/date=2026-02-14/room_id=room-1/part-<run>-00000.parquet
+
+The partition columns are taken out of the files, so
+``pyarrow.dataset.dataset(root, partitioning="hive")`` restores them. Column
+types follow the model's ``schemas/models/*.yml`` definition; string columns
+are dictionary-encoded and every row group carries min/max statistics, so
+readers can skip row groups by room, player or time.
+
+Memory stays bounded however large the input: rows are buffered per
+partition and written as a row group once a partition has
+``row_group_size`` rows, the largest buffer is written whenever
+``max_buffered_rows`` are held in total, and at most ``max_open_files``
+Parquet writers are open at a time (the least recently used is closed and
+the partition continues in a new part file).
+
+Run from ``apps/api`` over newline-delimited pages or stream events::
+
+    python -m analytics.export --model CombatEvent --out exports/events pages.jsonl
+"""
+
+import argparse
+import json
+import sys
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from storage.dynamodb_codec import codec_for
+from storage.schema_maps import MODEL_ATTRIBUTES
+
+# Value written for a missing partition key, as Hive and Arrow expect.
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Column whose date partitions each exportable model.
+PARTITION_TIME = {"CombatEvent": "timestamp", "PlayerSession": "last_heartbeat"}
+
+_SCALAR_TYPES = {
+    "string": pa.string(),
+    "number": pa.float64(),
+    "integer": pa.int64(),
+    "boolean": pa.bool_(),
+    "datetime": pa.timestamp("us", tz="UTC"),
+    "object": pa.string(),
+}
+
+Partition = Tuple[str, str]
+
+
+def _attributes(model_name: str) -> Dict[str, Dict[str, Any]]:
+    return MODEL_ATTRIBUTES[model_name]
+
+
+def arrow_schema(model_name: str, exclude: Iterable[str] = ()) -> pa.Schema:
+    """Build the Arrow schema of a model from its schema YAML.
+
+    Objects are stored as JSON strings and arrays as lists of strings (array
+    entries of objects are already JSON strings in the generated models).
+    """
+    attributes = _attributes(model_name)
+    skip = set(exclude)
+    fields = []
+    for name, spec in attributes.items():
+        if name in skip:
+            continue
+        if spec["type"] == "array":
+            kind = pa.list_(pa.string())
+        else:
+            kind = _SCALAR_TYPES[spec["type"]]
+        fields.append(pa.field(name, kind, nullable=not spec.get("required", False)))
+    return pa.schema(fields)
+
+
+class ParquetExporter:
+    """Streams one model's items into a partitioned Parquet dataset."""
+
+    def __init__(
+        self,
+        root: Path,
+        model_name: str = "CombatEvent",
+        row_group_size: int = 50_000,
+        max_buffered_rows: int = 200_000,
+        max_open_files: int = 64,
+        compression: str = "zstd",
+        run_id: Optional[str] = None,
+    ) -> None:
+        """Create the exporter.
+
+        Args:
+            root: Dataset directory (created if missing)
+            model_name: ``CombatEvent`` or ``PlayerSession``
+            row_group_size: Rows per Parquet row group
+            max_buffered_rows: Rows held in memory across all partitions
+            max_open_files: Parquet writers kept open at once
+            compression: Parquet compression codec
+            run_id: Part file prefix; keeps separate exports to one root apart
+        """
+        self.root = Path(root)
+        self.model_name = model_name
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max_buffered_rows
+        self.max_open_files = max_open_files
+        self.compression = compression
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._codec = codec_for(model_name)
+        self._time_field = PARTITION_TIME[model_name]
+        self.schema = arrow_schema(model_name, exclude=("room_id",))
+        self._json_fields = {
+            name
+            for name, spec in _attributes(model_name).items()
+            if spec["type"] == "object"
+        }
+        self._dictionary = [f.name for f in self.schema if f.type == pa.string()]
+        self._buffers: Dict[Partition, Dict[str, List[Any]]] = {}
+        self._buffered = 0
+        self._writers: "OrderedDict[Partition, pq.ParquetWriter]" = OrderedDict()
+        self._parts: Dict[Partition, int] = {}
+        self.files: List[Path] = []
+        self.rows = 0
+        self.row_groups = 0
+        self.skipped = 0
+
+    def __enter__(self) -> "ParquetExporter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Input
+
+    def write_values(self, values: Mapping[str, Any]) -> None:
+        """Buffer one row given as a field -> value mapping."""
+        partition = self._partition(values)
+        buffer = self._buffers.get(partition)
+        if buffer is None:
+            buffer = self._buffers[partition] = {f.name: [] for f in self.schema}
+        for name, column in buffer.items():
+            value = values.get(name)
+            if isinstance(value, Enum):
+                value = value.value
+            elif name in self._json_fields and value is not None:
+                value = json.dumps(value, separators=(",", ":"), default=str)
+            column.append(value)
+        self._buffered += 1
+        self.rows += 1
+        if len(buffer[self.schema[0].name]) >= self.row_group_size:
+            self._flush(partition)
+        elif self._buffered >= self.max_buffered_rows:
+            self._flush(max(self._buffers, key=self._buffered_in))
+
+    def write_items(self, items: Iterable[Mapping[str, Any]]) -> None:
+        """Buffer low-level DynamoDB items."""
+        for item in items:
+            self.write_values(self._codec.decode_values(item))
+
+    def write_pages(self, pages: Iterable[Mapping[str, Any]]) -> None:
+        """Buffer every item of ``Query``/``Scan`` response pages."""
+        for page in pages:
+            self.write_items(page.get("Items", ()))
+
+    def write_stream_records(self, records: Iterable[Mapping[str, Any]]) -> None:
+        """Buffer the new images of DynamoDB Streams records.
+
+        ``REMOVE`` records (including TTL expiry) have no new image and are
+        counted in ``skipped``.
+        """
+        for record in records:
+            image = record.get("dynamodb", {}).get("NewImage")
+            if image is None:
+                self.skipped += 1
+                continue
+            self.write_values(self._codec.decode_values(image))
+
+    def write_models(self, instances: Iterable[BaseModel]) -> None:
+        """Buffer generated model instances."""
+        for instance in instances:
+            self.write_values(dict(instance))
+
+    # Output
+
+    def close(self) -> List[Path]:
+        """Write every buffered row, close all files and return their paths."""
+        for partition in list(self._buffers):
+            self._flush(partition)
+        while self._writers:
+            self._writers.popitem(last=False)[1].close()
+        return self.files
+
+    def _partition(self, values: Mapping[str, Any]) -> Partition:
+        moment = values.get(self._time_field)
+        if isinstance(moment, datetime):
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(timezone.utc)
+            day = moment.date().isoformat()
+        else:
+            day = NULL_PARTITION
+        return day, values.get("room_id") or NULL_PARTITION
+
+    def _buffered_in(self, partition: Partition) -> int:
+        return len(self._buffers[partition][self.schema[0].name])
+
+    def _flush(self, partition: Partition) -> None:
+        buffer = self._buffers.pop(partition, None)
+        if buffer is None:
+            return
+        table = pa.Table.from_arrays(
+            [pa.array(buffer[f.name], type=f.type) for f in self.schema],
+            schema=self.schema,
+        )
+        self._buffered -= table.num_rows
+        for start in range(0, table.num_rows, self.row_group_size):
+            self._writer(partition).write_table(
+                table.slice(start, self.row_group_size),
+                row_group_size=self.row_group_size,
+            )
+            self.row_groups += 1
+
+    def _writer(self, partition: Partition) -> pq.ParquetWriter:
+        writer = self._writers.get(partition)
+        if writer is not None:
+            self._writers.move_to_end(partition)
+            return writer
+        if len(self._writers) >= self.max_open_files:
+            self._writers.popitem(last=False)[1].close()
+        day, room_id = partition
+        directory = self.root / f"date={day}" / f"room_id={room_id}"
+        directory.mkdir(parents=True, exist_ok=True)
+        part = self._parts.get(partition, 0)
+        self._parts[partition] = part + 1
+        path = directory / f"part-{self.run_id}-{part:05d}.parquet"
+        writer = self._writers[partition] = pq.ParquetWriter(
+            path,
+            self.schema,
+            compression=self.compression,
+            use_dictionary=self._dictionary,
+            write_statistics=True,
+        )
+        self.files.append(path)
+        return writer
+
+
+def _records(lines: Iterable[str]) -> Iterable[Tuple[str, Mapping[str, Any]]]:
+    for line in lines:
+        if line.strip():
+            document = json.loads(line)
+            if "Records" in document:
+                yield from (("record", record) for record in document["Records"])
+            elif "Items" in document:
+                yield from (("item", item) for item in document["Items"])
+            else:
+                yield "item", document
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Export DynamoDB items to Parquet")
+    parser.add_argument("inputs", nargs="+", type=Path, help="NDJSON page/stream files")
+    parser.add_argument(
+        "--model", default="CombatEvent", choices=sorted(PARTITION_TIME)
+    )
+    parser.add_argument("--out", type=Path, required=True, help="Dataset directory")
+    parser.add_argument("--row-group-size", type=int, default=50_000)
+    parser.add_argument("--max-buffered-rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with ParquetExporter(
+        args.out,
+        args.model,
+        row_group_size=args.row_group_size,
+        max_buffered_rows=args.max_buffered_rows,
+    ) as exporter:
+        for path in args.inputs:
+            with open(path) as f:
+                for kind, document in _records(f):
+                    if kind == "record":
+                        exporter.write_stream_records([document])
+                    else:
+                        exporter.write_items([document])
+    print(
+        f"{exporter.rows} rows, {exporter.row_groups} row groups, "
+        f"{len(exporter.files)} files under {args.out}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
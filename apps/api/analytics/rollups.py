@@ -0,0 +1,438 @@
+"""Incremental, mergeable combat rollups.
+
+``CombatRollup`` folds ``CombatEventBatch``es into running aggregates for
+balancing: damage by ability and by enemy type, time-to-kill by enemy type,
+and per-player hit and crit rates. Every aggregate is a partial that merges
+with another one of the same kind (counts and sums add, quantile sketches
+add their bucket counts), so workers can each roll up their own share of the
+event stream and a coordinator combines the results without rereading raw
+events. ``to_dict``/``from_dict`` move partials between processes as JSON.
+
+Definitions:
+
+- an *attack* is a ``damage_dealt`` event from a player; it *hits* when its
+  ``damage_amount`` is positive and is a *crit* when it hits with
+  ``is_critical`` set (hit rate = hits / attacks, crit rate = crits / hits)
+- *time-to-kill* runs from the first ``damage_dealt`` on an enemy instance to
+  its ``enemy_died`` event (``target_enemy_id``, else ``source_enemy_id``)
+
+Enemy types come from a caller-supplied enemy instance -> ``enemy_type_id``
+mapping; enemies missing from it are grouped under ``None``. A kill whose
+first hit was rolled up by a different worker is not timed, so partition the
+stream by ``room_id`` (as DynamoDB Streams shards ``CombatEventsTable``).
+
+Enemies that are hit but never die (rooms abandoned mid-fight) would keep
+their first hit forever, so first hits older than ``max_open_seconds`` before
+the newest event of the latest batch are dropped and counted in
+``expired_hits``; a kill after that is not timed.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .columnar import Categorical, CombatEventBatch
+
+Key = Optional[str]
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Positive values fall into logarithmic buckets ``(gamma**(i-1), gamma**i]``
+    with ``gamma = (1 + a) / (1 - a)``, so any quantile is returned within a
+    relative error ``a`` of a value at that rank. Zeros (misses, instant
+    kills) are counted on their own. Merging adds bucket counts, which makes
+    the result independent of how the data was split between sketches.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add_many(self, values: np.ndarray) -> None:
+        """Add non-negative values (NaN values are skipped)."""
+        values = values[~np.isnan(values)]
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        self.count += len(values)
+        if len(positive):
+            index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            keys, counts = np.unique(index, return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's counts to this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate ``q``-quantile (NaN if empty)."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma**key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-safe form of the sketch."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zeros": self.zeros,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch from ``to_dict`` output."""
+        sketch = cls(data["relative_accuracy"])
+        sketch.zeros = data["zeros"]
+        sketch.buckets = {int(k): v for k, v in data["buckets"].items()}
+        sketch.count = sketch.zeros + sum(sketch.buckets.values())
+        return sketch
+
+
+@dataclass
+class Summary:
+    """Count, sum, extremes and a quantile sketch of one value stream."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add_many(self, values: np.ndarray) -> None:
+        """Add values (NaN values are skipped)."""
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.sketch.add_many(values)
+
+    def merge(self, other: "Summary") -> None:
+        """Fold another summary into this one."""
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> float:
+        """Mean value (NaN if empty)."""
+        return self.total / self.count if self.count else math.nan
+
+    def report(self) -> Dict[str, float]:
+        """Return count, sum, mean, extremes and p50/p95/p99."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "min": self.minimum if self.count else math.nan,
+            "max": self.maximum if self.count else math.nan,
+            "p50": self.sketch.quantile(0.5),
+            "p95": self.sketch.quantile(0.95),
+            "p99": self.sketch.quantile(0.99),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-safe form of the summary."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum if self.count else None,
+            "maximum": self.maximum if self.count else None,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Summary":
+        """Rebuild a summary from ``to_dict`` output."""
+        return cls(
+            count=data["count"],
+            total=data["total"],
+            minimum=math.inf if data["minimum"] is None else data["minimum"],
+            maximum=-math.inf if data["maximum"] is None else data["maximum"],
+            sketch=QuantileSketch.from_dict(data["sketch"]),
+        )
+
+
+@dataclass
+class AttackCounts:
+    """Attack, hit and crit counts of one player."""
+
+    attacks: int = 0
+    hits: int = 0
+    crits: int = 0
+
+    def merge(self, other: "AttackCounts") -> None:
+        """Fold another player's counts into these."""
+        self.attacks += other.attacks
+        self.hits += other.hits
+        self.crits += other.crits
+
+    @property
+    def hit_rate(self) -> float:
+        """Hits per attack (NaN without attacks)."""
+        return self.hits / self.attacks if self.attacks else math.nan
+
+    @property
+    def crit_rate(self) -> float:
+        """Crits per hit (NaN without hits)."""
+        return self.crits / self.hits if self.hits else math.nan
+
+
+class CombatRollup:
+    """Running combat aggregates over a stream of event batches."""
+
+    def __init__(
+        self,
+        enemy_types: Optional[Mapping[str, str]] = None,
+        max_open_seconds: float = 3600.0,
+    ) -> None:
+        """Create an empty rollup.
+
+        Args:
+            enemy_types: Enemy instance ID -> ``enemy_type_id``
+            max_open_seconds: How long a first hit waits for its kill
+        """
+        self.enemy_types: Dict[str, str] = dict(enemy_types or {})
+        self.damage_by_ability: Dict[Key, Summary] = {}
+        self.damage_by_enemy_type: Dict[Key, Summary] = {}
+        self.time_to_kill: Dict[Key, Summary] = {}
+        self.attacks: Dict[Key, AttackCounts] = {}
+        # (room_id, enemy instance) -> first hit, microseconds since the epoch
+        self.first_hit: Dict[Tuple[str, str], int] = {}
+        self.max_open_seconds = max_open_seconds
+        self.expired_hits = 0
+        self.events = 0
+
+    def update(self, batch: CombatEventBatch) -> None:
+        """Fold one batch of events into the rollups."""
+        self.events += len(batch)
+        if not len(batch):
+            return
+        event_type = batch.categoricals["event_type"]
+        damage = batch.filter(event_type.codes == event_type.code_of("damage_dealt"))
+        amount = damage.floats["damage_amount"]
+        _add_grouped(self.damage_by_ability, damage.categoricals["ability_id"], amount)
+        types = self._enemy_type_column(damage.categoricals["target_enemy_id"])
+        _add_grouped(self.damage_by_enemy_type, types, amount)
+        self._count_attacks(damage)
+        self._record_first_hits(damage)
+        deaths = batch.filter(event_type.codes == event_type.code_of("enemy_died"))
+        self._record_kills(deaths)
+        self._expire_first_hits(int(batch.times["timestamp"].astype(np.int64).max()))
+
+    def merge(self, other: "CombatRollup") -> "CombatRollup":
+        """Fold another worker's partial rollup into this one and return self."""
+        self.enemy_types.update(other.enemy_types)
+        for mine, theirs in (
+            (self.damage_by_ability, other.damage_by_ability),
+            (self.damage_by_enemy_type, other.damage_by_enemy_type),
+            (self.time_to_kill, other.time_to_kill),
+        ):
+            for key, summary in theirs.items():
+                mine.setdefault(key, Summary()).merge(summary)
+        for key, counts in other.attacks.items():
+            self.attacks.setdefault(key, AttackCounts()).merge(counts)
+        for key, first in other.first_hit.items():
+            self.first_hit[key] = min(first, self.first_hit.get(key, first))
+        self.expired_hits += other.expired_hits
+        self.events += other.events
+        return self
+
+    @classmethod
+    def combine(cls, partials: Iterable["CombatRollup"]) -> "CombatRollup":
+        """Merge any number of partial rollups into a new one."""
+        result = cls()
+        for partial in partials:
+            result.merge(partial)
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        """Return the rollups as plain dictionaries for dashboards."""
+        return {
+            "events": self.events,
+            "damage_by_ability": _report(self.damage_by_ability),
+            "damage_by_enemy_type": _report(self.damage_by_enemy_type),
+            "time_to_kill_seconds": _report(self.time_to_kill),
+            "players": {
+                player: {
+                    "attacks": counts.attacks,
+                    "hit_rate": counts.hit_rate,
+                    "crit_rate": counts.crit_rate,
+                }
+                for player, counts in self.attacks.items()
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-safe partial for shipping to another process.
+
+        ``None`` keys are written as ``""`` (IDs are never empty).
+        """
+        return {
+            "events": self.events,
+            "enemy_types": self.enemy_types,
+            "damage_by_ability": _dump(self.damage_by_ability),
+            "damage_by_enemy_type": _dump(self.damage_by_enemy_type),
+            "time_to_kill": _dump(self.time_to_kill),
+            "attacks": {
+                _key_out(k): [c.attacks, c.hits, c.crits]
+                for k, c in self.attacks.items()
+            },
+            "first_hit": [
+                [room, enemy, t] for (room, enemy), t in self.first_hit.items()
+            ],
+            "max_open_seconds": self.max_open_seconds,
+            "expired_hits": self.expired_hits,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CombatRollup":
+        """Rebuild a partial from ``to_dict`` output."""
+        rollup = cls(data["enemy_types"], data["max_open_seconds"])
+        rollup.events = data["events"]
+        rollup.expired_hits = data["expired_hits"]
+        rollup.damage_by_ability = _load(data["damage_by_ability"])
+        rollup.damage_by_enemy_type = _load(data["damage_by_enemy_type"])
+        rollup.time_to_kill = _load(data["time_to_kill"])
+        rollup.attacks = {
+            _key_in(k): AttackCounts(*counts) for k, counts in data["attacks"].items()
+        }
+        rollup.first_hit = {(room, enemy): t for room, enemy, t in data["first_hit"]}
+        return rollup
+
+    def _enemy_type_column(self, enemies: Categorical) -> Categorical:
+        types = [self.enemy_types.get(enemy) for enemy in enemies.categories]
+        lookup = Categorical.encode(types)
+        remap = np.append(lookup.codes, -1)
+        return Categorical(remap[enemies.codes], lookup.categories)
+
+    def _count_attacks(self, damage: CombatEventBatch) -> None:
+        players = damage.categoricals["source_player_id"]
+        by_player = players.codes >= 0
+        codes = players.codes[by_player]
+        hits = damage.floats["damage_amount"][by_player] > 0
+        crits = hits & damage.is_critical[by_player]
+        size = len(players.categories)
+        attacks = np.bincount(codes, minlength=size)
+        hit_counts = np.bincount(codes, weights=hits, minlength=size)
+        crit_counts = np.bincount(codes, weights=crits, minlength=size)
+        for code in np.flatnonzero(attacks).tolist():
+            counts = self.attacks.setdefault(players.categories[code], AttackCounts())
+            counts.attacks += int(attacks[code])
+            counts.hits += int(hit_counts[code])
+            counts.crits += int(crit_counts[code])
+
+    def _record_first_hits(self, damage: CombatEventBatch) -> None:
+        rooms = damage.categoricals["room_id"]
+        enemies = damage.categoricals["target_enemy_id"]
+        times = damage.times["timestamp"].astype(np.int64)
+        for (room, enemy), first in _min_by_pair(rooms, enemies, times).items():
+            key = (room, enemy)
+            self.first_hit[key] = min(first, self.first_hit.get(key, first))
+
+    def _expire_first_hits(self, newest: int) -> None:
+        cutoff = newest - int(self.max_open_seconds * 1e6)
+        stale = [key for key, first in self.first_hit.items() if first < cutoff]
+        for key in stale:
+            del self.first_hit[key]
+        self.expired_hits += len(stale)
+
+    def _record_kills(self, deaths: CombatEventBatch) -> None:
+        if not len(deaths):
+            return
+        targets = deaths.categoricals["target_enemy_id"].decode()
+        sources = deaths.categoricals["source_enemy_id"].decode()
+        rooms = deaths.categoricals["room_id"].decode()
+        times = deaths.times["timestamp"].astype(np.int64).tolist()
+        kills: Dict[Key, List[float]] = {}
+        for room, target, source, died in zip(rooms, targets, sources, times):
+            enemy = target or source
+            first = self.first_hit.pop((room, enemy), None)
+            if enemy is None or first is None:
+                continue
+            kills.setdefault(self.enemy_types.get(enemy), []).append(
+                max(0, died - first) / 1e6
+            )
+        for enemy_type, seconds in kills.items():
+            self.time_to_kill.setdefault(enemy_type, Summary()).add_many(
+                np.asarray(seconds, dtype=np.float64)
+            )
+
+
+def _add_grouped(
+    target: Dict[Key, Summary], keys: Categorical, values: np.ndarray
+) -> None:
+    """Add ``values`` to the summary of each row's key, one slice per key."""
+    if not len(values):
+        return
+    order = np.argsort(keys.codes, kind="stable")
+    codes = keys.codes[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    for start, end in zip(starts.tolist(), np.r_[starts[1:], len(codes)].tolist()):
+        code = int(codes[start])
+        key = keys.categories[code] if code >= 0 else None
+        target.setdefault(key, Summary()).add_many(values[order[start:end]])
+
+
+def _min_by_pair(
+    rooms: Categorical, enemies: Categorical, times: np.ndarray
+) -> Dict[Tuple[str, str], int]:
+    """Earliest time per (room, enemy) pair, skipping rows without an enemy."""
+    present = (enemies.codes >= 0) & (rooms.codes >= 0)
+    if not present.any():
+        return {}
+    pairs = rooms.codes[present].astype(np.int64) * len(enemies.categories)
+    pairs += enemies.codes[present]
+    groups, inverse = np.unique(pairs, return_inverse=True)
+    first = np.full(len(groups), np.iinfo(np.int64).max)
+    np.minimum.at(first, inverse, times[present])
+    width = len(enemies.categories)
+    return {
+        (rooms.categories[pair // width], enemies.categories[pair % width]): t
+        for pair, t in zip(groups.tolist(), first.tolist())
+    }
+
+
+def _report(summaries: Mapping[Key, Summary]) -> Dict[Key, Dict[str, float]]:
+    return {key: summary.report() for key, summary in summaries.items()}
+
+
+def _key_out(key: Key) -> str:
+    return "" if key is None else key
+
+
+def _key_in(key: str) -> Key:
+    return key or None
+
+
+def _dump(summaries: Mapping[Key, Summary]) -> Dict[str, Any]:
+    return {_key_out(key): summary.to_dict() for key, summary in summaries.items()}
+
+
+def _load(data: Mapping[str, Any]) -> Dict[Key, Summary]:
+    return {_key_in(key): Summary.from_dict(value) for key, value in data.items()}
@@ -0,0 +1,5 @@
+"""FastAPI application for the TR-Dungeons backend."""
+
+from .main import create_app
+
+__all__ = ["create_app"]
@@ -0,0 +1,136 @@
+"""Versioned, precompressed snapshot of every static config model.
+
+Instead of one request per CombatStats, EnemyType, LootTable and Ability at
+game start, a client fetches a single bundle. The bundle's version is a hash
+of its content, so a client that already has the current version only needs
+the tiny ``/api/config/version`` request (or a 304 on the bundle itself).
+
+Each bundle is serialized once and stored raw, gzip- and brotli-compressed,
+so serving it is a byte copy regardless of the encoding the client accepts.
+Each encoding is a different representation with its own strong ETag (the
+version, suffixed ``-br``/``-gz`` for the compressed ones), so caches never
+answer a conditional request for one encoding with another's bytes.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import brotli
+
+from .config_source import ConfigSource
+
+BUNDLE_SECTIONS = {
+    "CombatStats": "combat_stats",
+    "EnemyType": "enemy_types",
+    "LootTable": "loot_tables",
+    "Ability": "abilities",
+}
+ENCODINGS = ("br", "gzip", "identity")
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz", "identity": ""}
+
+
+@dataclass(frozen=True)
+class ConfigBundle:
+    """One built bundle in every supported encoding."""
+
+    version: str
+    counts: Dict[str, int]
+    bodies: Dict[str, bytes]
+
+    def etag(self, encoding: str = "identity") -> str:
+        """Strong ETag of the bundle body in one encoding."""
+        return f'"{self.version}{ETAG_SUFFIXES[encoding]}"'
+
+    def body(self, encoding: str) -> bytes:
+        """Return the bundle body for ``br``, ``gzip`` or ``identity``."""
+        return self.bodies[encoding]
+
+
+def build_bundle(source: ConfigSource) -> ConfigBundle:
+    """Read every config model and build a content-hashed bundle.
+
+    Items are sorted by ID so that unchanged content always produces the same
+    version, whatever order the table returns them in.
+    """
+    sections = {
+        key: [
+            item.model_dump(mode="json")
+            for item in sorted(source.scan(model_name), key=lambda i: i.id)
+        ]
+        for model_name, key in BUNDLE_SECTIONS.items()
+    }
+    content = json.dumps(sections, separators=(",", ":"), sort_keys=True)
+    version = hashlib.sha256(content.encode()).hexdigest()[:20]
+    raw = f'{{"version":"{version}","config":{content}}}'.encode()
+    return ConfigBundle(
+        version=version,
+        counts={key: len(items) for key, items in sections.items()},
+        bodies={
+            "identity": raw,
+            "gzip": gzip.compress(raw, compresslevel=9, mtime=0),
+            "br": brotli.compress(raw, quality=11),
+        },
+    )
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Pick the best precompressed encoding the client accepts.
+
+    An encoding listed by name is accepted when its ``q`` is above zero; one
+    that is not listed falls back to the ``*`` entry, so ``*, br;q=0``
+    excludes brotli.
+    """
+    if not accept_encoding:
+        return "identity"
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        weight = 1.0
+        if q.startswith("q="):
+            try:
+                weight = float(q[2:])
+            except ValueError:
+                continue
+        weights[token.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if weights.get(encoding, wildcard) > 0:
+            return encoding
+    return "identity"
+
+
+class BundleStore:
+    """Holds the current bundle and rebuilds it after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        source: ConfigSource,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._source = source
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._current: Optional[Tuple[float, ConfigBundle]] = None
+        self.builds = 0
+
+    def current(self) -> ConfigBundle:
+        """Return the current bundle, building it if missing or stale."""
+        with self._lock:
+            if self._current is None or self._current[0] <= self._clock():
+                bundle = build_bundle(self._source)
+                self.builds += 1
+                self._current = (self._clock() + self._ttl, bundle)
+            return self._current[1]
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next request (e.g. after a content release)."""
+        with self._lock:
+            self._current = None
@@ -0,0 +1,90 @@
+"""Read access to the static configuration tables.
+
+CombatStats, EnemyType, LootTable and Ability items live in tables keyed by
+``pk``/``sk`` strings; a config item is stored with ``pk`` set to its ID and
+``sk`` set to ``CONFIG_SORT_KEY``.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Tuple
+
+from pydantic import BaseModel
+
+from storage.dynamodb_codec import codec_for
+
+CONFIG_MODELS = ("CombatStats", "EnemyType", "LootTable", "Ability")
+CONFIG_SORT_KEY = "CONFIG"
+
+
+class ConfigSource(Protocol):
+    """Where config models are read from."""
+
+    def get(self, model_name: str, item_id: str) -> Optional[BaseModel]:
+        """Return one config item, or None if it does not exist."""
+        ...
+
+    def scan(self, model_name: str) -> List[BaseModel]:
+        """Return every config item of one model."""
+        ...
+
+
+class DynamoDBConfigSource:
+    """Config source backed by the DynamoDB config tables."""
+
+    def __init__(self, client: Any, tables: Mapping[str, str]) -> None:
+        """Create the source.
+
+        Args:
+            client: boto3 DynamoDB low-level client
+            tables: Model name -> table name
+        """
+        self._client = client
+        self._tables = dict(tables)
+        self.reads = 0
+
+    def get(self, model_name: str, item_id: str) -> Optional[BaseModel]:
+        """Read one item with a strongly-typed, single-pass decode."""
+        self.reads += 1
+        response = self._client.get_item(
+            TableName=self._tables[model_name],
+            Key={"pk": {"S": item_id}, "sk": {"S": CONFIG_SORT_KEY}},
+        )
+        item = response.get("Item")
+        return codec_for(model_name).decode(item) if item is not None else None
+
+    def scan(self, model_name: str) -> List[BaseModel]:
+        """Read every config item of one model, one scan page at a time."""
+        codec = codec_for(model_name)
+        items: List[BaseModel] = []
+        paginator = self._client.get_paginator("scan")
+        for page in paginator.paginate(
+            TableName=self._tables[model_name],
+            FilterExpression="sk = :sk",
+            ExpressionAttributeValues={":sk": {"S": CONFIG_SORT_KEY}},
+        ):
+            self.reads += 1
+            items.extend(codec.decode_page(page))
+        return items
+
+
+class InMemoryConfigSource:
+    """Config source over in-process models, for tests and local runs."""
+
+    def __init__(self, items: Iterable[BaseModel] = ()) -> None:
+        self._items: Dict[Tuple[str, str], BaseModel] = {}
+        self.reads = 0
+        for item in items:
+            self.put(item)
+
+    def put(self, item: BaseModel) -> None:
+        """Add or replace a config item."""
+        self._items[(type(item).__name__, item.id)] = item
+
+    def get(self, model_name: str, item_id: str) -> Optional[BaseModel]:
+        """Return one config item, or None if it does not exist."""
+        self.reads += 1
+        return self._items.get((model_name, item_id))
+
+    def scan(self, model_name: str) -> List[BaseModel]:
+        """Return every config item of one model."""
+        self.reads += 1
+        return [item for (name, _), item in self._items.items() if name == model_name]
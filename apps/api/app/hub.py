@@ -0,0 +1,245 @@
+"""Per-room WebSocket broadcast hub.
+
+Each room has a set of subscribers. A broadcast is serialized once and the
+same frame object is queued for every receiver, so fan-out costs one
+``json.dumps`` regardless of room size.
+
+Every subscriber has a bounded send queue drained by its own sender task.
+Frames published with a ``coalesce`` key (position batches) replace the
+not-yet-sent frame with the same key instead of queueing behind it, and are
+the first to be dropped when a slow client's queue is full. A client whose
+queue is full of frames that cannot be dropped is disconnected rather than
+allowed to grow server memory.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
+
+Frame = Union[str, bytes]
+Send = Callable[[Frame], Awaitable[None]]
+
+
+def dumps(message: Dict[str, Any]) -> str:
+    """Serialize a protocol message as compact JSON text."""
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+
+class SendQueue:
+    """Bounded FIFO of outgoing frames with keyed replacement."""
+
+    def __init__(self, max_frames: int) -> None:
+        self.max_frames = max_frames
+        self._frames: Deque[List[Any]] = deque()
+        self._keyed: Dict[str, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.coalesced = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def put(self, frame: Frame, coalesce: Optional[str] = None) -> bool:
+        """Queue a frame.
+
+        Args:
+            frame: Serialized frame
+            coalesce: Key of a frame kind where only the newest matters
+
+        Returns:
+            False if the queue is full of frames that cannot be dropped
+        """
+        if self._closed:
+            return True
+        if coalesce is not None:
+            pending = self._keyed.get(coalesce)
+            if pending is not None:
+                pending[1] = frame
+                self.coalesced += 1
+                return True
+        if len(self._frames) >= self.max_frames and not self._drop_one():
+            return False
+        entry = [coalesce, frame]
+        self._frames.append(entry)
+        if coalesce is not None:
+            self._keyed[coalesce] = entry
+        self._ready.set()
+        return True
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue has been closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Wake any waiting ``get``; queued frames are discarded."""
+        self._closed = True
+        self._frames.clear()
+        self._keyed.clear()
+        self._ready.set()
+
+    async def get(self) -> Optional[Frame]:
+        """Wait for and remove the oldest frame; None once the queue is closed."""
+        while not self._frames:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        coalesce, frame = self._frames.popleft()
+        if coalesce is not None:
+            del self._keyed[coalesce]
+        return frame
+
+    def _drop_one(self) -> bool:
+        for entry in self._frames:
+            if entry[0] is not None:
+                self._frames.remove(entry)
+                del self._keyed[entry[0]]
+                self.dropped += 1
+                return True
+        return False
+
+
+class Subscriber:
+    """One connected client: its send queue and sender task."""
+
+    def __init__(
+        self, session_id: str, room_id: str, send: Send, max_frames: int = 64
+    ) -> None:
+        self.session_id = session_id
+        self.room_id = room_id
+        self.queue = SendQueue(max_frames)
+        self._send = send
+        self.sent = 0
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        """Queue a message for this client only."""
+        return self.queue.put(dumps(message))
+
+    async def pump(self) -> None:
+        """Send queued frames until the queue is closed or a send fails."""
+        while True:
+            frame = await self.queue.get()
+            if frame is None:
+                return
+            await self._send(frame)
+            self.sent += 1
+
+
+class RoomHub:
+    """Room membership and fan-out for WebSocket subscribers."""
+
+    def __init__(self, max_frames: int = 64) -> None:
+        """Create the hub.
+
+        Args:
+            max_frames: Send queue bound per subscriber
+        """
+        self.max_frames = max_frames
+        self._rooms: Dict[str, Set[Subscriber]] = {}
+        self.broadcasts = 0
+        self.disconnects = 0
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self._rooms.values())
+
+    def room_size(self, room_id: str) -> int:
+        """Number of subscribers in a room."""
+        return len(self._rooms.get(room_id, ()))
+
+    def session_ids(self, room_id: str) -> List[str]:
+        """Session IDs subscribed to a room."""
+        return [subscriber.session_id for subscriber in self._rooms.get(room_id, ())]
+
+    def join(self, session_id: str, room_id: str, send: Send) -> Subscriber:
+        """Subscribe a client to a room; the caller runs ``subscriber.pump()``."""
+        subscriber = Subscriber(session_id, room_id, send, self.max_frames)
+        self._rooms.setdefault(room_id, set()).add(subscriber)
+        return subscriber
+
+    def leave(self, subscriber: Subscriber) -> None:
+        """Unsubscribe a client and stop its sender."""
+        subscriber.queue.close()
+        members = self._rooms.get(subscriber.room_id)
+        if members is not None:
+            members.discard(subscriber)
+            if not members:
+                del self._rooms[subscriber.room_id]
+
+    def broadcast(
+        self,
+        room_id: str,
+        message: Union[Dict[str, Any], Frame],
+        coalesce: Optional[str] = None,
+        exclude: Optional[Subscriber] = None,
+    ) -> int:
+        """Queue one message for every subscriber in a room.
+
+        Args:
+            room_id: Target room
+            message: Protocol message (serialized here, once) or a prebuilt frame
+            coalesce: Replacement key for stale-able frames such as positions
+            exclude: Subscriber that should not receive its own message
+
+        Returns:
+            Number of subscribers the frame was queued for
+        """
+        members = self._rooms.get(room_id)
+        if not members:
+            return 0
+        frame = message if isinstance(message, (str, bytes)) else dumps(message)
+        self.broadcasts += 1
+        queued = 0
+        for subscriber in list(members):
+            if subscriber is not exclude:
+                queued += self._queue(subscriber, frame, coalesce)
+        return queued
+
+    def broadcast_each(
+        self,
+        room_id: str,
+        frames: Mapping[str, Frame],
+        coalesce: Optional[str] = None,
+    ) -> int:
+        """Queue a per-client frame (e.g. an interest-filtered position batch).
+
+        Args:
+            room_id: Target room
+            frames: session_id -> frame; subscribers without one get nothing
+            coalesce: Replacement key for stale-able frames such as positions
+
+        Returns:
+            Number of subscribers a frame was queued for
+        """
+        members = self._rooms.get(room_id)
+        if not members:
+            return 0
+        self.broadcasts += 1
+        queued = 0
+        for subscriber in list(members):
+            frame = frames.get(subscriber.session_id)
+            if frame is not None:
+                queued += self._queue(subscriber, frame, coalesce)
+        return queued
+
+    def _queue(
+        self, subscriber: Subscriber, frame: Frame, coalesce: Optional[str]
+    ) -> bool:
+        if subscriber.queue.put(frame, coalesce):
+            return True
+        self.disconnects += 1
+        self.leave(subscriber)
+        return False
@@ -0,0 +1,165 @@
+"""FastAPI application factory."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import FastAPI
+
+from rules.damage import StatsIndex
+from runtime.event_ingest import EventIngest, IngestedEventLog
+from runtime.event_ring import RecentEvents
+from runtime.heartbeat import HeartbeatMonitor
+from runtime.room_engine import RoomEngine
+from runtime.write_behind import WriteBehindSessionStore
+from storage.event_table import DynamoDBEventWriter, InMemoryEventWriter
+from storage.room_table import (
+    DynamoDBRoomCheckpointStore,
+    DynamoDBRoomEventLog,
+    InMemoryRoomCheckpointStore,
+    InMemoryRoomEventLog,
+)
+from storage.session_table import DynamoDBSessionWriter, InMemorySessionWriter
+
+from .bundle import BundleStore
+from .cache import TTLCache
+from .config_source import ConfigSource, DynamoDBConfigSource
+from .hub import RoomHub
+from .routers import bundle, config, events, rooms, runtime
+from .settings import Settings
+from .shard import RoomShard
+
+logger = logging.getLogger(__name__)
+
+
+def _room_runtime(
+    settings: Settings, client: Optional[Any], recent: RecentEvents
+) -> Tuple[RoomEngine, EventIngest]:
+    """Build the room engine and its event log pipeline.
+
+    With a DynamoDB client, checkpoints and logged events go to the room
+    states and combat events tables; without one (tests and local runs with
+    an injected config source) they are kept in memory.
+    """
+    if client is None:
+        checkpoints: Any = InMemoryRoomCheckpointStore()
+        log: Any = InMemoryRoomEventLog()
+        writer: Any = InMemoryEventWriter()
+    else:
+        checkpoints = DynamoDBRoomCheckpointStore(client, settings.room_states_table)
+        log = DynamoDBRoomEventLog(client, settings.combat_events_table)
+        writer = DynamoDBEventWriter(client, settings.combat_events_table)
+    ingest = EventIngest(writer, flush_interval=settings.event_flush_interval)
+    engine = RoomEngine(checkpoints, IngestedEventLog(ingest, log), recent=recent)
+    return engine, ingest
+
+
+def _session_store(
+    settings: Settings, client: Optional[Any]
+) -> WriteBehindSessionStore:
+    """Build the write-behind session store (in memory without a client)."""
+    if client is None:
+        writer: Any = InMemorySessionWriter()
+    else:
+        writer = DynamoDBSessionWriter(client, settings.player_sessions_table)
+    return WriteBehindSessionStore(
+        writer, flush_interval=settings.session_flush_interval
+    )
+
+
+def _load_rules(source: ConfigSource) -> Tuple[StatsIndex, Dict[str, str]]:
+    """Read the stats index and enemy_type_id -> combat_stats_id from config."""
+    enemy_types = {e.id: e.combat_stats_id for e in source.scan("EnemyType")}
+    return StatsIndex.from_config_source(source), enemy_types
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    engine: RoomEngine = app.state.room_engine
+    shard: RoomShard = app.state.room_shard
+    try:
+        shard.set_rules(*await asyncio.to_thread(_load_rules, app.state.config_source))
+    except Exception:
+        logger.exception("Loading combat rules failed; events are not validated")
+    checkpoints = asyncio.create_task(engine.run())
+    ingests = [
+        asyncio.create_task(pipeline.run())
+        for pipeline in app.state.event_ingests.values()
+    ]
+    loops = [asyncio.create_task(loop.run()) for loop in app.state.tick_loops.values()]
+    heartbeats = asyncio.create_task(app.state.heartbeats.run())
+    sessions = asyncio.create_task(app.state.session_store.run())
+    try:
+        yield
+    finally:
+        for task in (*loops, heartbeats):
+            task.cancel()
+        await asyncio.gather(*loops, heartbeats, return_exceptions=True)
+        # Cancelling the session store writes its dirty sessions.
+        sessions.cancel()
+        await asyncio.gather(sessions, return_exceptions=True)
+        checkpoints.cancel()
+        await asyncio.gather(checkpoints, return_exceptions=True)
+        try:
+            await engine.checkpoint()
+        except Exception:
+            logger.exception("Final room checkpoint failed")
+        # Cancelling an ingest flushes whatever it still buffers.
+        for task in ingests:
+            task.cancel()
+        await asyncio.gather(*ingests, return_exceptions=True)
+
+
+def create_app(
+    settings: Optional[Settings] = None,
+    config_source: Optional[ConfigSource] = None,
+) -> FastAPI:
+    """Create the API application.
+
+    Args:
+        settings: API settings (read from the environment by default)
+        config_source: Where config models are read from (DynamoDB by default;
+            when one is given, room state is kept in memory too)
+
+    Returns:
+        The configured FastAPI app
+    """
+    settings = settings or Settings()
+    client = None
+    if config_source is None:
+        import boto3
+
+        client = boto3.client("dynamodb")
+        config_source = DynamoDBConfigSource(client, settings.config_tables)
+    recent = RecentEvents(capacity=settings.event_ring_size)
+    engine, ingest = _room_runtime(settings, client, recent)
+    sessions = _session_store(settings, client)
+    heartbeats = HeartbeatMonitor(sessions, timeout=settings.heartbeat_timeout)
+
+    app = FastAPI(title="TR-Dungeons API", lifespan=_lifespan)
+    app.state.settings = settings
+    app.state.config_source = config_source
+    app.state.config_cache = TTLCache(
+        max_entries=settings.config_cache_size, ttl_seconds=settings.config_cache_ttl
+    )
+    app.state.config_bundles = BundleStore(
+        config_source, ttl_seconds=settings.config_cache_ttl
+    )
+    app.state.room_engine = engine
+    app.state.recent_events = recent
+    app.state.room_hub = RoomHub(max_frames=settings.ws_send_queue_frames)
+    app.state.session_store = sessions
+    app.state.heartbeats = heartbeats
+    app.state.room_shard = shard = RoomShard(
+        engine, app.state.room_hub, sessions=sessions, rate_hz=settings.tick_rate
+    )
+    heartbeats.on_disconnect(shard.remove_session)
+    app.state.tick_loops = {"rooms": shard.loop}
+    app.state.event_ingests = {"combat_events": ingest}
+    app.include_router(config.router)
+    app.include_router(bundle.router)
+    app.include_router(events.router)
+    app.include_router(rooms.router)
+    app.include_router(runtime.router)
+    return app
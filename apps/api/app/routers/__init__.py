@@ -0,0 +1 @@
+"""HTTP routers for the backend API."""
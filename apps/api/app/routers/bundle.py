@@ -0,0 +1,74 @@
+"""Config bundle endpoints."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+
+from ..bundle import negotiate_encoding
+from .config import etag_matches
+
+router = APIRouter(prefix="/api/config", tags=["config"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _bundle_response(
+    request: Request,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str],
+    cache_control: str,
+    version: Optional[str] = None,
+) -> Response:
+    bundle = request.app.state.config_bundles.current()
+    if version is not None and version != bundle.version:
+        raise HTTPException(404, f"Bundle version '{version}' is not current")
+    encoding = negotiate_encoding(accept_encoding)
+    headers = {
+        "ETag": bundle.etag(encoding),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+        "X-Bundle-Version": bundle.version,
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        bundle.body(encoding), headers=headers, media_type="application/json"
+    )
+
+
+@router.get("/version")
+def get_bundle_version(request: Request) -> Response:
+    """Return the current bundle version so clients can skip unchanged downloads."""
+    bundle = request.app.state.config_bundles.current()
+    body = f'{{"version":"{bundle.version}"}}'.encode()
+    return Response(
+        body,
+        headers={"Cache-Control": "no-cache"},
+        media_type="application/json",
+    )
+
+
+@router.get("/bundle")
+def get_bundle(
+    request: Request,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """Fetch the current config bundle."""
+    max_age = request.app.state.settings.config_max_age
+    return _bundle_response(
+        request, accept_encoding, if_none_match, f"public, max-age={max_age}"
+    )
+
+
+@router.get("/bundle/{version}")
+def get_bundle_version_pinned(
+    version: str,
+    request: Request,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """Fetch a specific bundle version; cacheable forever because it never changes."""
+    return _bundle_response(request, accept_encoding, if_none_match, IMMUTABLE, version)
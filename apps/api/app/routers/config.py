@@ -0,0 +1,130 @@
+"""Cached read endpoints for the static configuration models.
+
+Responses are cached in-process as serialized bytes together with a strong
+ETag computed from their content. A request whose ``If-None-Match`` matches
+the cached ETag is answered with ``304 Not Modified`` without reading the
+table or re-serializing, so a game launch with warm data costs no reads.
+
+Not-found responses are cached too, for the shorter
+``Settings.config_negative_ttl``, so clients repeatedly asking for a missing
+ID do not read the table on every request, while newly added items still
+show up quickly.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Optional, Type
+
+from fastapi import APIRouter, Header, Request, Response
+from pydantic import BaseModel
+
+from models.AbilityModel import AbilityGetResponse
+from models.CombatStatsModel import CombatStatsGetResponse
+from models.EnemyTypeModel import EnemyTypeGetResponse
+from models.LootTableModel import LootTableGetResponse
+
+router = APIRouter(prefix="/api", tags=["config"])
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Serialized response body and its strong ETag."""
+
+    status_code: int
+    body: bytes
+    etag: str
+
+
+def content_etag(body: bytes) -> str:
+    """Return a strong ETag for a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate ``If-None-Match`` against an ETag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def _load(
+    request: Request, model_name: str, envelope: Type[BaseModel], item_id: str
+) -> CachedResponse:
+    state = request.app.state
+    key = (model_name, item_id)
+    cached = state.config_cache.get(key)
+    if cached is not None:
+        return cached
+
+    item = state.config_source.get(model_name, item_id)
+    if item is None:
+        status_code = 404
+        payload = envelope(
+            code=404, success=False, message=f"{model_name} '{item_id}' not found"
+        )
+    else:
+        status_code = 200
+        payload = envelope(code=200, success=True, item=item)
+    body = payload.model_dump_json().encode()
+    cached = CachedResponse(status_code, body, content_etag(body))
+    if status_code == 200:
+        state.config_cache.put(key, cached)
+    else:
+        state.config_cache.put(key, cached, state.settings.config_negative_ttl)
+    return cached
+
+
+def _respond(
+    request: Request,
+    model_name: str,
+    envelope: Type[BaseModel],
+    item_id: str,
+    if_none_match: Optional[str],
+) -> Response:
+    cached = _load(request, model_name, envelope, item_id)
+    if cached.status_code != 200:
+        return Response(cached.body, cached.status_code, media_type="application/json")
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={request.app.state.settings.config_max_age}",
+    }
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, 200, headers=headers, media_type="application/json")
+
+
+@router.get("/combat-stats/{item_id}", response_model=CombatStatsGetResponse)
+def get_combat_stats(
+    item_id: str, request: Request, if_none_match: Optional[str] = Header(None)
+) -> Response:
+    """Fetch a CombatStats configuration."""
+    return _respond(
+        request, "CombatStats", CombatStatsGetResponse, item_id, if_none_match
+    )
+
+
+@router.get("/enemy-types/{item_id}", response_model=EnemyTypeGetResponse)
+def get_enemy_type(
+    item_id: str, request: Request, if_none_match: Optional[str] = Header(None)
+) -> Response:
+    """Fetch an EnemyType configuration."""
+    return _respond(request, "EnemyType", EnemyTypeGetResponse, item_id, if_none_match)
+
+
+@router.get("/loot-tables/{item_id}", response_model=LootTableGetResponse)
+def get_loot_table(
+    item_id: str, request: Request, if_none_match: Optional[str] = Header(None)
+) -> Response:
+    """Fetch a LootTable configuration."""
+    return _respond(request, "LootTable", LootTableGetResponse, item_id, if_none_match)
+
+
+@router.get("/abilities/{item_id}", response_model=AbilityGetResponse)
+def get_ability(
+    item_id: str, request: Request, if_none_match: Optional[str] = Header(None)
+) -> Response:
+    """Fetch an Ability configuration."""
+    return _respond(request, "Ability", AbilityGetResponse, item_id, if_none_match)
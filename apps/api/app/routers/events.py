@@ -0,0 +1,46 @@
+"""Reconnect sync from the per-room recent event buffer."""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from runtime.event_ring import RecentEvents
+from runtime.room_engine import RoomEngine
+
+router = APIRouter(prefix="/api", tags=["events"])
+
+
+@router.get("/events/{room_id}")
+def get_room_events(
+    request: Request,
+    room_id: str,
+    since: Optional[int] = Query(None, ge=0, description="Last event seq seen"),
+) -> Dict[str, Any]:
+    """Return the events a client missed, or a room snapshot if it fell behind.
+
+    Without ``since`` the whole buffer (the room's last N events) is returned.
+    When the client's sequence number is no longer buffered the response has
+    the room engine's current ``room_state`` instead of events; ``seq`` is the
+    sequence number the client is at after applying either.
+    """
+    engine: RoomEngine = request.app.state.room_engine
+    recent: RecentEvents = request.app.state.recent_events
+    ring = recent.ring(room_id)
+    if ring is None or room_id not in engine:
+        raise HTTPException(404, f"Room '{room_id}' is not live")
+    missed = ring.since(ring.first_seq - 1 if since is None else since)
+    if missed is None:
+        return {
+            "room_id": room_id,
+            "seq": ring.last_seq,
+            "events": [],
+            "room_state": engine.state(room_id).model_dump(mode="json"),
+        }
+    return {
+        "room_id": room_id,
+        "seq": ring.last_seq,
+        "events": [
+            {"seq": seq, "event": event.model_dump(mode="json")}
+            for seq, event in missed
+        ],
+    }
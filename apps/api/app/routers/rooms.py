@@ -0,0 +1,177 @@
+"""Room WebSocket endpoint (Phase 2 multiplayer protocol).
+
+A client joins with ``connect``; a room the engine does not own yet is
+recovered from its checkpoint first. The ``connected`` reply carries the
+room's state and version; tick frames carry deltas from that version on,
+and a client that missed some sends ``resync`` with the version it holds to
+get a ``room_update`` with the missing deltas or the full state.
+
+``session_update`` messages carry the client's ``PlayerSession`` and are
+queued on the room shard, which applies the latest one per tick;
+``heartbeat`` messages keep the session alive. ``combat_event`` messages
+are queued on the shard too: peers only see an event once the rules
+accepted it and the engine applied it, in a tick frame, and a rejected
+event is answered with an ``error``. Binary frames are not part of the
+client protocol and close the socket with 1003. When the socket closes, the
+session leaves the shard and the heartbeat monitor.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from starlette.datastructures import State
+
+from models import CombatEvent, PlayerSession
+from runtime.room_engine import RoomEngine
+
+from ..hub import Frame, RoomHub, Subscriber
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["rooms"])
+
+# Close code sent to clients that could not keep up with their room.
+CLOSE_TOO_SLOW = status.WS_1013_TRY_AGAIN_LATER
+
+
+def _error(message: str) -> Dict[str, Any]:
+    return {"type": "error", "message": message}
+
+
+def _session_update(state: State, subscriber: Subscriber, payload: Any) -> None:
+    try:
+        session = PlayerSession.model_validate(payload)
+    except ValidationError as e:
+        subscriber.send(_error(f"Invalid session: {e.error_count()} errors"))
+        return
+    if (session.session_id, session.room_id) != (
+        subscriber.session_id,
+        subscriber.room_id,
+    ):
+        subscriber.send(_error("Session updates must match the connected session"))
+        return
+    state.room_shard.submit_session(session)
+
+
+def _combat_event(state: State, subscriber: Subscriber, payload: Any) -> None:
+    if not isinstance(payload, dict):
+        subscriber.send(_error("Combat events must be JSON objects"))
+        return
+    try:
+        event = CombatEvent.model_validate({**payload, "room_id": subscriber.room_id})
+    except ValidationError as e:
+        subscriber.send(_error(f"Invalid combat event: {e.error_count()} errors"))
+        return
+    state.room_shard.submit_event(event, subscriber.session_id)
+
+
+def _resync(state: State, subscriber: Subscriber, version: Any) -> None:
+    if version is not None and (
+        not isinstance(version, int) or isinstance(version, bool)
+    ):
+        subscriber.send(_error("Resync version must be an integer"))
+        return
+    update = state.room_shard.sync(subscriber.room_id, version)
+    if update is None:
+        subscriber.send(_error(f"Room '{subscriber.room_id}' is not live"))
+        return
+    subscriber.send(update)
+
+
+async def _receive(websocket: WebSocket, state: State, subscriber: Subscriber) -> None:
+    while True:
+        received = await websocket.receive()
+        if received["type"] == "websocket.disconnect":
+            return
+        if received.get("bytes") is not None:
+            await websocket.close(status.WS_1003_UNSUPPORTED_DATA)
+            return
+        try:
+            message = json.loads(received.get("text") or "")
+        except ValueError:
+            subscriber.send(_error("Messages must be JSON objects"))
+            continue
+        kind = message.get("type") if isinstance(message, dict) else None
+        if kind == "heartbeat":
+            state.heartbeats.heartbeat(subscriber.session_id)
+            subscriber.send(
+                {
+                    "type": "heartbeat_ack",
+                    "server_time": datetime.now(timezone.utc).isoformat(),
+                }
+            )
+        elif kind == "session_update":
+            _session_update(state, subscriber, message.get("session"))
+        elif kind == "combat_event":
+            _combat_event(state, subscriber, message.get("event"))
+        elif kind == "resync":
+            _resync(state, subscriber, message.get("version"))
+        else:
+            subscriber.send(_error(f"Unsupported message type '{kind}'"))
+
+
+@router.websocket("/ws/rooms")
+async def room_socket(websocket: WebSocket) -> None:
+    """Join a room with a ``connect`` message, then exchange room traffic."""
+    state = websocket.app.state
+    hub: RoomHub = state.room_hub
+    engine: RoomEngine = state.room_engine
+    await websocket.accept()
+    try:
+        hello = await websocket.receive_json()
+    except (ValueError, WebSocketDisconnect):
+        await websocket.close(status.WS_1008_POLICY_VIOLATION)
+        return
+    if not (
+        isinstance(hello, dict)
+        and hello.get("type") == "connect"
+        and hello.get("session_id")
+        and hello.get("room_id")
+    ):
+        await websocket.close(status.WS_1008_POLICY_VIOLATION)
+        return
+    if hello["room_id"] not in engine:
+        try:
+            await engine.recover_in_thread(hello["room_id"])
+        except Exception:
+            logger.exception("Could not recover room %s", hello["room_id"])
+            await websocket.close(status.WS_1011_INTERNAL_ERROR)
+            return
+
+    async def send(frame: Frame) -> None:
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
+
+    subscriber = hub.join(hello["session_id"], hello["room_id"], send)
+    update = state.room_shard.sync(subscriber.room_id) or {}
+    subscriber.send(
+        {
+            "type": "connected",
+            "room_id": subscriber.room_id,
+            "version": update.get("version"),
+            "room_state": update.get("room_state"),
+        }
+    )
+    pump = asyncio.create_task(subscriber.pump())
+    state.heartbeats.heartbeat(subscriber.session_id)
+    receive = asyncio.create_task(_receive(websocket, state, subscriber))
+    try:
+        await asyncio.wait({pump, receive}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        too_slow = subscriber.queue.closed and not receive.done()
+        # Cancel without awaiting: nothing else may be awaited once the peer
+        # has gone, and both tasks finish on their next turn of the loop.
+        pump.cancel()
+        receive.cancel()
+        hub.leave(subscriber)
+        state.heartbeats.forget(subscriber.session_id)
+        state.room_shard.remove_session(subscriber.session_id)
+    if too_slow:
+        await websocket.close(CLOSE_TOO_SLOW)
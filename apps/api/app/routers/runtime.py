@@ -0,0 +1,25 @@
+"""Runtime metrics endpoints."""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+
+router = APIRouter(prefix="/api/runtime", tags=["runtime"])
+
+
+@router.get("/ticks")
+def get_tick_stats(request: Request) -> Dict[str, Dict[str, Any]]:
+    """Tick-duration histograms and overrun counters per registered tick loop."""
+    return {
+        name: loop.stats.snapshot()
+        for name, loop in request.app.state.tick_loops.items()
+    }
+
+
+@router.get("/ingest")
+def get_ingest_stats(request: Request) -> Dict[str, Dict[str, Any]]:
+    """Queue depth, flush latency and drop counters per combat event pipeline."""
+    return {
+        name: pipeline.snapshot()
+        for name, pipeline in request.app.state.event_ingests.items()
+    }
@@ -0,0 +1,89 @@
+"""Runtime settings read from the environment."""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+@dataclass(frozen=True)
+class Settings:
+    """API settings.
+
+    Attributes:
+        config_tables: Model name -> DynamoDB table holding that config model
+        config_cache_ttl: Seconds a cached config response stays fresh
+        config_negative_ttl: Seconds a config 404 stays cached
+        config_cache_size: Maximum cached config responses
+        config_max_age: ``Cache-Control: max-age`` sent to clients
+        ws_send_queue_frames: Outgoing frames buffered per WebSocket client
+        event_ring_size: Recent combat events kept per room for reconnect sync
+        room_states_table: DynamoDB table holding room checkpoints
+        combat_events_table: DynamoDB table holding the room event logs
+        event_flush_interval: Seconds a logged combat event waits to be written
+        player_sessions_table: DynamoDB table holding player sessions
+        session_flush_interval: Seconds between batched session writes
+        heartbeat_timeout: Seconds without a heartbeat before a session is dropped
+        tick_rate: Room shard ticks per second
+    """
+
+    config_tables: Dict[str, str] = field(
+        default_factory=lambda: {
+            "CombatStats": os.environ.get(
+                "COMBAT_STATS_TABLE", "tr-dungeons-combat-stats"
+            ),
+            "EnemyType": os.environ.get("ENEMY_TYPES_TABLE", "tr-dungeons-enemy-types"),
+            "LootTable": os.environ.get("LOOT_TABLES_TABLE", "tr-dungeons-loot-tables"),
+            "Ability": os.environ.get("ABILITIES_TABLE", "tr-dungeons-abilities"),
+        }
+    )
+    config_cache_ttl: float = field(
+        default_factory=lambda: _env_float("CONFIG_CACHE_TTL_SECONDS", 300.0)
+    )
+    config_negative_ttl: float = field(
+        default_factory=lambda: _env_float("CONFIG_NEGATIVE_CACHE_TTL_SECONDS", 5.0)
+    )
+    config_cache_size: int = field(
+        default_factory=lambda: _env_int("CONFIG_CACHE_MAX_ENTRIES", 4096)
+    )
+    config_max_age: int = field(
+        default_factory=lambda: _env_int("CONFIG_CLIENT_MAX_AGE_SECONDS", 60)
+    )
+    ws_send_queue_frames: int = field(
+        default_factory=lambda: _env_int("WS_SEND_QUEUE_FRAMES", 64)
+    )
+    event_ring_size: int = field(
+        default_factory=lambda: _env_int("EVENT_RING_SIZE", 256)
+    )
+    room_states_table: str = field(
+        default_factory=lambda: os.environ.get(
+            "ROOM_STATES_TABLE", "tr-dungeons-room-states"
+        )
+    )
+    combat_events_table: str = field(
+        default_factory=lambda: os.environ.get(
+            "COMBAT_EVENTS_TABLE", "tr-dungeons-combat-events"
+        )
+    )
+    event_flush_interval: float = field(
+        default_factory=lambda: _env_float("EVENT_FLUSH_INTERVAL_SECONDS", 0.5)
+    )
+    player_sessions_table: str = field(
+        default_factory=lambda: os.environ.get(
+            "PLAYER_SESSIONS_TABLE", "tr-dungeons-player-sessions"
+        )
+    )
+    session_flush_interval: float = field(
+        default_factory=lambda: _env_float("SESSION_FLUSH_INTERVAL_SECONDS", 1.0)
+    )
+    heartbeat_timeout: float = field(
+        default_factory=lambda: _env_float("HEARTBEAT_TIMEOUT_SECONDS", 30.0)
+    )
+    tick_rate: float = field(default_factory=lambda: _env_float("TICK_RATE_HZ", 20.0))
@@ -0,0 +1,349 @@
+"""Tick-driven processing for a shard of rooms.
+
+Client input is queued as it arrives and handled once per tick: queued
+combat events are applied to the room engine in arrival order, session
+updates are coalesced to the latest state per session, and each client then
+gets at most one merged ``wire.tick_frame`` frame carrying the room delta,
+the tick's combat events and its interest-filtered position batch.
+
+With rules loaded (``set_rules``), a tick's combat events are checked in one
+``DamageValidator`` pass before they are applied, and position updates go
+through each room's ``MovementValidator``: moves that are too fast are
+clamped to the allowed distance and out-of-order updates are dropped.
+
+Each room's deltas are versioned by a ``RoomDeltaLog``; ``sync`` serves a
+joining or lagging client the delta chain since its version, or the full
+state when it is too far behind.
+
+Events submitted by a client session must come from that session's player.
+A rejected event is not applied or broadcast; the submitting session gets
+an ``error`` message naming it instead.
+"""
+
+from itertools import count
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from analytics.columnar import CombatEventBatch
+from models import CombatEvent, PlayerSession
+from rules.damage import REASONS, DamageValidator, StatsIndex
+from rules.movement import STALE, MovementValidator
+from runtime.interest import InterestGrid
+from runtime.room_engine import RoomEngine
+from runtime.tick import TickLoop
+from runtime.write_behind import WriteBehindSessionStore
+from wire.room_delta import RoomDeltaLog, dumps
+from wire.tick_frame import encode_tick_frame
+
+from .hub import RoomHub
+from .hub import dumps as dumps_text
+
+POSITIONS = "positions"
+
+
+class RoomShard:
+    """Input queues, per-tick simulation step and merged output for rooms."""
+
+    def __init__(
+        self,
+        engine: RoomEngine,
+        hub: RoomHub,
+        interest: Optional[InterestGrid] = None,
+        sessions: Optional[WriteBehindSessionStore] = None,
+        rate_hz: float = 20.0,
+        stats: Optional[StatsIndex] = None,
+        enemy_types: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Create the shard.
+
+        Args:
+            engine: Owner of the shard's live room state
+            hub: Where merged frames are sent
+            interest: Position interest management (20 m radius by default)
+            sessions: Optional write-behind store that session updates go to
+            rate_hz: Ticks per second
+            stats: Combat stats to validate damage and movement with; see
+                ``set_rules``
+            enemy_types: enemy_type_id -> combat_stats_id
+        """
+        self.engine = engine
+        self.hub = hub
+        self.interest = interest or InterestGrid()
+        self.sessions = sessions
+        self.loop = TickLoop(self.step, rate_hz)
+        self._events: List[Tuple[Optional[str], CombatEvent]] = []
+        self._updates: Dict[str, PlayerSession] = {}
+        self._room_of: Dict[str, str] = {}
+        self._latest: Dict[str, Dict[str, PlayerSession]] = {}
+        self._slots: Dict[str, Dict[str, int]] = {}
+        self._logs: Dict[str, RoomDeltaLog] = {}
+        self._movement: Dict[str, MovementValidator] = {}
+        self._player_stats: Dict[str, str] = {}
+        self._enemy_stats: Dict[str, str] = {}
+        self.stats: Optional[StatsIndex] = None
+        self.enemy_types: Dict[str, str] = {}
+        self.damage: Optional[DamageValidator] = None
+        self.rejected = 0
+        self.corrected = 0
+        self.dropped_updates = 0
+        if stats is not None:
+            self.set_rules(stats, enemy_types or {})
+
+    def set_rules(self, stats: StatsIndex, enemy_types: Mapping[str, str]) -> None:
+        """Validate combat events and movement against config-derived stats.
+
+        Args:
+            stats: ``CombatStats`` and ``Ability`` arrays
+            enemy_types: enemy_type_id -> combat_stats_id
+        """
+        self.stats = stats
+        self.enemy_types = dict(enemy_types)
+        self.damage = DamageValidator(stats, self._player_stats, self._enemy_stats)
+
+    def submit_event(
+        self, event: CombatEvent, session_id: Optional[str] = None
+    ) -> None:
+        """Queue a combat event for the next tick.
+
+        Args:
+            event: Parsed combat event
+            session_id: Client session that sent it; rejections are reported
+                to it, and the event must come from its player
+        """
+        self._events.append((session_id, event))
+
+    def submit_session(self, session: PlayerSession) -> None:
+        """Queue a session update; only the latest per session is processed."""
+        self._updates[session.session_id] = session
+
+    def remove_session(self, session_id: str) -> None:
+        """Forget a disconnected session: its position, slot and queued update.
+
+        The slot is free for the next session to join the room. With a
+        write-behind store attached, the session's pending state is written.
+        """
+        self._updates.pop(session_id, None)
+        self.interest.remove(session_id)
+        room_id = self._room_of.pop(session_id, None)
+        if room_id is not None:
+            self._player_stats.pop(self._latest[room_id][session_id].player_id, None)
+            self._leave_room(session_id, room_id)
+        if self.sessions is not None:
+            self.sessions.remove(session_id)
+
+    def sync(
+        self, room_id: str, client_version: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the ``room_update`` that brings a client up to date.
+
+        Args:
+            room_id: Room to sync
+            client_version: Room version the client holds; None for a full state
+
+        Returns:
+            The message, or None if the engine does not own the room
+        """
+        if room_id not in self.engine:
+            return None
+        return self._log(room_id).sync(client_version)
+
+    def _log(self, room_id: str) -> RoomDeltaLog:
+        log = self._logs.get(room_id)
+        if log is None:
+            log = self._logs[room_id] = RoomDeltaLog(self.engine.state(room_id))
+        return log
+
+    def slots(self, room_id: str) -> Dict[str, int]:
+        """Per-room slot numbers used in position batches."""
+        return self._slots.get(room_id, {})
+
+    def step(self, tick: int) -> None:
+        """Drain the input queues, advance state and emit one frame per client."""
+        events, self._events = self._events, []
+        updates, self._updates = self._updates, {}
+
+        for room_id in [r for r in self._logs if r not in self.engine]:
+            del self._logs[room_id]
+
+        applied: Dict[str, List[Dict[str, Any]]] = {}
+        for event in self._checked(events):
+            self._log(event.room_id)
+            self.engine.apply(event)
+            applied.setdefault(event.room_id, []).append(event.model_dump(mode="json"))
+
+        moved: Set[str] = set()
+        for session in self._moves(updates.values()):
+            self._track(session)
+            if session.room_id is not None:
+                moved.add(session.room_id)
+            if self.sessions is not None:
+                self.sessions.update(session)
+
+        for room_id in applied.keys() | moved:
+            self._emit(tick, room_id, applied.get(room_id), room_id in moved)
+
+    def _checked(
+        self, events: List[Tuple[Optional[str], CombatEvent]]
+    ) -> List[CombatEvent]:
+        """Drop events for rooms the engine does not own, from other players'
+        sessions, or with invalid damage."""
+        live = []
+        senders = []
+        for session_id, event in events:
+            if event.room_id not in self.engine:
+                self._reject(session_id, event, "room is not live")
+            elif session_id is not None and (
+                event.source_player_id is not None
+                and event.source_player_id != self._player_of(session_id)
+            ):
+                self._reject(session_id, event, "source is not this session's player")
+            else:
+                live.append(event)
+                senders.append(session_id)
+        if self.damage is None or not live:
+            return live
+        self._enemy_stats.clear()
+        for event in live:
+            enemies = self.engine.rooms[event.room_id].enemies
+            for enemy_id in (event.source_enemy_id, event.target_enemy_id):
+                enemy = enemies.get(enemy_id) if enemy_id else None
+                if enemy is not None:
+                    stats_id = self.enemy_types.get(enemy.get("enemy_type_id"))
+                    if stats_id is not None:
+                        self._enemy_stats[enemy_id] = stats_id
+        verdict = self.damage.validate(CombatEventBatch.from_models(live))
+        accepted = []
+        for i, event in enumerate(live):
+            if verdict.accepted[i]:
+                accepted.append(event)
+            else:
+                self._reject(senders[i], event, REASONS[verdict.reason[i]])
+        return accepted
+
+    def _player_of(self, session_id: str) -> Optional[str]:
+        room_id = self._room_of.get(session_id)
+        if room_id is None:
+            return None
+        return self._latest[room_id][session_id].player_id
+
+    def _reject(
+        self, session_id: Optional[str], event: CombatEvent, reason: str
+    ) -> None:
+        self.rejected += 1
+        if session_id is None:
+            return
+        message = {
+            "type": "error",
+            "message": f"Combat event rejected: {reason}",
+            "event_id": event.event_id,
+        }
+        self.hub.broadcast_each(event.room_id, {session_id: dumps_text(message)})
+
+    def _moves(self, updates: Iterable[PlayerSession]) -> List[PlayerSession]:
+        """Check position updates; clamp moves that are too fast, drop stale ones.
+
+        A session's first update in a room is trusted; without rules every
+        update is accepted.
+        """
+        stats = self.stats
+        if stats is None:
+            return list(updates)
+        accepted = []
+        by_room: Dict[str, List[PlayerSession]] = {}
+        for session in updates:
+            if session.combat_stats_id not in stats.stats_row:
+                self.dropped_updates += 1
+            elif session.session_id in self._slots.get(session.room_id, ()):
+                by_room.setdefault(session.room_id, []).append(session)
+            else:
+                accepted.append(session)
+        for room_id, sessions in by_room.items():
+            verdict = self._movement[room_id].validate_sessions(
+                sessions, self._slots[room_id]
+            )
+            for i, session in enumerate(sessions):
+                if verdict.accepted[i]:
+                    accepted.append(session)
+                elif verdict.reason[i] == STALE:
+                    self.dropped_updates += 1
+                else:
+                    self.corrected += 1
+                    x, y, z = verdict.position[i].tolist()
+                    accepted.append(
+                        session.model_copy(
+                            update={"position_x": x, "position_y": y, "position_z": z}
+                        )
+                    )
+        return accepted
+
+    def _track(self, session: PlayerSession) -> None:
+        session_id = session.session_id
+        previous = self._room_of.get(session_id)
+        if previous is not None and previous != session.room_id:
+            self._leave_room(session_id, previous)
+        self.interest.update(session)
+        if session.room_id is None:
+            self._room_of.pop(session_id, None)
+            return
+        self._room_of[session_id] = session.room_id
+        self._latest.setdefault(session.room_id, {})[session_id] = session
+        self._player_stats[session.player_id] = session.combat_stats_id
+        slots = self._slots.setdefault(session.room_id, {})
+        if session_id not in slots:
+            used = set(slots.values())
+            slot = slots[session_id] = next(i for i in count() if i not in used)
+            if self.stats is not None:
+                movement = self._movement.get(session.room_id)
+                if movement is None:
+                    movement = self._movement[session.room_id] = MovementValidator(
+                        clamp=True
+                    )
+                row = self.stats.stats_row[session.combat_stats_id]
+                movement.join(slot, float(self.stats.move_speed[row]), session)
+
+    def _leave_room(self, session_id: str, room_id: str) -> None:
+        del self._latest[room_id][session_id]
+        slot = self._slots[room_id].pop(session_id)
+        movement = self._movement.get(room_id)
+        if movement is not None:
+            movement.leave(slot)
+        if not self._latest[room_id]:
+            del self._latest[room_id], self._slots[room_id]
+            self._movement.pop(room_id, None)
+
+    def _emit(
+        self,
+        tick: int,
+        room_id: str,
+        events: Optional[List[Dict[str, Any]]],
+        moved: bool,
+    ) -> None:
+        message: Dict[str, Any] = {"type": "tick", "room_id": room_id}
+        if events:
+            delta = self._logs[room_id].commit(self.engine.state(room_id))
+            if delta is not None:
+                message["delta"] = delta
+            message["events"] = events
+        shared = dumps(message) if events else None
+        batches = (
+            self.interest.position_batches(
+                room_id, self._latest[room_id], self._slots[room_id]
+            )
+            if moved and room_id in self._latest
+            else {}
+        )
+        frames: Dict[str, bytes] = {}
+        built: Dict[int, bytes] = {}
+        for session_id in self.hub.session_ids(room_id):
+            positions = batches.get(session_id)
+            if shared is None and positions is None:
+                continue
+            frame = built.get(id(positions))
+            if frame is None:
+                frame = built[id(positions)] = encode_tick_frame(
+                    tick, shared, positions
+                )
+            frames[session_id] = frame
+        # Position-only frames are superseded by the next tick's positions.
+        self.hub.broadcast_each(
+            room_id, frames, coalesce=POSITIONS if shared is None else None
+        )
@@ -0,0 +1 @@
+"""Micro-benchmarks for the TR-Dungeons backend API."""
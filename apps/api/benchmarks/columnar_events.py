@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark columnar vs object-loop combat analytics.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.columnar_events --count 200000
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+
+from analytics.columnar import CombatEventBatch
+from models import CombatEvent
+
+from .fixtures import event_payloads
+
+
+def damage_by_player_room_loop(events):
+    """Reference implementation iterating models field by field."""
+    totals = defaultdict(float)
+    for event in events:
+        if event.event_type == "damage_dealt" and event.damage_amount is not None:
+            totals[(event.room_id, event.source_player_id)] += event.damage_amount
+    return dict(totals)
+
+
+def timed(label, fn, *args):
+    """Run ``fn`` once and print its wall time."""
+    start = time.perf_counter()
+    result = fn(*args)
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Columnar CombatEvent benchmarks")
+    parser.add_argument("--count", type=int, default=200_000, help="Events per batch")
+    args = parser.parse_args()
+
+    events = [CombatEvent.model_validate(p) for p in event_payloads(args.count)]
+    lines = [e.model_dump_json() for e in events]
+
+    batch = timed("build from models", CombatEventBatch.from_models, events)
+    timed("build from NDJSON", CombatEventBatch.from_ndjson, lines)
+    expected = timed(
+        "damage/player/room (model loop)", damage_by_player_room_loop, events
+    )
+    actual = timed("damage/player/room (columnar)", batch.damage_by_player_room)
+    timed("crit rate/player (columnar)", batch.crit_rate_by_player)
+
+    if expected.keys() != actual.keys():
+        print("❌ Columnar result does not match the model loop")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
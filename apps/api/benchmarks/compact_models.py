@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark memory and construction cost of compact vs Pydantic models.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.compact_models --count 100000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from models import CombatEvent, PlayerSession
+from runtime.compact import CompactCombatEvent, CompactPlayerSession
+
+from .fixtures import event_payloads, session_payloads
+
+
+def measure_memory(build: Callable[[], List[object]]) -> float:
+    """Return bytes allocated per instance by ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / len(instances)
+
+
+def measure_rate(
+    build: Callable[[], List[object]], count: int, repeat: int = 3
+) -> float:
+    """Return the best observed construction rate in instances per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compact model benchmarks")
+    parser.add_argument("--count", type=int, default=100_000, help="Instances per run")
+    args = parser.parse_args()
+
+    sessions = [PlayerSession.model_validate(p) for p in session_payloads(args.count)]
+    events = [CombatEvent.model_validate(p) for p in event_payloads(args.count)]
+
+    cases = [
+        ("PlayerSession (pydantic)", lambda: [s.model_copy() for s in sessions]),
+        (
+            "PlayerSession (compact)",
+            lambda: [CompactPlayerSession.from_model(s) for s in sessions],
+        ),
+        ("CombatEvent (pydantic)", lambda: [e.model_copy() for e in events]),
+        (
+            "CombatEvent (compact)",
+            lambda: [CompactCombatEvent.from_model(e) for e in events],
+        ),
+    ]
+
+    compact_sessions = [CompactPlayerSession.from_model(s) for s in sessions]
+    compact_events = [CompactCombatEvent.from_model(e) for e in events]
+    conversions = [
+        (
+            "PlayerSession compact -> model",
+            lambda: [c.to_model() for c in compact_sessions],
+        ),
+        (
+            "CombatEvent compact -> model",
+            lambda: [c.to_model() for c in compact_events],
+        ),
+    ]
+
+    print(f"{'case':<34} {'bytes/inst':>12} {'inst/sec':>14}")
+    for name, build in cases:
+        per_instance = measure_memory(build)
+        rate = measure_rate(build, args.count)
+        print(f"{name:<34} {per_instance:>12.1f} {rate:>14,.0f}")
+    for name, build in conversions:
+        rate = measure_rate(build, args.count)
+        print(f"{name:<34} {'-':>12} {rate:>14,.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark client cold start: one config bundle vs per-entity requests.
+
+The client is simulated in-process against the real ASGI app. Each HTTP
+request adds ``--rtt-ms`` of simulated network round trip and each table
+read adds ``--read-ms`` of simulated DynamoDB latency. Requests are issued
+sequentially, as the Godot client does at startup.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.config_bundle --entities 50 --rtt-ms 40 --read-ms 8
+"""
+
+import argparse
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from app.config_source import InMemoryConfigSource
+from app.main import create_app
+from app.settings import Settings
+from models import Ability, CombatStats, EnemyType, LootTable
+
+from .fixtures import (
+    ability_payload,
+    combat_stats_payload,
+    enemy_type_payload,
+    loot_table_payload,
+)
+
+ROUTES = {
+    "combat-stats": (CombatStats, combat_stats_payload),
+    "enemy-types": (EnemyType, enemy_type_payload),
+    "loot-tables": (LootTable, loot_table_payload),
+    "abilities": (Ability, ability_payload),
+}
+
+
+class SlowSource(InMemoryConfigSource):
+    """In-memory source that sleeps to simulate table read latency."""
+
+    def __init__(self, items, read_seconds: float) -> None:
+        super().__init__(items)
+        self.read_seconds = read_seconds
+
+    def get(self, model_name, item_id):
+        time.sleep(self.read_seconds)
+        return super().get(model_name, item_id)
+
+    def scan(self, model_name):
+        time.sleep(self.read_seconds)
+        return super().scan(model_name)
+
+
+def cold_start(items, args, fetch) -> tuple:
+    """Run one cold start against a fresh app; return (seconds, bytes, requests, reads)."""
+    source = SlowSource(items, args.read_ms / 1000)
+    client = TestClient(create_app(Settings(), source))
+    rtt = args.rtt_ms / 1000
+    total_bytes = 0
+    requests = 0
+    start = time.perf_counter()
+    for path, headers in fetch():
+        time.sleep(rtt)
+        response = client.get(path, headers=headers)
+        total_bytes += int(
+            response.headers.get("content-length", len(response.content))
+        )
+        requests += 1
+    return time.perf_counter() - start, total_bytes, requests, source.reads
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Config bundle cold-start benchmark")
+    parser.add_argument(
+        "--entities", type=int, default=50, help="Items per config model"
+    )
+    parser.add_argument(
+        "--rtt-ms", type=float, default=40.0, help="Simulated network RTT"
+    )
+    parser.add_argument(
+        "--read-ms", type=float, default=8.0, help="Simulated table read"
+    )
+    args = parser.parse_args()
+
+    items = [
+        model.model_validate(payload(i))
+        for model, payload in ROUTES.values()
+        for i in range(args.entities)
+    ]
+
+    def per_entity():
+        for route, (model, payload) in ROUTES.items():
+            for i in range(args.entities):
+                yield f"/api/{route}/{payload(i)['id']}", {"Accept-Encoding": "gzip"}
+
+    def bundle():
+        yield "/api/config/version", {}
+        yield "/api/config/bundle", {"Accept-Encoding": "br, gzip"}
+
+    print(
+        f"{len(items)} config items, RTT {args.rtt_ms} ms, table read {args.read_ms} ms"
+    )
+    print(
+        f"{'strategy':<14} {'latency ms':>12} {'bytes':>10} {'requests':>10} {'reads':>8}"
+    )
+    for name, fetch in (("per-entity", per_entity), ("bundle", bundle)):
+        seconds, size, requests, reads = cold_start(items, args, fetch)
+        print(
+            f"{name:<14} {seconds * 1000:>12.1f} {size:>10} {requests:>10} {reads:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
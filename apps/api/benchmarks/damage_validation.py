@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark vectorized damage validation against a per-event loop.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.damage_validation --count 10000
+"""
+
+import argparse
+import sys
+import time
+
+from analytics.columnar import CombatEventBatch
+from models import Ability, CombatEvent, CombatStats
+from rules.damage import DamageValidator, StatsIndex, expected_damage
+
+from .fixtures import ability_payload, combat_stats_payload, event_payloads
+
+
+def best_of(fn, repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Damage validation benchmark")
+    parser.add_argument("--count", type=int, default=10_000, help="Events per call")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    args = parser.parse_args()
+
+    stats = [CombatStats.model_validate(combat_stats_payload(i)) for i in range(16)]
+    abilities = [
+        Ability.model_validate({**ability_payload(0), "id": "fireball"}),
+        Ability.model_validate(
+            {**ability_payload(1), "id": "melee_attack", "damage": None}
+        ),
+    ]
+    player_stats = {f"player-{i:08d}": stats[i % 4].id for i in range(4)}
+    enemy_stats = {f"enemy-{i:04d}": stats[4 + i % 12].id for i in range(12)}
+    events = [CombatEvent.model_validate(p) for p in event_payloads(args.count)]
+
+    validator = DamageValidator(StatsIndex(stats, abilities), player_stats, enemy_stats)
+    stats_by_id = {s.id: s for s in stats}
+    ability_by_id = {a.id: a for a in abilities}
+
+    def loop():
+        results = []
+        for e in events:
+            if e.event_type not in ("damage_dealt", "damage_taken"):
+                results.append(True)
+                continue
+            attacker = stats_by_id.get(
+                player_stats.get(e.source_player_id)
+                or enemy_stats.get(e.source_enemy_id)
+            )
+            target = stats_by_id.get(
+                player_stats.get(e.target_player_id)
+                or enemy_stats.get(e.target_enemy_id)
+            )
+            if attacker is None or target is None or e.damage_amount is None:
+                results.append(False)
+                continue
+            expected = expected_damage(
+                attacker, target, e.is_critical, ability_by_id.get(e.ability_id)
+            )
+            results.append(abs(e.damage_amount - expected) <= 0.01)
+        return results
+
+    batch = CombatEventBatch.from_models(events)
+    build = best_of(lambda: CombatEventBatch.from_models(events), args.repeat)
+    vectorized = best_of(lambda: validator.validate(batch), args.repeat)
+    scalar = best_of(loop, args.repeat)
+
+    print(f"{args.count} events per call")
+    print(f"{'case':<28} {'ms/call':>9} {'events/s':>14}")
+    for name, seconds in (
+        ("per-event loop", scalar),
+        ("vectorized validate", vectorized),
+        ("  + CombatEventBatch build", build + vectorized),
+    ):
+        print(f"{name:<28} {seconds * 1000:>9.2f} {args.count / seconds:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark the schema-driven codec against the boto3 resource-layer path.
+
+The resource-layer path is what ``boto3.resource("dynamodb")`` does: the
+``TypeDeserializer`` produces ``Decimal`` numbers, which then go through
+``model_validate``. Writing goes the other way through ``Decimal`` and
+``TypeSerializer``.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.dynamodb_codec --count 50000
+"""
+
+import argparse
+import sys
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from models import CombatEvent, PlayerSession
+from storage.dynamodb_codec import codec_for
+
+from .fixtures import event_payloads, session_payloads
+
+
+def to_resource_item(instance):
+    """Resource-layer write path: floats become Decimal, datetimes ISO strings."""
+
+    def convert(value):
+        if isinstance(value, float):
+            return Decimal(repr(value))
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [convert(v) for v in value]
+        return value
+
+    plain = instance.model_dump(mode="json", exclude_none=True)
+    return {k: convert(v) for k, v in plain.items()}
+
+
+def rate(fn, items):
+    """Return items per second for ``fn`` applied to every item."""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="DynamoDB codec benchmarks")
+    parser.add_argument("--count", type=int, default=50_000, help="Items per run")
+    args = parser.parse_args()
+
+    deserializer = TypeDeserializer()
+    serializer = TypeSerializer()
+
+    print(f"{'case':<44} {'items/sec':>12}")
+    cases = [
+        ("PlayerSession", PlayerSession, session_payloads(args.count)),
+        ("CombatEvent", CombatEvent, event_payloads(args.count)),
+    ]
+    for name, model, payloads in cases:
+        codec = codec_for(name)
+        instances = [model.model_validate(p) for p in payloads]
+        items = [codec.encode(i) for i in instances]
+
+        def resource_read(item, model=model):
+            plain = {k: deserializer.deserialize(v) for k, v in item.items()}
+            return model.model_validate(plain)
+
+        def resource_write(instance):
+            return {
+                k: serializer.serialize(v)
+                for k, v in to_resource_item(instance).items()
+            }
+
+        print(
+            f"{name + ' read (TypeDeserializer+validate)':<44} "
+            f"{rate(resource_read, items):>12,.0f}"
+        )
+        print(f"{name + ' read (codec)':<44} {rate(codec.decode, items):>12,.0f}")
+        print(
+            f"{name + ' write (Decimal+TypeSerializer)':<44} "
+            f"{rate(resource_write, instances):>12,.0f}"
+        )
+        print(f"{name + ' write (codec)':<44} {rate(codec.encode, instances):>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
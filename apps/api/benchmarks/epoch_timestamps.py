@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark datetime vs epoch-millisecond CombatEvent batches.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.epoch_timestamps --count 10000
+"""
+
+import argparse
+import sys
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from models import CombatEvent
+from wire.epoch import EpochCombatEvent, to_epoch_ms
+
+from .fixtures import event_payloads
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    """Return the fastest wall time of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Epoch timestamp benchmarks")
+    parser.add_argument("--count", type=int, default=10_000, help="Events per batch")
+    args = parser.parse_args()
+
+    payloads = event_payloads(args.count)
+    standard = TypeAdapter(List[CombatEvent])
+    epoch = TypeAdapter(List[EpochCombatEvent])
+
+    standard_json = standard.dump_json(standard.validate_python(payloads))
+    epoch_payloads = [
+        {
+            **p,
+            "timestamp": to_epoch_ms(p["timestamp"]),
+            "created_at": to_epoch_ms(p["created_at"]),
+        }
+        for p in payloads
+    ]
+    epoch_models = epoch.validate_python(epoch_payloads)
+    epoch_json = epoch.dump_json(epoch_models)
+    standard_models = standard.validate_json(standard_json)
+
+    print(f"batch of {args.count} events")
+    print(f"{'operation':<28} {'datetime':>12} {'epoch ms':>12}  (events/sec)")
+    rows = [
+        (
+            "validate_json",
+            lambda: standard.validate_json(standard_json),
+            lambda: epoch.validate_json(epoch_json),
+        ),
+        (
+            "dump_json",
+            lambda: standard.dump_json(standard_models),
+            lambda: epoch.dump_json(epoch_models),
+        ),
+        (
+            "dump_python(mode=json)",
+            lambda: standard.dump_python(standard_models, mode="json"),
+            lambda: epoch.dump_python(epoch_models, mode="json"),
+        ),
+    ]
+    for name, run_standard, run_epoch in rows:
+        print(
+            f"{name:<28} {args.count / best_of(run_standard):>12,.0f} "
+            f"{args.count / best_of(run_epoch):>12,.0f}"
+        )
+    print(
+        f"{'JSON bytes/event':<28} {len(standard_json) / args.count:>12.1f} "
+        f"{len(epoch_json) / args.count:>12.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
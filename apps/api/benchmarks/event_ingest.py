@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Compare per-event PutItem writes with the batched event ingest pipeline.
+
+Each request to the fake table sleeps for ``--rtt-ms`` to stand in for a
+DynamoDB round trip, and every ``--unprocessed`` share of batched items is
+returned as unprocessed once to exercise the retry path.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.event_ingest --events 2000 --rtt-ms 5
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from models import CombatEvent
+from runtime.event_ingest import EventIngest
+from storage.event_table import DynamoDBEventWriter
+from storage.room_table import DynamoDBRoomEventLog
+
+from .fixtures import event_payloads
+
+
+class SlowClient:
+    """DynamoDB client stand-in with a fixed round-trip time."""
+
+    def __init__(self, rtt: float, unprocessed: float, seed: int) -> None:
+        self.rtt = rtt
+        self.unprocessed = unprocessed
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+    def put_item(self, **kwargs) -> dict:
+        self.requests += 1
+        time.sleep(self.rtt)
+        return {}
+
+    def batch_write_item(self, RequestItems) -> dict:
+        self.requests += 1
+        time.sleep(self.rtt)
+        ((table, requests),) = RequestItems.items()
+        left = [r for r in requests if self.rng.random() < self.unprocessed]
+        self.unprocessed /= 2
+        return {"UnprocessedItems": {table: left} if left else {}}
+
+
+async def batched(events, client) -> dict:
+    """Submit every event, let the pipeline run and return its metrics."""
+    ingest = EventIngest(
+        DynamoDBEventWriter(client, "events", base_delay=0.001), flush_interval=0.05
+    )
+    task = asyncio.create_task(ingest.run())
+    for event in events:
+        ingest.submit(event)
+        await asyncio.sleep(0)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return ingest.snapshot()
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Combat event ingest benchmark")
+    parser.add_argument("--events", type=int, default=2000, help="Events to write")
+    parser.add_argument("--rooms", type=int, default=8, help="Rooms to spread over")
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="Request RTT")
+    parser.add_argument("--unprocessed", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    events = [
+        CombatEvent.model_validate({**payload, "room_id": f"room-{i % args.rooms}"})
+        for i, payload in enumerate(event_payloads(args.events))
+    ]
+    rtt = args.rtt_ms / 1000
+
+    client = SlowClient(rtt, 0.0, args.seed)
+    log = DynamoDBRoomEventLog(client, "events")
+    start = time.perf_counter()
+    for seq, event in enumerate(events, 1):
+        log.append(event, seq)
+    single = time.perf_counter() - start
+    single_requests = client.requests
+
+    client = SlowClient(rtt, args.unprocessed, args.seed)
+    start = time.perf_counter()
+    metrics = asyncio.run(batched(events, client))
+    batch = time.perf_counter() - start
+
+    print(f"{args.events} events over {args.rooms} rooms, {args.rtt_ms} ms RTT")
+    print(f"{'case':<20} {'requests':>9} {'seconds':>9} {'events/s':>10}")
+    for name, requests, seconds in (
+        ("PutItem per event", single_requests, single),
+        ("EventIngest", client.requests, batch),
+    ):
+        print(
+            f"{name:<20} {requests:>9} {seconds:>9.2f} {args.events / seconds:>10,.0f}"
+        )
+    print(
+        f"written={metrics['written']} dropped={metrics['dropped']} "
+        f"batches={metrics['batches']} mean_flush_ms={metrics['mean_flush_ms']:.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Deterministic sample data shared by the benchmarks."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+EPOCH = datetime(2026, 2, 14, 12, 0, 0, tzinfo=timezone.utc)
+
+EVENT_TYPES = [
+    "damage_dealt",
+    "damage_taken",
+    "ability_used",
+    "enemy_died",
+    "player_died",
+    "loot_dropped",
+    "loot_picked_up",
+    "door_opened",
+    "door_closed",
+]
+
+
+def session_payload(i: int, room_count: int = 100) -> Dict[str, Any]:
+    """Return a raw PlayerSession payload as it would arrive over the API."""
+    return {
+        "session_id": f"session-{i:08d}",
+        "player_id": f"player-{i:08d}",
+        "character_name": f"Adventurer{i}",
+        "room_id": f"room-{i % room_count:04d}",
+        "combat_stats_id": "player_default",
+        "current_health": 100.0 - (i % 50),
+        "current_mana": 50.0 + (i % 25),
+        "current_stamina": 75.0,
+        "position_x": float(i % 40) * 0.5,
+        "position_y": 0.0,
+        "position_z": float(i % 30) * 0.25,
+        "is_alive": True,
+        "last_heartbeat": EPOCH + timedelta(seconds=i),
+        "created_at": EPOCH,
+        "updated_at": EPOCH + timedelta(seconds=i),
+    }
+
+
+def event_payload(i: int, room_count: int = 100) -> Dict[str, Any]:
+    """Return a raw CombatEvent payload as it would arrive over the API."""
+    return {
+        "event_id": f"event-{i:010d}",
+        "room_id": f"room-{i % room_count:04d}",
+        "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+        "timestamp": EPOCH + timedelta(milliseconds=i * 50),
+        "source_player_id": f"player-{i % 4:08d}",
+        "source_enemy_id": None,
+        "target_player_id": None,
+        "target_enemy_id": f"enemy-{i % 12:04d}",
+        "ability_id": "melee_attack" if i % 3 else "fireball",
+        "damage_amount": 10.0 + (i % 15),
+        "is_critical": i % 7 == 0,
+        "item_id": None,
+        "item_quantity": None,
+        "position_x": float(i % 40) * 0.5,
+        "position_y": 0.0,
+        "position_z": float(i % 30) * 0.25,
+        "metadata": None,
+        "created_at": EPOCH + timedelta(milliseconds=i * 50 + 5),
+    }
+
+
+def session_payloads(count: int) -> List[Dict[str, Any]]:
+    """Return ``count`` session payloads."""
+    return [session_payload(i) for i in range(count)]
+
+
+def event_payloads(count: int) -> List[Dict[str, Any]]:
+    """Return ``count`` event payloads."""
+    return [event_payload(i) for i in range(count)]
+
+
+def room_payload(room_id: str = "room-0000", enemies: int = 50) -> Dict[str, Any]:
+    """Return a raw RoomState payload with ``enemies`` enemies and four doors."""
+    return {
+        "room_id": room_id,
+        "dungeon_id": "dungeon-crypt",
+        "room_type": "combat",
+        "max_players": 4,
+        "current_player_count": 4,
+        "is_cleared": False,
+        "enemies": [
+            json.dumps(
+                {
+                    "enemy_instance_id": f"{room_id}-enemy-{i:03d}",
+                    "enemy_type_id": "skeleton" if i % 3 else "skeleton_archer",
+                    "current_health": 50.0,
+                    "position_x": float(i % 10) * 2.0,
+                    "position_y": 0.0,
+                    "position_z": float(i // 10) * 2.0,
+                    "is_alive": True,
+                },
+                separators=(",", ":"),
+            )
+            for i in range(enemies)
+        ],
+        "loot_drops": [],
+        "doors": [
+            json.dumps(
+                {
+                    "door_id": f"{room_id}-door-{i}",
+                    "is_open": False,
+                    "is_locked": i == 0,
+                },
+                separators=(",", ":"),
+            )
+            for i in range(4)
+        ],
+        "created_at": EPOCH,
+        "updated_at": EPOCH,
+    }
+
+
+def combat_stats_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw CombatStats payload."""
+    return {
+        "id": f"stats-{i:04d}",
+        "max_health": 100.0,
+        "max_mana": 50.0,
+        "max_stamina": 100.0,
+        "attack_damage": 10.0 + i % 5,
+        "attack_speed": 1.0,
+        "attack_range": 2.0,
+        "armor": 5.0,
+        "move_speed": 5.0,
+        "critical_chance": 0.1,
+        "critical_multiplier": 2.0,
+        "created_at": EPOCH,
+        "updated_at": EPOCH,
+    }
+
+
+def enemy_type_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw EnemyType payload."""
+    return {
+        "id": f"enemy-type-{i:04d}",
+        "name": f"Skeleton {i}",
+        "combat_stats_id": f"stats-{i:04d}",
+        "detection_radius": 10.0,
+        "attack_range": 2.0,
+        "patrol_radius": 5.0,
+        "attack_cooldown": 1.5,
+        "attack_windup": 0.4,
+        "loot_table_id": f"loot-table-{i:04d}",
+        "model_path": "res://assets/characters/enemies/Skeleton_Minion.glb",
+        "created_at": EPOCH,
+        "updated_at": EPOCH,
+    }
+
+
+def loot_table_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw LootTable payload with three drops."""
+    drops = [
+        {
+            "item_id": "gold",
+            "item_type": "gold",
+            "chance": 0.8,
+            "min_quantity": 1,
+            "max_quantity": 10,
+        },
+        {
+            "item_id": "health_potion",
+            "item_type": "consumable",
+            "chance": 0.3,
+            "min_quantity": 1,
+            "max_quantity": 2,
+        },
+        {
+            "item_id": "rusty_sword",
+            "item_type": "equipment",
+            "chance": 0.05,
+            "min_quantity": 1,
+            "max_quantity": 1,
+        },
+    ]
+    return {
+        "id": f"loot-table-{i:04d}",
+        "name": f"Skeleton drops {i}",
+        "drops": [json.dumps(d, separators=(",", ":")) for d in drops],
+        "created_at": EPOCH,
+        "updated_at": EPOCH,
+    }
+
+
+def ability_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw Ability payload."""
+    return {
+        "id": f"ability-{i:04d}",
+        "name": "Fireball",
+        "ability_type": "projectile",
+        "cooldown": 5.0,
+        "mana_cost": 20.0,
+        "stamina_cost": 0.0,
+        "cast_time": 0.5,
+        "damage": 30.0,
+        "projectile_speed": 15.0,
+        "max_range": 20.0,
+        "effect_duration": None,
+        "created_at": EPOCH,
+        "updated_at": EPOCH,
+    }
+
+
+def combat_data_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw CombatData payload."""
+    return {"attack_damage": 10 + i % 5, "attack_range": 2.0, "attack_cooldown": 1.0}
+
+
+def health_data_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw HealthData payload."""
+    return {"max_health": 100, "current_health": 100 - i % 100}
+
+
+def movement_data_payload(i: int = 0) -> Dict[str, Any]:
+    """Return a raw MovementData payload."""
+    return {"move_speed": 5.0, "rotation_speed": 10.0}
+
+
+MODEL_PAYLOADS = {
+    "Ability": ability_payload,
+    "CombatData": combat_data_payload,
+    "CombatEvent": event_payload,
+    "CombatStats": combat_stats_payload,
+    "EnemyType": enemy_type_payload,
+    "HealthData": health_data_payload,
+    "LootTable": loot_table_payload,
+    "MovementData": movement_data_payload,
+    "PlayerSession": session_payload,
+    "RoomState": lambda i=0: room_payload(f"room-{i:04d}", enemies=8),
+}
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark position broadcast fan-out with and without interest management.
+
+Players wander a square room; every tick each player's position is updated
+and position batches are built for every client. "all" sends every other
+player to every client (one shared batch); "grid" sends each client only the
+players within ``--radius`` via ``InterestGrid``.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.interest_management --ticks 200
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from runtime.compact import CompactPlayerSession
+from runtime.interest import InterestGrid
+from wire.session_codec import HEADER, RECORD, encode_batch
+
+from models import PlayerSession
+
+from .fixtures import session_payload
+
+
+def make_room(players: int, size: float, rng: random.Random):
+    """Return compact sessions scattered over a ``size`` x ``size`` room."""
+    sessions = {}
+    for i in range(players):
+        model = PlayerSession.model_validate(session_payload(i, room_count=1))
+        compact = CompactPlayerSession.from_model(model)
+        compact.position_x = rng.uniform(0, size)
+        compact.position_z = rng.uniform(0, size)
+        sessions[compact.session_id] = compact
+    return sessions
+
+
+def step(sessions, size: float, rng: random.Random) -> None:
+    """Move every player a little, staying inside the room."""
+    for s in sessions.values():
+        s.position_x = min(size, max(0.0, s.position_x + rng.uniform(-0.5, 0.5)))
+        s.position_z = min(size, max(0.0, s.position_z + rng.uniform(-0.5, 0.5)))
+
+
+def run_all(sessions, slots, ticks, size, rng):
+    """Everyone receives everyone else: one batch of all players per tick."""
+    records = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(sessions, size, rng)
+        encode_batch(sessions.values(), slots)
+        records += len(sessions) * (len(sessions) - 1)
+    return records, time.perf_counter() - start
+
+
+def run_grid(sessions, slots, ticks, size, rng, radius):
+    """Interest-filtered batches built from the grid each tick."""
+    interest = InterestGrid(radius=radius)
+    records = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(sessions, size, rng)
+        interest.update_all(sessions.values())
+        for batch in interest.position_batches("room-0000", sessions, slots).values():
+            records += (len(batch) - HEADER.size) // RECORD.size
+    return records, time.perf_counter() - start
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Interest management benchmark")
+    parser.add_argument("--ticks", type=int, default=200, help="Ticks per case")
+    parser.add_argument("--room-size", type=float, default=80.0, help="Room edge (m)")
+    parser.add_argument("--radius", type=float, default=20.0, help="Interest radius")
+    parser.add_argument("--seed", type=int, default=11, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"room {args.room_size:.0f}m, radius {args.radius:.0f}m, {args.ticks} ticks")
+    print(
+        f"{'players':>7} {'mode':>5} {'records/tick':>13} "
+        f"{'bytes/tick':>11} {'CPU us/tick':>12}"
+    )
+    for players in (4, 16, 64):
+        for mode in ("all", "grid"):
+            rng = random.Random(args.seed)
+            sessions = make_room(players, args.room_size, rng)
+            slots = {sid: i for i, sid in enumerate(sessions)}
+            if mode == "all":
+                records, seconds = run_all(
+                    sessions, slots, args.ticks, args.room_size, rng
+                )
+            else:
+                records, seconds = run_grid(
+                    sessions, slots, args.ticks, args.room_size, rng, args.radius
+                )
+            per_tick = records / args.ticks
+            print(
+                f"{players:>7} {mode:>5} {per_tick:>13.1f} "
+                f"{per_tick * RECORD.size:>11.0f} "
+                f"{seconds / args.ticks * 1e6:>12.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""Load-test a running API with simulated co-op rooms.
+
+Every simulated player loads its combat stats over HTTP, joins a room on
+``/ws/rooms`` and then, until the test ends, sends:
+
+- a ``session_update`` every ``--position-interval`` seconds (the spec's
+  200-500 ms position updates), moving at walking speed,
+- a ``heartbeat`` every ``--heartbeat-interval`` seconds (10 s in the spec),
+- ``combat_event`` melee hits so the whole run averages
+  ``--events-per-second``.
+
+All of it goes through the server's room shard: session updates are
+coalesced and validated per tick and come back as interest-filtered
+position batches, and combat events are checked against the damage rules,
+applied by the room engine and fanned out in the room's tick frames. The
+claimed damage follows the local server's stats (10 attack against 5
+armor); against ``--url`` servers with other stats the hits are rejected
+and show up as ``error received``.
+
+The defaults are the spec's load targets: 100 rooms, 400 players, 1000
+events/s. Without ``--url`` the harness starts a local uvicorn server whose
+config reads come from an in-memory stand-in for the DynamoDB tables and
+whose rooms are open from the start, so no AWS account is needed.
+
+Latencies are measured by the clients: HTTP config reads, connect
+handshakes, heartbeat round trips, and combat events from sender until the
+tick frame applying them reaches the other players in the room. A room's
+players always run in the same client process, so that is timed with that
+process's clock. Each client process runs its rooms on one event loop; if
+it saturates, the ``loop lag`` line grows and latencies include client-side
+queueing, so raise ``--workers``. After the run, the server's tick
+durations and event ingest flush latencies are read from
+``/api/runtime/ticks`` and ``/api/runtime/ingest``.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.load_test --seconds 20 --workers 4
+    python -m benchmarks.load_test --url http://localhost:8000 --rooms 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Tuple
+
+import httpx
+import websockets
+
+from app.config_source import InMemoryConfigSource
+from app.main import create_app
+from app.settings import Settings
+from models import Ability, CombatStats, EnemyType, RoomState
+from wire.tick_frame import decode_tick_frame
+
+from .fixtures import (
+    ability_payload,
+    combat_stats_payload,
+    enemy_type_payload,
+    room_payload,
+)
+
+STATS_ID = "stats-0000"
+ENEMIES_PER_ROOM = 50
+# Melee damage for STATS_ID hitting an enemy with the same stats: attack 10
+# minus armor 5, doubled on a critical hit.
+MELEE_DAMAGE = 5.0
+CRITICAL_MULTIPLIER = 2.0
+# Walking speed, below the stats' move_speed so no update is clamped.
+WALK_SPEED = 3.0
+
+
+def room_id(r: int) -> str:
+    """Return the ID of the r-th simulated room."""
+    return f"room-{r:04d}"
+
+
+def local_app():
+    """App factory for the local server, with in-memory config storage.
+
+    The ``LOAD_TEST_ROOMS`` rooms the harness will join are opened in the
+    room engine, with enemies whose types use the players' stats.
+    """
+    source = InMemoryConfigSource(
+        [
+            CombatStats.model_validate(combat_stats_payload(0)),
+            Ability.model_validate(ability_payload(0)),
+            *(
+                EnemyType.model_validate({**enemy_type_payload(0), "id": type_id})
+                for type_id in ("skeleton", "skeleton_archer")
+            ),
+        ]
+    )
+    app = create_app(Settings(), source)
+    for r in range(int(os.environ.get("LOAD_TEST_ROOMS", "0"))):
+        app.state.room_engine.open(
+            RoomState.model_validate(room_payload(room_id(r), ENEMIES_PER_ROOM))
+        )
+    return app
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value at ``fraction`` of a sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Recorder:
+    """Latency samples (in milliseconds) and counters for one run."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def latency(self, name: str, ms: float) -> None:
+        """Record one latency sample."""
+        self.latencies.setdefault(name, []).append(ms)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment a counter."""
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def merge(self, other: "Recorder") -> None:
+        """Add another worker's samples and counters."""
+        for name, values in other.latencies.items():
+            self.latencies.setdefault(name, []).extend(values)
+        for name, total in other.counts.items():
+            self.count(name, total)
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+    def report(
+        self,
+        ticks: Mapping[str, Dict[str, Any]],
+        ingests: Mapping[str, Dict[str, Any]],
+    ) -> str:
+        """Format latency percentiles and per-second throughput."""
+        lines = [
+            f"{'latency (ms)':<24} {'n':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+        ]
+        for name, values in self.latencies.items():
+            values.sort()
+            lines.append(
+                f"{name:<24} {len(values):>8} "
+                + " ".join(
+                    f"{percentile(values, f):>8.2f}" for f in (0.5, 0.9, 0.99, 1.0)
+                )
+            )
+        lines.append(f"{'counter':<24} {'total':>8} {'per s':>10}")
+        for name, total in sorted(self.counts.items()):
+            lines.append(f"{name:<24} {total:>8} {total / self.elapsed:>10,.1f}")
+        lines.append(
+            f"{'server (ms)':<24} {'n':>8} {'mean':>8} {'p99 <=':>8} {'max':>8} "
+            f"{'over':>8}"
+        )
+        for name, stats in ticks.items():
+            lines.append(
+                f"{'tick ' + name:<24} {stats['ticks']:>8} {stats['mean_ms']:>8.2f} "
+                f"{histogram_bound(stats['histogram_ms'], 0.99):>8} "
+                f"{stats['max_ms']:>8.2f} {stats['overruns']:>8}"
+            )
+        for name, stats in ingests.items():
+            lines.append(
+                f"{'ingest ' + name:<24} {stats['batches']:>8} "
+                f"{stats['mean_flush_ms']:>8.2f} "
+                f"{histogram_bound(stats['flush_histogram_ms'], 0.99):>8} "
+                f"{stats['max_flush_ms']:>8.2f} {stats['dropped']:>8}"
+            )
+        return "\n".join(lines)
+
+
+def histogram_bound(histogram: Mapping[str, int], fraction: float) -> str:
+    """Return the upper bound of the bucket holding ``fraction`` of the samples."""
+    total = sum(histogram.values())
+    seen = 0
+    for bound, n in histogram.items():
+        seen += n
+        if total and seen >= total * fraction:
+            return bound
+    return "-"
+
+
+@dataclass
+class Player:
+    """One simulated player."""
+
+    session_id: str
+    player_id: str
+    room_id: str
+    position_x: float = 0.0
+    position_y: float = 0.0
+    position_z: float = 0.0
+    events_sent: int = 0
+    joined_at: str = ""
+
+    def walk(self, seconds: float) -> None:
+        """Move in a random direction at walking speed."""
+        step = WALK_SPEED * seconds / 2**0.5
+        self.position_x += random.uniform(-step, step)
+        self.position_z += random.uniform(-step, step)
+
+
+def now_iso() -> str:
+    """Return the current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def session_update(player: Player) -> str:
+    """Build a ``session_update`` message carrying the player's session."""
+    now = now_iso()
+    return json.dumps(
+        {
+            "type": "session_update",
+            "session": {
+                "session_id": player.session_id,
+                "player_id": player.player_id,
+                "character_name": player.player_id,
+                "room_id": player.room_id,
+                "combat_stats_id": STATS_ID,
+                "current_health": 100.0,
+                "current_mana": 50.0,
+                "current_stamina": 100.0,
+                "position_x": player.position_x,
+                "position_y": player.position_y,
+                "position_z": player.position_z,
+                "is_alive": True,
+                "last_heartbeat": now,
+                "created_at": player.joined_at,
+                "updated_at": now,
+            },
+        },
+        separators=(",", ":"),
+    )
+
+
+def combat_event(player: Player, sent_at: float) -> str:
+    """Build a ``combat_event`` melee hit on a random enemy in the room."""
+    player.events_sent += 1
+    critical = random.random() < 0.1
+    enemy = random.randrange(ENEMIES_PER_ROOM)
+    now = now_iso()
+    return json.dumps(
+        {
+            "type": "combat_event",
+            "event": {
+                "event_id": f"{player.session_id}-event-{player.events_sent}",
+                "event_type": "damage_dealt",
+                "timestamp": now,
+                "source_player_id": player.player_id,
+                "target_enemy_id": f"{player.room_id}-enemy-{enemy:03d}",
+                "damage_amount": MELEE_DAMAGE
+                * (CRITICAL_MULTIPLIER if critical else 1.0),
+                "is_critical": critical,
+                "position_x": player.position_x,
+                "position_y": player.position_y,
+                "position_z": player.position_z,
+                "metadata": {"sent_at": sent_at},
+                "created_at": now,
+            },
+        },
+        separators=(",", ":"),
+    )
+
+
+async def receive(
+    ws, player: Player, recorder: Recorder, heartbeats: Deque[float]
+) -> None:
+    """Consume server frames and time the ones this harness can correlate."""
+    async for frame in ws:
+        now = time.perf_counter()
+        if isinstance(frame, bytes):
+            _, message, positions = decode_tick_frame(frame)
+            recorder.count("tick frames received")
+            if positions is not None:
+                recorder.count("position batches received")
+            for event in (message or {}).get("events", ()):
+                if event.get("source_player_id") == player.player_id:
+                    continue
+                recorder.count("events applied")
+                sent_at = (event.get("metadata") or {}).get("sent_at")
+                if sent_at is not None:
+                    recorder.latency("event applied", (now - sent_at) * 1000)
+            continue
+        message = json.loads(frame)
+        kind = message.get("type")
+        recorder.count(f"{kind} received")
+        if kind == "heartbeat_ack" and heartbeats:
+            recorder.latency("heartbeat rtt", (now - heartbeats.popleft()) * 1000)
+
+
+async def player_loop(
+    player: Player,
+    args,
+    http: httpx.AsyncClient,
+    recorder: Recorder,
+    start_at: float,
+    stop_at: float,
+) -> None:
+    """Run one simulated client from join to the end of the test."""
+    await asyncio.sleep(max(0.0, start_at - time.perf_counter()))
+    began = time.perf_counter()
+    response = await http.get(f"/api/combat-stats/{STATS_ID}")
+    recorder.latency("http config", (time.perf_counter() - began) * 1000)
+    recorder.count(f"http {response.status_code}")
+
+    ws_url = args.url.replace("http", "ws", 1) + "/ws/rooms"
+    began = time.perf_counter()
+    try:
+        ws = await websockets.connect(ws_url, max_queue=None)
+    except (OSError, websockets.WebSocketException):
+        recorder.count("connect failed")
+        return
+    heartbeats: Deque[float] = deque()
+    try:
+        await ws.send(
+            json.dumps(
+                {
+                    "type": "connect",
+                    "session_id": player.session_id,
+                    "room_id": player.room_id,
+                }
+            )
+        )
+        hello = json.loads(await ws.recv())
+        if hello.get("type") != "connected":
+            recorder.count("connect rejected")
+            return
+        recorder.latency("connect", (time.perf_counter() - began) * 1000)
+        listener = asyncio.create_task(receive(ws, player, recorder, heartbeats))
+        player.joined_at = now_iso()
+        await ws.send(session_update(player))
+        recorder.count("session updates sent")
+
+        event_rate = args.events_per_second / (args.rooms * args.room_size)
+        now = time.perf_counter()
+        next_position = now + random.uniform(0.0, args.position_interval)
+        next_heartbeat = now + random.uniform(0.0, args.heartbeat_interval)
+        next_event = now + random.expovariate(event_rate) if event_rate else stop_at
+        while True:
+            wake = min(next_position, next_heartbeat, next_event)
+            if wake >= stop_at or listener.done():
+                break
+            await asyncio.sleep(max(0.0, wake - time.perf_counter()))
+            now = time.perf_counter()
+            if now >= next_position:
+                player.walk(args.position_interval)
+                await ws.send(session_update(player))
+                recorder.count("session updates sent")
+                next_position += args.position_interval
+            if now >= next_heartbeat:
+                heartbeats.append(time.perf_counter())
+                await ws.send(
+                    json.dumps(
+                        {
+                            "type": "heartbeat",
+                            "session_id": player.session_id,
+                            "timestamp": now_iso(),
+                        }
+                    )
+                )
+                recorder.count("heartbeats sent")
+                next_heartbeat += args.heartbeat_interval
+            if now >= next_event:
+                await ws.send(combat_event(player, time.perf_counter()))
+                recorder.count("events sent")
+                next_event += random.expovariate(event_rate)
+        # Let in-flight fan-out arrive before closing.
+        await asyncio.sleep(args.drain)
+        listener.cancel()
+    except websockets.ConnectionClosed as exc:
+        recorder.count(f"closed {exc.rcvd.code if exc.rcvd else 'abnormal'}")
+    finally:
+        await ws.close()
+
+
+async def measure_loop_lag(
+    recorder: Recorder, stop_at: float, interval: float = 0.05
+) -> None:
+    """Sample how late the client event loop wakes up."""
+    while time.perf_counter() < stop_at:
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        recorder.latency("loop lag", max(0.0, time.perf_counter() - due) * 1000)
+
+
+def free_port() -> int:
+    """Return a TCP port that is free on localhost."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_server(port: int, rooms: int) -> Iterator[str]:
+    """Run the API with ``rooms`` open rooms in a uvicorn subprocess.
+
+    Yields:
+        The server's base URL
+    """
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--factory",
+            "benchmarks.load_test:local_app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--ws-max-queue",
+            "1024",
+        ],
+        env={**os.environ, "LOAD_TEST_ROOMS": str(rooms)},
+    )
+    try:
+        with httpx.Client(base_url=url) as http:
+            for _ in range(100):
+                try:
+                    http.get("/api/runtime/ticks")
+                    break
+                except httpx.TransportError:
+                    if server.poll() is not None:
+                        raise RuntimeError("Local server exited during startup")
+                    time.sleep(0.1)
+            else:
+                raise RuntimeError("Local server did not start")
+        yield url
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run(args, rooms: range) -> Recorder:
+    """Drive the load for some of the rooms and return the measurements."""
+    recorder = Recorder()
+    players = [
+        Player(
+            session_id=f"session-{r:04d}-{s}",
+            player_id=f"player-{r:04d}-{s}",
+            room_id=room_id(r),
+            position_x=random.uniform(-20.0, 20.0),
+            position_z=random.uniform(-20.0, 20.0),
+        )
+        for r in rooms
+        for s in range(args.room_size)
+    ]
+    limits = httpx.Limits(max_connections=args.http_connections)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits) as http:
+        start = time.perf_counter()
+        stop_at = start + args.ramp + args.seconds
+        tasks = [
+            asyncio.create_task(
+                player_loop(
+                    player,
+                    args,
+                    http,
+                    recorder,
+                    start + args.ramp * i / len(players),
+                    stop_at,
+                )
+            )
+            for i, player in enumerate(players)
+        ]
+        tasks.append(asyncio.create_task(measure_loop_lag(recorder, stop_at)))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        recorder.elapsed = time.perf_counter() - start - args.ramp
+    for result in results:
+        if isinstance(result, Exception):
+            recorder.count(f"error {type(result).__name__}")
+    return recorder
+
+
+def run_worker(args, rooms: range) -> Recorder:
+    """Run one worker process's share of the rooms on its own event loop."""
+    return asyncio.run(run(args, rooms))
+
+
+def server_stats(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Read the server's tick and event ingest metrics."""
+    with httpx.Client(base_url=url) as http:
+        ticks = http.get("/api/runtime/ticks").json()
+        ingests = http.get("/api/runtime/ingest").json()
+    return ticks, ingests
+
+
+def drive(args) -> Recorder:
+    """Split the rooms across worker processes and merge their measurements."""
+    workers = max(1, min(args.workers, args.rooms))
+    shares = [range(w, args.rooms, workers) for w in range(workers)]
+    if workers == 1:
+        return run_worker(args, shares[0])
+    recorder = Recorder()
+    with ProcessPoolExecutor(workers) as pool:
+        for part in pool.map(run_worker, [args] * workers, shares):
+            recorder.merge(part)
+    return recorder
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Co-op room load test")
+    parser.add_argument("--url", help="Server base URL (default: start one locally)")
+    parser.add_argument("--rooms", type=int, default=100, help="Concurrent rooms")
+    parser.add_argument("--room-size", type=int, default=4, help="Players per room")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Steady state")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Join ramp-up")
+    parser.add_argument(
+        "--events-per-second", type=float, default=1000.0, help="Total event rate"
+    )
+    parser.add_argument(
+        "--position-interval",
+        type=float,
+        default=0.25,
+        help="Seconds per session update",
+    )
+    parser.add_argument(
+        "--heartbeat-interval", type=float, default=10.0, help="Seconds per heartbeat"
+    )
+    parser.add_argument("--drain", type=float, default=0.5, help="Wait before close")
+    parser.add_argument("--http-connections", type=int, default=50)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Client processes (rooms are split)"
+    )
+    args = parser.parse_args()
+
+    if args.url is None:
+        with local_server(free_port(), args.rooms) as url:
+            args.url = url
+            recorder = drive(args)
+            ticks, ingests = server_stats(url)
+    else:
+        recorder = drive(args)
+        ticks, ingests = server_stats(args.url)
+    players = args.rooms * args.room_size
+    print(
+        f"{players} players in {args.rooms} rooms against {args.url}, "
+        f"{args.seconds:.0f}s after a {args.ramp:.0f}s ramp-up, "
+        f"{args.workers} client process(es)"
+    )
+    print(recorder.report(ticks, ingests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark batched loot rolls against the client's per-drop loop.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.loot_roller --count 10000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from models import LootTable
+from rules.loot import LootService
+
+from .fixtures import loot_table_payload
+
+
+def best_of(fn, repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Loot roller benchmark")
+    parser.add_argument("--count", type=int, default=10_000, help="Deaths per call")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    args = parser.parse_args()
+
+    table = LootTable.model_validate(loot_table_payload())
+    service = LootService(seed=2024)
+    rng = random.Random(2024)
+
+    def loop():
+        # Mirrors loot_table.gd::roll, including parsing the drops per roll.
+        results = []
+        for _ in range(args.count):
+            dropped = []
+            for raw in table.drops:
+                drop = json.loads(raw)
+                if rng.random() < drop["chance"]:
+                    quantity = rng.randint(drop["min_quantity"], drop["max_quantity"])
+                    dropped.append({"item_id": drop["item_id"], "quantity": quantity})
+            results.append(dropped)
+        return results
+
+    scalar = best_of(loop, args.repeat)
+    vectorized = best_of(lambda: service.roll(table, args.count, 0), args.repeat)
+    grouped = best_of(
+        lambda: service.roll(table, args.count, 0).by_death(), args.repeat
+    )
+
+    print(f"{args.count} deaths per call, {len(table.drops)} drops per table")
+    print(f"{'case':<28} {'ms/call':>9} {'deaths/s':>14}")
+    for name, seconds in (
+        ("per-drop loop", scalar),
+        ("LootService.roll", vectorized),
+        ("  + by_death()", grouped),
+    ):
+        print(f"{name:<28} {seconds * 1000:>9.2f} {args.count / seconds:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark vectorized movement validation against a per-update loop.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.movement_validation --count 400
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from rules.movement import (
+    DODGE_DISTANCE,
+    DODGE_STAMINA_COST,
+    STAMINA_REGEN_PER_SECOND,
+    MovementValidator,
+)
+
+
+def best_of(fn, repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Movement validation benchmark")
+    parser.add_argument("--count", type=int, default=400, help="Updates per tick")
+    parser.add_argument("--ticks", type=int, default=100, help="Ticks per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    n = args.count
+    slots = np.arange(n)
+    speeds = rng.uniform(4.0, 6.0, n)
+    step_ms = 200
+    ticks = []
+    position = np.zeros((n, 3))
+    for tick in range(1, args.ticks + 1):
+        position = position + rng.normal(0.0, 0.6, (n, 3))
+        ticks.append((position, np.full(n, 100.0), np.full(n, tick * step_ms)))
+
+    def vectorized():
+        validator = MovementValidator(tolerance=0.1)
+        for slot in slots:
+            validator.join(int(slot), float(speeds[slot]))
+        validator.validate(
+            slots, np.zeros((n, 3)), np.full(n, 100.0), np.zeros(n), None, 0
+        )
+        for tick_position, stamina, at_ms in ticks:
+            validator.validate(slots, tick_position, stamina, at_ms, None, at_ms)
+        return validator.violations
+
+    def loop():
+        last = {int(s): (0.0, 0.0, 100.0, 0) for s in slots}
+        violations = 0
+        for tick_position, stamina, at_ms in ticks:
+            for s in range(n):
+                x, _, z = tick_position[s]
+                lx, lz, ls, lt = last[s]
+                dt = max(0.0, (int(at_ms[s]) - lt) / 1000.0)
+                budget = min(100.0, ls + STAMINA_REGEN_PER_SECOND * dt)
+                left = min(max(stamina[s], 0.0), budget)
+                dodges = math.floor((budget - left) / DODGE_STAMINA_COST + 1e-9)
+                allowed = speeds[s] * dt + dodges * DODGE_DISTANCE + 0.1
+                if math.hypot(x - lx, z - lz) > allowed:
+                    violations += 1
+                else:
+                    last[s] = (x, z, left, int(at_ms[s]))
+        return violations
+
+    assert vectorized() == loop()
+    scalar = best_of(loop, args.repeat) / args.ticks
+    fast = best_of(vectorized, args.repeat) / args.ticks
+
+    print(f"{n} updates per tick, {args.ticks} ticks")
+    print(f"{'case':<24} {'ms/tick':>9} {'updates/s':>14}")
+    for name, seconds in (("per-update loop", scalar), ("vectorized validate", fast)):
+        print(f"{name:<24} {seconds * 1000:>9.3f} {n / seconds:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
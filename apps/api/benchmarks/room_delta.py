@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Benchmark RoomState delta updates against full-state broadcasts.
+
+Each simulated update damages one enemy, as a single ``damage_dealt`` event
+would. Run from ``apps/api``::
+
+    python -m benchmarks.room_delta --enemies 50 --updates 2000
+"""
+
+import argparse
+import sys
+import time
+
+from models import RoomState
+from storage.dynamodb_codec import decode_entry, encode_entry
+from wire.room_delta import RoomDeltaLog, dumps
+
+from .fixtures import room_payload
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="RoomState delta benchmarks")
+    parser.add_argument("--enemies", type=int, default=50, help="Enemies per room")
+    parser.add_argument(
+        "--updates", type=int, default=2_000, help="Updates to simulate"
+    )
+    args = parser.parse_args()
+
+    room = RoomState.model_validate(room_payload(enemies=args.enemies))
+    states = []
+    enemies = list(room.enemies)
+    state = room
+    for i in range(args.updates):
+        index = i % len(enemies)
+        entry = decode_entry(enemies[index])
+        entry["current_health"] = max(0.0, entry["current_health"] - 7.5)
+        entry["is_alive"] = entry["current_health"] > 0
+        enemies[index] = encode_entry(entry)
+        state = state.model_copy(update={"enemies": list(enemies)})
+        states.append(state)
+
+    start = time.perf_counter()
+    full_bytes = sum(len(s.model_dump_json()) for s in states)
+    full_time = time.perf_counter() - start
+
+    log = RoomDeltaLog(room)
+    start = time.perf_counter()
+    delta_bytes = sum(len(dumps(log.commit(s))) for s in states)
+    delta_time = time.perf_counter() - start
+
+    print(f"enemies per room: {args.enemies}, updates: {args.updates}")
+    print(f"{'mode':<16} {'bytes/update':>14} {'us/update':>12}")
+    print(
+        f"{'full state':<16} {full_bytes / len(states):>14.1f} "
+        f"{full_time / len(states) * 1e6:>12.1f}"
+    )
+    print(
+        f"{'delta':<16} {delta_bytes / len(states):>14.1f} "
+        f"{delta_time / len(states) * 1e6:>12.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Load-test the room broadcast hub with thousands of simulated sockets.
+
+All sockets share one event loop, as they would in one uvicorn worker. Every
+tick each room broadcasts a position batch (coalescable, binary) and every
+``--event-every`` ticks a ``room_update`` (must be delivered). A fraction of
+clients are slow: each send takes ``--slow-ms``, so their queues fill and
+the hub coalesces, drops or disconnects them.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.room_hub_load --sockets 4000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.hub import RoomHub
+from wire.session_codec import HEADER, RECORD
+
+
+def percentile(values, fraction: float) -> float:
+    """Return the value at ``fraction`` of a sorted list, in milliseconds."""
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+async def run(args) -> None:
+    """Drive the hub and print delivery and CPU statistics."""
+    hub = RoomHub(max_frames=args.queue)
+    delivered = [0]
+
+    def make_send(delay: float):
+        async def send(frame) -> None:
+            delivered[0] += 1
+            await asyncio.sleep(delay)
+
+        return send
+
+    rooms = [f"room-{i:05d}" for i in range(args.sockets // args.room_size)]
+    subscribers = []
+    for n in range(len(rooms) * args.room_size):
+        slow = args.slow_fraction and n % round(1 / args.slow_fraction) == 0
+        subscriber = hub.join(
+            f"session-{n:06d}",
+            rooms[n // args.room_size],
+            make_send(args.slow_ms / 1000 if slow else 0),
+        )
+        subscribers.append(subscriber)
+    pumps = [asyncio.create_task(s.pump()) for s in subscribers]
+
+    positions = bytes(HEADER.size + RECORD.size * args.room_size)
+    interval = 1 / args.tick_rate
+    ticks = int(args.seconds * args.tick_rate)
+    broadcast_cpu = []
+    lag = []
+    start = time.perf_counter()
+    for tick in range(ticks):
+        due = start + tick * interval
+        lag.append(max(0.0, time.perf_counter() - due))
+        began = time.perf_counter()
+        for room_id in rooms:
+            hub.broadcast(room_id, positions, coalesce="positions")
+            if tick % args.event_every == 0:
+                hub.broadcast(
+                    room_id,
+                    {"type": "room_update", "room_id": room_id, "version": tick},
+                )
+        broadcast_cpu.append(time.perf_counter() - began)
+        await asyncio.sleep(max(0.0, due + interval - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+
+    for subscriber in subscribers:
+        hub.leave(subscriber)
+    await asyncio.gather(*pumps, return_exceptions=True)
+
+    broadcast_cpu.sort()
+    lag.sort()
+    coalesced = sum(s.queue.coalesced for s in subscribers)
+    dropped = sum(s.queue.dropped for s in subscribers)
+    print(
+        f"{len(subscribers)} sockets in {len(rooms)} rooms, "
+        f"{args.tick_rate:.0f} Hz for {elapsed:.1f}s"
+    )
+    print(f"  broadcasts          {hub.broadcasts}")
+    print(f"  frames delivered    {delivered[0]} ({delivered[0] / elapsed:,.0f}/s)")
+    print(f"  positions coalesced {coalesced}")
+    print(f"  positions dropped   {dropped}")
+    print(f"  slow disconnects    {hub.disconnects}")
+    for name, values in (("broadcast CPU/tick", broadcast_cpu), ("tick lag", lag)):
+        print(
+            f"  {name:<19} p50 {percentile(values, 0.5):.2f} ms"
+            f"  p99 {percentile(values, 0.99):.2f} ms"
+        )
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Room hub load test")
+    parser.add_argument("--sockets", type=int, default=4000, help="Simulated sockets")
+    parser.add_argument("--room-size", type=int, default=4, help="Sockets per room")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Test duration")
+    parser.add_argument("--tick-rate", type=float, default=20.0, help="Broadcasts/sec")
+    parser.add_argument("--event-every", type=int, default=10, help="Ticks per update")
+    parser.add_argument("--queue", type=int, default=64, help="Send queue frames")
+    parser.add_argument(
+        "--slow-fraction", type=float, default=0.05, help="Share of slow clients"
+    )
+    parser.add_argument("--slow-ms", type=float, default=250.0, help="Slow send time")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
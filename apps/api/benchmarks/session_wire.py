@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark the binary session batch format against JSON.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.session_wire --players 4 --batches 20000
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from models import PlayerSession
+from wire.session_codec import SessionBatchView, decode_batch, encode_batch
+
+from .fixtures import session_payloads
+
+SUBSET = (
+    "session_id",
+    "position_x",
+    "position_y",
+    "position_z",
+    "current_health",
+    "current_mana",
+    "current_stamina",
+    "is_alive",
+    "last_heartbeat",
+)
+
+
+def rate(fn, batches):
+    """Return batches per second."""
+    start = time.perf_counter()
+    for _ in range(batches):
+        fn()
+    return batches / (time.perf_counter() - start)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Session wire format benchmarks")
+    parser.add_argument("--players", type=int, default=4, help="Sessions per batch")
+    parser.add_argument("--batches", type=int, default=20_000, help="Batches per run")
+    args = parser.parse_args()
+
+    sessions = [PlayerSession.model_validate(p) for p in session_payloads(args.players)]
+    slots = {s.session_id: i for i, s in enumerate(sessions)}
+    subset_rows = [s.model_dump(mode="json", include=set(SUBSET)) for s in sessions]
+
+    full_json = json.dumps([s.model_dump(mode="json") for s in sessions]).encode()
+    subset_json = json.dumps(subset_rows).encode()
+    binary = encode_batch(sessions, slots)
+
+    print(
+        f"{'format':<28} {'bytes':>8} {'bytes/player':>13} {'enc/s':>10} {'dec/s':>10}"
+    )
+    rows = [
+        (
+            "JSON (full model)",
+            full_json,
+            lambda: json.dumps([s.model_dump(mode="json") for s in sessions]).encode(),
+            lambda: [PlayerSession.model_validate(d) for d in json.loads(full_json)],
+        ),
+        (
+            "JSON (subset)",
+            subset_json,
+            lambda: json.dumps(
+                [s.model_dump(mode="json", include=set(SUBSET)) for s in sessions]
+            ).encode(),
+            lambda: json.loads(subset_json),
+        ),
+        (
+            "binary v2 (decode all)",
+            binary,
+            lambda: encode_batch(sessions, slots),
+            lambda: decode_batch(binary),
+        ),
+        (
+            "binary v2 (numpy view)",
+            binary,
+            lambda: encode_batch(sessions, slots),
+            lambda: SessionBatchView(binary).as_array(),
+        ),
+    ]
+    for name, payload, encode, decode in rows:
+        print(
+            f"{name:<28} {len(payload):>8} {len(payload) / args.players:>13.1f} "
+            f"{rate(encode, args.batches):>10,.0f} {rate(decode, args.batches):>10,.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Simulate session update load and count PlayerSessions table writes.
+
+Each player sends ``--rate`` session updates per second for ``--seconds`` of
+simulated time. Every ``--event-every`` seconds on average a player dies,
+respawns or changes room, which the write-behind store writes through
+immediately. Compares write-through (one ``PutItem`` per update) against
+``WriteBehindSessionStore`` at several flush intervals.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.session_write_behind --players 4 --seconds 3600
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from models import PlayerSession
+from runtime.write_behind import WriteBehindSessionStore
+from storage.session_table import InMemorySessionWriter
+
+from .fixtures import session_payload
+
+
+class SimulatedClock:
+    """Clock driven by the simulation rather than wall time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def simulate(args, flush_interval: float) -> tuple:
+    """Replay the update stream; return (updates, items written, requests, seconds)."""
+    rng = random.Random(args.seed)
+    clock = SimulatedClock()
+    writer = InMemorySessionWriter()
+    store = WriteBehindSessionStore(writer, flush_interval=flush_interval, clock=clock)
+    sessions = [
+        PlayerSession.model_validate(session_payload(i, room_count=1))
+        for i in range(args.players)
+    ]
+    step = 1.0 / args.rate
+    event_chance = step / args.event_every
+    start = time.perf_counter()
+    for tick in range(int(args.seconds * args.rate)):
+        clock.now = tick * step
+        for i, session in enumerate(sessions):
+            update = {
+                "position_x": (session.position_x or 0.0) + rng.uniform(-0.5, 0.5),
+                "current_stamina": rng.uniform(0.0, 100.0),
+            }
+            if rng.random() < event_chance:
+                if rng.random() < 0.5:
+                    update["is_alive"] = not session.is_alive
+                else:
+                    update["room_id"] = f"room-{rng.randrange(8):04d}"
+            sessions[i] = session = session.model_copy(update=update)
+            store.update(session)
+        store.maybe_flush()
+    store.flush()
+    elapsed = time.perf_counter() - start
+    return store.updates, writer.items, writer.requests, elapsed
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Write-behind session benchmark")
+    parser.add_argument("--players", type=int, default=4, help="Concurrent players")
+    parser.add_argument("--seconds", type=float, default=3600.0, help="Simulated time")
+    parser.add_argument("--rate", type=float, default=5.0, help="Updates/sec/player")
+    parser.add_argument(
+        "--event-every",
+        type=float,
+        default=30.0,
+        help="Mean seconds between deaths/moves",
+    )
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    updates = int(args.seconds * args.rate) * args.players
+    print(
+        f"{args.players} players x {args.rate}/s for {args.seconds:.0f}s "
+        f"= {updates} updates"
+    )
+    print(
+        f"{'strategy':<22} {'items':>9} {'requests':>9} {'reduction':>10} {'sim ms':>8}"
+    )
+    print(f"{'write-through':<22} {updates:>9} {updates:>9} {'-':>10} {'-':>8}")
+    for interval in (0.5, 1.0, 2.0, 5.0):
+        _, items, requests, elapsed = simulate(args, interval)
+        name = f"write-behind {interval}s"
+        print(
+            f"{name:<22} {items:>9} {requests:>9} "
+            f"{1 - items / updates:>9.1%} {elapsed * 1000:>8.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
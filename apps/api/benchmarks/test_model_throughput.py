@@ -0,0 +1,114 @@
+"""Throughput benchmarks for every generated model.
+
+Covers both copies of the generated models: ``apps/api/models`` and
+``generated/python/models``. Run from ``apps/api``::
+
+    pytest benchmarks --benchmark-only --benchmark-max-time=0.2
+
+CI compares a pull request against its base branch with
+``--benchmark-compare-fail`` (see ``.github/workflows/api-benchmarks.yml``).
+"""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from typing import List, Type
+
+import pytest
+from pydantic import BaseModel, TypeAdapter
+
+import models
+
+from .fixtures import MODEL_PAYLOADS
+
+GENERATED_DIR = Path(__file__).resolve().parents[3] / "generated" / "python" / "models"
+BATCH_SIZES = (10, 100, 1000)
+
+
+def _load_generated_package() -> str:
+    """Import ``generated/python/models`` as ``generated_models`` and return its name."""
+    name = "generated_models"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name,
+            GENERATED_DIR / "__init__.py",
+            submodule_search_locations=[str(GENERATED_DIR)],
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return name
+
+
+def _model_classes() -> List[pytest.param]:
+    params = [
+        pytest.param(getattr(models, name), id=f"api-{name}") for name in models.__all__
+    ]
+    package = _load_generated_package()
+    for path in sorted(GENERATED_DIR.glob("*Model.py")):
+        name = path.stem.removesuffix("Model")
+        module = importlib.import_module(f"{package}.{path.stem}")
+        params.append(pytest.param(getattr(module, name), id=f"generated-{name}"))
+    return params
+
+
+MODEL_CLASSES = _model_classes()
+
+
+def _payload(model: Type[BaseModel], i: int = 0) -> dict:
+    return MODEL_PAYLOADS[model.__name__](i)
+
+
+def test_every_model_has_a_payload():
+    """Every generated model must have sample data, or it silently goes unmeasured."""
+    missing = {p.values[0].__name__ for p in MODEL_CLASSES} - MODEL_PAYLOADS.keys()
+    assert not missing
+
+
+@pytest.mark.parametrize("model", MODEL_CLASSES)
+def test_construct(benchmark, model):
+    """Keyword construction: ``Model(**payload)``."""
+    payload = _payload(model)
+    benchmark(lambda: model(**payload))
+
+
+@pytest.mark.parametrize("model", MODEL_CLASSES)
+def test_model_validate(benchmark, model):
+    """``model_validate`` from a Python dict."""
+    payload = _payload(model)
+    benchmark(model.model_validate, payload)
+
+
+@pytest.mark.parametrize("model", MODEL_CLASSES)
+def test_model_validate_json(benchmark, model):
+    """``model_validate_json`` from JSON bytes."""
+    raw = model.model_validate(_payload(model)).model_dump_json()
+    benchmark(model.model_validate_json, raw)
+
+
+@pytest.mark.parametrize("model", MODEL_CLASSES)
+def test_model_dump_json(benchmark, model):
+    """``model_dump_json`` of a validated instance."""
+    instance = model.model_validate(_payload(model))
+    benchmark(instance.model_dump_json)
+
+
+@pytest.mark.parametrize("size", BATCH_SIZES)
+@pytest.mark.parametrize("model", MODEL_CLASSES)
+def test_list_validate(benchmark, model, size):
+    """``TypeAdapter(List[Model]).validate_python`` over a batch."""
+    adapter = TypeAdapter(List[model])
+    payloads = [_payload(model, i) for i in range(size)]
+    benchmark.extra_info["batch_size"] = size
+    benchmark(adapter.validate_python, payloads)
+
+
+@pytest.mark.parametrize("size", BATCH_SIZES)
+@pytest.mark.parametrize("model", MODEL_CLASSES)
+def test_list_round_trip_json(benchmark, model, size):
+    """JSON round trip of a batch: ``dump_json`` then ``validate_json``."""
+    adapter = TypeAdapter(List[model])
+    instances = adapter.validate_python([_payload(model, i) for i in range(size)])
+    benchmark.extra_info["batch_size"] = size
+    benchmark(lambda: adapter.validate_json(adapter.dump_json(instances)))
@@ -0,0 +1,18 @@
+"""Server-authoritative game rules."""
+
+from .damage import DamageValidator, DamageVerdict, StatsIndex, expected_damage
+from .loot import CompiledLootTable, LootRolls, LootService, death_nonce
+from .movement import MovementValidator, MovementVerdict
+
+__all__ = [
+    "CompiledLootTable",
+    "DamageValidator",
+    "DamageVerdict",
+    "LootRolls",
+    "LootService",
+    "MovementValidator",
+    "MovementVerdict",
+    "StatsIndex",
+    "death_nonce",
+    "expected_damage",
+]
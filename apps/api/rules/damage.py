@@ -0,0 +1,204 @@
+"""Server-side validation of claimed combat damage.
+
+Mirrors ``CombatComponent.calculate_damage`` in the Godot client::
+
+    damage = max(1, base - target.armor)
+    if critical: damage *= attacker.critical_multiplier
+
+where ``base`` is ``Ability.damage`` when the event names an ability that
+has one, and the attacker's ``attack_damage`` otherwise.
+
+A whole ``CombatEventBatch`` is checked in one pass: ID columns are already
+dictionary-encoded, so each distinct attacker, target and ability is looked
+up once and mapped to a row of the precomputed ``StatsIndex`` arrays, and
+the formula then runs as array arithmetic over every event.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from analytics.columnar import Categorical, CombatEventBatch
+from models import Ability, CombatStats
+
+DAMAGE_EVENTS = ("damage_dealt", "damage_taken")
+
+# Per-event verdict reasons.
+OK = 0
+NOT_CHECKED = 1
+UNKNOWN_SOURCE = 2
+UNKNOWN_TARGET = 3
+MISSING_AMOUNT = 4
+MISMATCH = 5
+REASONS = (
+    "ok",
+    "not_checked",
+    "unknown_source",
+    "unknown_target",
+    "missing_amount",
+    "mismatch",
+)
+
+
+class StatsIndex:
+    """``CombatStats`` and ``Ability`` values as arrays with ID -> row lookups."""
+
+    def __init__(
+        self, stats: Iterable[CombatStats], abilities: Iterable[Ability] = ()
+    ) -> None:
+        stats = list(stats)
+        abilities = list(abilities)
+        self.stats_row: Dict[str, int] = {s.id: i for i, s in enumerate(stats)}
+        self.ability_row: Dict[str, int] = {a.id: i for i, a in enumerate(abilities)}
+        self.armor = np.array([s.armor for s in stats], dtype=np.float64)
+        self.attack_damage = np.array(
+            [s.attack_damage for s in stats], dtype=np.float64
+        )
+        self.critical_multiplier = np.array(
+            [s.critical_multiplier for s in stats], dtype=np.float64
+        )
+        self.move_speed = np.array([s.move_speed for s in stats], dtype=np.float64)
+        self.ability_damage = np.array(
+            [np.nan if a.damage is None else a.damage for a in abilities],
+            dtype=np.float64,
+        )
+
+    @classmethod
+    def from_config_source(cls, source: Any) -> "StatsIndex":
+        """Build the index from every CombatStats and Ability in a config source.
+
+        Args:
+            source: An ``app.config_source.ConfigSource``
+        """
+        return cls(source.scan("CombatStats"), source.scan("Ability"))
+
+
+@dataclass
+class DamageVerdict:
+    """Per-event validation result, aligned with the input batch.
+
+    Attributes:
+        accepted: True where the claim matches (or the event is not a damage event)
+        expected: Server-computed damage; NaN where it could not be computed
+        reason: One of the module's reason codes (index into ``REASONS``)
+    """
+
+    accepted: np.ndarray
+    expected: np.ndarray
+    reason: np.ndarray
+
+    def rejected(self, event_ids: np.ndarray) -> List[str]:
+        """Return the IDs of rejected events."""
+        return event_ids[~self.accepted].tolist()
+
+
+def _rows(
+    column: Categorical, stats_of: Mapping[str, str], stats_row: Mapping[str, int]
+) -> np.ndarray:
+    """Map each event's actor ID to a stats row (-1 if missing or unknown)."""
+    lookup = np.array(
+        [stats_row.get(stats_of.get(actor, ""), -1) for actor in column.categories]
+        + [-1],
+        dtype=np.int64,
+    )
+    return lookup[column.codes]
+
+
+class DamageValidator:
+    """Validates claimed ``damage_amount`` for batches of combat events."""
+
+    def __init__(
+        self,
+        index: StatsIndex,
+        player_stats: Mapping[str, str],
+        enemy_stats: Mapping[str, str],
+        abs_tolerance: float = 0.01,
+        rel_tolerance: float = 1e-4,
+    ) -> None:
+        """Create the validator.
+
+        Args:
+            index: Precomputed stats and ability arrays
+            player_stats: player_id -> combat_stats_id (from the player's session)
+            enemy_stats: enemy_instance_id -> combat_stats_id (via its EnemyType)
+            abs_tolerance: Allowed absolute difference from the expected damage
+            rel_tolerance: Allowed relative difference from the expected damage
+        """
+        self.index = index
+        self.player_stats = player_stats
+        self.enemy_stats = enemy_stats
+        self.abs_tolerance = abs_tolerance
+        self.rel_tolerance = rel_tolerance
+
+    def _actor_rows(self, batch: CombatEventBatch, role: str) -> np.ndarray:
+        rows = self.index.stats_row
+        players = _rows(batch[f"{role}_player_id"], self.player_stats, rows)
+        enemies = _rows(batch[f"{role}_enemy_id"], self.enemy_stats, rows)
+        return np.where(players >= 0, players, enemies)
+
+    def validate(self, batch: CombatEventBatch) -> DamageVerdict:
+        """Check every damage event in a batch against the server's formula."""
+        index = self.index
+        n = len(batch)
+        event_type = batch["event_type"]
+        checked = np.isin(
+            event_type.codes, [event_type.code_of(t) for t in DAMAGE_EVENTS]
+        )
+        source = self._actor_rows(batch, "source")
+        target = self._actor_rows(batch, "target")
+
+        abilities = batch["ability_id"]
+        ability_lookup = np.array(
+            [index.ability_row.get(a, -1) for a in abilities.categories] + [-1],
+            dtype=np.int64,
+        )
+        ability = ability_lookup[abilities.codes]
+        ability_damage = np.full(n, np.nan)
+        has_ability = ability >= 0
+        ability_damage[has_ability] = index.ability_damage[ability[has_ability]]
+
+        known = (source >= 0) & (target >= 0)
+        src = np.where(known, source, 0)
+        tgt = np.where(known, target, 0)
+        base = np.where(
+            np.isnan(ability_damage), index.attack_damage[src], ability_damage
+        )
+        expected = np.maximum(1.0, base - index.armor[tgt])
+        expected = np.where(
+            batch.is_critical, expected * index.critical_multiplier[src], expected
+        )
+
+        claimed = batch["damage_amount"]
+        matches = np.abs(claimed - expected) <= np.maximum(
+            self.abs_tolerance, self.rel_tolerance * expected
+        )
+
+        reason = np.full(n, NOT_CHECKED, dtype=np.int8)
+        reason[checked] = OK
+        reason[checked & ~matches] = MISMATCH
+        reason[checked & np.isnan(claimed)] = MISSING_AMOUNT
+        reason[checked & (target < 0)] = UNKNOWN_TARGET
+        reason[checked & (source < 0)] = UNKNOWN_SOURCE
+        expected[~(checked & known)] = np.nan
+        return DamageVerdict(
+            accepted=(reason == OK) | (reason == NOT_CHECKED),
+            expected=expected,
+            reason=reason,
+        )
+
+
+def expected_damage(
+    attacker: CombatStats,
+    target: CombatStats,
+    is_critical: bool,
+    ability: Optional[Ability] = None,
+) -> float:
+    """Scalar form of the damage formula, for single events and tests."""
+    base = (
+        ability.damage
+        if ability is not None and ability.damage is not None
+        else attacker.attack_damage
+    )
+    damage = max(1.0, base - target.armor)
+    return damage * attacker.critical_multiplier if is_critical else damage
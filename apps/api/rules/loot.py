@@ -0,0 +1,210 @@
+"""Server-authoritative loot rolls.
+
+Same semantics as ``LootTable.roll`` in the Godot client: every drop of a
+table is rolled independently against its ``chance``, and a dropped item's
+quantity is uniform over ``[min_quantity, max_quantity]``.
+
+A table is compiled once into arrays. For tables of up to
+``MAX_ALIAS_DROPS`` drops, the independent per-drop rolls are folded into
+one distribution over the ``2**k`` possible sets of dropped items and
+sampled with Walker's alias method: two random numbers per enemy death,
+however many drops the table has. Larger tables fall back to one uniform
+per drop and death. Either way a whole batch of deaths is rolled with array
+operations.
+
+Randomness comes from a Philox counter-based generator keyed by the
+service's seed. Every batch is rolled from its own counter block (its
+``nonce``), so any roll can be reproduced for an audit from
+``(seed, table ID, table updated_at, count, nonce)``. The nonce is not a
+counter kept by the service, which would restart at zero with the process
+and be shared by every instance: ``death_nonce`` derives it from the room
+and ``event_id`` of the batch's first ``enemy_died`` event, so a batch
+rolls the same way wherever and whenever it is rolled, and two batches
+share a counter block only if they start with the same death.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import CombatEvent, LootTable
+from storage.dynamodb_codec import decode_entry
+
+MAX_ALIAS_DROPS = 10
+
+
+def death_nonce(room_id: str, event_id: str) -> int:
+    """Return the 64-bit counter block for a batch starting with this death."""
+    digest = hashlib.blake2b(f"{room_id}/{event_id}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def build_alias(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Build Walker/Vose alias arrays for a discrete distribution.
+
+    Returns:
+        ``(prob, alias)``: sample column ``i`` uniformly, keep it with
+        probability ``prob[i]``, otherwise take ``alias[i]``
+    """
+    n = len(probabilities)
+    scaled = np.asarray(probabilities, dtype=np.float64) * (n / probabilities.sum())
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    return prob, alias
+
+
+@dataclass
+class CompiledLootTable:
+    """Array form of one ``LootTable``."""
+
+    table_id: str
+    version: datetime
+    item_ids: List[str]
+    item_types: List[str]
+    chance: np.ndarray
+    min_quantity: np.ndarray
+    max_quantity: np.ndarray
+    outcomes: Optional[np.ndarray] = None
+    alias_prob: Optional[np.ndarray] = None
+    alias: Optional[np.ndarray] = None
+
+    @classmethod
+    def compile(cls, table: LootTable) -> "CompiledLootTable":
+        """Compile a table's drops into arrays (and an alias table if small)."""
+        drops = [decode_entry(entry) for entry in table.drops]
+        compiled = cls(
+            table_id=table.id,
+            version=table.updated_at or table.created_at,
+            item_ids=[d["item_id"] for d in drops],
+            item_types=[d["item_type"] for d in drops],
+            chance=np.array([d["chance"] for d in drops], dtype=np.float64),
+            min_quantity=np.array([d["min_quantity"] for d in drops], dtype=np.int64),
+            max_quantity=np.array([d["max_quantity"] for d in drops], dtype=np.int64),
+        )
+        k = len(drops)
+        if 0 < k <= MAX_ALIAS_DROPS:
+            outcomes = (np.arange(2**k)[:, None] >> np.arange(k)) & 1
+            compiled.outcomes = outcomes.astype(np.bool_)
+            weights = np.where(
+                compiled.outcomes, compiled.chance, 1.0 - compiled.chance
+            ).prod(axis=1)
+            compiled.alias_prob, compiled.alias = build_alias(weights)
+        return compiled
+
+    def presence(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Roll which drops each of ``count`` deaths produces, shape (count, k)."""
+        if self.outcomes is None:
+            return rng.random((count, len(self.item_ids))) < self.chance
+        column = rng.integers(0, len(self.alias), size=count)
+        keep = rng.random(count) < self.alias_prob[column]
+        return self.outcomes[np.where(keep, column, self.alias[column])]
+
+
+@dataclass
+class LootRolls:
+    """Items dropped by a batch of deaths, one row per dropped item.
+
+    Attributes:
+        table: The compiled table that was rolled
+        nonce: Counter block the batch was rolled from
+        count: Number of deaths rolled
+        death: Index of the death (0..count-1) that dropped each item
+        drop: Index of the table drop for each item
+        quantity: Quantity of each item
+    """
+
+    table: CompiledLootTable
+    nonce: int
+    count: int
+    death: np.ndarray
+    drop: np.ndarray
+    quantity: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.death)
+
+    def by_death(self) -> List[List[Dict[str, Any]]]:
+        """Return ``[{item_id, quantity}, ...]`` per death, like the client's roll."""
+        result: List[List[Dict[str, Any]]] = [[] for _ in range(self.count)]
+        item_ids = self.table.item_ids
+        for death, drop, quantity in zip(
+            self.death.tolist(), self.drop.tolist(), self.quantity.tolist()
+        ):
+            result[death].append({"item_id": item_ids[drop], "quantity": quantity})
+        return result
+
+
+class LootService:
+    """Rolls loot for batches of enemy deaths from compiled, cached tables."""
+
+    def __init__(self, seed: int) -> None:
+        """Create the service.
+
+        Args:
+            seed: Philox key; keep it with the roll records to audit them
+        """
+        self.seed = seed
+        self._tables: Dict[str, CompiledLootTable] = {}
+        self.compilations = 0
+
+    def compiled(self, table: LootTable) -> CompiledLootTable:
+        """Return the compiled table, recompiling only when ``updated_at`` changed."""
+        version = table.updated_at or table.created_at
+        compiled = self._tables.get(table.id)
+        if compiled is None or compiled.version != version:
+            compiled = self._tables[table.id] = CompiledLootTable.compile(table)
+            self.compilations += 1
+        return compiled
+
+    def generator(self, nonce: int) -> np.random.Generator:
+        """Return the generator for one counter block."""
+        return np.random.Generator(
+            np.random.Philox(key=self.seed, counter=[0, nonce, 0, 0])
+        )
+
+    def roll_deaths(self, table: LootTable, deaths: Sequence[CombatEvent]) -> LootRolls:
+        """Roll a batch of ``enemy_died`` events, keyed by the first of them.
+
+        Args:
+            table: Loot table of the enemies that died
+            deaths: The deaths, in the order they are reported back
+
+        Returns:
+            The dropped items; ``death`` indexes into ``deaths``
+        """
+        if not deaths:
+            return self.roll(table, 0, 0)
+        first = deaths[0]
+        return self.roll(table, len(deaths), death_nonce(first.room_id, first.event_id))
+
+    def roll(self, table: LootTable, count: int, nonce: int) -> LootRolls:
+        """Roll ``count`` enemy deaths against a table.
+
+        Args:
+            table: Loot table of the enemies that died
+            count: Number of deaths to roll
+            nonce: Counter block to use, from ``death_nonce``; never reuse one
+                for a different batch
+
+        Returns:
+            The dropped items
+        """
+        compiled = self.compiled(table)
+        rng = self.generator(nonce)
+        present = compiled.presence(count, rng)
+        death, drop = np.nonzero(present)
+        quantity = rng.integers(
+            compiled.min_quantity[drop], compiled.max_quantity[drop], endpoint=True
+        )
+        return LootRolls(compiled, nonce, count, death, drop, quantity)
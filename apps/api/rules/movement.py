@@ -0,0 +1,339 @@
+"""Server-side validation of reported player positions (no teleporting).
+
+Each session update reports where the player is now. The distance from the
+last trusted position, over the time between the two updates, implies a
+speed; an update is accepted when the distance fits within::
+
+    allowed = move_speed * sprint_multiplier * dt + dodges * DODGE_DISTANCE + tolerance
+
+``move_speed`` is the player's ``CombatStats.move_speed``. A dodge moves the
+player ``DODGE_DISTANCE`` metres in 0.3 s and costs ``DODGE_STAMINA_COST``
+stamina (combat design properties 12 and 13). ``tolerance`` absorbs float32
+wire precision. Distance is measured on the x/z ground plane; height changes
+(stairs, falls) are not limited.
+
+Nothing in the allowance is taken on the client's word:
+
+- ``dt`` is the heartbeat delta, capped by the server's receive-time delta
+  plus ``max_jitter_ms``, so a heartbeat stamped in the future buys no
+  distance
+- stamina is tracked by the server: it regenerates at most
+  ``STAMINA_REGEN_PER_SECOND`` (the client's rate) up to ``max_stamina``, a
+  reported value above that is clamped, and dodges are counted only from
+  whole ``DODGE_STAMINA_COST`` amounts spent below the server's value
+
+State is kept per room slot (the small per-room session index the wire
+format uses) in NumPy arrays, so a whole tick of updates is checked with
+array arithmetic. Rejected updates are either flagged, leaving the trusted
+position where it was, or clamped: the position is pulled back along the
+reported direction to the allowed distance and becomes the trusted one.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from wire.epoch import heartbeat_ms
+from wire.session_codec import (
+    FLAG_HAS_POSITION,
+    RESOURCE_STEP,
+    SLOT_MASK,
+    SessionBatchView,
+)
+
+DODGE_DISTANCE = 4.0
+DODGE_STAMINA_COST = 20.0
+STAMINA_REGEN_PER_SECOND = 20.0
+
+# Per-update verdict reasons.
+OK = 0
+NOT_CHECKED = 1
+UNKNOWN_SLOT = 2
+SUPERSEDED = 3
+STALE = 4
+TOO_FAST = 5
+REASONS = ("ok", "not_checked", "unknown_slot", "superseded", "stale", "too_fast")
+
+
+@dataclass
+class MovementVerdict:
+    """Per-update validation result, aligned with the input updates.
+
+    Attributes:
+        accepted: True where the reported position was accepted
+        reason: One of the module's reason codes (index into ``REASONS``)
+        distance: Ground distance from the last trusted position (NaN if unchecked)
+        speed: Implied ground speed in m/s (NaN if unchecked)
+        allowed: Largest ground distance the update could cover
+        position: Position to use; clamped where a violation was clamped
+    """
+
+    accepted: np.ndarray
+    reason: np.ndarray
+    distance: np.ndarray
+    speed: np.ndarray
+    allowed: np.ndarray
+    position: np.ndarray
+
+    @property
+    def violations(self) -> np.ndarray:
+        """Mask of updates that moved too fast."""
+        return self.reason == TOO_FAST
+
+    def rejected(self, ids: np.ndarray) -> List[Any]:
+        """Return the IDs (slots or session IDs) of rejected updates."""
+        return np.asarray(ids)[~self.accepted].tolist()
+
+
+class MovementValidator:
+    """Speed checks for one room's session position updates."""
+
+    def __init__(
+        self,
+        sprint_multiplier: float = 1.0,
+        tolerance: float = 0.5,
+        clamp: bool = False,
+        capacity: int = 16,
+        max_jitter_ms: int = 250,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create the validator.
+
+        Args:
+            sprint_multiplier: Allowance over ``move_speed`` for sprinting
+                (the client has no sprint yet, hence 1.0)
+            tolerance: Extra ground distance allowed per update, in metres
+            clamp: Clamp violations to the allowed distance instead of only
+                flagging them
+            capacity: Initial number of slots; grows as slots are joined
+            max_jitter_ms: How much longer than the server-side gap between
+                two updates the client's heartbeat gap may be
+            clock: Server time source for receive times, in seconds
+        """
+        self.sprint_multiplier = sprint_multiplier
+        self.tolerance = tolerance
+        self.clamp = clamp
+        self.max_jitter_ms = max_jitter_ms
+        self._clock = clock
+        self._speed = np.full(capacity, np.nan)
+        self._max_stamina = np.zeros(capacity)
+        self._position = np.zeros((capacity, 3))
+        self._at_ms = np.zeros(capacity, dtype=np.int64)
+        self._received_ms = np.zeros(capacity, dtype=np.int64)
+        self._stamina = np.zeros(capacity)
+        self._placed = np.zeros(capacity, dtype=bool)
+        self.violations = 0
+
+    def join(
+        self,
+        slot: int,
+        move_speed: float,
+        session: Any = None,
+        max_stamina: float = 100.0,
+    ) -> None:
+        """Start tracking a slot.
+
+        Args:
+            slot: The session's per-room slot
+            move_speed: The player's ``CombatStats.move_speed``
+            session: Optional joining session whose position, stamina and
+                heartbeat become the first trusted state
+            max_stamina: The player's ``CombatStats.max_stamina``
+        """
+        if slot >= len(self._speed):
+            self._grow(slot + 1)
+        self._speed[slot] = move_speed
+        self._max_stamina[slot] = max_stamina
+        self._placed[slot] = False
+        if session is not None:
+            x, y, z = session.position_x, session.position_y, session.position_z
+            at_ms = heartbeat_ms(session)
+            if x is not None and y is not None and z is not None and at_ms:
+                self._position[slot] = (x, y, z)
+                self._at_ms[slot] = at_ms
+                self._received_ms[slot] = self._now_ms()
+                self._stamina[slot] = min(session.current_stamina, max_stamina)
+                self._placed[slot] = True
+
+    def leave(self, slot: int) -> None:
+        """Stop tracking a slot."""
+        if slot < len(self._speed):
+            self._speed[slot] = np.nan
+            self._placed[slot] = False
+
+    def validate(
+        self,
+        slot: np.ndarray,
+        position: np.ndarray,
+        stamina: np.ndarray,
+        at_ms: np.ndarray,
+        has_position: Optional[np.ndarray] = None,
+        received_ms: Any = None,
+    ) -> MovementVerdict:
+        """Check a tick's position updates and advance the trusted state.
+
+        When a slot appears more than once, only its last update is checked;
+        the earlier ones are ``SUPERSEDED``. A slot's first position is
+        accepted as is.
+
+        Args:
+            slot: Per-room slot of each update
+            position: ``(n, 3)`` reported x/y/z positions
+            stamina: Reported ``current_stamina``
+            at_ms: Heartbeat of each update, in epoch milliseconds
+            has_position: False where the update carries no position
+            received_ms: When the server received each update (or all of
+                them), in milliseconds on ``clock``; defaults to now
+        """
+        slot = np.asarray(slot, dtype=np.int64)
+        position = np.asarray(position, dtype=np.float64).reshape(-1, 3)
+        stamina = np.asarray(stamina, dtype=np.float64)
+        at_ms = np.asarray(at_ms, dtype=np.int64)
+        n = len(slot)
+        if received_ms is None:
+            received_ms = self._now_ms()
+        received_ms = np.broadcast_to(np.asarray(received_ms, dtype=np.int64), n)
+        if has_position is None:
+            has_position = np.ones(n, dtype=bool)
+
+        reason = np.full(n, NOT_CHECKED, dtype=np.int8)
+        known = slot < len(self._speed)
+        known[known] = ~np.isnan(self._speed[slot[known]])
+        reason[has_position & ~known] = UNKNOWN_SLOT
+        latest = np.zeros(n, dtype=bool)
+        _, last = np.unique(slot[::-1], return_index=True)
+        latest[n - 1 - last] = True
+        reason[has_position & known & ~latest] = SUPERSEDED
+        live = has_position & known & latest
+        rows = slot[live]
+
+        placed = self._placed[rows]
+        claimed = (at_ms[live] - self._at_ms[rows]) / 1000.0
+        elapsed = (
+            received_ms[live] - self._received_ms[rows] + self.max_jitter_ms
+        ) / 1000.0
+        dt = np.maximum(np.minimum(claimed, elapsed), 0.0)
+        step = position[live] - self._position[rows]
+        distance = np.hypot(step[:, 0], step[:, 2])
+        budget = np.where(
+            placed,
+            np.minimum(
+                self._max_stamina[rows],
+                self._stamina[rows] + STAMINA_REGEN_PER_SECOND * dt,
+            ),
+            self._max_stamina[rows],
+        )
+        spent_to = np.clip(stamina[live], 0.0, budget)
+        dodges = np.floor((budget - spent_to) / DODGE_STAMINA_COST + 1e-9)
+        allowed = (
+            self._speed[rows] * self.sprint_multiplier * dt
+            + dodges * DODGE_DISTANCE
+            + self.tolerance
+        )
+        stale = placed & (claimed < 0)
+        fast = placed & ~stale & (distance > allowed)
+        verdict = np.where(stale, STALE, np.where(fast, TOO_FAST, OK))
+        reason[live] = verdict
+
+        corrected = position.copy()
+        trusted = verdict == OK
+        if self.clamp:
+            scale = allowed[fast] / distance[fast]
+            clamped = position[live][fast].copy()
+            clamped[:, [0, 2]] = (
+                self._position[rows[fast]][:, [0, 2]]
+                + step[fast][:, [0, 2]] * scale[:, None]
+            )
+            corrected[np.flatnonzero(live)[fast]] = clamped
+            trusted |= fast
+        moved = rows[trusted]
+        self._position[moved] = corrected[live][trusted]
+        self._at_ms[moved] = at_ms[live][trusted]
+        self._received_ms[moved] = received_ms[live][trusted]
+        self._stamina[moved] = spent_to[trusted]
+        self._placed[moved] = True
+        self.violations += int(fast.sum())
+
+        out_distance = np.full(n, np.nan)
+        out_speed = np.full(n, np.nan)
+        out_allowed = np.full(n, np.nan)
+        checked = np.flatnonzero(live)[placed & ~stale]
+        out_distance[checked] = distance[placed & ~stale]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out_speed[checked] = (distance / dt)[placed & ~stale]
+        out_allowed[checked] = allowed[placed & ~stale]
+        return MovementVerdict(
+            accepted=(reason == OK) | (reason == NOT_CHECKED),
+            reason=reason,
+            distance=out_distance,
+            speed=out_speed,
+            allowed=out_allowed,
+            position=corrected,
+        )
+
+    def validate_batch(
+        self, batch: SessionBatchView, received_ms: Optional[int] = None
+    ) -> MovementVerdict:
+        """Check every record of a decoded wire batch, without copying it."""
+        records = batch.as_array()
+        flags = records["slot_flags"]
+        return self.validate(
+            flags & SLOT_MASK,
+            batch.positions(),
+            records["current_stamina"] * RESOURCE_STEP,
+            batch.base_heartbeat_ms - records["heartbeat_age_ms"].astype(np.int64),
+            (flags & FLAG_HAS_POSITION) != 0,
+            received_ms,
+        )
+
+    def validate_sessions(
+        self,
+        sessions: Iterable[Any],
+        slots: Mapping[str, int],
+        received_ms: Any = None,
+    ) -> MovementVerdict:
+        """Check ``PlayerSession`` (or compact/epoch session) updates.
+
+        Args:
+            sessions: Updated sessions, in arrival order
+            slots: Mapping of session_id to its per-room slot number
+            received_ms: Server receive times, as for ``validate``
+        """
+        sessions = list(sessions)
+        position = np.array(
+            [
+                (
+                    np.nan if s.position_x is None else s.position_x,
+                    np.nan if s.position_y is None else s.position_y,
+                    np.nan if s.position_z is None else s.position_z,
+                )
+                for s in sessions
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        return self.validate(
+            np.array([slots[s.session_id] for s in sessions], dtype=np.int64),
+            position,
+            np.array([s.current_stamina for s in sessions], dtype=np.float64),
+            np.array([heartbeat_ms(s) or 0 for s in sessions], dtype=np.int64),
+            ~np.isnan(position).any(axis=1),
+            received_ms,
+        )
+
+    def _now_ms(self) -> int:
+        return int(self._clock() * 1000)
+
+    def _grow(self, size: int) -> None:
+        capacity = max(size, 2 * len(self._speed))
+        extra = capacity - len(self._speed)
+        self._speed = np.concatenate((self._speed, np.full(extra, np.nan)))
+        self._max_stamina = np.concatenate((self._max_stamina, np.zeros(extra)))
+        self._position = np.concatenate((self._position, np.zeros((extra, 3))))
+        self._at_ms = np.concatenate((self._at_ms, np.zeros(extra, dtype=np.int64)))
+        self._received_ms = np.concatenate(
+            (self._received_ms, np.zeros(extra, dtype=np.int64))
+        )
+        self._stamina = np.concatenate((self._stamina, np.zeros(extra)))
+        self._placed = np.concatenate((self._placed, np.zeros(extra, dtype=bool)))
@@ -0,0 +1,37 @@
+"""Server-side runtime state for live rooms and sessions."""
+
+from .compact import CompactCombatEvent, CompactPlayerSession
+from .event_ingest import EventIngest, IngestedEventLog
+from .event_ring import EventRing, RecentEvents
+from .heartbeat import HeartbeatMonitor, TimerWheel
+from .interest import InterestGrid, RoomGrid
+from .position_history import PositionHistory, Rewind
+from .replay import RoomReplayer
+from .room_engine import EventLogGap, LiveRoom, RoomEngine
+from .stores import RoomEventStore, SessionStore
+from .tick import TickLoop, TickStats
+from .write_behind import WriteBehindSessionStore
+
+__all__ = [
+    "CompactCombatEvent",
+    "CompactPlayerSession",
+    "EventIngest",
+    "EventLogGap",
+    "EventRing",
+    "HeartbeatMonitor",
+    "IngestedEventLog",
+    "InterestGrid",
+    "LiveRoom",
+    "PositionHistory",
+    "RoomEngine",
+    "RecentEvents",
+    "Rewind",
+    "RoomEventStore",
+    "RoomReplayer",
+    "RoomGrid",
+    "SessionStore",
+    "TickLoop",
+    "TickStats",
+    "TimerWheel",
+    "WriteBehindSessionStore",
+]
@@ -0,0 +1,123 @@
+"""Compact runtime representations of hot session models.
+
+The generated Pydantic models carry per-instance ``__dict__`` and
+``__pydantic_fields_set__`` storage, which adds up quickly when a server keeps
+hundreds of thousands of sessions and events resident. The slotted dataclasses
+here hold exactly the same fields with no per-instance dictionaries.
+
+Validation happens once at the API boundary on the Pydantic model. Converting
+to the compact form copies attribute references, and converting back uses
+``model_construct`` so already-validated data is not validated twice.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from models import CombatEvent, PlayerSession
+
+
+@dataclass(slots=True)
+class CompactPlayerSession:
+    """Slotted in-memory counterpart of ``PlayerSession``."""
+
+    session_id: str
+    player_id: str
+    character_name: str
+    room_id: Optional[str]
+    combat_stats_id: str
+    current_health: float
+    current_mana: float
+    current_stamina: float
+    position_x: Optional[float]
+    position_y: Optional[float]
+    position_z: Optional[float]
+    is_alive: bool
+    last_heartbeat: datetime
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, model: PlayerSession) -> "CompactPlayerSession":
+        """Build a compact session from a validated ``PlayerSession``."""
+        return cls(
+            model.session_id,
+            model.player_id,
+            model.character_name,
+            model.room_id,
+            model.combat_stats_id,
+            model.current_health,
+            model.current_mana,
+            model.current_stamina,
+            model.position_x,
+            model.position_y,
+            model.position_z,
+            model.is_alive,
+            model.last_heartbeat,
+            model.created_at,
+            model.updated_at,
+        )
+
+    def to_model(self) -> PlayerSession:
+        """Rebuild the ``PlayerSession`` without re-running validation."""
+        return PlayerSession.model_construct(
+            **{name: getattr(self, name) for name in _SESSION_FIELDS}
+        )
+
+
+@dataclass(slots=True)
+class CompactCombatEvent:
+    """Slotted in-memory counterpart of ``CombatEvent``."""
+
+    event_id: str
+    room_id: str
+    event_type: str
+    timestamp: datetime
+    source_player_id: Optional[str]
+    source_enemy_id: Optional[str]
+    target_player_id: Optional[str]
+    target_enemy_id: Optional[str]
+    ability_id: Optional[str]
+    damage_amount: Optional[float]
+    is_critical: Optional[bool]
+    item_id: Optional[str]
+    item_quantity: Optional[int]
+    position_x: Optional[float]
+    position_y: Optional[float]
+    position_z: Optional[float]
+    metadata: Optional[Dict[str, Any]]
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, model: CombatEvent) -> "CompactCombatEvent":
+        """Build a compact event from a validated ``CombatEvent``."""
+        return cls(
+            model.event_id,
+            model.room_id,
+            model.event_type,
+            model.timestamp,
+            model.source_player_id,
+            model.source_enemy_id,
+            model.target_player_id,
+            model.target_enemy_id,
+            model.ability_id,
+            model.damage_amount,
+            model.is_critical,
+            model.item_id,
+            model.item_quantity,
+            model.position_x,
+            model.position_y,
+            model.position_z,
+            model.metadata,
+            model.created_at,
+        )
+
+    def to_model(self) -> CombatEvent:
+        """Rebuild the ``CombatEvent`` without re-running validation."""
+        return CombatEvent.model_construct(
+            **{name: getattr(self, name) for name in _EVENT_FIELDS}
+        )
+
+
+_SESSION_FIELDS = tuple(f.name for f in fields(CompactPlayerSession))
+_EVENT_FIELDS = tuple(f.name for f in fields(CompactCombatEvent))
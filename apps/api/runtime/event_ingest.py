@@ -0,0 +1,268 @@
+"""Batched, asynchronous ingest of combat events into ``CombatEventsTable``.
+
+Writing every event as it arrives costs one DynamoDB request per event.
+``EventIngest`` buffers submitted events per room and writes them in
+``BatchWriteItem`` groups of up to 25: a room's full groups go out as soon as
+they fill up, and everything else is flushed every ``flush_interval``
+seconds, with partial groups from different rooms packed together. Writes
+run in a worker thread so the event loop never blocks on DynamoDB. An event
+submitted with its room log sequence number is stored with ``event_seq``, so
+room log appends can go through the same pipeline: ``IngestedEventLog`` is a
+``RoomEventLog`` whose appends are buffered here instead of being written
+one ``PutItem`` at a time on the event loop.
+
+The buffer is bounded. When it holds ``max_pending`` events, new events are
+rejected and counted as dropped instead of growing server memory; events
+the writer could not store after its retries are counted the same way.
+Events superseded within a batch by a later event with the same
+``(room_id, event_id)`` key are written once and counted as deduped. A
+write that raises is logged and its events go back to the front of their
+rooms' buffers for the next flush.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from models import CombatEvent
+from storage.event_table import EventWriter, LoggedEvent
+from storage.room_table import RoomEventLog
+from storage.session_table import BATCH_WRITE_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the flush-latency histogram buckets, in milliseconds.
+FLUSH_BUCKETS_MS = (5.0, 10.0, 20.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+
+class IngestStats:
+    """Ingest counters and a histogram of per-batch flush latency."""
+
+    def __init__(self, buckets_ms: Sequence[float] = FLUSH_BUCKETS_MS) -> None:
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.submitted = 0
+        self.written = 0
+        self.deduped = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        """Record how long one batch took to write."""
+        self.counts[bisect.bisect_left(self.buckets_ms, duration_ms)] += 1
+        self.batches += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters and histogram (``le`` bucket bounds in ms)."""
+        bounds = [str(b) for b in self.buckets_ms] + ["+Inf"]
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "deduped": self.deduped,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_flush_ms": self.total_ms / self.batches if self.batches else 0.0,
+            "max_flush_ms": self.max_ms,
+            "flush_histogram_ms": dict(zip(bounds, self.counts)),
+        }
+
+
+class EventIngest:
+    """Per-room event buffers flushed to an ``EventWriter`` in batches."""
+
+    def __init__(
+        self,
+        writer: EventWriter,
+        flush_interval: float = 0.5,
+        max_pending: int = 10_000,
+        batch_size: int = BATCH_WRITE_LIMIT,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Create the pipeline.
+
+        Args:
+            writer: Destination for event batches
+            flush_interval: Maximum seconds an event waits in the buffer
+            max_pending: Buffered events beyond which new events are dropped
+            batch_size: Events per write (at most ``BatchWriteItem``'s 25)
+            clock: Time source for flush latency, in seconds
+        """
+        self._writer = writer
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = min(batch_size, BATCH_WRITE_LIMIT)
+        self._clock = clock
+        self._rooms: Dict[str, List[LoggedEvent]] = {}
+        self._depth = 0
+        self._full = asyncio.Event()
+        self.stats = IngestStats()
+
+    @property
+    def depth(self) -> int:
+        """Number of buffered events."""
+        return self._depth
+
+    def submit(self, event: CombatEvent, seq: Optional[int] = None) -> bool:
+        """Buffer an event for writing.
+
+        Args:
+            event: Event to write
+            seq: The event's number in its room's log, if it is logged
+
+        Returns:
+            False if the buffer is full and the event was dropped
+        """
+        self.stats.submitted += 1
+        if self._depth >= self.max_pending:
+            self.stats.dropped += 1
+            return False
+        pending = self._rooms.setdefault(event.room_id, [])
+        pending.append((seq, event))
+        self._depth += 1
+        if len(pending) >= self.batch_size:
+            self._full.set()
+        return True
+
+    def take(self, everything: bool = True) -> List[List[LoggedEvent]]:
+        """Remove buffered events from the buffer as write batches.
+
+        Args:
+            everything: Also take partial batches (packed across rooms);
+                otherwise only rooms' full batches are taken
+        """
+        size = self.batch_size
+        batches: List[List[LoggedEvent]] = []
+        leftover: List[LoggedEvent] = []
+        for room_id in list(self._rooms):
+            pending = self._rooms[room_id]
+            full = len(pending) - len(pending) % size
+            batches.extend(pending[i : i + size] for i in range(0, full, size))
+            if everything:
+                leftover.extend(pending[full:])
+                del self._rooms[room_id]
+            elif full == len(pending):
+                del self._rooms[room_id]
+            else:
+                self._rooms[room_id] = pending[full:]
+        batches.extend(leftover[i : i + size] for i in range(0, len(leftover), size))
+        self._depth -= sum(len(batch) for batch in batches)
+        self._full.clear()
+        return batches
+
+    async def flush(self, everything: bool = True) -> int:
+        """Write buffered events and return how many were stored.
+
+        Args:
+            everything: Flush partial batches too, not just full ones
+        """
+        written = 0
+        batches = self.take(everything)
+        for index, batch in enumerate(batches):
+            start = self._clock()
+            write = asyncio.ensure_future(asyncio.to_thread(self._writer.write, batch))
+            try:
+                failed = await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # The batch is already being written in its thread: wait for it
+                # so it is accounted for, keep the rest buffered and stop.
+                for unsent in reversed(batches[index + 1 :]):
+                    self._requeue(unsent)
+                self._account(batch, await write, start)
+                raise
+            except Exception:
+                self.stats.errors += 1
+                for unsent in reversed(batches[index:]):
+                    self._requeue(unsent)
+                raise
+            written += self._account(batch, failed, start)
+        return written
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the ingest metrics including the current queue depth."""
+        return {"queue_depth": self._depth, **self.stats.snapshot()}
+
+    async def run(self) -> None:
+        """Flush full batches promptly and everything else on the interval.
+
+        Runs until cancelled, then flushes whatever is still buffered.
+        """
+        deadline = self._clock() + self.flush_interval
+        try:
+            while True:
+                remaining = deadline - self._clock()
+                try:
+                    await asyncio.wait_for(
+                        self._full.wait(), timeout=max(0.0, remaining)
+                    )
+                    everything = False
+                except asyncio.TimeoutError:
+                    everything = True
+                    deadline = self._clock() + self.flush_interval
+                try:
+                    await self.flush(everything)
+                except Exception:
+                    # The events were requeued and go out with the next flush.
+                    logger.exception("Combat event flush failed")
+        finally:
+            await self.flush()
+
+    def _account(
+        self, batch: List[LoggedEvent], failed: List[LoggedEvent], start: float
+    ) -> int:
+        self.stats.record((self._clock() - start) * 1000)
+        # The writer sends each key of a batch once; the last event wins.
+        unique = len({(event.room_id, event.event_id) for _, event in batch})
+        written = unique - len(failed)
+        self.stats.written += written
+        self.stats.deduped += len(batch) - unique
+        self.stats.dropped += len(failed)
+        return written
+
+    def _requeue(self, batch: List[LoggedEvent]) -> None:
+        # Back to the front of each room's buffer, keeping arrival order.
+        by_room: Dict[str, List[LoggedEvent]] = {}
+        for seq, event in batch:
+            by_room.setdefault(event.room_id, []).append((seq, event))
+        for room_id, events in by_room.items():
+            self._rooms[room_id] = events + self._rooms.get(room_id, [])
+        self._depth += len(batch)
+
+
+class IngestedEventLog:
+    """Room event log whose appends are batched through an ``EventIngest``.
+
+    Appends return at once; the events reach the table with the ingest's next
+    flush, so a crash loses at most ``flush_interval`` seconds of events.
+    Reads go to the durable log.
+    """
+
+    def __init__(self, ingest: EventIngest, log: RoomEventLog) -> None:
+        """Create the log.
+
+        Args:
+            ingest: Pipeline the appended events are submitted to
+            log: Durable log that ``since`` reads from
+        """
+        self._ingest = ingest
+        self._log = log
+
+    def append(self, event: CombatEvent, seq: int) -> None:
+        """Buffer an event for the next flush."""
+        if not self._ingest.submit(event, seq):
+            logger.warning(
+                "Event buffer full, event %s of room %s not logged",
+                seq,
+                event.room_id,
+            )
+
+    def since(self, room_id: str, seq: int) -> List[Tuple[int, CombatEvent]]:
+        """Return the durably logged events after ``seq``."""
+        return self._log.since(room_id, seq)
@@ -0,0 +1,130 @@
+"""Recent combat events per room, for reconnect sync.
+
+A reconnecting client sends the sequence number of the last event it saw.
+``RecentEvents`` keeps each room's newest ``capacity`` events in a ring
+buffer indexed by sequence number, so the missed events are a slice of
+memory rather than a ``CombatEventsTable`` query. A client whose sequence
+number has already left the window (or is ahead of the server, e.g. after a
+restart) gets ``None`` and must resync from a room snapshot.
+
+Sequence numbers are the room's event sequence from ``RoomEngine`` (the
+same ``event_seq`` stored with logged events and checkpoints), so they stay
+meaningful across checkpoint recovery.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from models import CombatEvent
+
+from .compact import CompactCombatEvent
+
+
+class EventRing:
+    """Fixed-capacity buffer of one room's most recent events."""
+
+    def __init__(self, capacity: int, last_seq: int = 0) -> None:
+        """Create an empty ring.
+
+        Args:
+            capacity: Maximum number of buffered events
+            last_seq: Sequence number of the room's latest event so far
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._buffer: List[Optional[CompactCombatEvent]] = [None] * capacity
+        self._first = last_seq + 1
+        self.last_seq = last_seq
+
+    def __len__(self) -> int:
+        return self.last_seq - self._first + 1
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest buffered event."""
+        return self._first
+
+    def append(self, event: CombatEvent, seq: Optional[int] = None) -> int:
+        """Buffer an event, overwriting the oldest one when full.
+
+        Args:
+            event: Validated combat event
+            seq: The event's sequence number (default: the next one); only an
+                empty ring may start at an arbitrary number
+
+        Returns:
+            The event's sequence number
+
+        Raises:
+            ValueError: If ``seq`` does not directly follow the last event
+        """
+        if seq is None:
+            seq = self.last_seq + 1
+        elif not len(self):
+            self._first = seq
+        elif seq != self.last_seq + 1:
+            raise ValueError(f"Expected event seq {self.last_seq + 1}, got {seq}")
+        self._buffer[seq % self.capacity] = CompactCombatEvent.from_model(event)
+        self.last_seq = seq
+        self._first = max(self._first, seq - self.capacity + 1)
+        return seq
+
+    def since(self, seq: int) -> Optional[List[Tuple[int, CombatEvent]]]:
+        """Return ``(seq, event)`` pairs after ``seq``, oldest first.
+
+        Returns:
+            The missed events, or None if some of them are no longer buffered
+        """
+        if seq > self.last_seq or seq < self._first - 1:
+            return None
+        return [
+            (s, self._buffer[s % self.capacity].to_model())
+            for s in range(seq + 1, self.last_seq + 1)
+        ]
+
+
+class RecentEvents:
+    """Ring buffers of recent events for every live room."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        """Create the store.
+
+        Args:
+            capacity: Events kept per room
+        """
+        self.capacity = capacity
+        self._rooms: Dict[str, EventRing] = {}
+
+    def __contains__(self, room_id: object) -> bool:
+        return room_id in self._rooms
+
+    def ring(self, room_id: str) -> Optional[EventRing]:
+        """Return a room's ring, or None if the room is not tracked."""
+        return self._rooms.get(room_id)
+
+    def reset(self, room_id: str, last_seq: int = 0) -> EventRing:
+        """Start a room's ring afresh at its current sequence number."""
+        ring = self._rooms[room_id] = EventRing(self.capacity, last_seq)
+        return ring
+
+    def append(self, event: CombatEvent, seq: Optional[int] = None) -> int:
+        """Buffer an event in its room's ring and return its sequence number."""
+        ring = self._rooms.get(event.room_id)
+        if ring is None:
+            ring = self._rooms[event.room_id] = EventRing(self.capacity)
+        return ring.append(event, seq)
+
+    def last_seq(self, room_id: str) -> int:
+        """Sequence number of a room's newest buffered event (0 if none)."""
+        ring = self._rooms.get(room_id)
+        return ring.last_seq if ring is not None else 0
+
+    def since(self, room_id: str, seq: int) -> Optional[List[Tuple[int, CombatEvent]]]:
+        """Return a room's events after ``seq``, or None if a snapshot is needed."""
+        ring = self._rooms.get(room_id)
+        return ring.since(seq) if ring is not None else None
+
+    def drop_room(self, room_id: str) -> int:
+        """Forget a room's events and return how many were buffered."""
+        ring = self._rooms.pop(room_id, None)
+        return len(ring) if ring is not None else 0
@@ -0,0 +1,168 @@
+"""Heartbeat tracking and disconnect detection.
+
+Clients send a heartbeat every 10 seconds. Instead of scanning or querying
+``PlayerSession.last_heartbeat`` for stale sessions, ``HeartbeatMonitor``
+keeps each session's expiry in a ``TimerWheel``: a heartbeat moves the
+session to a new slot in O(1), and advancing the wheel only looks at the
+slots whose time has come. Sessions that miss their deadline are handed to
+the registered disconnect handlers.
+
+Heartbeats are not written one by one. With a ``WriteBehindSessionStore``
+attached, each one updates the in-memory session and marks it dirty, and
+``last_heartbeat`` reaches the table with the store's next batched flush.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from .write_behind import WriteBehindSessionStore
+
+logger = logging.getLogger(__name__)
+
+DisconnectHandler = Callable[[str], None]
+
+
+class TimerWheel:
+    """Hashed timing wheel of one-shot deadlines keyed by ID.
+
+    Deadlines are rounded up to ``resolution`` seconds and hashed into
+    ``slots`` buckets; a deadline further out than one turn of the wheel
+    stays in its bucket until a later turn reaches it. Timers never fire
+    early and fire at most one ``resolution`` late.
+    """
+
+    def __init__(self, resolution: float = 1.0, slots: int = 512, start: float = 0.0):
+        """Create the wheel.
+
+        Args:
+            resolution: Seconds per slot
+            slots: Number of slots in one turn of the wheel
+            start: Current time, in seconds
+        """
+        self.resolution = resolution
+        self._slots: List[Dict[str, int]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[str, int] = {}
+        self._tick = math.floor(start / resolution)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """Set (or move) a key's deadline, in seconds."""
+        self.cancel(key)
+        tick = max(math.ceil(deadline / self.resolution), self._tick)
+        slot = tick % len(self._slots)
+        self._slots[slot][key] = tick
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str) -> bool:
+        """Remove a key's deadline; return False if it had none."""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self, now: float) -> List[str]:
+        """Move the wheel to ``now`` and return the keys whose deadline passed."""
+        target = math.floor(now / self.resolution)
+        if target < self._tick:
+            return []
+        expired: List[str] = []
+        # After a long pause every slot is visited once rather than every tick.
+        steps = min(target - self._tick + 1, len(self._slots))
+        for step in range(steps):
+            timers = self._slots[(self._tick + step) % len(self._slots)]
+            due = [key for key, tick in timers.items() if tick <= target]
+            for key in due:
+                del timers[key]
+                del self._slot_of[key]
+            expired.extend(due)
+        self._tick = target + 1
+        return expired
+
+
+class HeartbeatMonitor:
+    """Detects sessions that stopped sending heartbeats."""
+
+    def __init__(
+        self,
+        sessions: Optional[WriteBehindSessionStore] = None,
+        timeout: float = 30.0,
+        resolution: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create the monitor.
+
+        Args:
+            sessions: Store whose ``last_heartbeat`` values are kept current
+            timeout: Seconds without a heartbeat before a session is
+                disconnected (three missed 10-second heartbeats by default)
+            resolution: Seconds between expiry checks
+            clock: Monotonic time source, in seconds
+        """
+        self.timeout = timeout
+        self.resolution = resolution
+        self._sessions = sessions
+        self._clock = clock
+        self._wheel = TimerWheel(resolution, start=clock())
+        self._handlers: List[DisconnectHandler] = []
+        self.heartbeats = 0
+        self.disconnects = 0
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._wheel
+
+    def on_disconnect(self, handler: DisconnectHandler) -> DisconnectHandler:
+        """Register a handler called with the ID of each expired session."""
+        self._handlers.append(handler)
+        return handler
+
+    def heartbeat(self, session_id: str, at: Optional[datetime] = None) -> None:
+        """Record a heartbeat and push the session's expiry back.
+
+        Args:
+            session_id: Session that sent the heartbeat
+            at: Heartbeat time stored as ``last_heartbeat`` (defaults to now)
+        """
+        self.heartbeats += 1
+        self._wheel.schedule(session_id, self._clock() + self.timeout)
+        if self._sessions is not None:
+            self._sessions.touch(session_id, at or datetime.now(timezone.utc))
+
+    def forget(self, session_id: str) -> None:
+        """Stop tracking a session that left cleanly."""
+        self._wheel.cancel(session_id)
+
+    def expire(self) -> List[str]:
+        """Disconnect every session whose timeout has passed.
+
+        Returns:
+            IDs of the expired sessions
+        """
+        expired = self._wheel.advance(self._clock())
+        self.disconnects += len(expired)
+        for session_id in expired:
+            for handler in self._handlers:
+                try:
+                    handler(session_id)
+                except Exception:
+                    # One failing handler must not keep the others from running.
+                    logger.exception("Disconnect handler failed for %s", session_id)
+        return expired
+
+    async def run(self) -> None:
+        """Check for expired sessions every ``resolution`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.resolution)
+            self.expire()
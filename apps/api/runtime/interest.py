@@ -0,0 +1,194 @@
+"""Spatial interest management for position broadcasts.
+
+Sending every player's position to every other player in a room is O(n²) in
+records per tick. ``InterestGrid`` buckets each room's players into square
+cells over ``position_x``/``position_z`` so a client's interest set (the
+players within ``radius`` of it) is found by looking at neighbouring cells
+only, and each client's position batch carries just those players.
+
+Players without a position (or room) are left out of the grid: they neither
+receive a position batch nor appear in anyone else's.
+"""
+
+import math
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from wire.session_codec import DEFAULT_BOUNDS, Bounds, join_batch, pack_records
+
+Cell = Tuple[int, int]
+
+
+class RoomGrid:
+    """Uniform grid of one room's player positions."""
+
+    def __init__(self, cell_size: float) -> None:
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[str]] = {}
+        self._positions: Dict[str, Tuple[float, float, Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._positions
+
+    def _cell(self, x: float, z: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(z / self.cell_size))
+
+    def move(self, session_id: str, x: float, z: float) -> None:
+        """Insert a player or update its position."""
+        cell = self._cell(x, z)
+        previous = self._positions.get(session_id)
+        if previous is not None and previous[2] != cell:
+            self._discard(session_id, previous[2])
+        if previous is None or previous[2] != cell:
+            self._cells.setdefault(cell, set()).add(session_id)
+        self._positions[session_id] = (x, z, cell)
+
+    def remove(self, session_id: str) -> None:
+        """Remove a player; unknown IDs are ignored."""
+        previous = self._positions.pop(session_id, None)
+        if previous is not None:
+            self._discard(session_id, previous[2])
+
+    def near(self, x: float, z: float, radius: float) -> List[str]:
+        """Return the players within ``radius`` of a point."""
+        reach = math.ceil(radius / self.cell_size)
+        cx, cz = self._cell(x, z)
+        limit = radius * radius
+        found = []
+        for ix in range(cx - reach, cx + reach + 1):
+            for iz in range(cz - reach, cz + reach + 1):
+                for other in self._cells.get((ix, iz), ()):
+                    ox, oz, _ = self._positions[other]
+                    if (ox - x) ** 2 + (oz - z) ** 2 <= limit:
+                        found.append(other)
+        return found
+
+    def interest(self, session_id: str, radius: float) -> List[str]:
+        """Return the other players within ``radius`` of a player."""
+        position = self._positions.get(session_id)
+        if position is None:
+            return []
+        return [
+            other
+            for other in self.near(position[0], position[1], radius)
+            if other != session_id
+        ]
+
+    def interest_sets(self, radius: float) -> Dict[str, FrozenSet[str]]:
+        """Return every player's interest set."""
+        return {
+            session_id: frozenset(self.interest(session_id, radius))
+            for session_id in self._positions
+        }
+
+    def _discard(self, session_id: str, cell: Cell) -> None:
+        members = self._cells[cell]
+        members.discard(session_id)
+        if not members:
+            del self._cells[cell]
+
+
+class InterestGrid:
+    """Per-room spatial grids and interest-filtered position batches."""
+
+    def __init__(self, radius: float = 20.0, cell_size: Optional[float] = None) -> None:
+        """Create the grid.
+
+        Args:
+            radius: Distance within which players receive each other's positions
+            cell_size: Grid cell edge length (defaults to ``radius``)
+        """
+        self.radius = radius
+        self.cell_size = cell_size or radius
+        self._rooms: Dict[str, RoomGrid] = {}
+        self._room_of: Dict[str, str] = {}
+
+    def room(self, room_id: str) -> Optional[RoomGrid]:
+        """Return a room's grid, or None if it has no positioned players."""
+        return self._rooms.get(room_id)
+
+    def update(self, session: Any) -> None:
+        """Track a session's room and position.
+
+        Args:
+            session: ``PlayerSession``, ``EpochPlayerSession`` or
+                ``CompactPlayerSession``
+        """
+        session_id = session.session_id
+        previous_room = self._room_of.get(session_id)
+        if previous_room is not None and previous_room != session.room_id:
+            self.remove(session_id)
+        x, z = session.position_x, session.position_z
+        if session.room_id is None or x is None or z is None:
+            self.remove(session_id)
+            return
+        grid = self._rooms.get(session.room_id)
+        if grid is None:
+            grid = self._rooms[session.room_id] = RoomGrid(self.cell_size)
+        grid.move(session_id, x, z)
+        self._room_of[session_id] = session.room_id
+
+    def update_all(self, sessions: Iterable[Any]) -> None:
+        """Track a batch of sessions."""
+        for session in sessions:
+            self.update(session)
+
+    def remove(self, session_id: str) -> None:
+        """Stop tracking a session."""
+        room_id = self._room_of.pop(session_id, None)
+        if room_id is None:
+            return
+        grid = self._rooms[room_id]
+        grid.remove(session_id)
+        if not len(grid):
+            del self._rooms[room_id]
+
+    def interest_sets(self, room_id: str) -> Dict[str, FrozenSet[str]]:
+        """Return each positioned player's interest set in a room."""
+        grid = self._rooms.get(room_id)
+        return grid.interest_sets(self.radius) if grid is not None else {}
+
+    def position_batches(
+        self,
+        room_id: str,
+        sessions: Mapping[str, Any],
+        slots: Mapping[str, int],
+        bounds: Bounds = DEFAULT_BOUNDS,
+    ) -> Dict[str, bytes]:
+        """Encode each client's position batch with only the players it can see.
+
+        Each session's record is packed once per call and the batches are
+        assembled from those records. Clients with identical interest sets
+        share one buffer, so the broadcast hub can queue the same frame
+        object for all of them.
+
+        Args:
+            room_id: Room to build batches for
+            sessions: session_id -> latest session state
+            slots: session_id -> per-room slot number
+            bounds: The room's bounds, which positions are quantized over
+
+        Returns:
+            session_id -> encoded ``wire.session_codec`` batch; clients with an
+            empty interest set are omitted
+        """
+        interest_sets = self.interest_sets(room_id)
+        if not interest_sets:
+            return {}
+        base, records = pack_records(
+            (sessions[session_id] for session_id in interest_sets), slots, bounds
+        )
+        encoded: Dict[FrozenSet[str], bytes] = {}
+        batches = {}
+        for session_id, interest in interest_sets.items():
+            if not interest:
+                continue
+            frame = encoded.get(interest)
+            if frame is None:
+                frame = encoded[interest] = join_batch(
+                    base, [records[other] for other in sorted(interest)]
+                )
+            batches[session_id] = frame
+        return batches
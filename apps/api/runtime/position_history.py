@@ -0,0 +1,234 @@
+"""Recent positions per entity, for lag-compensated hit validation.
+
+A client reports a hit at the time it saw it, which is up to one round trip
+behind the server. To check the hit, the server needs where the target was
+at that time. ``PositionHistory`` keeps each player's and enemy's newest
+``capacity`` position samples in a ring buffer: one row of a shared
+``(entities, capacity)`` timestamp array and ``(entities, capacity, 3)``
+position array, so memory per entity is fixed and a tick's worth of samples
+or hit lookups is a handful of array operations.
+
+Timestamps are epoch milliseconds, as in the wire format and
+``MovementValidator``. A lookup between two samples interpolates linearly; a
+lookup outside the buffered window holds the oldest or newest sample and is
+reported as out of window. ``max_rewind_ms`` bounds how far back a client may
+claim to have seen a target.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class Rewind:
+    """Positions looked up for a batch of queries, aligned with the input.
+
+    Attributes:
+        position: ``(n, 3)`` positions; NaN where the entity has no samples
+        found: True where the entity is tracked and has at least one sample
+        in_window: True where the query time was within the buffered samples
+        at_ms: Query times after clamping to the allowed rewind window
+    """
+
+    position: np.ndarray
+    found: np.ndarray
+    in_window: np.ndarray
+    at_ms: np.ndarray
+
+
+class PositionHistory:
+    """Fixed-size, array-backed position ring buffers per entity."""
+
+    def __init__(
+        self,
+        capacity: int = 32,
+        max_rewind_ms: Optional[int] = 500,
+        entities: int = 16,
+    ) -> None:
+        """Create an empty history.
+
+        Args:
+            capacity: Samples kept per entity (at 20 Hz, 32 covers 1.6 s)
+            max_rewind_ms: Furthest a lookup may reach behind ``now_ms``;
+                None for no limit
+            entities: Initial number of entity rows; grows as entities are added
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.max_rewind_ms = max_rewind_ms
+        self._times = np.zeros((entities, capacity), dtype=np.int64)
+        self._positions = np.zeros((entities, capacity, 3))
+        self._head = np.zeros(entities, dtype=np.int64)
+        self._count = np.zeros(entities, dtype=np.int64)
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = list(range(entities - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._rows
+
+    def row(self, entity_id: str) -> int:
+        """Return an entity's row, starting to track it if needed."""
+        row = self._rows.get(entity_id)
+        if row is None:
+            if not self._free:
+                self._grow()
+            row = self._rows[entity_id] = self._free.pop()
+        return row
+
+    def rows(self, entity_ids: Sequence[str]) -> np.ndarray:
+        """Return the rows of tracked entities (-1 for unknown ones)."""
+        rows = self._rows
+        return np.array([rows.get(e, -1) for e in entity_ids], dtype=np.int64)
+
+    def forget(self, entity_id: str) -> None:
+        """Stop tracking an entity and free its row."""
+        row = self._rows.pop(entity_id, None)
+        if row is not None:
+            self._head[row] = self._count[row] = 0
+            self._free.append(row)
+
+    def record(
+        self, entity_id: str, at_ms: int, position: Tuple[float, float, float]
+    ) -> bool:
+        """Add one sample; see ``record_rows``."""
+        recorded = self.record_rows(
+            np.array([self.row(entity_id)]), np.array([at_ms]), np.array([position])
+        )
+        return bool(recorded[0])
+
+    def record_many(
+        self, entity_ids: Sequence[str], at_ms: np.ndarray, positions: np.ndarray
+    ) -> np.ndarray:
+        """Add one sample for each of several entities, tracking new ones."""
+        rows = np.array([self.row(e) for e in entity_ids], dtype=np.int64)
+        return self.record_rows(rows, at_ms, positions)
+
+    def record_rows(
+        self, rows: np.ndarray, at_ms: np.ndarray, positions: np.ndarray
+    ) -> np.ndarray:
+        """Add samples to entity rows, overwriting each row's oldest when full.
+
+        A sample no newer than its entity's latest is ignored.
+
+        Args:
+            rows: Entity rows (each at most once)
+            at_ms: Sample times in epoch milliseconds
+            positions: ``(n, 3)`` x/y/z positions
+
+        Returns:
+            Mask of the samples that were recorded
+
+        Raises:
+            ValueError: If a row appears more than once
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        at_ms = np.asarray(at_ms, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if len(np.unique(rows)) != len(rows):
+            raise ValueError("Each entity may be recorded at most once per call")
+        head = self._head[rows]
+        latest = self._times[rows, (head - 1) % self.capacity]
+        newer = (self._count[rows] == 0) | (at_ms > latest)
+        rows, head = rows[newer], head[newer]
+        self._times[rows, head] = at_ms[newer]
+        self._positions[rows, head] = positions[newer]
+        self._head[rows] = (head + 1) % self.capacity
+        self._count[rows] = np.minimum(self._count[rows] + 1, self.capacity)
+        return newer
+
+    def at(
+        self, entity_id: str, at_ms: int, now_ms: Optional[int] = None
+    ) -> Optional[Tuple[float, float, float]]:
+        """Return where an entity was at a time, or None if it has no samples."""
+        rewind = self.lookup_rows(self.rows([entity_id]), [at_ms], now_ms)
+        if not rewind.found[0]:
+            return None
+        x, y, z = rewind.position[0].tolist()
+        return x, y, z
+
+    def lookup(
+        self,
+        entity_ids: Sequence[str],
+        at_ms: np.ndarray,
+        now_ms: Optional[int] = None,
+    ) -> Rewind:
+        """Rewind several entities at once; see ``lookup_rows``."""
+        return self.lookup_rows(self.rows(entity_ids), at_ms, now_ms)
+
+    def lookup_rows(
+        self, rows: np.ndarray, at_ms: np.ndarray, now_ms: Optional[int] = None
+    ) -> Rewind:
+        """Return each entity's interpolated position at its query time.
+
+        Rows may repeat (several hits on one target) and may be -1 for
+        untracked entities.
+
+        Args:
+            rows: Entity rows from ``rows``/``row``
+            at_ms: Claimed times of the queries, in epoch milliseconds
+            now_ms: Server time; claims are clamped to
+                ``[now_ms - max_rewind_ms, now_ms]``
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        at_ms = np.asarray(at_ms, dtype=np.int64)
+        if now_ms is not None:
+            floor = (
+                now_ms - self.max_rewind_ms if self.max_rewind_ms is not None else None
+            )
+            at_ms = np.clip(at_ms, floor, now_ms)
+        n = len(rows)
+        position = np.full((n, 3), np.nan)
+        in_window = np.zeros(n, dtype=bool)
+        found = rows >= 0
+        found[found] = self._count[rows[found]] > 0
+        r, q = rows[found], at_ms[found]
+
+        # Each row's samples in time order, padded past its count.
+        count = self._count[r][:, None]
+        k = np.arange(self.capacity)
+        order = (self._head[r][:, None] - count + k) % self.capacity
+        times = np.where(
+            k < count, self._times[r[:, None], order], np.iinfo(np.int64).max
+        )
+        after = (times <= q[:, None]).sum(axis=1)
+        last = count[:, 0] - 1
+        lo = np.clip(after - 1, 0, last)
+        hi = np.minimum(after, last)
+        line = np.arange(len(r))
+        t0, t1 = times[line, lo], times[line, hi]
+        p0 = self._positions[r, order[line, lo]]
+        p1 = self._positions[r, order[line, hi]]
+        span = np.where(t1 > t0, t1 - t0, 1)
+        frac = np.clip((q - t0) / span, 0.0, 1.0)[:, None]
+
+        position[found] = p0 + (p1 - p0) * frac
+        in_window[found] = (q >= times[:, 0]) & (q <= times[line, last])
+        return Rewind(position=position, found=found, in_window=in_window, at_ms=at_ms)
+
+    def trail(self, entity_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return an entity's buffered ``(times, positions)``, oldest first."""
+        row = self._rows.get(entity_id)
+        if row is None:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 3))
+        count = self._count[row]
+        order = (self._head[row] - count + np.arange(count)) % self.capacity
+        return self._times[row, order], self._positions[row, order]
+
+    def _grow(self) -> None:
+        size = len(self._head)
+        extra = max(size, 1)
+        self._times = np.concatenate(
+            (self._times, np.zeros((extra, self.capacity), dtype=np.int64))
+        )
+        self._positions = np.concatenate(
+            (self._positions, np.zeros((extra, self.capacity, 3)))
+        )
+        self._head = np.concatenate((self._head, np.zeros(extra, dtype=np.int64)))
+        self._count = np.concatenate((self._count, np.zeros(extra, dtype=np.int64)))
+        self._free.extend(range(size + extra - 1, size - 1, -1))
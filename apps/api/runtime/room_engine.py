@@ -0,0 +1,415 @@
+"""Authoritative in-memory room state.
+
+The server owns each live room's ``RoomState`` in process instead of doing a
+read-modify-write against ``RoomStatesTable`` for every hit. Events for a room
+are applied strictly in arrival order; each is numbered and appended to the
+event log before it changes the state. ``apply`` runs on the event loop (and
+inside ``RoomShard.step``), so the log's ``append`` must not block: in
+production it is a ``runtime.event_ingest.IngestedEventLog``, which buffers
+appends and writes them in batches from a worker thread, with ``event_seq``
+and the ``expires_at`` TTL on every item.
+
+Snapshots are written to the checkpoint store off the event path: dirty rooms
+every ``checkpoint_interval`` seconds, and straight away after a key
+transition (an enemy dying, the room being cleared, a door changing, loot
+being picked up). After a crash, ``RoomEngine.recover`` rebuilds a room from
+its last checkpoint plus the logged events that came after it. The log can
+lose events (ingest overflow, rejected batches, TTL expiry), so a rebuild
+checks that sequence numbers follow on from each other and raises
+``EventLogGap`` rather than returning a state that skipped events.
+
+With a ``RoomSnapshotStore`` attached, the room's state is also kept as a
+snapshot when it opens and after every ``snapshot_every``-th event (written
+with the next checkpoint pass), so ``runtime.replay.RoomReplayer`` can
+rebuild it as of any event. With a ``RecentEvents`` store attached, every
+applied (or replayed) event is also buffered under its sequence number for
+reconnect sync.
+
+Event semantics:
+
+- ``damage_dealt`` with ``target_enemy_id``: reduces the enemy's health;
+  the enemy dies at zero
+- ``enemy_died``: marks ``target_enemy_id`` (or ``source_enemy_id``) dead
+- ``loot_dropped``: adds a loot drop for ``item_id``/``item_quantity`` at the
+  event position; ``metadata.loot_instance_id`` (default: the event ID) and
+  ``metadata.item_type`` (default ``"item"``) complete the entry
+- ``loot_picked_up``: marks ``metadata.loot_instance_id`` picked up by
+  ``source_player_id``; a second pickup of the same drop is ignored
+- ``door_opened``/``door_closed``: sets ``is_open`` on ``metadata.door_id``
+
+The room is cleared once it has enemies and all of them are dead. Every
+applied event moves ``updated_at`` to the event's timestamp.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from models import CombatEvent, RoomState
+from storage.dynamodb_codec import decode_entry, encode_entry
+from storage.room_table import RoomCheckpointStore, RoomEventLog, RoomSnapshotStore
+from wire.room_delta import ENTRY_KEYS, SCALAR_FIELDS
+
+from .event_ring import RecentEvents
+
+logger = logging.getLogger(__name__)
+
+
+def _index(entries: Iterable[str], key: str) -> Dict[str, Dict[str, Any]]:
+    return {entry[key]: entry for entry in map(decode_entry, entries)}
+
+
+class EventLogGap(LookupError):
+    """A room's event log is missing events between two sequence numbers.
+
+    Attributes:
+        room: The room rebuilt up to the last event before the gap
+        expected: Sequence number that should have come next
+        found: Sequence number that came instead
+    """
+
+    def __init__(self, room: "LiveRoom", found: int) -> None:
+        self.room = room
+        self.expected = room.seq + 1
+        self.found = found
+        super().__init__(
+            f"Room '{room.room_id}' log is missing events "
+            f"{self.expected}..{found - 1}"
+        )
+
+
+class LiveRoom:
+    """Mutable, decoded form of one room's state."""
+
+    def __init__(self, state: RoomState, seq: int = 0) -> None:
+        """Decode a room state once for in-place updates.
+
+        Args:
+            state: Room state to start from
+            seq: Number of the room's events already reflected in ``state``
+        """
+        self.room_id = state.room_id
+        self.seq = seq
+        self.scalars: Dict[str, Any] = {
+            name: getattr(state, name) for name in SCALAR_FIELDS
+        }
+        self.entries: Dict[str, Dict[str, Dict[str, Any]]] = {
+            field: _index(getattr(state, field), key)
+            for field, key in ENTRY_KEYS.items()
+        }
+
+    @property
+    def enemies(self) -> Dict[str, Dict[str, Any]]:
+        """Enemy entries by ``enemy_instance_id``."""
+        return self.entries["enemies"]
+
+    @property
+    def loot_drops(self) -> Dict[str, Dict[str, Any]]:
+        """Loot entries by ``loot_instance_id``."""
+        return self.entries["loot_drops"]
+
+    @property
+    def doors(self) -> Dict[str, Dict[str, Any]]:
+        """Door entries by ``door_id``."""
+        return self.entries["doors"]
+
+    def apply(self, event: CombatEvent) -> bool:
+        """Apply one event and return True if it was a key transition."""
+        handler = _HANDLERS.get(event.event_type)
+        key = handler(self, event) if handler is not None else False
+        was_cleared = self.scalars["is_cleared"]
+        if self.enemies and not was_cleared:
+            self.scalars["is_cleared"] = not any(
+                enemy["is_alive"] for enemy in self.enemies.values()
+            )
+        self.scalars["updated_at"] = event.timestamp
+        return key or self.scalars["is_cleared"] != was_cleared
+
+    def to_state(self) -> RoomState:
+        """Build a ``RoomState`` snapshot without re-running validation."""
+        values = dict(self.scalars)
+        for field, entries in self.entries.items():
+            values[field] = [encode_entry(entry) for entry in entries.values()]
+        return RoomState.model_construct(room_id=self.room_id, **values)
+
+    def _damage(self, event: CombatEvent) -> bool:
+        enemy = self.enemies.get(event.target_enemy_id)
+        if enemy is None or not enemy["is_alive"] or not event.damage_amount:
+            return False
+        enemy["current_health"] = max(
+            0.0, enemy["current_health"] - event.damage_amount
+        )
+        if enemy["current_health"] > 0:
+            return False
+        enemy["is_alive"] = False
+        return True
+
+    def _enemy_died(self, event: CombatEvent) -> bool:
+        enemy = self.enemies.get(event.target_enemy_id or event.source_enemy_id)
+        if enemy is None or not enemy["is_alive"]:
+            return False
+        enemy["current_health"] = 0.0
+        enemy["is_alive"] = False
+        return True
+
+    def _loot_dropped(self, event: CombatEvent) -> bool:
+        metadata = event.metadata or {}
+        loot_id = metadata.get("loot_instance_id", event.event_id)
+        self.loot_drops[loot_id] = {
+            "loot_instance_id": loot_id,
+            "item_id": event.item_id,
+            "item_type": metadata.get("item_type", "item"),
+            "quantity": event.item_quantity or 1,
+            "position_x": event.position_x or 0.0,
+            "position_y": event.position_y or 0.0,
+            "position_z": event.position_z or 0.0,
+            "is_picked_up": False,
+        }
+        return False
+
+    def _loot_picked_up(self, event: CombatEvent) -> bool:
+        loot = self.loot_drops.get((event.metadata or {}).get("loot_instance_id"))
+        if loot is None or loot["is_picked_up"]:
+            return False
+        loot["is_picked_up"] = True
+        loot["picked_up_by"] = event.source_player_id
+        return True
+
+    def _door(self, event: CombatEvent) -> bool:
+        door = self.doors.get((event.metadata or {}).get("door_id"))
+        is_open = event.event_type == "door_opened"
+        if door is None or door["is_open"] == is_open:
+            return False
+        door["is_open"] = is_open
+        return True
+
+
+_HANDLERS: Dict[str, Callable[[LiveRoom, CombatEvent], bool]] = {
+    "damage_dealt": LiveRoom._damage,
+    "enemy_died": LiveRoom._enemy_died,
+    "loot_dropped": LiveRoom._loot_dropped,
+    "loot_picked_up": LiveRoom._loot_picked_up,
+    "door_opened": LiveRoom._door,
+    "door_closed": LiveRoom._door,
+}
+
+
+class RoomEngine:
+    """Owns live rooms, applies their events and checkpoints them."""
+
+    def __init__(
+        self,
+        checkpoints: RoomCheckpointStore,
+        events: RoomEventLog,
+        checkpoint_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        recent: Optional[RecentEvents] = None,
+        snapshots: Optional[RoomSnapshotStore] = None,
+        snapshot_every: int = 100,
+    ) -> None:
+        """Create the engine.
+
+        Args:
+            checkpoints: Where room snapshots are written
+            events: Log that every applied event is appended to first; its
+                ``append`` is called on the event loop and must not block
+            checkpoint_interval: Seconds between checkpoints of dirty rooms
+            clock: Monotonic time source, in seconds
+            recent: Optional buffer of recent events for reconnect sync
+            snapshots: Optional history of snapshots for replays
+            snapshot_every: Events between snapshots in ``snapshots``
+        """
+        self.rooms: Dict[str, LiveRoom] = {}
+        self._checkpoints = checkpoints
+        self._events = events
+        self._interval = checkpoint_interval
+        self._clock = clock
+        self._recent = recent
+        self._snapshots = snapshots
+        self._snapshot_every = snapshot_every
+        self._pending_snapshots: List[Tuple[RoomState, int]] = []
+        self._dirty: Set[str] = set()
+        self._closing: Set[str] = set()
+        self._urgent = asyncio.Event()
+        self._last_checkpoint = clock()
+        self.checkpoints_written = 0
+        self.snapshots_written = 0
+
+    def __contains__(self, room_id: object) -> bool:
+        return room_id in self.rooms and room_id not in self._closing
+
+    def open(self, state: RoomState) -> LiveRoom:
+        """Start owning a new room; it is checkpointed on the next pass."""
+        room = LiveRoom(state)
+        self.rooms[room.room_id] = room
+        if self._recent is not None:
+            self._recent.reset(room.room_id)
+        if self._snapshots is not None:
+            self._pending_snapshots.append((room.to_state(), 0))
+        self._mark(room.room_id, urgent=True)
+        return room
+
+    def recover(self, room_id: str) -> Optional[LiveRoom]:
+        """Rebuild a room from its last checkpoint plus later logged events.
+
+        Returns:
+            The recovered room, or None if the room was never checkpointed
+
+        Raises:
+            EventLogGap: If the log skips a sequence number; the room is not
+                opened, and the error holds it as rebuilt up to the gap
+        """
+        loaded = self._load(room_id)
+        return self._adopt(*loaded) if loaded is not None else None
+
+    async def recover_in_thread(self, room_id: str) -> Optional[LiveRoom]:
+        """Recover a room with the storage reads in a worker thread.
+
+        The room is registered back on the event loop. If it was opened
+        while the reads were running, the open room is kept and returned.
+
+        Raises:
+            EventLogGap: As for ``recover``
+        """
+        loaded = await asyncio.to_thread(self._load, room_id)
+        if room_id in self.rooms:
+            return self.rooms[room_id]
+        return self._adopt(*loaded) if loaded is not None else None
+
+    def _load(
+        self, room_id: str
+    ) -> Optional[Tuple[LiveRoom, int, List[Tuple[int, CombatEvent]]]]:
+        """Read and fold a room's checkpoint and later events, without opening it."""
+        checkpoint = self._checkpoints.load(room_id)
+        if checkpoint is None:
+            return None
+        room = LiveRoom(*checkpoint)
+        replayed = self._events.since(room_id, room.seq)
+        for seq, event in replayed:
+            if seq != room.seq + 1:
+                raise EventLogGap(room, seq)
+            room.apply(event)
+            room.seq = seq
+        return room, checkpoint[1], replayed
+
+    def _adopt(
+        self,
+        room: LiveRoom,
+        checkpoint_seq: int,
+        replayed: List[Tuple[int, CombatEvent]],
+    ) -> LiveRoom:
+        if self._recent is not None:
+            self._recent.reset(room.room_id, checkpoint_seq)
+            for seq, event in replayed:
+                self._recent.append(event, seq)
+        self.rooms[room.room_id] = room
+        if room.seq != checkpoint_seq:
+            self._mark(room.room_id, urgent=True)
+        return room
+
+    def apply(self, event: CombatEvent) -> bool:
+        """Log and apply an event to its room.
+
+        Returns:
+            True if the event was a key transition (checkpointed promptly)
+
+        Raises:
+            KeyError: If the engine does not own the event's room, or is
+                closing it
+        """
+        if event.room_id in self._closing:
+            raise KeyError(event.room_id)
+        room = self.rooms[event.room_id]
+        self._events.append(event, room.seq + 1)
+        room.seq += 1
+        key = room.apply(event)
+        if self._recent is not None:
+            self._recent.append(event, room.seq)
+        snapshot = self._snapshots is not None and room.seq % self._snapshot_every == 0
+        if snapshot:
+            self._pending_snapshots.append((room.to_state(), room.seq))
+        self._mark(room.room_id, urgent=key or snapshot)
+        return key
+
+    def state(self, room_id: str) -> RoomState:
+        """Return a snapshot of a room's current state."""
+        return self.rooms[room_id].to_state()
+
+    async def close(self, room_id: str) -> Optional[RoomState]:
+        """Write a final checkpoint, stop owning the room and return its state.
+
+        The room stops accepting events before the checkpoint is written, so
+        nothing applied during the write is lost; if the write fails, the
+        room is open again and the error is raised.
+        """
+        room = self.rooms.get(room_id)
+        if room is None or room_id in self._closing:
+            return None
+        self._closing.add(room_id)
+        try:
+            state = room.to_state()
+            await asyncio.to_thread(self._checkpoints.save, state, room.seq)
+        finally:
+            self._closing.discard(room_id)
+        del self.rooms[room_id]
+        self._dirty.discard(room_id)
+        if self._recent is not None:
+            self._recent.drop_room(room_id)
+        return state
+
+    def snapshot_dirty(self) -> Dict[str, Tuple[RoomState, int]]:
+        """Take consistent snapshots of every dirty room and clear the dirty set."""
+        snapshots = {
+            room_id: (self.rooms[room_id].to_state(), self.rooms[room_id].seq)
+            for room_id in self._dirty
+        }
+        self._dirty.clear()
+        self._urgent.clear()
+        self._last_checkpoint = self._clock()
+        return snapshots
+
+    async def checkpoint(self) -> int:
+        """Write dirty rooms and pending history snapshots off the event loop."""
+        snapshots = self.snapshot_dirty()
+        written = 0
+        for room_id, (state, seq) in snapshots.items():
+            try:
+                saved = await asyncio.to_thread(self._checkpoints.save, state, seq)
+            except Exception:
+                if room_id in self.rooms:
+                    self._mark(room_id, urgent=False)
+                raise
+            written += saved
+        self.checkpoints_written += written
+        await self._write_snapshots()
+        return written
+
+    async def run(self) -> None:
+        """Checkpoint on the interval or after key transitions until cancelled."""
+        while True:
+            remaining = self._interval - (self._clock() - self._last_checkpoint)
+            try:
+                await asyncio.wait_for(self._urgent.wait(), timeout=max(0.0, remaining))
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.checkpoint()
+            except Exception:
+                # Rooms stay dirty and are retried on the next pass.
+                logger.exception("Room checkpoint failed")
+
+    async def _write_snapshots(self) -> None:
+        pending, self._pending_snapshots = self._pending_snapshots, []
+        for index, (state, seq) in enumerate(pending):
+            try:
+                await asyncio.to_thread(self._snapshots.save, state, seq)
+            except Exception:
+                self._pending_snapshots[:0] = pending[index:]
+                raise
+            self.snapshots_written += 1
+
+    def _mark(self, room_id: str, urgent: bool) -> None:
+        self._dirty.add(room_id)
+        if urgent:
+            self._urgent.set()
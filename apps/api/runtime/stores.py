@@ -0,0 +1,106 @@
+"""In-memory session and room event stores.
+
+Both stores accept validated Pydantic models at their boundary and keep the
+compact slotted form internally (see ``runtime.compact``).
+"""
+
+from typing import Dict, Iterator, List, Optional, Set
+
+from models import CombatEvent, PlayerSession
+
+from .compact import CompactCombatEvent, CompactPlayerSession
+
+
+class SessionStore:
+    """Live player sessions indexed by session ID and by room."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, CompactPlayerSession] = {}
+        self._by_room: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def put(self, session: PlayerSession) -> CompactPlayerSession:
+        """Insert or replace a session.
+
+        Args:
+            session: Validated session model
+
+        Returns:
+            The stored compact session
+        """
+        return self.put_compact(CompactPlayerSession.from_model(session))
+
+    def put_compact(self, compact: CompactPlayerSession) -> CompactPlayerSession:
+        """Insert or replace a session that is already in compact form."""
+        previous = self._sessions.get(compact.session_id)
+        if previous is not None and previous.room_id != compact.room_id:
+            self._unindex(previous)
+        self._sessions[compact.session_id] = compact
+        if compact.room_id is not None:
+            self._by_room.setdefault(compact.room_id, set()).add(compact.session_id)
+        return compact
+
+    def get(self, session_id: str) -> Optional[CompactPlayerSession]:
+        """Return the compact session, or None if unknown."""
+        return self._sessions.get(session_id)
+
+    def get_model(self, session_id: str) -> Optional[PlayerSession]:
+        """Return the session as a ``PlayerSession``, or None if unknown."""
+        compact = self._sessions.get(session_id)
+        return compact.to_model() if compact is not None else None
+
+    def remove(self, session_id: str) -> Optional[CompactPlayerSession]:
+        """Remove a session and return it, or None if unknown."""
+        compact = self._sessions.pop(session_id, None)
+        if compact is not None:
+            self._unindex(compact)
+        return compact
+
+    def in_room(self, room_id: str) -> List[CompactPlayerSession]:
+        """Return all sessions currently in a room."""
+        return [self._sessions[sid] for sid in self._by_room.get(room_id, ())]
+
+    def __iter__(self) -> Iterator[CompactPlayerSession]:
+        return iter(self._sessions.values())
+
+    def _unindex(self, compact: CompactPlayerSession) -> None:
+        if compact.room_id is None:
+            return
+        members = self._by_room.get(compact.room_id)
+        if members is not None:
+            members.discard(compact.session_id)
+            if not members:
+                del self._by_room[compact.room_id]
+
+
+class RoomEventStore:
+    """Combat events held per room in arrival order."""
+
+    def __init__(self) -> None:
+        self._events: Dict[str, List[CompactCombatEvent]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(events) for events in self._events.values())
+
+    def append(self, event: CombatEvent) -> CompactCombatEvent:
+        """Append a validated event to its room's log."""
+        compact = CompactCombatEvent.from_model(event)
+        self._events.setdefault(compact.room_id, []).append(compact)
+        return compact
+
+    def events(self, room_id: str) -> List[CompactCombatEvent]:
+        """Return the compact events recorded for a room."""
+        return list(self._events.get(room_id, ()))
+
+    def models(self, room_id: str) -> List[CombatEvent]:
+        """Return the events recorded for a room as ``CombatEvent`` models."""
+        return [compact.to_model() for compact in self._events.get(room_id, ())]
+
+    def drop_room(self, room_id: str) -> int:
+        """Forget all events for a room and return how many were dropped."""
+        return len(self._events.pop(room_id, ()))
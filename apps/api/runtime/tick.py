@@ -0,0 +1,115 @@
+"""Fixed-timestep tick scheduling.
+
+``TickLoop`` calls a step function at a fixed rate on the asyncio loop. The
+schedule is anchored to the start time, so a late tick does not push every
+later tick back. A tick that takes longer than the timestep counts as an
+overrun; when the loop falls more than one whole tick behind, the missed
+ticks are skipped (and counted) instead of being run back to back. A step
+that raises is logged and counted as an error, and the loop keeps ticking:
+one bad input must not stop every room in the shard.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the tick-duration histogram buckets, in milliseconds.
+DEFAULT_BUCKETS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+
+class TickStats:
+    """Tick-duration histogram and overrun counters."""
+
+    def __init__(
+        self, budget_ms: float, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS
+    ) -> None:
+        self.budget_ms = budget_ms
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        """Record one tick's duration."""
+        self.counts[bisect.bisect_left(self.buckets_ms, duration_ms)] += 1
+        self.ticks += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if duration_ms > self.budget_ms:
+            self.overruns += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters and histogram (``le`` bucket bounds in ms)."""
+        bounds = [str(b) for b in self.buckets_ms] + ["+Inf"]
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "budget_ms": self.budget_ms,
+            "mean_ms": self.total_ms / self.ticks if self.ticks else 0.0,
+            "max_ms": self.max_ms,
+            "histogram_ms": dict(zip(bounds, self.counts)),
+        }
+
+
+class TickLoop:
+    """Runs ``step(tick)`` at a fixed rate until cancelled."""
+
+    def __init__(
+        self,
+        step: Callable[[int], None],
+        rate_hz: float = 20.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Create the loop.
+
+        Args:
+            step: Work for one tick; receives the tick number
+            rate_hz: Ticks per second
+            clock: Monotonic time source, in seconds
+        """
+        self._step = step
+        self.interval = 1.0 / rate_hz
+        self._clock = clock
+        self.tick = 0
+        self.stats = TickStats(budget_ms=self.interval * 1000)
+
+    def run_tick(self) -> float:
+        """Run one tick now and return its duration in seconds.
+
+        A step that raises is logged and counted in ``stats.errors``; the
+        tick still counts and the next one runs on schedule.
+        """
+        started = self._clock()
+        try:
+            self._step(self.tick)
+        except Exception:
+            self.stats.errors += 1
+            logger.exception("Tick %d failed", self.tick)
+        duration = self._clock() - started
+        self.stats.record(duration * 1000)
+        self.tick += 1
+        return duration
+
+    async def run(self) -> None:
+        """Tick on schedule until cancelled."""
+        deadline = self._clock()
+        while True:
+            self.run_tick()
+            deadline += self.interval
+            behind = self._clock() - deadline
+            if behind > self.interval:
+                missed = int(behind // self.interval)
+                self.stats.skipped += missed
+                self.tick += missed
+                deadline += missed * self.interval
+            await asyncio.sleep(max(0.0, deadline - self._clock()))
@@ -0,0 +1,200 @@
+"""Write-behind buffering of PlayerSession updates.
+
+Clients update their session several times a second, almost always with new
+position and resource values that nobody reads from the table until the
+player reconnects. ``WriteBehindSessionStore`` keeps the latest state in
+memory, so consecutive updates to the same session collapse into one pending
+write, and ``run`` flushes the dirty sessions in batches every
+``flush_interval`` seconds from a worker thread, so the event loop never
+waits on DynamoDB. A failed flush is logged and its sessions stay dirty for
+the next one.
+
+Changes that other servers and recovery depend on (a new session, a death or
+respawn, a room change, a player leaving) do not wait for the interval: the
+session goes on an urgent list and ``run`` is woken to write just those
+sessions from the worker thread straight away. ``update`` and ``remove``
+never call the writer themselves, since they run on the event loop (and
+inside ``RoomShard.step``). If an urgent write fails, the sessions stay
+dirty and go out with the next flush.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from models import PlayerSession
+from storage.session_table import SessionWriter
+
+from .compact import CompactPlayerSession
+from .stores import SessionStore
+
+logger = logging.getLogger(__name__)
+
+CRITICAL_FIELDS = ("is_alive", "room_id")
+
+
+class WriteBehindSessionStore:
+    """Session store that coalesces writes to the sessions table."""
+
+    def __init__(
+        self,
+        writer: SessionWriter,
+        flush_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create the store.
+
+        Args:
+            writer: Destination for flushed sessions
+            flush_interval: Seconds between batched flushes of dirty sessions
+            clock: Monotonic time source, in seconds
+        """
+        self.sessions = SessionStore()
+        self._writer = writer
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._dirty: Dict[str, CompactPlayerSession] = {}
+        self._urgent: Set[str] = set()
+        self._wake = asyncio.Event()
+        self._last_flush = clock()
+        self.updates = 0
+        self.writes = 0
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    @property
+    def pending(self) -> int:
+        """Number of sessions with unflushed changes."""
+        return len(self._dirty)
+
+    @property
+    def urgent(self) -> int:
+        """Number of pending sessions waiting for an immediate write."""
+        return len(self._urgent)
+
+    def update(self, session: PlayerSession) -> bool:
+        """Record the latest state of a session.
+
+        Args:
+            session: Validated session model
+
+        Returns:
+            True if the session was queued for an immediate write
+        """
+        self.updates += 1
+        previous = self.sessions.get(session.session_id)
+        compact = self.sessions.put(session)
+        self._dirty[compact.session_id] = compact
+        if previous is None or any(
+            getattr(previous, name) != getattr(compact, name)
+            for name in CRITICAL_FIELDS
+        ):
+            self._mark_urgent(compact.session_id)
+            return True
+        return False
+
+    def touch(self, session_id: str, last_heartbeat: datetime) -> bool:
+        """Record a heartbeat; it is written with the next batched flush.
+
+        Returns:
+            False if the session is unknown
+        """
+        compact = self.sessions.get(session_id)
+        if compact is None:
+            return False
+        compact.last_heartbeat = last_heartbeat
+        self._dirty[session_id] = compact
+        return True
+
+    def get(self, session_id: str) -> Optional[PlayerSession]:
+        """Return the latest session state, flushed or not."""
+        return self.sessions.get_model(session_id)
+
+    def remove(self, session_id: str) -> Optional[PlayerSession]:
+        """Stop tracking a session; its pending state is queued for an immediate write."""
+        removed = self.sessions.remove(session_id)
+        if session_id in self._dirty:
+            self._mark_urgent(session_id)
+        return removed.to_model() if removed is not None else None
+
+    def maybe_flush(self) -> int:
+        """Flush if ``flush_interval`` has elapsed; return sessions written."""
+        if self._clock() - self._last_flush < self._flush_interval:
+            return 0
+        return self.flush()
+
+    def flush(self, urgent_only: bool = False) -> int:
+        """Write dirty sessions now and return how many were written.
+
+        Args:
+            urgent_only: Write only the sessions queued for an immediate write
+        """
+        batch = self._take(urgent_only)
+        if batch:
+            try:
+                self._write(batch)
+            except Exception:
+                self._requeue(batch)
+                raise
+        return len(batch)
+
+    async def flush_in_thread(self, urgent_only: bool = False) -> int:
+        """Write dirty sessions from a worker thread; see ``flush``."""
+        batch = self._take(urgent_only)
+        if batch:
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except BaseException:
+                self._requeue(batch)
+                raise
+        return len(batch)
+
+    async def run(self) -> None:
+        """Flush every ``flush_interval`` seconds until cancelled, then flush once more.
+
+        Urgent sessions are written as soon as they are queued.
+        """
+        try:
+            while True:
+                remaining = self._flush_interval - (self._clock() - self._last_flush)
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=max(0.0, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                urgent_only = self._wake.is_set()
+                self._wake.clear()
+                try:
+                    await self.flush_in_thread(urgent_only)
+                except Exception:
+                    # The sessions stay dirty and go out with the next flush.
+                    logger.exception("Session flush failed")
+        finally:
+            await self.flush_in_thread()
+
+    def _take(self, urgent_only: bool = False) -> List[CompactPlayerSession]:
+        if urgent_only:
+            batch = [self._dirty.pop(session_id) for session_id in self._urgent]
+        else:
+            self._last_flush = self._clock()
+            batch = list(self._dirty.values())
+            self._dirty.clear()
+        self._urgent.clear()
+        return batch
+
+    def _mark_urgent(self, session_id: str) -> None:
+        self._urgent.add(session_id)
+        self._wake.set()
+
+    def _requeue(self, batch: List[CompactPlayerSession]) -> None:
+        # Updates made while the batch was being written are newer: keep them.
+        for compact in batch:
+            self._dirty.setdefault(compact.session_id, compact)
+
+    def _write(self, batch: List[CompactPlayerSession]) -> None:
+        self._writer.write(batch)
+        self.writes += len(batch)
@@ -0,0 +1,38 @@
+"""Persistence helpers for the DynamoDB-backed tables."""
+
+from .dynamodb_codec import ModelCodec, codec_for, decode_entry, encode_entry
+from .event_table import DynamoDBEventWriter, EventWriter, InMemoryEventWriter
+from .room_table import (
+    DynamoDBRoomCheckpointStore,
+    DynamoDBRoomEventLog,
+    DynamoDBRoomSnapshotStore,
+    InMemoryRoomCheckpointStore,
+    InMemoryRoomEventLog,
+    InMemoryRoomSnapshotStore,
+    RoomCheckpointStore,
+    RoomEventLog,
+    RoomSnapshotStore,
+)
+from .session_table import DynamoDBSessionWriter, InMemorySessionWriter, SessionWriter
+
+__all__ = [
+    "DynamoDBEventWriter",
+    "DynamoDBRoomCheckpointStore",
+    "DynamoDBRoomEventLog",
+    "DynamoDBRoomSnapshotStore",
+    "DynamoDBSessionWriter",
+    "EventWriter",
+    "InMemoryEventWriter",
+    "InMemoryRoomCheckpointStore",
+    "InMemoryRoomEventLog",
+    "InMemoryRoomSnapshotStore",
+    "InMemorySessionWriter",
+    "ModelCodec",
+    "RoomCheckpointStore",
+    "RoomEventLog",
+    "RoomSnapshotStore",
+    "SessionWriter",
+    "codec_for",
+    "decode_entry",
+    "encode_entry",
+]
@@ -0,0 +1,102 @@
+"""Generate ``storage/schema_maps.py`` from the repository's schema YAML.
+
+The codec needs each model's attribute types and each table's TTL attribute
+at runtime, but a deployed ``apps/api`` bundle does not ship the repo-root
+``schemas/`` directory. This build step copies the parts the codec reads
+(``type``, ``required``, ``items`` and ``properties``) into a generated module
+inside the package.
+
+Run from ``apps/api`` whenever ``schemas/models`` or ``schemas/tables`` change
+(next to ``orb-schema generate``)::
+
+    python -m storage.build_schema_maps
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from pprint import pformat
+from typing import Any, Dict, Mapping, Tuple
+
+import yaml
+
+REPO_SCHEMAS = Path(__file__).resolve().parents[3] / "schemas"
+OUTPUT = Path(__file__).resolve().parent / "schema_maps.py"
+
+# Keys of an attribute spec that the codec and exporters read.
+_SPEC_KEYS = ("type", "required", "items", "properties")
+
+_HEADER = '''\
+# AUTO-GENERATED by storage.build_schema_maps - DO NOT EDIT
+# Regenerate with: python -m storage.build_schema_maps
+"""Model attribute specs and table TTL attributes from ``schemas/``."""
+
+'''
+
+
+def _spec(spec: Mapping[str, Any]) -> Dict[str, Any]:
+    """Keep the codec-relevant keys of an attribute spec, recursively."""
+    kept = {}
+    for key in _SPEC_KEYS:
+        if key not in spec:
+            continue
+        value = spec[key]
+        if key == "items":
+            value = _spec(value)
+        elif key == "properties":
+            value = {name: _spec(sub) for name, sub in value.items()}
+        kept[key] = value
+    return kept
+
+
+def build(
+    schemas: Path = REPO_SCHEMAS,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Read the model and table schemas.
+
+    Args:
+        schemas: The repository's ``schemas`` directory
+
+    Returns:
+        ``(model attributes by model name, TTL attribute by model name)``
+    """
+    attributes = {}
+    for path in sorted((schemas / "models").glob("*.yml")):
+        with open(path) as f:
+            model = yaml.safe_load(f)["model"]
+        attributes[path.stem] = {
+            name: _spec(spec) for name, spec in model["attributes"].items()
+        }
+    ttl = {}
+    for path in sorted((schemas / "tables").glob("*.yml")):
+        with open(path) as f:
+            table = yaml.safe_load(f)
+        name = table.get("model", {}).get("name")
+        settings = table.get("table", {}).get("ttl") or {}
+        if name and settings.get("enabled"):
+            ttl[name] = settings["attribute_name"]
+    return attributes, ttl
+
+
+def render(attributes: Mapping[str, Any], ttl: Mapping[str, str]) -> str:
+    """Return the source of the generated module."""
+    return (
+        _HEADER
+        + f"MODEL_ATTRIBUTES = {pformat(dict(attributes), sort_dicts=False)}\n\n"
+        + f"TTL_ATTRIBUTES = {pformat(dict(ttl), sort_dicts=False)}\n"
+    )
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Generate storage/schema_maps.py")
+    parser.add_argument("--schemas", type=Path, default=REPO_SCHEMAS)
+    parser.add_argument("--out", type=Path, default=OUTPUT)
+    args = parser.parse_args()
+    args.out.write_text(render(*build(args.schemas)))
+    print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""Schema-driven DynamoDB item codec for the generated models.
+
+Converters are built once per model from the same ``schemas/models/*.yml``
+definitions that orb-schema-generator uses, so a low-level DynamoDB
+AttributeValue map becomes a model in a single pass: numbers are parsed
+straight to ``float``/``int`` (no ``Decimal``), datetimes from their ISO-8601
+strings, and the result is built with ``model_construct`` because the schema
+already fixed every field's type.
+
+Array attributes whose items are objects (``RoomState.enemies``,
+``LootTable.drops`` ...) are typed ``List[str]`` in the generated models. Each
+entry is held as a compact JSON object string in the model and stored as a
+native DynamoDB map in the table.
+
+DynamoDB TTL only reads Number attributes holding epoch seconds. The datetime
+attribute a table schema (``schemas/tables/*.yml``) names as its
+``ttl.attribute_name`` is therefore stored as ``{"N": epoch seconds}`` and
+decoded back to an aware UTC datetime (to whole seconds).
+
+Deployed bundles do not include the repo-root ``schemas/`` directory, so the
+attribute specs and TTL attributes are read from ``storage/schema_maps.py``,
+generated from the YAML at build time by ``python -m storage.build_schema_maps``.
+"""
+
+import json
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+import yaml
+from pydantic import BaseModel
+
+import models
+
+from .schema_maps import MODEL_ATTRIBUTES, TTL_ATTRIBUTES
+
+AttributeValue = Dict[str, Any]
+Encoder = Callable[[Any], AttributeValue]
+Decoder = Callable[[AttributeValue], Any]
+
+
+def encode_entry(entry: Mapping[str, Any]) -> str:
+    """Serialize an array-of-object entry to the model's compact JSON string."""
+    return json.dumps(entry, separators=(",", ":"))
+
+
+def decode_entry(entry: str) -> Dict[str, Any]:
+    """Parse a model's JSON entry string back into a dictionary."""
+    return json.loads(entry)
+
+
+# Scalar converters
+
+
+def _number_to_str(value: Any) -> str:
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"DynamoDB cannot store non-finite number {value!r}")
+    return repr(value) if isinstance(value, float) else str(int(value))
+
+
+def _enc_string(value: Any) -> AttributeValue:
+    return {"S": value}
+
+
+def _enc_number(value: Any) -> AttributeValue:
+    return {"N": _number_to_str(float(value))}
+
+
+def _enc_integer(value: Any) -> AttributeValue:
+    return {"N": _number_to_str(int(value))}
+
+
+def _enc_boolean(value: Any) -> AttributeValue:
+    return {"BOOL": bool(value)}
+
+
+def _enc_datetime(value: datetime) -> AttributeValue:
+    return {"S": value.isoformat()}
+
+
+def _enc_epoch_seconds(value: datetime) -> AttributeValue:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return {"N": str(int(value.timestamp()))}
+
+
+def _enc_any(value: Any) -> AttributeValue:
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float)):
+        return {"N": _number_to_str(value)}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, datetime):
+        return _enc_datetime(value)
+    if isinstance(value, Mapping):
+        return {"M": {k: _enc_any(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [_enc_any(v) for v in value]}
+    raise TypeError(f"Cannot encode {type(value).__name__} as a DynamoDB attribute")
+
+
+def _dec_string(av: AttributeValue) -> Optional[str]:
+    return av.get("S")
+
+
+def _dec_number(av: AttributeValue) -> Optional[float]:
+    raw = av.get("N")
+    return float(raw) if raw is not None else None
+
+
+def _dec_integer(av: AttributeValue) -> Optional[int]:
+    raw = av.get("N")
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return int(float(raw))
+
+
+def _dec_boolean(av: AttributeValue) -> Optional[bool]:
+    return av.get("BOOL")
+
+
+def _dec_datetime(av: AttributeValue) -> Optional[datetime]:
+    raw = av.get("S")
+    return datetime.fromisoformat(raw) if raw is not None else None
+
+
+def _dec_epoch_seconds(av: AttributeValue) -> Optional[datetime]:
+    raw = av.get("N")
+    if raw is None:
+        # Items written before TTL attributes were stored as numbers.
+        return _dec_datetime(av)
+    return datetime.fromtimestamp(int(float(raw)), tz=timezone.utc)
+
+
+def _dec_any(av: AttributeValue) -> Any:
+    ((kind, raw),) = av.items()
+    if kind == "S":
+        return raw
+    if kind == "N":
+        return float(raw) if any(c in raw for c in ".eE") else int(raw)
+    if kind == "BOOL":
+        return raw
+    if kind == "NULL":
+        return None
+    if kind == "M":
+        return {k: _dec_any(v) for k, v in raw.items()}
+    if kind == "L":
+        return [_dec_any(v) for v in raw]
+    raise ValueError(f"Unsupported DynamoDB attribute type '{kind}'")
+
+
+_SCALARS: Dict[str, Tuple[Encoder, Decoder]] = {
+    "string": (_enc_string, _dec_string),
+    "number": (_enc_number, _dec_number),
+    "integer": (_enc_integer, _dec_integer),
+    "boolean": (_enc_boolean, _dec_boolean),
+    "datetime": (_enc_datetime, _dec_datetime),
+    "object": (_enc_any, _dec_any),
+}
+
+
+def _converters(spec: Mapping[str, Any]) -> Tuple[Encoder, Decoder]:
+    """Build the encoder/decoder pair for one schema attribute."""
+    kind = spec["type"]
+    if kind == "array":
+        items = spec.get("items", {"type": "string"})
+        if items.get("type") == "object" and "properties" in items:
+            return _object_entry_list(items["properties"])
+        enc_item, dec_item = _converters(items)
+        return (
+            lambda value: {"L": [enc_item(v) for v in value]},
+            lambda av: [dec_item(v) for v in av["L"]] if "L" in av else None,
+        )
+    if kind == "object" and "properties" in spec:
+        enc_map, dec_map = _object_map(spec["properties"])
+        return (
+            lambda value: {"M": enc_map(value)},
+            lambda av: dec_map(av["M"]) if "M" in av else None,
+        )
+    try:
+        return _SCALARS[kind]
+    except KeyError:
+        raise ValueError(f"Unsupported schema attribute type '{kind}'") from None
+
+
+def _object_map(
+    properties: Mapping[str, Any],
+) -> Tuple[
+    Callable[[Mapping[str, Any]], Dict[str, AttributeValue]],
+    Callable[[Mapping[str, AttributeValue]], Dict[str, Any]],
+]:
+    fields = [(name, *_converters(spec)) for name, spec in properties.items()]
+
+    def encode(value: Mapping[str, Any]) -> Dict[str, AttributeValue]:
+        return {
+            name: enc(value[name])
+            for name, enc, _ in fields
+            if value.get(name) is not None
+        }
+
+    def decode(item: Mapping[str, AttributeValue]) -> Dict[str, Any]:
+        return {name: dec(item[name]) for name, _, dec in fields if name in item}
+
+    return encode, decode
+
+
+def _object_entry_list(properties: Mapping[str, Any]) -> Tuple[Encoder, Decoder]:
+    enc_map, dec_map = _object_map(properties)
+
+    def encode(value: Iterable[str]) -> AttributeValue:
+        return {"L": [{"M": enc_map(decode_entry(entry))} for entry in value]}
+
+    def decode(av: AttributeValue) -> Optional[List[str]]:
+        if "L" not in av:
+            return None
+        return [encode_entry(dec_map(entry["M"])) for entry in av["L"]]
+
+    return encode, decode
+
+
+def ttl_attribute(model_name: str) -> Optional[str]:
+    """Return the TTL attribute of the table that stores a model, if any."""
+    return TTL_ATTRIBUTES.get(model_name)
+
+
+class ModelCodec:
+    """Single-pass converter between DynamoDB items and one generated model."""
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        attributes: Mapping[str, Mapping[str, Any]],
+        ttl_attribute: Optional[str] = None,
+    ) -> None:
+        """Build the converters.
+
+        Args:
+            model: Generated model class
+            attributes: The schema's ``model.attributes`` specs
+            ttl_attribute: The table's TTL attribute; a datetime attribute of
+                that name is stored as epoch seconds
+        """
+        self.model = model
+        self.ttl_attribute = ttl_attribute
+        self._fields: List[Tuple[str, Encoder, Decoder, bool, Any]] = []
+        for name, spec in attributes.items():
+            if name == ttl_attribute and spec["type"] == "datetime":
+                encode, decode = _enc_epoch_seconds, _dec_epoch_seconds
+            else:
+                encode, decode = _converters(spec)
+            field = model.model_fields[name]
+            default = None if field.is_required() else field.get_default()
+            self._fields.append((name, encode, decode, field.is_required(), default))
+
+    @classmethod
+    def from_schema_file(
+        cls, model: Type[BaseModel], path: Path, ttl_attribute: Optional[str] = None
+    ) -> "ModelCodec":
+        """Build a codec from a schema YAML file."""
+        with open(path) as f:
+            return cls(model, yaml.safe_load(f)["model"]["attributes"], ttl_attribute)
+
+    def encode(self, instance: BaseModel) -> Dict[str, AttributeValue]:
+        """Convert a model into a low-level DynamoDB item, omitting None values."""
+        item = {}
+        for name, encode, _, _, _ in self._fields:
+            value = getattr(instance, name)
+            if value is not None:
+                item[name] = encode(value)
+        return item
+
+    def decode_values(self, item: Mapping[str, AttributeValue]) -> Dict[str, Any]:
+        """Convert a low-level DynamoDB item into a field->value dictionary."""
+        values = {}
+        for name, _, decode, required, default in self._fields:
+            av = item.get(name)
+            if av is None:
+                if required:
+                    raise ValueError(
+                        f"{self.model.__name__} item is missing required attribute '{name}'"
+                    )
+                values[name] = default
+            else:
+                values[name] = decode(av)
+        return values
+
+    def decode(self, item: Mapping[str, AttributeValue]) -> BaseModel:
+        """Convert a low-level DynamoDB item into a model without re-validation."""
+        return self.model.model_construct(**self.decode_values(item))
+
+    def decode_page(self, page: Mapping[str, Any]) -> List[BaseModel]:
+        """Decode every item in a ``Query``/``Scan``/``BatchGetItem`` page."""
+        return [self.decode(item) for item in page.get("Items", ())]
+
+
+_CODECS: Dict[str, ModelCodec] = {}
+
+
+def codec_for(name: str) -> ModelCodec:
+    """Return the cached codec for a generated model by schema name."""
+    codec = _CODECS.get(name)
+    if codec is None:
+        codec = ModelCodec(
+            getattr(models, name), MODEL_ATTRIBUTES[name], ttl_attribute(name)
+        )
+        _CODECS[name] = codec
+    return codec
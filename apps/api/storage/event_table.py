@@ -0,0 +1,184 @@
+"""Batched writers for the CombatEvents table.
+
+Events are written with ``BatchWriteItem`` (at most 25 puts per request).
+Unprocessed items are resubmitted after an exponential backoff with jitter,
+and every item carries an ``expires_at`` TTL so DynamoDB deletes old events
+on its own (24 hours after the event by default).
+
+Events are written as ``(seq, event)`` pairs. ``seq`` is the event's number
+in its room's log (``None`` for events that are not part of a room log) and
+is stored as ``event_seq``. ``event_item`` builds every item written to the
+table, so room log appends and batched writes store the same attributes.
+
+A chunk holds each ``(room_id, event_id)`` key once (the last pair wins):
+``BatchWriteItem`` rejects a request with duplicate keys. ``ValidationException``
+rejects the whole request when a single item is invalid, so the chunk's items
+are then sent one by one: only the items rejected on their own are logged and
+handed back as failed, instead of being raised and retried.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from models import CombatEvent
+
+from .dynamodb_codec import codec_for, ttl_attribute
+from .session_table import BATCH_WRITE_LIMIT, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+SEQ_ATTRIBUTE = "event_seq"
+TTL_ATTRIBUTE = ttl_attribute("CombatEvent") or "expires_at"
+EVENT_TTL_SECONDS = 24 * 60 * 60
+
+# A combat event and its number in the room's log (None if not logged).
+LoggedEvent = Tuple[Optional[int], CombatEvent]
+
+
+def expires_at(event: CombatEvent, ttl_seconds: float = EVENT_TTL_SECONDS) -> int:
+    """Return the event's TTL as epoch seconds."""
+    return int(event.timestamp.timestamp() + ttl_seconds)
+
+
+def event_item(
+    event: CombatEvent, seq: Optional[int], ttl_seconds: float = EVENT_TTL_SECONDS
+) -> Dict[str, Any]:
+    """Encode an event as a ``CombatEventsTable`` item with its seq and TTL."""
+    item = codec_for("CombatEvent").encode(event)
+    if seq is not None:
+        item[SEQ_ATTRIBUTE] = {"N": str(seq)}
+    item[TTL_ATTRIBUTE] = {"N": str(expires_at(event, ttl_seconds))}
+    return item
+
+
+class EventWriter(Protocol):
+    """Where batches of combat events are persisted."""
+
+    def write(self, events: Sequence[LoggedEvent]) -> List[LoggedEvent]:
+        """Persist events and return the ones that could not be written."""
+        ...
+
+
+class DynamoDBEventWriter:
+    """Event writer backed by ``CombatEventsTable`` (``room_id``/``event_id`` keys)."""
+
+    def __init__(
+        self,
+        client: Any,
+        table: str,
+        ttl_seconds: float = EVENT_TTL_SECONDS,
+        max_attempts: int = 5,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create the writer.
+
+        Args:
+            client: boto3 DynamoDB low-level client
+            table: CombatEvents table name
+            ttl_seconds: Lifetime of an event item after its timestamp
+            max_attempts: Requests per chunk before its leftovers are given up
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound of the backoff, in seconds
+            sleep: Blocking sleep used between retries
+        """
+        self._client = client
+        self._table = table
+        self._ttl = ttl_seconds
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._sleep = sleep
+        self.requests = 0
+        self.retries = 0
+        self.items = 0
+        self.rejected = 0
+
+    def write(self, events: Sequence[LoggedEvent]) -> List[LoggedEvent]:
+        """Write events in ``BatchWriteItem`` chunks.
+
+        Returns:
+            Events still unprocessed after ``max_attempts`` requests, and the
+            events of chunks DynamoDB rejected as invalid
+        """
+        failed: List[LoggedEvent] = []
+        for start in range(0, len(events), BATCH_WRITE_LIMIT):
+            chunk = events[start : start + BATCH_WRITE_LIMIT]
+            failed.extend(self._write_chunk(chunk))
+        return failed
+
+    def _write_chunk(self, chunk: Sequence[LoggedEvent]) -> List[LoggedEvent]:
+        by_key: Dict[Tuple[str, str], LoggedEvent] = {}
+        for seq, event in chunk:
+            by_key[(event.room_id, event.event_id)] = (seq, event)
+        failed = self._send(
+            [
+                {"PutRequest": {"Item": event_item(event, seq, self._ttl)}}
+                for seq, event in by_key.values()
+            ]
+        )
+        self.items += len(by_key) - len(failed)
+        return [
+            by_key[(item["room_id"]["S"], item["event_id"]["S"])]
+            for item in (request["PutRequest"]["Item"] for request in failed)
+        ]
+
+    def _send(self, pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send put requests and return the ones that were not written."""
+        for attempt in range(self._max_attempts):
+            if attempt:
+                self.retries += 1
+                self._sleep(backoff_delay(attempt, self._base_delay, self._max_delay))
+            self.requests += 1
+            try:
+                response = self._client.batch_write_item(
+                    RequestItems={self._table: pending}
+                )
+            except self._client.exceptions.ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") != "ValidationException":
+                    raise
+                if len(pending) > 1:
+                    # Find the invalid items without losing the valid ones.
+                    return [
+                        failed
+                        for request in pending
+                        for failed in self._send([request])
+                    ]
+                item = pending[0]["PutRequest"]["Item"]
+                logger.error(
+                    "Dropping invalid combat event %s/%s: %s",
+                    item["room_id"]["S"],
+                    item["event_id"]["S"],
+                    exc,
+                )
+                self.rejected += 1
+                return pending
+            pending = response.get("UnprocessedItems", {}).get(self._table) or []
+            if not pending:
+                break
+        return pending
+
+
+class InMemoryEventWriter:
+    """Event writer over a dictionary, for tests and local runs."""
+
+    def __init__(self, ttl_seconds: float = EVENT_TTL_SECONDS) -> None:
+        self.events: Dict[Tuple[str, str], CombatEvent] = {}
+        self.seqs: Dict[Tuple[str, str], Optional[int]] = {}
+        self.expires: Dict[Tuple[str, str], int] = {}
+        self._ttl = ttl_seconds
+        self.requests = 0
+        self.items = 0
+
+    def write(self, events: Sequence[LoggedEvent]) -> List[LoggedEvent]:
+        """Record events, counting one request per ``BatchWriteItem`` chunk."""
+        self.requests += -(-len(events) // BATCH_WRITE_LIMIT)
+        self.items += len(events)
+        for seq, event in events:
+            key = (event.room_id, event.event_id)
+            self.events[key] = event
+            self.seqs[key] = seq
+            self.expires[key] = expires_at(event, self._ttl)
+        return []
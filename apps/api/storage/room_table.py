@@ -0,0 +1,260 @@
+"""Room checkpoints and the per-room combat event log.
+
+A checkpoint is a ``RoomState`` item in ``RoomStatesTable`` plus an
+``event_seq`` attribute: the number of the room's events already applied to
+that state. Logged events carry the same ``event_seq`` in
+``CombatEventsTable``, so recovery is "load the checkpoint, then replay the
+events after its ``event_seq``".
+
+Checkpoint writes are conditional on ``event_seq`` increasing, so a slow
+writer can never replace a newer checkpoint with an older one.
+
+A checkpoint only keeps a room's latest state. Snapshot stores keep one
+``RoomState`` per ``event_seq`` (every N events), so a room can be rebuilt
+as of any point in its history from the nearest earlier snapshot.
+"""
+
+import bisect
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from models import CombatEvent, RoomState
+
+from .dynamodb_codec import codec_for
+from .event_table import EVENT_TTL_SECONDS, SEQ_ATTRIBUTE, event_item
+
+SEQ_INDEX = "event_seq-index"
+
+
+class RoomCheckpointStore(Protocol):
+    """Where room snapshots are persisted."""
+
+    def save(self, state: RoomState, seq: int) -> bool:
+        """Store a snapshot; return False if a newer one is already stored."""
+        ...
+
+    def load(self, room_id: str) -> Optional[Tuple[RoomState, int]]:
+        """Return the latest snapshot and its event sequence, or None."""
+        ...
+
+
+class RoomEventLog(Protocol):
+    """Ordered, durable log of the events applied to each room."""
+
+    def append(self, event: CombatEvent, seq: int) -> None:
+        """Record an event as the room's ``seq``-th event."""
+        ...
+
+    def since(self, room_id: str, seq: int) -> List[Tuple[int, CombatEvent]]:
+        """Return ``(seq, event)`` pairs after ``seq``, in order."""
+        ...
+
+
+class RoomSnapshotStore(Protocol):
+    """History of room snapshots keyed by event sequence number."""
+
+    def save(self, state: RoomState, seq: int) -> None:
+        """Store the room's state after its ``seq``-th event."""
+        ...
+
+    def nearest(self, room_id: str, seq: int) -> Optional[Tuple[RoomState, int]]:
+        """Return the latest snapshot at or before ``seq``, or None."""
+        ...
+
+
+class DynamoDBRoomCheckpointStore:
+    """Checkpoint store backed by ``RoomStatesTable`` (partition key ``room_id``)."""
+
+    def __init__(self, client: Any, table: str) -> None:
+        """Create the store.
+
+        Args:
+            client: boto3 DynamoDB low-level client
+            table: RoomStates table name
+        """
+        self._client = client
+        self._table = table
+        self._codec = codec_for("RoomState")
+
+    def save(self, state: RoomState, seq: int) -> bool:
+        """Write a snapshot unless a checkpoint with a later sequence exists."""
+        item = self._codec.encode(state)
+        item[SEQ_ATTRIBUTE] = {"N": str(seq)}
+        try:
+            self._client.put_item(
+                TableName=self._table,
+                Item=item,
+                ConditionExpression="attribute_not_exists(#seq) OR #seq < :seq",
+                ExpressionAttributeNames={"#seq": SEQ_ATTRIBUTE},
+                ExpressionAttributeValues={":seq": {"N": str(seq)}},
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            return False
+        return True
+
+    def load(self, room_id: str) -> Optional[Tuple[RoomState, int]]:
+        """Read the latest snapshot with a strongly consistent read."""
+        response = self._client.get_item(
+            TableName=self._table,
+            Key={"room_id": {"S": room_id}},
+            ConsistentRead=True,
+        )
+        item = response.get("Item")
+        if item is None:
+            return None
+        seq = int(item[SEQ_ATTRIBUTE]["N"]) if SEQ_ATTRIBUTE in item else 0
+        return self._codec.decode(item), seq
+
+
+class DynamoDBRoomEventLog:
+    """Event log backed by ``CombatEventsTable`` (``room_id``/``event_id`` keys).
+
+    Appends store the same item as ``DynamoDBEventWriter`` (``event_item``),
+    with ``event_seq`` and the ``expires_at`` TTL. Replay reads through the
+    table's ``event_seq-index`` local secondary index (``room_id``/``event_seq``),
+    so only the events after ``seq`` are read.
+    """
+
+    def __init__(
+        self, client: Any, table: str, ttl_seconds: float = EVENT_TTL_SECONDS
+    ) -> None:
+        """Create the log.
+
+        Args:
+            client: boto3 DynamoDB low-level client
+            table: CombatEvents table name
+            ttl_seconds: Lifetime of an event item after its timestamp
+        """
+        self._client = client
+        self._table = table
+        self._ttl = ttl_seconds
+        self._codec = codec_for("CombatEvent")
+
+    def append(self, event: CombatEvent, seq: int) -> None:
+        """Write one event with its room sequence number."""
+        self._client.put_item(
+            TableName=self._table, Item=event_item(event, seq, self._ttl)
+        )
+
+    def since(self, room_id: str, seq: int) -> List[Tuple[int, CombatEvent]]:
+        """Query the room's events after ``seq``, in sequence order."""
+        events = []
+        paginator = self._client.get_paginator("query")
+        for page in paginator.paginate(
+            TableName=self._table,
+            IndexName=SEQ_INDEX,
+            KeyConditionExpression="room_id = :room AND #seq > :seq",
+            ExpressionAttributeNames={"#seq": SEQ_ATTRIBUTE},
+            ExpressionAttributeValues={
+                ":room": {"S": room_id},
+                ":seq": {"N": str(seq)},
+            },
+            ConsistentRead=True,
+        ):
+            for item in page.get("Items", ()):
+                events.append((int(item[SEQ_ATTRIBUTE]["N"]), self._codec.decode(item)))
+        return events
+
+
+class DynamoDBRoomSnapshotStore:
+    """Snapshot store backed by ``RoomSnapshotsTable``.
+
+    The table's partition key is ``room_id`` (S) and its sort key
+    ``event_seq`` (N); items are encoded ``RoomState`` models.
+    """
+
+    def __init__(self, client: Any, table: str) -> None:
+        """Create the store.
+
+        Args:
+            client: boto3 DynamoDB low-level client
+            table: Room snapshots table name
+        """
+        self._client = client
+        self._table = table
+        self._codec = codec_for("RoomState")
+
+    def save(self, state: RoomState, seq: int) -> None:
+        """Write one snapshot."""
+        item = self._codec.encode(state)
+        item[SEQ_ATTRIBUTE] = {"N": str(seq)}
+        self._client.put_item(TableName=self._table, Item=item)
+
+    def nearest(self, room_id: str, seq: int) -> Optional[Tuple[RoomState, int]]:
+        """Query the newest snapshot with ``event_seq <= seq``."""
+        response = self._client.query(
+            TableName=self._table,
+            KeyConditionExpression="room_id = :room AND #seq <= :seq",
+            ExpressionAttributeNames={"#seq": SEQ_ATTRIBUTE},
+            ExpressionAttributeValues={
+                ":room": {"S": room_id},
+                ":seq": {"N": str(seq)},
+            },
+            ScanIndexForward=False,
+            Limit=1,
+            ConsistentRead=True,
+        )
+        items = response.get("Items")
+        if not items:
+            return None
+        return self._codec.decode(items[0]), int(items[0][SEQ_ATTRIBUTE]["N"])
+
+
+class InMemoryRoomCheckpointStore:
+    """Checkpoint store over a dictionary, for tests and local runs."""
+
+    def __init__(self) -> None:
+        self.checkpoints: Dict[str, Tuple[RoomState, int]] = {}
+        self.writes = 0
+
+    def save(self, state: RoomState, seq: int) -> bool:
+        """Store a snapshot unless a later one is already stored."""
+        current = self.checkpoints.get(state.room_id)
+        if current is not None and current[1] >= seq:
+            return False
+        self.checkpoints[state.room_id] = (state, seq)
+        self.writes += 1
+        return True
+
+    def load(self, room_id: str) -> Optional[Tuple[RoomState, int]]:
+        """Return the latest snapshot, or None."""
+        return self.checkpoints.get(room_id)
+
+
+class InMemoryRoomEventLog:
+    """Event log over per-room lists, for tests and local runs."""
+
+    def __init__(self) -> None:
+        self.events: Dict[str, List[Tuple[int, CombatEvent]]] = {}
+
+    def append(self, event: CombatEvent, seq: int) -> None:
+        """Record an event."""
+        self.events.setdefault(event.room_id, []).append((seq, event))
+
+    def since(self, room_id: str, seq: int) -> List[Tuple[int, CombatEvent]]:
+        """Return the room's events after ``seq``."""
+        return [pair for pair in self.events.get(room_id, ()) if pair[0] > seq]
+
+
+class InMemoryRoomSnapshotStore:
+    """Snapshot store over per-room sorted lists, for tests and local runs."""
+
+    def __init__(self) -> None:
+        self.snapshots: Dict[str, List[Tuple[int, RoomState]]] = {}
+
+    def save(self, state: RoomState, seq: int) -> None:
+        """Store a snapshot, replacing one with the same sequence number."""
+        history = self.snapshots.setdefault(state.room_id, [])
+        index = bisect.bisect_left(history, seq, key=lambda pair: pair[0])
+        if index < len(history) and history[index][0] == seq:
+            history[index] = (seq, state)
+        else:
+            history.insert(index, (seq, state))
+
+    def nearest(self, room_id: str, seq: int) -> Optional[Tuple[RoomState, int]]:
+        """Return the latest snapshot at or before ``seq``."""
+        history = self.snapshots.get(room_id, [])
+        index = bisect.bisect_right(history, seq, key=lambda pair: pair[0])
+        if not index:
+            return None
+        found, state = history[index - 1]
+        return state, found
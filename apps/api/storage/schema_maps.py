@@ -0,0 +1,185 @@
+# AUTO-GENERATED by storage.build_schema_maps - DO NOT EDIT
+# Regenerate with: python -m storage.build_schema_maps
+"""Model attribute specs and table TTL attributes from ``schemas/``."""
+
+MODEL_ATTRIBUTES = {
+    "Ability": {
+        "id": {"type": "string", "required": True},
+        "name": {"type": "string", "required": True},
+        "ability_type": {"type": "string", "required": True},
+        "cooldown": {"type": "number", "required": True},
+        "mana_cost": {"type": "number", "required": True},
+        "stamina_cost": {"type": "number", "required": True},
+        "cast_time": {"type": "number", "required": True},
+        "damage": {"type": "number", "required": False},
+        "projectile_speed": {"type": "number", "required": False},
+        "max_range": {"type": "number", "required": False},
+        "effect_duration": {"type": "number", "required": False},
+        "created_at": {"type": "datetime", "required": True},
+        "updated_at": {"type": "datetime", "required": False},
+    },
+    "CombatData": {
+        "attack_damage": {"type": "integer", "required": True},
+        "attack_range": {"type": "number", "required": True},
+        "attack_cooldown": {"type": "number", "required": True},
+    },
+    "CombatEvent": {
+        "event_id": {"type": "string", "required": True},
+        "room_id": {"type": "string", "required": True},
+        "event_type": {"type": "string", "required": True},
+        "timestamp": {"type": "datetime", "required": True},
+        "source_player_id": {"type": "string", "required": False},
+        "source_enemy_id": {"type": "string", "required": False},
+        "target_player_id": {"type": "string", "required": False},
+        "target_enemy_id": {"type": "string", "required": False},
+        "ability_id": {"type": "string", "required": False},
+        "damage_amount": {"type": "number", "required": False},
+        "is_critical": {"type": "boolean", "required": False},
+        "item_id": {"type": "string", "required": False},
+        "item_quantity": {"type": "integer", "required": False},
+        "position_x": {"type": "number", "required": False},
+        "position_y": {"type": "number", "required": False},
+        "position_z": {"type": "number", "required": False},
+        "metadata": {"type": "object", "required": False},
+        "created_at": {"type": "datetime", "required": True},
+    },
+    "CombatStats": {
+        "id": {"type": "string", "required": True},
+        "max_health": {"type": "number", "required": True},
+        "max_mana": {"type": "number", "required": True},
+        "max_stamina": {"type": "number", "required": True},
+        "attack_damage": {"type": "number", "required": True},
+        "attack_speed": {"type": "number", "required": True},
+        "attack_range": {"type": "number", "required": True},
+        "armor": {"type": "number", "required": True},
+        "move_speed": {"type": "number", "required": True},
+        "critical_chance": {"type": "number", "required": True},
+        "critical_multiplier": {"type": "number", "required": True},
+        "created_at": {"type": "datetime", "required": True},
+        "updated_at": {"type": "datetime", "required": False},
+    },
+    "EnemyType": {
+        "id": {"type": "string", "required": True},
+        "name": {"type": "string", "required": True},
+        "combat_stats_id": {"type": "string", "required": True},
+        "detection_radius": {"type": "number", "required": True},
+        "attack_range": {"type": "number", "required": True},
+        "patrol_radius": {"type": "number", "required": True},
+        "attack_cooldown": {"type": "number", "required": True},
+        "attack_windup": {"type": "number", "required": True},
+        "loot_table_id": {"type": "string", "required": False},
+        "model_path": {"type": "string", "required": True},
+        "created_at": {"type": "datetime", "required": True},
+        "updated_at": {"type": "datetime", "required": False},
+    },
+    "HealthData": {
+        "max_health": {"type": "integer", "required": True},
+        "current_health": {"type": "integer", "required": True},
+    },
+    "LootTable": {
+        "id": {"type": "string", "required": True},
+        "name": {"type": "string", "required": True},
+        "drops": {
+            "type": "array",
+            "required": True,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "item_id": {"type": "string", "required": True},
+                    "item_type": {"type": "string", "required": True},
+                    "chance": {"type": "number", "required": True},
+                    "min_quantity": {"type": "integer", "required": True},
+                    "max_quantity": {"type": "integer", "required": True},
+                },
+            },
+        },
+        "created_at": {"type": "datetime", "required": True},
+        "updated_at": {"type": "datetime", "required": False},
+    },
+    "MovementData": {
+        "move_speed": {"type": "number", "required": True},
+        "rotation_speed": {"type": "number", "required": True},
+    },
+    "PlayerSession": {
+        "session_id": {"type": "string", "required": True},
+        "player_id": {"type": "string", "required": True},
+        "character_name": {"type": "string", "required": True},
+        "room_id": {"type": "string", "required": False},
+        "combat_stats_id": {"type": "string", "required": True},
+        "current_health": {"type": "number", "required": True},
+        "current_mana": {"type": "number", "required": True},
+        "current_stamina": {"type": "number", "required": True},
+        "position_x": {"type": "number", "required": False},
+        "position_y": {"type": "number", "required": False},
+        "position_z": {"type": "number", "required": False},
+        "is_alive": {"type": "boolean", "required": True},
+        "last_heartbeat": {"type": "datetime", "required": True},
+        "created_at": {"type": "datetime", "required": True},
+        "updated_at": {"type": "datetime", "required": False},
+    },
+    "RoomState": {
+        "room_id": {"type": "string", "required": True},
+        "dungeon_id": {"type": "string", "required": True},
+        "room_type": {"type": "string", "required": True},
+        "max_players": {"type": "integer", "required": True},
+        "current_player_count": {"type": "integer", "required": True},
+        "is_cleared": {"type": "boolean", "required": True},
+        "enemies": {
+            "type": "array",
+            "required": True,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "enemy_instance_id": {"type": "string", "required": True},
+                    "enemy_type_id": {"type": "string", "required": True},
+                    "current_health": {"type": "number", "required": True},
+                    "position_x": {"type": "number", "required": True},
+                    "position_y": {"type": "number", "required": True},
+                    "position_z": {"type": "number", "required": True},
+                    "is_alive": {"type": "boolean", "required": True},
+                    "aggro_player_id": {"type": "string", "required": False},
+                },
+            },
+        },
+        "loot_drops": {
+            "type": "array",
+            "required": True,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "loot_instance_id": {"type": "string", "required": True},
+                    "item_id": {"type": "string", "required": True},
+                    "item_type": {"type": "string", "required": True},
+                    "quantity": {"type": "integer", "required": True},
+                    "position_x": {"type": "number", "required": True},
+                    "position_y": {"type": "number", "required": True},
+                    "position_z": {"type": "number", "required": True},
+                    "is_picked_up": {"type": "boolean", "required": True},
+                    "picked_up_by": {"type": "string", "required": False},
+                },
+            },
+        },
+        "doors": {
+            "type": "array",
+            "required": True,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "door_id": {"type": "string", "required": True},
+                    "is_open": {"type": "boolean", "required": True},
+                    "is_locked": {"type": "boolean", "required": True},
+                    "connected_room_id": {"type": "string", "required": False},
+                },
+            },
+        },
+        "created_at": {"type": "datetime", "required": True},
+        "updated_at": {"type": "datetime", "required": False},
+        "expires_at": {"type": "datetime", "required": False},
+    },
+}
+
+TTL_ATTRIBUTES = {
+    "CombatEvent": "expires_at",
+    "PlayerSession": "expires_at",
+    "RoomState": "expires_at",
+}
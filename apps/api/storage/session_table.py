@@ -0,0 +1,138 @@
+"""Writers for the PlayerSessions table.
+
+``PlayerSessionsTable`` is keyed by ``session_id``, so a session item is the
+encoded model plus the table's ``expires_at`` TTL: epoch seconds
+``ttl_seconds`` after the session's ``last_heartbeat`` (24 hours by default),
+so sessions that stop sending heartbeats are deleted by DynamoDB. Writers
+take whole batches; the DynamoDB writer sends them with ``BatchWriteItem``
+(at most 25 puts per request) and resubmits any ``UnprocessedItems`` after
+an exponential backoff with jitter.
+"""
+
+import random
+import time
+from datetime import timezone
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence
+
+from .dynamodb_codec import codec_for, ttl_attribute
+
+BATCH_WRITE_LIMIT = 25
+TTL_ATTRIBUTE = ttl_attribute("PlayerSession") or "expires_at"
+SESSION_TTL_SECONDS = 24 * 60 * 60
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Return the jittered delay before retry number ``attempt`` (from 1)."""
+    delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def session_expires_at(session: Any, ttl_seconds: float = SESSION_TTL_SECONDS) -> int:
+    """Return a session's TTL as epoch seconds, counted from its last heartbeat."""
+    heartbeat = session.last_heartbeat
+    if heartbeat.tzinfo is None:
+        heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+    return int(heartbeat.timestamp() + ttl_seconds)
+
+
+def session_item(
+    session: Any, ttl_seconds: float = SESSION_TTL_SECONDS
+) -> Dict[str, Any]:
+    """Encode a session as a ``PlayerSessionsTable`` item with its TTL."""
+    item = codec_for("PlayerSession").encode(session)
+    item[TTL_ATTRIBUTE] = {"N": str(session_expires_at(session, ttl_seconds))}
+    return item
+
+
+class SessionWriter(Protocol):
+    """Where session state is persisted."""
+
+    def write(self, sessions: Sequence[Any]) -> None:
+        """Persist the latest state of each session (last write wins)."""
+        ...
+
+
+class DynamoDBSessionWriter:
+    """Session writer backed by the PlayerSessions DynamoDB table."""
+
+    def __init__(
+        self,
+        client: Any,
+        table: str,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        max_attempts: int = 5,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create the writer.
+
+        Args:
+            client: boto3 DynamoDB low-level client
+            table: PlayerSessions table name
+            ttl_seconds: Lifetime of a session item after its last heartbeat
+            max_attempts: Requests per chunk before unprocessed items are an error
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound of the backoff, in seconds
+            sleep: Blocking sleep used between retries
+        """
+        self._client = client
+        self._table = table
+        self._ttl_seconds = ttl_seconds
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._sleep = sleep
+        self.requests = 0
+        self.retries = 0
+        self.items = 0
+
+    def write(self, sessions: Sequence[Any]) -> None:
+        """Write sessions in ``BatchWriteItem`` chunks.
+
+        Args:
+            sessions: ``PlayerSession`` or ``CompactPlayerSession`` instances
+
+        Raises:
+            RuntimeError: If DynamoDB keeps returning unprocessed items
+        """
+        for start in range(0, len(sessions), BATCH_WRITE_LIMIT):
+            chunk = sessions[start : start + BATCH_WRITE_LIMIT]
+            pending: Optional[List[Dict[str, Any]]] = [
+                {"PutRequest": {"Item": session_item(session, self._ttl_seconds)}}
+                for session in chunk
+            ]
+            for attempt in range(self._max_attempts):
+                if attempt:
+                    self.retries += 1
+                    self._sleep(
+                        backoff_delay(attempt, self._base_delay, self._max_delay)
+                    )
+                self.requests += 1
+                response = self._client.batch_write_item(
+                    RequestItems={self._table: pending}
+                )
+                pending = response.get("UnprocessedItems", {}).get(self._table)
+                if not pending:
+                    break
+            else:
+                raise RuntimeError(
+                    f"{len(pending)} session writes left unprocessed in {self._table}"
+                )
+            self.items += len(chunk)
+
+
+class InMemorySessionWriter:
+    """Session writer over a dictionary, for tests and local runs."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[str, Any] = {}
+        self.requests = 0
+        self.items = 0
+
+    def write(self, sessions: Sequence[Any]) -> None:
+        """Record sessions, counting one request per ``BatchWriteItem`` chunk."""
+        self.requests += -(-len(sessions) // BATCH_WRITE_LIMIT)
+        self.items += len(sessions)
+        for session in sessions:
+            self.sessions[session.session_id] = session
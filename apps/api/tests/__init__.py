@@ -0,0 +1 @@
+"""Backend API tests."""
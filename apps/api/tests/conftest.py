@@ -0,0 +1,234 @@
+"""Shared fixtures for backend API tests."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+import pytest
+
+from app.config_source import InMemoryConfigSource
+from models import (
+    Ability,
+    CombatEvent,
+    CombatStats,
+    EnemyType,
+    LootTable,
+    PlayerSession,
+    RoomState,
+)
+from storage.dynamodb_codec import encode_entry
+
+NOW = datetime(2026, 2, 14, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Create a clock starting at zero."""
+    return FakeClock()
+
+
+@pytest.fixture
+def session() -> PlayerSession:
+    """Create a validated player session."""
+    return PlayerSession(
+        session_id="session-1",
+        player_id="player-1",
+        character_name="Ranger",
+        room_id="room-1",
+        combat_stats_id="player_default",
+        current_health=80.0,
+        current_mana=40.0,
+        current_stamina=60.0,
+        position_x=1.5,
+        position_y=0.0,
+        position_z=-2.25,
+        is_alive=True,
+        last_heartbeat=NOW,
+        created_at=NOW,
+        updated_at=None,
+    )
+
+
+@pytest.fixture
+def make_session(session: PlayerSession) -> Callable[..., PlayerSession]:
+    """Return a factory for variants of the ``session`` fixture.
+
+    ``make_session(session_id="session-1", seconds=0.0, **update)`` returns
+    the session under ``session_id``, its heartbeat ``seconds`` later, with
+    ``update`` applied on top.
+    """
+
+    def make(
+        session_id: str = "session-1", seconds: float = 0.0, **update
+    ) -> PlayerSession:
+        values = {
+            "session_id": session_id,
+            "last_heartbeat": session.last_heartbeat + timedelta(seconds=seconds),
+        }
+        values.update(update)
+        return session.model_copy(update=values)
+
+    return make
+
+
+@pytest.fixture
+def event() -> CombatEvent:
+    """Create a validated damage_dealt combat event."""
+    return CombatEvent(
+        event_id="event-1",
+        room_id="room-1",
+        event_type="damage_dealt",
+        timestamp=NOW,
+        source_player_id="player-1",
+        target_enemy_id="enemy-1",
+        ability_id="melee_attack",
+        damage_amount=25.0,
+        is_critical=True,
+        position_x=10.0,
+        position_y=0.0,
+        position_z=5.0,
+        metadata={"combo": 2},
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def make_event(event: CombatEvent) -> Callable[..., CombatEvent]:
+    """Return a factory for numbered variants of the ``event`` fixture.
+
+    ``make_event(n, seconds=None, **update)`` returns ``event-{n}``, timed
+    ``seconds`` (default ``n``) after the fixture event, as a plain hit
+    (``is_critical=False``, no metadata) with ``update`` applied on top.
+    """
+
+    def make(n: int, seconds: Optional[float] = None, **update) -> CombatEvent:
+        values = {
+            "event_id": f"event-{n}",
+            "timestamp": event.timestamp
+            + timedelta(seconds=n if seconds is None else seconds),
+            "is_critical": False,
+            "metadata": None,
+        }
+        values.update(update)
+        return event.model_copy(update=values)
+
+    return make
+
+
+@pytest.fixture
+def make_events(event: CombatEvent) -> Callable[..., List[CombatEvent]]:
+    """Return a factory for distinct copies of the ``event`` fixture.
+
+    ``make_events(count, room_id="room-1")`` returns ``count`` events in one
+    room, with IDs ``{room_id}-event-{i}``.
+    """
+
+    def make(count: int, room_id: str = "room-1") -> List[CombatEvent]:
+        return [
+            event.model_copy(
+                update={"event_id": f"{room_id}-event-{i}", "room_id": room_id}
+            )
+            for i in range(count)
+        ]
+
+    return make
+
+
+@pytest.fixture
+def room() -> RoomState:
+    """Create a combat room with two enemies, one loot drop and one door."""
+    return RoomState(
+        room_id="room-1",
+        dungeon_id="dungeon-1",
+        room_type="combat",
+        max_players=4,
+        current_player_count=2,
+        is_cleared=False,
+        enemies=[
+            encode_entry(
+                {
+                    "enemy_instance_id": f"enemy-{i}",
+                    "enemy_type_id": "skeleton",
+                    "current_health": 30.5,
+                    "position_x": float(i),
+                    "position_y": 0.0,
+                    "position_z": 2.0,
+                    "is_alive": True,
+                }
+            )
+            for i in (1, 2)
+        ],
+        loot_drops=[
+            encode_entry(
+                {
+                    "loot_instance_id": "loot-1",
+                    "item_id": "gold",
+                    "item_type": "gold",
+                    "quantity": 5,
+                    "position_x": 1.0,
+                    "position_y": 0.0,
+                    "position_z": 2.0,
+                    "is_picked_up": False,
+                }
+            )
+        ],
+        doors=[
+            encode_entry({"door_id": "door-1", "is_open": False, "is_locked": True})
+        ],
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def config_source() -> InMemoryConfigSource:
+    """Create a config source with one item of each config model."""
+    return InMemoryConfigSource(
+        [
+            CombatStats(
+                id="player_default",
+                max_health=100.0,
+                max_mana=50.0,
+                max_stamina=100.0,
+                attack_damage=10.0,
+                attack_speed=1.0,
+                attack_range=2.0,
+                armor=5.0,
+                move_speed=5.0,
+                critical_chance=0.1,
+                critical_multiplier=2.0,
+                created_at=NOW,
+            ),
+            EnemyType(
+                id="skeleton",
+                name="Skeleton",
+                combat_stats_id="player_default",
+                detection_radius=10.0,
+                attack_range=2.0,
+                patrol_radius=5.0,
+                attack_cooldown=1.5,
+                attack_windup=0.4,
+                model_path="res://skeleton.glb",
+                created_at=NOW,
+            ),
+            LootTable(id="skeleton_loot", name="Skeleton", drops=[], created_at=NOW),
+            Ability(
+                id="fireball",
+                name="Fireball",
+                ability_type="projectile",
+                cooldown=5.0,
+                mana_cost=20.0,
+                stamina_cost=0.0,
+                cast_time=0.5,
+                created_at=NOW,
+            ),
+        ]
+    )
@@ -0,0 +1,131 @@
+"""Unit tests for the config bundle builder and endpoints."""
+
+import gzip
+import json
+from datetime import datetime, timezone
+
+import brotli
+import pytest
+from fastapi.testclient import TestClient
+
+from app.bundle import build_bundle, negotiate_encoding
+from app.config_source import InMemoryConfigSource
+from app.main import create_app
+from app.settings import Settings
+from models import LootTable
+
+NOW = datetime(2026, 2, 14, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def client(config_source: InMemoryConfigSource) -> TestClient:
+    """Create a test client over the in-memory source."""
+    return TestClient(create_app(Settings(), config_source))
+
+
+class TestBuildBundle:
+    """Tests for build_bundle."""
+
+    def test_contains_every_section(self, config_source):
+        """Test that every config model is included."""
+        bundle = build_bundle(config_source)
+        assert bundle.counts == {
+            "combat_stats": 1,
+            "enemy_types": 1,
+            "loot_tables": 1,
+            "abilities": 1,
+        }
+        body = json.loads(bundle.body("identity"))
+        assert body["version"] == bundle.version
+        assert body["config"]["abilities"][0]["id"] == "fireball"
+
+    def test_encodings_decompress_to_same_body(self, config_source):
+        """Test that precompressed bodies match the raw body."""
+        bundle = build_bundle(config_source)
+        raw = bundle.body("identity")
+        assert gzip.decompress(bundle.body("gzip")) == raw
+        assert brotli.decompress(bundle.body("br")) == raw
+
+    def test_version_tracks_content(self, config_source):
+        """Test that the version is stable and changes with content."""
+        first = build_bundle(config_source)
+        assert build_bundle(config_source).version == first.version
+        config_source.put(
+            LootTable(id="boss_loot", name="Boss", drops=[], created_at=NOW)
+        )
+        assert build_bundle(config_source).version != first.version
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            (None, "identity"),
+            ("gzip, deflate", "gzip"),
+            ("gzip, br", "br"),
+            ("br;q=0, gzip", "gzip"),
+            ("*", "br"),
+            ("*, br;q=0", "gzip"),
+            ("br;q=0, *", "gzip"),
+            ("*;q=0, gzip", "gzip"),
+            ("deflate", "identity"),
+        ],
+    )
+    def test_negotiation(self, header, expected):
+        """Test encoding preference and q=0 exclusion."""
+        assert negotiate_encoding(header) == expected
+
+
+class TestBundleRoutes:
+    """Tests for the bundle endpoints."""
+
+    def test_version_then_bundle(self, client, config_source):
+        """Test the version check and a compressed bundle download."""
+        version = client.get("/api/config/version").json()["version"]
+        response = client.get("/api/config/bundle", headers={"Accept-Encoding": "br"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["x-bundle-version"] == version
+        assert response.json()["version"] == version
+
+    def test_bundle_built_once(self, client, config_source):
+        """Test that repeated requests reuse the built bundle."""
+        client.get("/api/config/version")
+        client.get("/api/config/bundle")
+        client.get("/api/config/bundle")
+        assert config_source.reads == 4  # one scan per config model
+
+    def test_if_none_match_returns_304(self, client):
+        """Test that clients with the current bundle get 304."""
+        etag = client.get("/api/config/bundle").headers["etag"]
+        response = client.get("/api/config/bundle", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_each_encoding_has_its_own_etag(self, client):
+        """Test that an ETag only validates the encoding it was served with."""
+        etags = {
+            encoding: client.get(
+                "/api/config/bundle", headers={"Accept-Encoding": encoding}
+            ).headers["etag"]
+            for encoding in ("br", "gzip", "identity")
+        }
+        version = client.get("/api/config/version").json()["version"]
+        assert etags == {
+            "br": f'"{version}-br"',
+            "gzip": f'"{version}-gz"',
+            "identity": f'"{version}"',
+        }
+        response = client.get(
+            "/api/config/bundle",
+            headers={"Accept-Encoding": "identity", "If-None-Match": etags["br"]},
+        )
+        assert response.status_code == 200
+
+    def test_pinned_version(self, client):
+        """Test that a pinned version is immutable and stale versions 404."""
+        version = client.get("/api/config/version").json()["version"]
+        response = client.get(f"/api/config/bundle/{version}")
+        assert "immutable" in response.headers["cache-control"]
+        assert client.get("/api/config/bundle/deadbeef").status_code == 404
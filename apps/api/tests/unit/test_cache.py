@@ -0,0 +1,57 @@
+"""Unit tests for the TTL + LRU cache."""
+
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_hit_and_miss(self):
+        """Test basic get/put and hit counters."""
+        cache = TTLCache(max_entries=2)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_expire(self, clock):
+        """Test that entries are dropped after their TTL."""
+        cache = TTLCache(ttl_seconds=10, clock=clock)
+        cache.put("a", 1)
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl(self, clock):
+        """Test that an entry can be given a shorter TTL than the cache's."""
+        cache = TTLCache(ttl_seconds=10, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2, ttl_seconds=2)
+        clock.now = 1.9
+        assert cache.get("b") == 2
+        clock.now = 2.0
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_least_recently_used_is_evicted(self):
+        """Test LRU eviction when the cache is full."""
+        cache = TTLCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate(self):
+        """Test dropping one or all entries."""
+        cache = TTLCache()
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        cache.invalidate()
+        assert len(cache) == 0
@@ -0,0 +1,145 @@
+"""Unit tests for columnar CombatEvent batches."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from analytics.columnar import Categorical, CombatEventBatch
+from models import CombatEvent
+from wire.epoch import EpochCombatEvent
+
+
+@pytest.fixture
+def events(event: CombatEvent) -> list:
+    """Create a small mixed batch of events across two rooms."""
+    return [
+        event,
+        event.model_copy(
+            update={"event_id": "e2", "damage_amount": 10.0, "is_critical": False}
+        ),
+        event.model_copy(
+            update={
+                "event_id": "e3",
+                "source_player_id": "player-2",
+                "room_id": "room-2",
+            }
+        ),
+        event.model_copy(
+            update={"event_id": "e4", "event_type": "enemy_died", "damage_amount": None}
+        ),
+    ]
+
+
+class TestCategorical:
+    """Tests for Categorical encoding."""
+
+    def test_encode_and_decode(self):
+        """Test that encoding assigns first-seen codes and -1 for missing."""
+        column = Categorical.encode(["a", None, "b", "a"])
+        assert column.codes.tolist() == [0, -1, 1, 0]
+        assert column.categories == ["a", "b"]
+        assert column.decode() == ["a", None, "b", "a"]
+
+
+class TestCombatEventBatch:
+    """Tests for CombatEventBatch."""
+
+    def test_from_models(self, events):
+        """Test that model lists convert into typed columns."""
+        batch = CombatEventBatch.from_models(events)
+        assert len(batch) == 4
+        assert batch["damage_amount"].dtype == np.float64
+        assert math.isnan(batch["damage_amount"][3])
+        assert batch["timestamp"].dtype == np.dtype("datetime64[us]")
+        assert batch["event_type"].decode()[3] == "enemy_died"
+
+    def test_ndjson_matches_models(self, events):
+        """Test that NDJSON input produces the same columns as models."""
+        lines = [e.model_dump_json() for e in events]
+        from_json = CombatEventBatch.from_ndjson(lines)
+        from_models = CombatEventBatch.from_models(events)
+        assert from_json.damage_by_player_room() == from_models.damage_by_player_room()
+        assert (from_json["timestamp"] == from_models["timestamp"]).all()
+
+    def test_dynamodb_pages(self):
+        """Test decoding low-level DynamoDB query pages."""
+        item = {
+            "event_id": {"S": "e1"},
+            "room_id": {"S": "room-1"},
+            "event_type": {"S": "damage_dealt"},
+            "timestamp": {"S": "2026-02-14T12:00:00Z"},
+            "created_at": {"S": "2026-02-14T12:00:00Z"},
+            "source_player_id": {"S": "player-1"},
+            "damage_amount": {"N": "12.5"},
+            "is_critical": {"BOOL": True},
+            "item_id": {"NULL": True},
+            "metadata": {"M": {"combo": {"N": "2"}}},
+        }
+        batch = CombatEventBatch.from_dynamodb_pages(
+            [{"Items": [item]}, {"Items": [item]}]
+        )
+        assert len(batch) == 2
+        assert batch.is_critical.all()
+        assert batch.damage_by_player_room() == {("room-1", "player-1"): 25.0}
+        assert batch.metadata[0] == {"combo": 2}
+        assert batch["timestamp"][0] == np.datetime64("2026-02-14T12:00:00", "us")
+
+    def test_epoch_millisecond_timestamps(self, events):
+        """Test that numeric timestamps from the epoch models are read as ms."""
+        epoch = [EpochCombatEvent.from_model(e) for e in events]
+        from_models = CombatEventBatch.from_models(events)
+        from_epoch = CombatEventBatch.from_models(epoch)
+        lines = [e.model_dump_json() for e in epoch]
+        from_json = CombatEventBatch.from_ndjson(lines)
+        assert isinstance(json.loads(lines[0])["timestamp"], int)
+        for batch in (from_epoch, from_json):
+            assert (batch["timestamp"] == from_models["timestamp"]).all()
+            assert (batch["created_at"] == from_models["created_at"]).all()
+        row = {"event_id": "e9", "timestamp": 1.5, "created_at": 0}
+        times = CombatEventBatch.from_rows([row]).times
+        assert times["timestamp"][0] == np.datetime64(1500, "us")
+
+    def test_damage_by_player_room(self, events):
+        """Test the damage-per-player-per-room rollup."""
+        batch = CombatEventBatch.from_models(events)
+        assert batch.damage_by_player_room() == {
+            ("room-1", "player-1"): 35.0,
+            ("room-2", "player-2"): 25.0,
+        }
+
+    def test_group_by_aggregations(self, events):
+        """Test count/mean/min/max aggregations and NaN skipping."""
+        batch = CombatEventBatch.from_models(events)
+        keys = ("source_player_id",)
+        assert batch.group_by(keys, agg="count") == {
+            ("player-1",): 3.0,
+            ("player-2",): 1.0,
+        }
+        assert batch.group_by(keys, "damage_amount", "mean")[("player-1",)] == 17.5
+        assert batch.group_by(keys, "damage_amount", "min")[("player-1",)] == 10.0
+        assert batch.group_by(keys, "damage_amount", "max")[("player-1",)] == 25.0
+
+    def test_group_by_missing_key(self, events):
+        """Test that missing categorical values group under None."""
+        batch = CombatEventBatch.from_models(events)
+        assert batch.group_by(("item_id",), agg="count") == {(None,): 4.0}
+
+    def test_mask_with_collection(self, events):
+        """Test filtering on a set of categorical values."""
+        batch = CombatEventBatch.from_models(events)
+        mask = batch.mask(room_id={"room-2", "room-unknown"})
+        assert mask.tolist() == [False, False, True, False]
+        assert batch.filter(mask).event_ids.tolist() == ["e3"]
+
+    def test_crit_rate_by_player(self, events):
+        """Test critical hit rate per player."""
+        batch = CombatEventBatch.from_models(events)
+        assert batch.crit_rate_by_player() == {("player-1",): 0.5, ("player-2",): 1.0}
+
+    def test_unknown_aggregation(self, events):
+        """Test that unknown aggregations are rejected."""
+        batch = CombatEventBatch.from_models(events)
+        with pytest.raises(ValueError):
+            batch.group_by(("room_id",), "damage_amount", "median")
@@ -0,0 +1,45 @@
+"""Unit tests for compact runtime models."""
+
+import sys
+
+from models import CombatEvent, PlayerSession
+from runtime.compact import CompactCombatEvent, CompactPlayerSession
+
+
+class TestCompactPlayerSession:
+    """Tests for CompactPlayerSession."""
+
+    def test_fields_match_model(self):
+        """Test that the compact form covers every PlayerSession field in order."""
+        assert list(CompactPlayerSession.__slots__) == list(PlayerSession.model_fields)
+
+    def test_round_trip_is_lossless(self, session: PlayerSession):
+        """Test that converting to compact and back preserves every value."""
+        compact = CompactPlayerSession.from_model(session)
+        assert compact.to_model() == session
+
+    def test_has_no_instance_dict(self, session: PlayerSession):
+        """Test that compact sessions are slotted."""
+        compact = CompactPlayerSession.from_model(session)
+        assert not hasattr(compact, "__dict__")
+        assert sys.getsizeof(compact) < sys.getsizeof(session.__dict__)
+
+    def test_model_validate_from_attributes(self, session: PlayerSession):
+        """Test that from_attributes validation accepts the compact form."""
+        compact = CompactPlayerSession.from_model(session)
+        assert PlayerSession.model_validate(compact) == session
+
+
+class TestCompactCombatEvent:
+    """Tests for CompactCombatEvent."""
+
+    def test_fields_match_model(self):
+        """Test that the compact form covers every CombatEvent field in order."""
+        assert list(CompactCombatEvent.__slots__) == list(CombatEvent.model_fields)
+
+    def test_round_trip_is_lossless(self, event: CombatEvent):
+        """Test that converting to compact and back preserves every value."""
+        compact = CompactCombatEvent.from_model(event)
+        restored = compact.to_model()
+        assert restored == event
+        assert restored.model_dump_json() == event.model_dump_json()
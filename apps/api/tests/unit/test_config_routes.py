@@ -0,0 +1,80 @@
+"""Unit tests for the cached config read endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import TTLCache
+from app.config_source import InMemoryConfigSource
+from app.main import create_app
+from app.settings import Settings
+
+
+@pytest.fixture
+def client(config_source: InMemoryConfigSource) -> TestClient:
+    """Create a test client over the in-memory source."""
+    return TestClient(create_app(Settings(config_max_age=30), config_source))
+
+
+class TestConfigRoutes:
+    """Tests for the config read endpoints."""
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/combat-stats/player_default",
+            "/api/enemy-types/skeleton",
+            "/api/loot-tables/skeleton_loot",
+            "/api/abilities/fireball",
+        ],
+    )
+    def test_get_returns_envelope_with_etag(self, client: TestClient, path: str):
+        """Test that each endpoint returns the generated GetResponse envelope."""
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "public, max-age=30"
+
+    def test_warm_cache_costs_no_reads(self, client, config_source):
+        """Test that repeated requests are served from the cache."""
+        first = client.get("/api/abilities/fireball")
+        second = client.get("/api/abilities/fireball")
+        assert config_source.reads == 1
+        assert first.content == second.content
+        assert first.headers["etag"] == second.headers["etag"]
+
+    def test_if_none_match_returns_304(self, client, config_source):
+        """Test that a matching If-None-Match short-circuits to 304."""
+        etag = client.get("/api/combat-stats/player_default").headers["etag"]
+        response = client.get(
+            "/api/combat-stats/player_default",
+            headers={"If-None-Match": f'W/"x", {etag}'},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert config_source.reads == 1
+
+    def test_stale_etag_returns_body(self, client):
+        """Test that a non-matching ETag gets the full response."""
+        response = client.get(
+            "/api/abilities/fireball", headers={"If-None-Match": '"old"'}
+        )
+        assert response.status_code == 200
+        assert response.json()["item"]["id"] == "fireball"
+
+    def test_missing_item_is_404_and_briefly_cached(self, config_source, clock):
+        """Test that unknown IDs return 404 and are re-read once the short TTL ends."""
+        app = create_app(Settings(config_negative_ttl=5.0), config_source)
+        app.state.config_cache = TTLCache(ttl_seconds=300.0, clock=clock)
+        client = TestClient(app)
+        response = client.get("/api/enemy-types/dragon")
+        assert response.status_code == 404
+        assert response.json()["success"] is False
+        assert "etag" not in response.headers
+        clock.now = 4.9
+        client.get("/api/enemy-types/dragon")
+        assert config_source.reads == 1
+        clock.now = 5.0
+        client.get("/api/enemy-types/dragon")
+        assert config_source.reads == 2
@@ -0,0 +1,130 @@
+"""Unit tests for server-side damage validation."""
+
+import numpy as np
+import pytest
+
+from analytics.columnar import CombatEventBatch
+from models import Ability, CombatStats
+from rules.damage import (
+    MISMATCH,
+    MISSING_AMOUNT,
+    NOT_CHECKED,
+    OK,
+    UNKNOWN_SOURCE,
+    DamageValidator,
+    StatsIndex,
+    expected_damage,
+)
+
+
+@pytest.fixture
+def stats(config_source) -> dict:
+    """Create player and skeleton stats with distinct armor and multipliers."""
+    player = config_source.get("CombatStats", "player_default")
+    skeleton = player.model_copy(
+        update={"id": "skeleton", "armor": 2.0, "critical_multiplier": 1.5}
+    )
+    return {"player_default": player, "skeleton": skeleton}
+
+
+@pytest.fixture
+def fireball(config_source) -> Ability:
+    """Create a fireball that deals 30 damage."""
+    return config_source.get("Ability", "fireball").model_copy(update={"damage": 30.0})
+
+
+@pytest.fixture
+def validator(stats, fireball) -> DamageValidator:
+    """Create a validator for one player and two skeletons."""
+    return DamageValidator(
+        StatsIndex(stats.values(), [fireball]),
+        player_stats={"player-1": "player_default"},
+        enemy_stats={"enemy-1": "skeleton", "enemy-2": "skeleton"},
+    )
+
+
+class TestDamageValidator:
+    """Tests for DamageValidator."""
+
+    def test_matches_scalar_formula(self, validator, stats, fireball, make_event):
+        """Test accepted claims for melee, ability, critical and enemy attacks."""
+        player, skeleton = stats["player_default"], stats["skeleton"]
+        cases = [
+            (
+                dict(ability_id="melee_attack", is_critical=False),
+                player,
+                skeleton,
+                None,
+            ),
+            (dict(ability_id="melee_attack", is_critical=True), player, skeleton, None),
+            (dict(ability_id="fireball", is_critical=True), player, skeleton, fireball),
+            (
+                dict(
+                    event_type="damage_taken",
+                    source_player_id=None,
+                    source_enemy_id="enemy-2",
+                    target_enemy_id=None,
+                    target_player_id="player-1",
+                    ability_id=None,
+                    is_critical=False,
+                ),
+                skeleton,
+                player,
+                None,
+            ),
+        ]
+        events = []
+        for n, (update, attacker, target, ability) in enumerate(cases):
+            amount = expected_damage(attacker, target, update["is_critical"], ability)
+            events.append(make_event(n, damage_amount=amount, **update))
+        verdict = validator.validate(CombatEventBatch.from_models(events))
+        assert verdict.reason.tolist() == [OK] * 4
+        assert verdict.expected.tolist() == pytest.approx([8.0, 16.0, 56.0, 5.0])
+
+    def test_rejections(self, validator, make_event):
+        """Test mismatched, missing and unattributable claims."""
+        events = [
+            make_event(0, is_critical=False, damage_amount=999.0),
+            make_event(1, damage_amount=None),
+            make_event(2, source_player_id="player-unknown"),
+            make_event(3, event_type="loot_dropped", damage_amount=None),
+        ]
+        batch = CombatEventBatch.from_models(events)
+        verdict = validator.validate(batch)
+        assert verdict.reason.tolist() == [
+            MISMATCH,
+            MISSING_AMOUNT,
+            UNKNOWN_SOURCE,
+            NOT_CHECKED,
+        ]
+        assert verdict.accepted.tolist() == [False, False, False, True]
+        assert verdict.rejected(batch.event_ids) == ["event-0", "event-1", "event-2"]
+        assert np.isnan(verdict.expected[2])
+
+    def test_minimum_damage_is_one(self, stats, make_event):
+        """Test that armor can never reduce a hit below one point."""
+        tank = stats["skeleton"].model_copy(update={"armor": 500.0})
+        validator = DamageValidator(
+            StatsIndex([stats["player_default"], tank]),
+            {"player-1": "player_default"},
+            {"enemy-1": "skeleton"},
+        )
+        verdict = validator.validate(
+            CombatEventBatch.from_models(
+                [make_event(0, is_critical=True, damage_amount=2.0)]
+            )
+        )
+        assert verdict.expected.tolist() == [2.0]
+
+    def test_index_from_config_source(self, config_source):
+        """Test building the index from the config tables."""
+        index = StatsIndex.from_config_source(config_source)
+        assert index.stats_row == {"player_default": 0}
+        assert np.isnan(index.ability_damage[index.ability_row["fireball"]])
+
+
+def test_scalar_formula(stats: dict):
+    """Test the scalar reference formula directly."""
+    attacker: CombatStats = stats["player_default"]
+    assert expected_damage(attacker, stats["skeleton"], False) == 8.0
+    assert expected_damage(attacker, stats["skeleton"], True) == 16.0
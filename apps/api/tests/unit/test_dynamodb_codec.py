@@ -0,0 +1,103 @@
+"""Unit tests for the schema-driven DynamoDB codec."""
+
+from datetime import datetime, timezone
+
+import pytest
+from boto3.dynamodb.types import TypeDeserializer
+
+from models import CombatEvent, PlayerSession, RoomState
+from storage import build_schema_maps
+from storage.dynamodb_codec import codec_for, decode_entry, ttl_attribute
+from storage.schema_maps import MODEL_ATTRIBUTES, TTL_ATTRIBUTES
+
+
+class TestModelCodec:
+    """Tests for ModelCodec."""
+
+    @pytest.mark.parametrize("name", sorted(MODEL_ATTRIBUTES))
+    def test_every_schema_builds(self, name):
+        """Test that a codec can be built for every model schema."""
+        assert codec_for(name).model.__name__ == name
+
+    @pytest.mark.skipif(
+        not build_schema_maps.REPO_SCHEMAS.is_dir(), reason="schemas/ not available"
+    )
+    def test_schema_maps_match_the_schemas(self):
+        """Test that the packaged schema maps were regenerated from the YAML."""
+        attributes, ttl = build_schema_maps.build()
+        assert attributes == MODEL_ATTRIBUTES
+        assert ttl == TTL_ATTRIBUTES
+
+    def test_session_round_trip(self, session: PlayerSession):
+        """Test that a session survives encode/decode exactly."""
+        codec = codec_for("PlayerSession")
+        item = codec.encode(session)
+        assert item["current_health"] == {"N": "80.0"}
+        assert "updated_at" not in item
+        assert codec.decode(item) == session
+
+    def test_event_round_trip(self, event: CombatEvent):
+        """Test that an event with metadata survives encode/decode exactly."""
+        codec = codec_for("CombatEvent")
+        assert codec.decode(codec.encode(event)) == event
+
+    def test_room_entries_stored_as_maps(self, room: RoomState):
+        """Test that JSON entry strings are stored as typed DynamoDB maps."""
+        codec = codec_for("RoomState")
+        item = codec.encode(room)
+        enemy = item["enemies"]["L"][0]["M"]
+        assert enemy["current_health"] == {"N": "30.5"}
+        assert item["loot_drops"]["L"][0]["M"]["quantity"] == {"N": "5"}
+        decoded = codec.decode(item)
+        assert decoded == room
+        assert decode_entry(decoded.loot_drops[0])["quantity"] == 5
+
+    def test_items_are_boto3_compatible(self, room: RoomState):
+        """Test that encoded items deserialize with boto3's TypeDeserializer."""
+        item = codec_for("RoomState").encode(room)
+        deserializer = TypeDeserializer()
+        plain = {k: deserializer.deserialize(v) for k, v in item.items()}
+        assert plain["enemies"][0]["enemy_type_id"] == "skeleton"
+
+    def test_missing_optional_uses_default(self, event: CombatEvent):
+        """Test that absent optional attributes fall back to model defaults."""
+        codec = codec_for("CombatEvent")
+        item = codec.encode(event)
+        del item["is_critical"]
+        item["item_id"] = {"NULL": True}
+        decoded = codec.decode(item)
+        assert decoded.is_critical is False
+        assert decoded.item_id is None
+
+    def test_missing_required_raises(self, session: PlayerSession):
+        """Test that absent required attributes are rejected."""
+        codec = codec_for("PlayerSession")
+        item = codec.encode(session)
+        del item["player_id"]
+        with pytest.raises(ValueError, match="player_id"):
+            codec.decode(item)
+
+    def test_non_finite_number_rejected(self, session: PlayerSession):
+        """Test that NaN cannot be written to DynamoDB."""
+        with pytest.raises(ValueError):
+            codec_for("PlayerSession").encode(
+                session.model_copy(update={"position_x": float("nan")})
+            )
+
+    def test_ttl_attribute_stored_as_epoch_seconds(self, room: RoomState):
+        """Test that the table's TTL attribute is a Number DynamoDB can expire on."""
+        codec = codec_for("RoomState")
+        expiry = datetime(2026, 2, 15, 12, 0, 30, tzinfo=timezone.utc)
+        item = codec.encode(room.model_copy(update={"expires_at": expiry}))
+
+        assert codec.ttl_attribute == "expires_at"
+        assert item["expires_at"] == {"N": str(int(expiry.timestamp()))}
+        assert codec.decode(item).expires_at == expiry
+        item["expires_at"] = {"S": expiry.isoformat()}
+        assert codec.decode(item).expires_at == expiry
+
+    def test_ttl_attributes_come_from_table_schemas(self):
+        """Test that TTL attributes come from the table schemas."""
+        assert ttl_attribute("RoomState") == "expires_at"
+        assert ttl_attribute("CombatEvent") == "expires_at"
+        assert ttl_attribute("CombatStats") is None
@@ -0,0 +1,85 @@
+"""Unit tests for epoch-millisecond model variants."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from models import CombatEvent, PlayerSession
+from storage.dynamodb_codec import codec_for
+from storage.event_table import expires_at
+from wire.epoch import EpochCombatEvent, EpochPlayerSession, from_epoch_ms, to_epoch_ms
+from wire.session_codec import decode_batch, encode_batch
+
+
+class TestEpochCombatEvent:
+    """Tests for EpochCombatEvent."""
+
+    def test_accepts_every_timestamp_form(self, event: CombatEvent):
+        """Test that numbers in any unit, datetimes and ISO strings agree."""
+        expected = to_epoch_ms(event.timestamp)
+        payload = event.model_dump()
+        for value in (
+            expected,
+            expected / 1000,
+            expected * 1000,
+            expected * 1_000_000,
+            str(expected),
+            str(expected / 1000),
+            event.timestamp,
+            event.timestamp.isoformat(),
+        ):
+            payload["timestamp"] = value
+            assert EpochCombatEvent.model_validate(payload).timestamp == expected
+
+    def test_serializes_integers(self, event: CombatEvent):
+        """Test that JSON output carries integer timestamps."""
+        epoch = EpochCombatEvent.from_model(event)
+        dumped = json.loads(epoch.model_dump_json())
+        assert dumped["timestamp"] == to_epoch_ms(event.timestamp)
+        assert isinstance(dumped["created_at"], int)
+
+    def test_round_trip(self, event: CombatEvent):
+        """Test conversion to and from the standard model."""
+        epoch = EpochCombatEvent.from_model(event)
+        assert epoch.timestamp_dt == event.timestamp
+        assert epoch.to_model() == event
+
+    def test_unit_follows_magnitude_not_type(self, event: CombatEvent):
+        """Test that integer unix seconds are not read as milliseconds."""
+        expected = to_epoch_ms(event.timestamp) // 1000 * 1000
+        payload = {**event.model_dump(), "timestamp": expected // 1000}
+        assert EpochCombatEvent.model_validate(payload).timestamp == expected
+        payload["timestamp"] = float(expected)
+        assert EpochCombatEvent.model_validate(payload).timestamp == expected
+
+    def test_is_not_a_combat_event(self, event: CombatEvent):
+        """Test that the variant must be converted before datetime-only code."""
+        epoch = EpochCombatEvent.from_model(event)
+        assert not isinstance(epoch, CombatEvent)
+        model = epoch.to_model()
+        assert codec_for("CombatEvent").decode(codec_for("CombatEvent").encode(model))
+        assert expires_at(model) == expires_at(event)
+
+    def test_rejects_boolean(self, event: CombatEvent):
+        """Test that booleans are not mistaken for timestamps."""
+        with pytest.raises(ValidationError):
+            EpochCombatEvent.model_validate({**event.model_dump(), "timestamp": True})
+
+
+class TestEpochPlayerSession:
+    """Tests for EpochPlayerSession."""
+
+    def test_round_trip(self, session: PlayerSession):
+        """Test conversion to and from the standard model."""
+        epoch = EpochPlayerSession.from_model(session)
+        assert isinstance(epoch.last_heartbeat, int)
+        assert not isinstance(epoch, PlayerSession)
+        assert epoch.to_model() == session
+
+    def test_wire_codec_accepts_epoch_sessions(self, session: PlayerSession):
+        """Test that the binary codec reads integer heartbeats directly."""
+        epoch = EpochPlayerSession.from_model(session)
+        (update,) = decode_batch(encode_batch([epoch], {"session-1": 0}))
+        assert update.heartbeat_ms == epoch.last_heartbeat
+        assert from_epoch_ms(update.heartbeat_ms) == session.last_heartbeat
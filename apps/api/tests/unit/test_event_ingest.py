@@ -0,0 +1,262 @@
+"""Unit tests for batched combat event ingest."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.settings import Settings
+from runtime.event_ingest import EventIngest
+from storage import event_table
+from storage.event_table import DynamoDBEventWriter, InMemoryEventWriter, expires_at
+from storage.room_table import DynamoDBRoomEventLog
+
+
+def unlogged(events):
+    """Return events as ``(seq, event)`` pairs outside any room log."""
+    return [(None, e) for e in events]
+
+
+class ClientError(Exception):
+    """Stand-in for botocore's ClientError."""
+
+    def __init__(self, code) -> None:
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class FlakyClient:
+    """Fake DynamoDB client that leaves the first items of a request unprocessed."""
+
+    class exceptions:
+        ClientError = ClientError
+
+    def __init__(self, unprocessed) -> None:
+        self.unprocessed = list(unprocessed)
+        self.calls = []
+        self.puts = []
+
+    def put_item(self, TableName, Item):
+        self.puts.append(Item)
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems["events"]
+        self.calls.append(requests)
+        keys = [(r["PutRequest"]["Item"]["event_id"]["S"]) for r in requests]
+        if len(set(keys)) != len(keys):
+            raise ClientError("ValidationException")
+        left = self.unprocessed.pop(0) if self.unprocessed else 0
+        return {"UnprocessedItems": {"events": requests[:left]} if left else {}}
+
+
+class TestDynamoDBEventWriter:
+    """Tests for DynamoDBEventWriter."""
+
+    def test_retries_with_backoff_and_sets_ttl(self, event, make_events):
+        """Test chunking, retries of unprocessed items and expires_at."""
+        client = FlakyClient([4, 1])
+        delays = []
+        writer = DynamoDBEventWriter(client, "events", sleep=delays.append)
+        assert writer.write(unlogged(make_events(30))) == []
+        assert [len(call) for call in client.calls] == [25, 4, 1, 5]
+        assert len(delays) == 2 and delays[0] <= 0.05 < delays[1] * 2
+        item = client.calls[0][0]["PutRequest"]["Item"]
+        assert item["expires_at"] == {"N": str(expires_at(event))}
+        assert expires_at(event) == int(
+            (event.timestamp + timedelta(days=1)).timestamp()
+        )
+        assert (writer.requests, writer.retries, writer.items) == (4, 2, 30)
+
+    def test_returns_events_left_unprocessed(self, make_events):
+        """Test that persistently unprocessed items are handed back."""
+        client = FlakyClient([2, 2, 2])
+        writer = DynamoDBEventWriter(
+            client, "events", max_attempts=3, sleep=lambda delay: None
+        )
+        events = unlogged(make_events(5))
+        assert writer.write(events) == events[:2]
+        assert writer.items == 3
+
+    def test_duplicate_keys_are_written_once(self, make_events):
+        """Test that a chunk never sends the same key twice."""
+        client = FlakyClient([])
+        writer = DynamoDBEventWriter(client, "events")
+        first, second = make_events(2)
+        retry = first.model_copy(update={"damage_amount": 99.0})
+        assert writer.write([(1, first), (2, second), (3, retry)]) == []
+        items = [r["PutRequest"]["Item"] for r in client.calls[0]]
+        assert [i["event_seq"]["N"] for i in items] == ["3", "2"]
+        assert writer.items == 2
+
+    def test_invalid_items_are_given_up_one_by_one(self, make_events, monkeypatch):
+        """Test that a ValidationException drops only the invalid item."""
+
+        class RejectingClient(FlakyClient):
+            def batch_write_item(self, RequestItems):
+                requests = RequestItems["events"]
+                self.calls.append(requests)
+                if any("bad" in r["PutRequest"]["Item"] for r in requests):
+                    raise ClientError("ValidationException")
+                return {}
+
+        client = RejectingClient([])
+        writer = DynamoDBEventWriter(client, "events", sleep=lambda delay: None)
+        events = unlogged(make_events(3))
+        bad = events[1]
+        original = event_table.event_item
+
+        def item(e, seq, ttl):
+            encoded = original(e, seq, ttl)
+            if e is bad[1]:
+                encoded["bad"] = {"S": "x"}
+            return encoded
+
+        monkeypatch.setattr(event_table, "event_item", item)
+        assert writer.write(events) == [bad]
+        assert [len(call) for call in client.calls] == [3, 1, 1, 1]
+        assert (writer.rejected, writer.items) == (1, 2)
+
+        class DownClient(FlakyClient):
+            def batch_write_item(self, RequestItems):
+                raise ClientError("InternalServerError")
+
+        with pytest.raises(ClientError):
+            DynamoDBEventWriter(DownClient([]), "events").write(events)
+
+    def test_room_log_appends_match_batched_items(self, event):
+        """Test that room log appends carry the seq and TTL batched writes do."""
+        client = FlakyClient([])
+        DynamoDBRoomEventLog(client, "events").append(event, 7)
+        DynamoDBEventWriter(client, "events").write([(7, event)])
+        assert client.puts[0] == client.calls[0][0]["PutRequest"]["Item"]
+        assert client.puts[0]["event_seq"] == {"N": "7"}
+        assert client.puts[0]["expires_at"] == {"N": str(expires_at(event))}
+
+
+class BrokenWriter:
+    """Writer that raises on its first call."""
+
+    def __init__(self) -> None:
+        self.inner = InMemoryEventWriter()
+        self.calls = 0
+
+    def write(self, events):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("network down")
+        return self.inner.write(events)
+
+
+class TestEventIngest:
+    """Tests for EventIngest."""
+
+    def test_take_full_batches_then_pack_the_rest(self, make_events):
+        """Test per-room full batches and packing of partial ones."""
+        ingest = EventIngest(InMemoryEventWriter())
+        for e in make_events(30) + make_events(10, "room-2"):
+            ingest.submit(e)
+        full = ingest.take(everything=False)
+        assert [len(batch) for batch in full] == [25]
+        assert ingest.depth == 15
+        rest = ingest.take()
+        assert [len(batch) for batch in rest] == [15]
+        assert {e.room_id for _, e in rest[0]} == {"room-1", "room-2"}
+        assert ingest.depth == 0
+
+    def test_full_buffer_drops_events(self, make_events):
+        """Test the bounded buffer and the drop counter."""
+        ingest = EventIngest(InMemoryEventWriter(), max_pending=3)
+        accepted = [ingest.submit(e) for e in make_events(5)]
+        assert accepted == [True, True, True, False, False]
+        assert ingest.snapshot()["dropped"] == 2
+        assert ingest.snapshot()["queue_depth"] == 3
+
+    @pytest.mark.asyncio
+    async def test_flush_counts_requests_and_latency(self, make_events):
+        """Test that a flush writes batches and records metrics."""
+        writer = InMemoryEventWriter()
+        ingest = EventIngest(writer)
+        for e in make_events(60):
+            ingest.submit(e)
+        assert await ingest.flush() == 60
+        assert writer.requests == 3
+        snapshot = ingest.snapshot()
+        assert snapshot["written"] == 60 and snapshot["batches"] == 3
+        assert sum(snapshot["flush_histogram_ms"].values()) == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_counted_as_deduped(self, make_events):
+        """Test that events superseded within a batch are not counted as written."""
+        ingest = EventIngest(DynamoDBEventWriter(FlakyClient([]), "events"))
+        first, second = make_events(2)
+        for e in (first, second, first):
+            ingest.submit(e)
+        assert await ingest.flush() == 2
+        snapshot = ingest.snapshot()
+        counts = [snapshot[name] for name in ("written", "deduped", "dropped")]
+        assert counts == [2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_requeues_in_order(self, make_events):
+        """Test that a raising writer leaves events buffered for the next flush."""
+        writer = BrokenWriter()
+        ingest = EventIngest(writer)
+        events = make_events(30)
+        for e in events:
+            ingest.submit(e)
+        with pytest.raises(ConnectionError):
+            await ingest.flush()
+        assert ingest.depth == 30
+        assert await ingest.flush() == 30
+        assert list(writer.inner.events.values()) == events
+
+    @pytest.mark.asyncio
+    async def test_submitted_seq_is_written(self, event):
+        """Test that a room log sequence number travels with its event."""
+        writer = InMemoryEventWriter()
+        ingest = EventIngest(writer)
+        ingest.submit(event, 4)
+        await ingest.flush()
+        assert writer.seqs[(event.room_id, event.event_id)] == 4
+
+    @pytest.mark.asyncio
+    async def test_run_flushes_full_batches_promptly(self, make_events):
+        """Test that a full batch does not wait for the interval."""
+        writer = InMemoryEventWriter()
+        ingest = EventIngest(writer, flush_interval=60.0)
+        task = asyncio.create_task(ingest.run())
+        for e in make_events(26):
+            ingest.submit(e)
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if writer.items:
+                break
+        assert writer.items == 25
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert writer.items == 26
+
+
+def test_ingest_stats_route(config_source, event):
+    """Test that registered pipelines are exposed over HTTP."""
+    app = create_app(Settings(), config_source)
+    ingest = EventIngest(InMemoryEventWriter())
+    ingest.submit(event)
+    app.state.event_ingests["events"] = ingest
+    body = TestClient(app).get("/api/runtime/ingest").json()
+    assert body["events"]["queue_depth"] == 1
+
+
+def test_app_logs_engine_events_through_ingest(config_source, room, make_events):
+    """Test that the app's room engine logs via its ingest, flushed on shutdown."""
+    app = create_app(Settings(), config_source)
+    with TestClient(app):
+        app.state.room_engine.open(room)
+        for e in make_events(3):
+            app.state.room_engine.apply(e)
+    ingest = app.state.event_ingests["combat_events"]
+    assert ingest.depth == 0
+    assert ingest.snapshot()["written"] == 3
@@ -0,0 +1,108 @@
+"""Unit tests for the recent event ring buffers and reconnect sync."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.settings import Settings
+from models import CombatEvent
+from runtime.event_ring import EventRing, RecentEvents
+from runtime.room_engine import RoomEngine
+from storage.room_table import InMemoryRoomCheckpointStore, InMemoryRoomEventLog
+
+
+def numbered(event: CombatEvent, i: int) -> CombatEvent:
+    """Return a copy of the event with a distinct ID."""
+    return event.model_copy(update={"event_id": f"event-{i}"})
+
+
+class TestEventRing:
+    """Tests for EventRing."""
+
+    def test_since_returns_missed_events(self, event):
+        """Test reading the events after a sequence number."""
+        ring = EventRing(capacity=8)
+        for i in range(1, 6):
+            assert ring.append(numbered(event, i)) == i
+        missed = ring.since(3)
+        assert [(seq, e.event_id) for seq, e in missed] == [
+            (4, "event-4"),
+            (5, "event-5"),
+        ]
+        assert missed[0][1] == numbered(event, 4)
+        assert ring.since(5) == []
+
+    def test_window_slides_when_full(self, event):
+        """Test that overwritten events force a snapshot resync."""
+        ring = EventRing(capacity=4)
+        for i in range(1, 11):
+            ring.append(numbered(event, i))
+        assert (ring.first_seq, ring.last_seq, len(ring)) == (7, 10, 4)
+        assert [seq for seq, _ in ring.since(6)] == [7, 8, 9, 10]
+        assert ring.since(5) is None
+        assert ring.since(11) is None
+
+    def test_explicit_sequence_numbers(self, event):
+        """Test that numbering must stay contiguous after the first event."""
+        ring = EventRing(capacity=4, last_seq=41)
+        assert ring.since(41) == []
+        assert ring.since(40) is None
+        ring.append(event, 42)
+        with pytest.raises(ValueError):
+            ring.append(event, 44)
+
+
+class TestRecentEvents:
+    """Tests for RecentEvents wired into the room engine."""
+
+    def test_engine_buffers_applied_and_replayed_events(self, room, event):
+        """Test that engine sequence numbers survive checkpoint recovery."""
+        checkpoints, log = InMemoryRoomCheckpointStore(), InMemoryRoomEventLog()
+        recent = RecentEvents(capacity=16)
+        engine = RoomEngine(checkpoints, log, recent=recent)
+        engine.open(room)
+        checkpoints.save(engine.state("room-1"), 0)
+        for i in range(3):
+            engine.apply(numbered(event, i))
+        assert recent.last_seq("room-1") == 3
+
+        restarted = RecentEvents(capacity=16)
+        RoomEngine(checkpoints, log, recent=restarted).recover("room-1")
+        assert [seq for seq, _ in restarted.since("room-1", 1)] == [2, 3]
+        assert recent.since("room-2", 0) is None
+
+
+class TestEventsRoute:
+    """Tests for GET /api/events/{room_id}."""
+
+    @pytest.fixture
+    def client(self, config_source) -> TestClient:
+        """Create a test client with a four-event ring per room."""
+        return TestClient(create_app(Settings(event_ring_size=4), config_source))
+
+    def test_returns_missed_events_then_snapshot(self, client, room, event):
+        """Test incremental sync and the snapshot fallback from the engine."""
+        engine = client.app.state.room_engine
+        engine.open(room)
+        for i in range(1, 7):
+            engine.apply(numbered(event, i))
+
+        body = client.get("/api/events/room-1", params={"since": 4}).json()
+        assert body["seq"] == 6
+        assert [e["seq"] for e in body["events"]] == [5, 6]
+        assert body["events"][0]["event"]["event_id"] == "event-5"
+        assert "room_state" not in body
+
+        body = client.get("/api/events/room-1").json()
+        assert [e["seq"] for e in body["events"]] == [3, 4, 5, 6]
+
+        body = client.get("/api/events/room-1", params={"since": 1}).json()
+        assert body["events"] == []
+        assert body["room_state"] == engine.state("room-1").model_dump(mode="json")
+        sync = client.app.state.room_shard.sync("room-1")
+        assert sync["room_state"] == body["room_state"]
+        assert client.app.state.event_ingests["combat_events"].depth == 6
+
+    def test_unknown_room(self, client):
+        """Test that rooms without a ring are not found."""
+        assert client.get("/api/events/nowhere").status_code == 404
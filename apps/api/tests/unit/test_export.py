@@ -0,0 +1,145 @@
+"""Unit tests for the partitioned Parquet export."""
+
+import json
+from datetime import timedelta
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from analytics.export import NULL_PARTITION, ParquetExporter, arrow_schema
+from models import CombatEvent, PlayerSession
+from storage.dynamodb_codec import codec_for
+
+
+def events(event: CombatEvent, count: int, rooms: int = 2, days: int = 1) -> list:
+    """Return ``count`` events spread over rooms and days."""
+    return [
+        event.model_copy(
+            update={
+                "event_id": f"event-{n}",
+                "room_id": f"room-{n % rooms}",
+                "timestamp": event.timestamp + timedelta(days=n % days, seconds=n),
+                "damage_amount": float(n),
+            }
+        )
+        for n in range(count)
+    ]
+
+
+def read(root) -> pa.Table:
+    """Read an exported dataset back with its partition columns."""
+    return ds.dataset(root, format="parquet", partitioning="hive").to_table()
+
+
+def test_arrow_schema_follows_model_schema() -> None:
+    """Test that column types come from the schema YAML."""
+    schema = arrow_schema("CombatEvent", exclude=("room_id",))
+
+    assert "room_id" not in schema.names
+    assert schema.field("event_id").type == pa.string()
+    assert not schema.field("event_id").nullable
+    assert schema.field("damage_amount").type == pa.float64()
+    assert schema.field("is_critical").type == pa.bool_()
+    assert schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+    assert schema.field("metadata").type == pa.string()
+
+
+def test_export_pages_round_trip(tmp_path, event: CombatEvent) -> None:
+    """Test that items come back with their values and partition columns."""
+    codec = codec_for("CombatEvent")
+    batch = events(event, 10, rooms=2, days=3)
+    pages = [{"Items": [codec.encode(e) for e in batch[:6]]}]
+    pages.append({"Items": [codec.encode(e) for e in batch[6:]]})
+
+    with ParquetExporter(tmp_path, "CombatEvent") as exporter:
+        exporter.write_pages(pages)
+
+    table = read(tmp_path).sort_by("damage_amount")
+    assert table.num_rows == 10
+    assert exporter.rows == 10
+    assert len(exporter.files) == 6
+    assert table.column("event_id").to_pylist() == [e.event_id for e in batch]
+    assert table.column("room_id").to_pylist() == [e.room_id for e in batch]
+    assert json.loads(table.column("metadata")[0].as_py()) == {"combo": 2}
+    day = event.timestamp.date()
+    assert (tmp_path / f"date={day}" / "room_id=room-1").is_dir()
+    assert (tmp_path / f"date={day + timedelta(days=1)}" / "room_id=room-0").is_dir()
+
+
+def test_export_writes_dictionary_and_statistics(tmp_path, event: CombatEvent) -> None:
+    """Test that strings are dictionary-encoded and row groups carry stats."""
+    with ParquetExporter(tmp_path, row_group_size=4) as exporter:
+        exporter.write_models(events(event, 10, rooms=1))
+
+    (path,) = exporter.files
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 3
+    assert exporter.row_groups == 3
+    group = metadata.row_group(0)
+    names = [group.column(i).path_in_schema for i in range(group.num_columns)]
+    event_type = group.column(names.index("event_type"))
+    assert any("DICTIONARY" in encoding for encoding in event_type.encodings)
+    damage = group.column(names.index("damage_amount")).statistics
+    assert (damage.min, damage.max) == (0.0, 3.0)
+
+
+def test_export_bounds_buffered_rows(tmp_path, event: CombatEvent) -> None:
+    """Test that the largest partition is written once the buffer is full."""
+    exporter = ParquetExporter(tmp_path, row_group_size=100, max_buffered_rows=5)
+    batch = events(event, 12, rooms=3)
+
+    for e in batch:
+        exporter.write_models([e])
+        assert exporter._buffered < 5
+
+    exporter.close()
+    assert read(tmp_path).num_rows == 12
+
+
+def test_export_closes_least_recently_used_writers(
+    tmp_path, event: CombatEvent
+) -> None:
+    """Test that partitions continue in new part files past the open-file cap."""
+    exporter = ParquetExporter(
+        tmp_path, row_group_size=1, max_open_files=2, run_id="run"
+    )
+    exporter.write_models(events(event, 6, rooms=3))
+
+    assert len(exporter._writers) == 2
+    exporter.close()
+    assert len(exporter.files) == 6
+    assert read(tmp_path).num_rows == 6
+    room = tmp_path / f"date={event.timestamp.date()}" / "room_id=room-0"
+    assert sorted(p.name for p in room.iterdir()) == [
+        "part-run-00000.parquet",
+        "part-run-00001.parquet",
+    ]
+
+
+def test_export_stream_records(tmp_path, session: PlayerSession) -> None:
+    """Test that stream new images are exported and removals skipped."""
+    codec = codec_for("PlayerSession")
+    lobby = session.model_copy(update={"session_id": "session-2", "room_id": None})
+    records = [
+        {"eventName": "INSERT", "dynamodb": {"NewImage": codec.encode(session)}},
+        {"eventName": "MODIFY", "dynamodb": {"NewImage": codec.encode(lobby)}},
+        {"eventName": "REMOVE", "dynamodb": {"OldImage": codec.encode(session)}},
+    ]
+
+    with ParquetExporter(tmp_path, "PlayerSession") as exporter:
+        exporter.write_stream_records(records)
+
+    assert exporter.skipped == 1
+    table = read(tmp_path).sort_by("session_id")
+    assert table.column("session_id").to_pylist() == ["session-1", "session-2"]
+    assert table.column("current_health").to_pylist() == [80.0, 80.0]
+    day = session.last_heartbeat.date()
+    assert (tmp_path / f"date={day}" / f"room_id={NULL_PARTITION}").is_dir()
+
+
+def test_export_rejects_unknown_model(tmp_path) -> None:
+    """Test that only models with a partition time column can be exported."""
+    with pytest.raises(KeyError):
+        ParquetExporter(tmp_path, "RoomState")
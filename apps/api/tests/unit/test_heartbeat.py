@@ -0,0 +1,115 @@
+"""Unit tests for heartbeat tracking and the timer wheel."""
+
+from datetime import timedelta
+
+from runtime.heartbeat import HeartbeatMonitor, TimerWheel
+from runtime.write_behind import WriteBehindSessionStore
+from storage.session_table import InMemorySessionWriter
+from tests.conftest import NOW
+
+
+class TestTimerWheel:
+    """Tests for TimerWheel."""
+
+    def test_fires_once_at_deadline(self):
+        """Test that a timer fires when its deadline passes, and only once."""
+        wheel = TimerWheel(resolution=1.0, slots=8)
+        wheel.schedule("a", 2.5)
+        assert wheel.advance(2.9) == []
+        assert wheel.advance(3.0) == ["a"]
+        assert wheel.advance(10.0) == []
+        assert len(wheel) == 0
+
+    def test_reschedule_and_cancel(self):
+        """Test that rescheduling moves a deadline and cancel removes it."""
+        wheel = TimerWheel(resolution=1.0, slots=8)
+        wheel.schedule("a", 2.0)
+        wheel.schedule("b", 2.0)
+        wheel.schedule("a", 5.0)
+        assert wheel.cancel("b") is True
+        assert wheel.cancel("b") is False
+        assert wheel.advance(4.0) == []
+        assert wheel.advance(5.0) == ["a"]
+
+    def test_deadlines_beyond_one_turn(self):
+        """Test deadlines further out than the wheel's span."""
+        wheel = TimerWheel(resolution=1.0, slots=4)
+        wheel.schedule("near", 1.0)
+        wheel.schedule("far", 9.0)
+        assert wheel.advance(1.0) == ["near"]
+        assert wheel.advance(8.0) == []
+        assert wheel.advance(9.0) == ["far"]
+
+    def test_long_pause_expires_everything_due(self):
+        """Test advancing across more than a full turn at once."""
+        wheel = TimerWheel(resolution=1.0, slots=4)
+        for i in range(10):
+            wheel.schedule(f"s{i}", float(i))
+        wheel.schedule("later", 50.0)
+        assert sorted(wheel.advance(20.0)) == sorted(f"s{i}" for i in range(10))
+        assert "later" in wheel
+
+
+class TestHeartbeatMonitor:
+    """Tests for HeartbeatMonitor."""
+
+    def test_expired_sessions_reach_handlers(self, clock):
+        """Test that a session missing its heartbeats is disconnected once."""
+        monitor = HeartbeatMonitor(timeout=30.0, clock=clock)
+        disconnected = []
+        monitor.on_disconnect(disconnected.append)
+        monitor.heartbeat("alive")
+        monitor.heartbeat("stale")
+        for _ in range(2):
+            clock.now += 10.0
+            monitor.heartbeat("alive")
+            assert monitor.expire() == []
+        clock.now = 30.0
+        assert monitor.expire() == ["stale"]
+        assert disconnected == ["stale"]
+        assert "alive" in monitor and "stale" not in monitor
+        assert monitor.disconnects == 1
+
+    def test_forget_and_failing_handler(self, clock):
+        """Test clean leaves and that one failing handler does not stop others."""
+        monitor = HeartbeatMonitor(timeout=5.0, clock=clock)
+        seen = []
+
+        @monitor.on_disconnect
+        def broken(session_id):
+            raise RuntimeError("boom")
+
+        monitor.on_disconnect(seen.append)
+        monitor.heartbeat("left")
+        monitor.heartbeat("lost")
+        monitor.forget("left")
+        clock.now = 6.0
+        assert monitor.expire() == ["lost"]
+        assert seen == ["lost"]
+
+    def test_heartbeats_are_flushed_in_bulk(self, session, clock):
+        """Test that last_heartbeat is written with batched flushes only."""
+        writer = InMemorySessionWriter()
+        store = WriteBehindSessionStore(writer, flush_interval=10.0, clock=clock)
+        store.update(session)
+        store.update(session.model_copy(update={"session_id": "session-2"}))
+        assert store.flush(urgent_only=True) == 2
+        monitor = HeartbeatMonitor(store, clock=clock)
+        for second in range(1, 4):
+            clock.now = float(second)
+            monitor.heartbeat("session-1", NOW + timedelta(seconds=second))
+            monitor.heartbeat("session-2", NOW + timedelta(seconds=second))
+        assert (writer.requests, store.urgent) == (1, 0)
+        assert store.get("session-1").last_heartbeat == NOW + timedelta(seconds=3)
+
+        assert store.flush() == 2
+        assert writer.requests == 2
+        assert writer.sessions["session-2"].last_heartbeat == NOW + timedelta(seconds=3)
+
+    def test_unknown_sessions_are_still_monitored(self, clock):
+        """Test that heartbeats for sessions the store lacks only set timers."""
+        store = WriteBehindSessionStore(InMemorySessionWriter(), clock=clock)
+        monitor = HeartbeatMonitor(store, clock=clock)
+        monitor.heartbeat("ghost")
+        assert "ghost" in monitor
+        assert store.pending == 0
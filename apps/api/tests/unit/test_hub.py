@@ -0,0 +1,258 @@
+"""Unit tests for the room broadcast hub and WebSocket endpoint."""
+
+import asyncio
+import json
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.hub import RoomHub, SendQueue
+from app.main import create_app
+from app.settings import Settings
+from wire.tick_frame import decode_tick_frame
+
+
+def next_json(socket) -> dict:
+    """Receive the next text message, skipping binary tick frames."""
+    while True:
+        message = socket.receive()
+        if message.get("text") is not None:
+            return json.loads(message["text"])
+
+
+class TestSendQueue:
+    """Tests for SendQueue."""
+
+    @pytest.mark.asyncio
+    async def test_coalesced_frames_replace_pending(self):
+        """Test that a newer keyed frame replaces the unsent one in place."""
+        queue = SendQueue(max_frames=4)
+        queue.put("pos-1", coalesce="positions")
+        queue.put("event-1")
+        queue.put("pos-2", coalesce="positions")
+        assert len(queue) == 2
+        assert queue.coalesced == 1
+        assert [await queue.get(), await queue.get()] == ["pos-2", "event-1"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_stale_positions_first(self):
+        """Test that keyed frames are dropped to make room for other frames."""
+        queue = SendQueue(max_frames=2)
+        queue.put("pos-1", coalesce="positions")
+        queue.put("event-1")
+        assert queue.put("event-2") is True
+        assert queue.dropped == 1
+        assert [await queue.get(), await queue.get()] == ["event-1", "event-2"]
+
+    def test_full_queue_of_undroppable_frames_rejects(self):
+        """Test that a queue full of events reports the client as too slow."""
+        queue = SendQueue(max_frames=2)
+        queue.put("event-1")
+        queue.put("event-2")
+        assert queue.put("event-3") is False
+
+    @pytest.mark.asyncio
+    async def test_close_wakes_waiter(self):
+        """Test that closing the queue ends a pending get."""
+        queue = SendQueue(max_frames=2)
+        waiter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        queue.close()
+        assert await waiter is None
+
+
+class TestRoomHub:
+    """Tests for RoomHub."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_serializes_once(self):
+        """Test that every subscriber receives the same frame object."""
+        hub = RoomHub()
+        received = []
+
+        async def send(frame):
+            received.append(frame)
+
+        subscribers = [hub.join(f"session-{i}", "room-1", send) for i in range(3)]
+        hub.join("session-x", "room-2", send)
+        assert hub.broadcast("room-1", {"type": "room_update", "version": 1}) == 3
+        for subscriber in subscribers:
+            hub.leave(subscriber)
+            await subscriber.pump()
+        assert len(received) == 0
+
+        subscribers = [hub.join(f"session-{i}", "room-1", send) for i in range(3)]
+        hub.broadcast("room-1", {"type": "room_update", "version": 2})
+        tasks = [asyncio.ensure_future(s.pump()) for s in subscribers]
+        await asyncio.sleep(0)
+        assert len(received) == 3
+        assert all(frame is received[0] for frame in received)
+        assert json.loads(received[0]) == {"type": "room_update", "version": 2}
+        for subscriber, task in zip(subscribers, tasks):
+            hub.leave(subscriber)
+            await task
+        assert hub.room_size("room-1") == 0
+        assert hub.room_size("room-2") == 1
+
+    def test_broadcast_each_sends_per_client_frames(self):
+        """Test that only subscribers with a frame receive one."""
+        hub = RoomHub()
+
+        async def send(frame):
+            pass
+
+        a = hub.join("a", "room-1", send)
+        b = hub.join("b", "room-1", send)
+        assert hub.broadcast_each("room-1", {"a": b"batch-a"}, coalesce="positions")
+        assert len(a.queue) == 1
+        assert len(b.queue) == 0
+
+    def test_slow_subscriber_is_disconnected(self):
+        """Test that a subscriber that cannot keep up is removed from the room."""
+        hub = RoomHub(max_frames=2)
+
+        async def send(frame):
+            pass
+
+        slow = hub.join("session-1", "room-1", send)
+        for version in range(3):
+            hub.broadcast("room-1", {"type": "room_update", "version": version})
+        assert hub.disconnects == 1
+        assert hub.room_size("room-1") == 0
+        assert slow.queue.closed
+
+
+class TestRoomSocket:
+    """Tests for the /ws/rooms endpoint."""
+
+    @pytest.fixture
+    def client(self, config_source) -> Iterator[TestClient]:
+        """Create a test client whose sockets share one event loop."""
+        with TestClient(create_app(Settings(), config_source)) as client:
+            yield client
+
+    def test_connect_and_heartbeat(self, client):
+        """Test the connect handshake, heartbeats and unknown messages."""
+        hub = client.app.state.room_hub
+        with client.websocket_connect("/ws/rooms") as alice:
+            alice.send_json({"type": "connect", "room_id": "room-1", "session_id": "a"})
+            assert alice.receive_json() == {
+                "type": "connected",
+                "room_id": "room-1",
+                "version": None,
+                "room_state": None,
+            }
+            alice.send_json({"type": "resync", "version": 0})
+            assert alice.receive_json()["type"] == "error"
+            alice.send_json({"type": "heartbeat", "session_id": "a"})
+            assert alice.receive_json()["type"] == "heartbeat_ack"
+
+            alice.send_json({"type": "teleport"})
+            assert alice.receive_json()["type"] == "error"
+        assert len(hub) == 0
+
+    def test_combat_events_are_validated_and_applied(
+        self, client, room, session, event
+    ):
+        """Test that peers only see combat events the rules and engine accepted."""
+        client.app.state.room_engine.open(room)
+        connect = {"type": "connect", "room_id": "room-1"}
+        with client.websocket_connect("/ws/rooms") as alice, client.websocket_connect(
+            "/ws/rooms"
+        ) as bob:
+            alice.send_json({**connect, "session_id": "session-1"})
+            connected = alice.receive_json()
+            assert connected["version"] == 0
+            assert connected["room_state"]["room_id"] == "room-1"
+            bob.send_json({**connect, "session_id": "session-2"})
+            bob.receive_json()
+            update = session.model_dump(mode="json")
+            alice.send_json({"type": "session_update", "session": update})
+            other = {**update, "session_id": "session-2", "player_id": "player-2"}
+            bob.send_json({"type": "session_update", "session": other})
+
+            payload = event.model_dump(mode="json", exclude={"room_id"})
+            for bad in (
+                {"damage_amount": 25.0},
+                {"source_player_id": "player-2"},
+                {"damage_amount": "lots"},
+            ):
+                alice.send_json({"type": "combat_event", "event": {**payload, **bad}})
+                assert next_json(alice)["type"] == "error"
+            valid = {**payload, "event_id": "event-2", "damage_amount": 10.0}
+            alice.send_json({"type": "combat_event", "event": valid})
+            while True:
+                _, message, _ = decode_tick_frame(bob.receive_bytes())
+                if message is not None:
+                    break
+            assert [e["event_id"] for e in message["events"]] == ["event-2"]
+            assert message["delta"]["version"] == 1
+
+            bob.send_json({"type": "resync", "version": 0})
+            resync = next_json(bob)
+            assert (resync["type"], resync["version"]) == ("room_update", 1)
+            assert resync["deltas"] == [message["delta"]]
+            bob.send_json({"type": "resync", "version": "latest"})
+            assert next_json(bob)["type"] == "error"
+        live = client.app.state.room_engine.rooms["room-1"]
+        assert live.enemies["enemy-1"]["current_health"] == 20.5
+        assert client.app.state.room_shard.rejected == 2
+
+    def test_binary_frames_are_unsupported(self, client):
+        """Test that a binary frame closes the socket with 1003."""
+        with client.websocket_connect("/ws/rooms") as socket:
+            socket.send_json(
+                {"type": "connect", "room_id": "room-1", "session_id": "a"}
+            )
+            socket.receive_json()
+            socket.send_bytes(b"\x00\x01")
+            message = socket.receive()
+        assert message["type"] == "websocket.close"
+        assert message["code"] == 1003
+        assert len(client.app.state.room_hub) == 0
+
+    def test_rooms_are_recovered_and_sessions_ticked(self, client, room, session):
+        """Test recovery on connect, session updates via the shard and cleanup."""
+        app = client.app
+        app.state.room_engine.open(room)
+        client.portal.call(app.state.room_engine.close, "room-1")
+        assert "room-1" not in app.state.room_engine
+        connect = {"type": "connect", "room_id": "room-1"}
+        with client.websocket_connect("/ws/rooms") as alice, client.websocket_connect(
+            "/ws/rooms"
+        ) as bob:
+            alice.send_json({**connect, "session_id": "session-1"})
+            assert alice.receive_json()["room_state"]["room_id"] == "room-1"
+            assert client.get("/api/events/room-1").status_code == 200
+            bob.send_json({**connect, "session_id": "session-2"})
+            bob.receive_json()
+
+            update = session.model_dump(mode="json")
+            alice.send_json({"type": "session_update", "session": update})
+            other = {**update, "session_id": "session-2", "player_id": "player-2"}
+            bob.send_json({"type": "session_update", "session": other})
+            _, _, positions = decode_tick_frame(bob.receive_bytes())
+            assert {p.slot for p in positions} <= {0, 1}
+            assert set(app.state.room_shard.slots("room-1")) == {
+                "session-1",
+                "session-2",
+            }
+            assert "session-1" in app.state.heartbeats
+
+            alice.send_json(
+                {"type": "session_update", "session": {**update, "room_id": "room-2"}}
+            )
+            assert next_json(alice)["type"] == "error"
+        assert app.state.room_shard.slots("room-1") == {}
+        assert "session-1" not in app.state.heartbeats
+        assert app.state.session_store.get("session-1") is None
+        assert client.get("/api/runtime/ticks").json()["rooms"]["ticks"] > 0
+
+    def test_first_message_must_be_connect(self, client):
+        """Test that a socket that does not connect to a room is closed."""
+        with client.websocket_connect("/ws/rooms") as socket:
+            socket.send_json({"type": "heartbeat"})
+            message = socket.receive()
+        assert message["type"] == "websocket.close"
+        assert message["code"] == 1008
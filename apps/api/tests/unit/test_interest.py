@@ -0,0 +1,86 @@
+"""Unit tests for spatial interest management."""
+
+import random
+
+from runtime.interest import InterestGrid, RoomGrid
+from wire.session_codec import decode_batch
+
+
+class TestRoomGrid:
+    """Tests for RoomGrid."""
+
+    def test_matches_brute_force(self):
+        """Test that grid queries agree with an all-pairs distance check."""
+        rng = random.Random(3)
+        grid = RoomGrid(cell_size=7.0)
+        points = {
+            f"p{i}": (rng.uniform(-50, 50), rng.uniform(-50, 50)) for i in range(200)
+        }
+        for session_id, (x, z) in points.items():
+            grid.move(session_id, x, z)
+        for session_id, (x, z) in list(points.items())[:40]:
+            expected = {
+                other
+                for other, (ox, oz) in points.items()
+                if other != session_id and (ox - x) ** 2 + (oz - z) ** 2 <= 15.0**2
+            }
+            assert set(grid.interest(session_id, 15.0)) == expected
+
+    def test_move_between_cells_and_remove(self):
+        """Test that moving and removing keep the cell index consistent."""
+        grid = RoomGrid(cell_size=10.0)
+        grid.move("a", 1.0, 1.0)
+        grid.move("b", 3.0, 1.0)
+        assert grid.interest("a", 5.0) == ["b"]
+        grid.move("b", 95.0, 95.0)
+        assert grid.interest("a", 5.0) == []
+        assert grid.interest("b", 5.0) == []
+        grid.remove("b")
+        grid.remove("b")
+        assert len(grid) == 1
+
+
+class TestInterestGrid:
+    """Tests for InterestGrid."""
+
+    def test_rooms_are_independent(self, make_session):
+        """Test that players only see players in their own room."""
+        interest = InterestGrid(radius=10.0)
+        interest.update(make_session("a", position_x=0.0, position_z=0.0))
+        interest.update(make_session("b", position_x=1.0, position_z=0.0))
+        interest.update(
+            make_session("c", position_x=1.0, position_z=1.0, room_id="room-2")
+        )
+        assert interest.interest_sets("room-1") == {
+            "a": frozenset({"b"}),
+            "b": frozenset({"a"}),
+        }
+        interest.update(
+            make_session("b", position_x=1.0, position_z=0.0, room_id="room-2")
+        )
+        assert interest.interest_sets("room-2")["c"] == frozenset({"b"})
+        assert interest.interest_sets("room-1") == {"a": frozenset()}
+
+    def test_unpositioned_sessions_are_dropped(self, make_session):
+        """Test that a session losing its position leaves the grid."""
+        interest = InterestGrid(radius=10.0)
+        interest.update(make_session("a", position_x=0.0, position_z=0.0))
+        interest.update(make_session("a", position_x=None, position_z=0.0))
+        assert interest.room("room-1") is None
+
+    def test_position_batches(self, make_session):
+        """Test that batches are filtered and shared when interest sets match."""
+        interest = InterestGrid(radius=5.0)
+        sessions = {
+            "a": make_session("a", position_x=0.0, position_z=0.0),
+            "x": make_session("x", position_x=4.0, position_z=0.0),
+            "b": make_session("b", position_x=8.0, position_z=0.0),
+            "far": make_session("far", position_x=50.0, position_z=0.0),
+        }
+        interest.update_all(sessions.values())
+        slots = {"a": 0, "x": 1, "b": 2, "far": 3}
+        batches = interest.position_batches("room-1", sessions, slots)
+        assert "far" not in batches
+        assert [u.slot for u in decode_batch(batches["x"])] == [0, 2]
+        assert [u.slot for u in decode_batch(batches["a"])] == [1]
+        assert batches["a"] is batches["b"]
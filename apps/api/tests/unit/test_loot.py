@@ -0,0 +1,118 @@
+"""Unit tests for server-side loot rolls."""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from models import LootTable
+from rules.loot import CompiledLootTable, LootService, build_alias, death_nonce
+from storage.dynamodb_codec import encode_entry
+from tests.conftest import NOW
+
+
+def make_table(drops, **update) -> LootTable:
+    """Create a loot table from (item_id, chance, min, max) tuples."""
+    return LootTable(
+        id="skeleton_loot",
+        name="Skeleton",
+        drops=[
+            encode_entry(
+                {
+                    "item_id": item_id,
+                    "item_type": "consumable",
+                    "chance": chance,
+                    "min_quantity": low,
+                    "max_quantity": high,
+                }
+            )
+            for item_id, chance, low, high in drops
+        ],
+        created_at=NOW,
+        **update,
+    )
+
+
+@pytest.fixture
+def table() -> LootTable:
+    """Create a three-drop table."""
+    return make_table(
+        [
+            ("gold", 0.8, 1, 10),
+            ("health_potion", 0.3, 1, 2),
+            ("rusty_sword", 0.05, 1, 1),
+        ]
+    )
+
+
+def test_alias_table_reproduces_distribution():
+    """Test that alias arrays encode the input probabilities exactly."""
+    weights = np.array([0.5, 0.1, 0.25, 0.15])
+    prob, alias = build_alias(weights)
+    n = len(weights)
+    recovered = prob / n
+    np.add.at(recovered, alias, (1.0 - prob) / n)
+    assert recovered == pytest.approx(weights)
+
+
+class TestLootService:
+    """Tests for LootService."""
+
+    def test_drop_rates_and_quantities(self, table):
+        """Test per-drop rates and quantity bounds over many deaths."""
+        rolls = LootService(seed=42).roll(table, 200_000, 0)
+        rates = np.bincount(rolls.drop, minlength=3) / rolls.count
+        assert rates == pytest.approx([0.8, 0.3, 0.05], abs=0.005)
+        gold = rolls.quantity[rolls.drop == 0]
+        assert gold.min() == 1 and gold.max() == 10
+
+    def test_large_tables_use_independent_rolls(self):
+        """Test the fallback path for tables too large for an alias table."""
+        table = make_table([(f"item-{i}", 0.1 * (i % 5), 1, 1) for i in range(12)])
+        compiled = CompiledLootTable.compile(table)
+        assert compiled.outcomes is None
+        rolls = LootService(seed=1).roll(table, 50_000, 0)
+        rates = np.bincount(rolls.drop, minlength=12) / rolls.count
+        assert rates == pytest.approx(compiled.chance, abs=0.01)
+
+    def test_rolls_are_reproducible_by_nonce(self, table):
+        """Test that seed + nonce fully determine a roll."""
+        first = LootService(seed=7).roll(table, 1000, nonce=5)
+        again = LootService(seed=7).roll(table, 1000, nonce=5)
+        other = LootService(seed=7).roll(table, 1000, nonce=6)
+        assert first.by_death() == again.by_death()
+        assert first.by_death() != other.by_death()
+
+    def test_nonces_derive_from_the_first_death(self, table, event):
+        """Test that a restarted or second service rolls a batch the same way."""
+        deaths = [
+            event.model_copy(
+                update={"event_id": f"death-{i}", "event_type": "enemy_died"}
+            )
+            for i in range(3)
+        ]
+        first = LootService(seed=7).roll_deaths(table, deaths)
+        again = LootService(seed=7).roll_deaths(table, deaths)
+        assert first.nonce == again.nonce == death_nonce("room-1", "death-0")
+        assert np.array_equal(first.quantity, again.quantity)
+        assert first.count == 3
+        assert LootService(seed=7).roll_deaths(table, deaths[1:]).nonce != first.nonce
+        assert death_nonce("room-2", "death-0") != first.nonce
+        assert 0 <= first.nonce < 2**64
+        assert len(LootService(seed=7).roll_deaths(table, [])) == 0
+
+    def test_compiled_tables_cached_by_updated_at(self, table):
+        """Test that a table is recompiled only when updated_at changes."""
+        service = LootService(seed=7)
+        service.roll(table, 1, 0)
+        service.roll(table, 1, 0)
+        assert service.compilations == 1
+        changed = table.model_copy(update={"updated_at": NOW + timedelta(hours=1)})
+        service.roll(changed, 1, 1)
+        assert service.compilations == 2
+
+    def test_by_death_and_empty_table(self):
+        """Test the client-shaped output and a table without drops."""
+        rolls = LootService(seed=3).roll(make_table([("gold", 1.0, 2, 2)]), 2, 0)
+        assert rolls.by_death() == [[{"item_id": "gold", "quantity": 2}]] * 2
+        assert len(LootService(seed=3).roll(make_table([]), 5, 0)) == 0
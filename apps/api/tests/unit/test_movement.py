@@ -0,0 +1,239 @@
+"""Unit tests for server-side movement validation."""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from models import PlayerSession
+from rules.damage import StatsIndex
+from rules.movement import (
+    DODGE_DISTANCE,
+    NOT_CHECKED,
+    OK,
+    STALE,
+    SUPERSEDED,
+    TOO_FAST,
+    UNKNOWN_SLOT,
+    MovementValidator,
+)
+from wire.epoch import to_epoch_ms
+from wire.session_codec import SessionBatchView, encode_batch
+
+SPEED = 5.0
+
+
+class ServerClock:
+    """Settable server clock, in seconds, driven in epoch milliseconds."""
+
+    def __init__(self, ms: int = 0) -> None:
+        self.ms = ms
+
+    def __call__(self) -> float:
+        return self.ms / 1000
+
+
+@pytest.fixture
+def start(session: PlayerSession) -> int:
+    """Return the fixture heartbeat in epoch ms."""
+    return to_epoch_ms(session.last_heartbeat)
+
+
+@pytest.fixture
+def clock(start: int) -> ServerClock:
+    """Create a server clock in step with the fixture heartbeat."""
+    return ServerClock(start)
+
+
+@pytest.fixture
+def validator(clock: ServerClock, start: int) -> MovementValidator:
+    """Create a validator with four players at the origin."""
+    validator = MovementValidator(tolerance=0.1, clock=clock)
+    for slot in range(4):
+        validator.join(slot, SPEED)
+    validator.validate(
+        np.arange(4), np.zeros((4, 3)), np.full(4, 100.0), np.full(4, start)
+    )
+    return validator
+
+
+class TestMovementValidator:
+    """Tests for MovementValidator."""
+
+    def test_checks_implied_speed_per_slot(self, validator, clock, start):
+        """Test that only updates faster than the slot's cap are rejected."""
+        clock.ms = start + 1000
+        position = np.array(
+            [[4.0, 0.0, 3.0], [3.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 9.0, 0.0]]
+        )
+        verdict = validator.validate(
+            np.arange(4), position, np.full(4, 100.0), np.full(4, start + 1000)
+        )
+
+        assert verdict.reason.tolist() == [OK, OK, TOO_FAST, OK]
+        assert verdict.accepted.tolist() == [True, True, False, True]
+        np.testing.assert_allclose(verdict.distance, [5.0, 3.0, 10.0, 0.0])
+        np.testing.assert_allclose(verdict.speed, [5.0, 3.0, 10.0, 0.0])
+        np.testing.assert_allclose(verdict.allowed, SPEED + 0.1)
+        assert verdict.rejected(np.arange(4)) == [2]
+        assert validator.violations == 1
+
+    def test_flagged_update_keeps_trusted_position(self, validator, clock, start):
+        """Test that a flagged teleport is measured from the last good position."""
+        clock.ms = start + 1000
+        validator.validate([2], [[50.0, 0.0, 0.0]], [100.0], [start + 1000])
+        clock.ms = start + 2000
+        verdict = validator.validate([2], [[9.0, 0.0, 0.0]], [100.0], [start + 2000])
+
+        assert verdict.reason.tolist() == [OK]
+        assert verdict.distance[0] == pytest.approx(9.0)
+
+    def test_clamps_violations(self, clock, start):
+        """Test that clamping pulls the position back along its direction."""
+        validator = MovementValidator(tolerance=0.0, clamp=True, clock=clock)
+        validator.join(0, SPEED)
+        validator.validate([0], [[0.0, 0.0, 0.0]], [100.0], [start])
+
+        clock.ms = start + 1000
+        verdict = validator.validate([0], [[30.0, 2.0, 40.0]], [100.0], [start + 1000])
+
+        assert verdict.reason.tolist() == [TOO_FAST]
+        np.testing.assert_allclose(verdict.position, [[3.0, 2.0, 4.0]])
+        clock.ms = start + 2000
+        again = validator.validate([0], [[3.0, 2.0, 9.0]], [100.0], [start + 2000])
+        assert again.distance[0] == pytest.approx(5.0)
+        assert again.accepted[0]
+
+    def test_allows_dodges_paid_with_stamina(self, validator, clock, start):
+        """Test that spent stamina grants dodge distance."""
+        clock.ms = start + 500
+        distance = SPEED * 0.5 + DODGE_DISTANCE
+        verdict = validator.validate(
+            [0, 1],
+            [[distance, 0.0, 0.0], [distance, 0.0, 0.0]],
+            [80.0, 100.0],
+            [start + 500, start + 500],
+        )
+
+        assert verdict.reason.tolist() == [OK, TOO_FAST]
+
+    def test_sprint_multiplier(self, clock, start):
+        """Test that the sprint allowance scales the speed cap."""
+        validator = MovementValidator(sprint_multiplier=1.5, tolerance=0.0, clock=clock)
+        validator.join(0, SPEED)
+        validator.validate([0], [[0.0, 0.0, 0.0]], [100.0], [start])
+        clock.ms = start + 1000
+
+        verdict = validator.validate([0], [[7.5, 0.0, 0.0]], [100.0], [start + 1000])
+
+        assert verdict.accepted[0]
+
+    def test_unknown_duplicate_stale_and_missing_updates(self, validator, start):
+        """Test the reasons for updates that are not speed-checked."""
+        verdict = validator.validate(
+            [9, 0, 0, 1, 3],
+            [[0.0, 0.0, 0.0], [90.0, 0.0, 0.0], [1.0, 0.0, 0.0]] + [[50.0, 0, 0]] * 2,
+            [100.0] * 5,
+            [start + 1000, start + 1000, start + 1000, start - 1000, start + 1000],
+            [True, True, True, True, False],
+        )
+
+        assert verdict.reason.tolist() == [
+            UNKNOWN_SLOT,
+            SUPERSEDED,
+            OK,
+            STALE,
+            NOT_CHECKED,
+        ]
+        assert verdict.accepted.tolist() == [False, False, True, False, True]
+
+    def test_first_position_and_leave(self, start):
+        """Test that a slot's first position is trusted and leaving forgets it."""
+        validator = MovementValidator()
+        validator.join(40, SPEED)
+
+        assert validator.validate([40], [[99.0, 0, 0]], [0.0], [start]).accepted[0]
+        validator.leave(40)
+        verdict = validator.validate([40], [[0.0, 0, 0]], [0.0], [start + 1])
+        assert verdict.reason.tolist() == [UNKNOWN_SLOT]
+
+    def test_validate_wire_batch(self, session, make_session, clock, start):
+        """Test checking a decoded binary session batch."""
+        validator = MovementValidator(tolerance=0.1, clock=clock)
+        validator.join(0, SPEED, session)
+        validator.join(1, SPEED, make_session("session-2", 0.0))
+        sessions = [
+            make_session("session-1", 1.0, position_x=session.position_x + 4.0),
+            make_session("session-2", 1.0, position_z=session.position_z + 20.0),
+        ]
+
+        buffer = encode_batch(sessions, {"session-1": 0, "session-2": 1})
+        verdict = validator.validate_batch(SessionBatchView(buffer), start + 1000)
+
+        assert verdict.reason.tolist() == [OK, TOO_FAST]
+
+    def test_validate_sessions_with_stats_index(
+        self, session, config_source, clock, start
+    ):
+        """Test checking PlayerSession models with caps from CombatStats."""
+        index = StatsIndex.from_config_source(config_source)
+        speed = index.move_speed[index.stats_row[session.combat_stats_id]]
+        validator = MovementValidator(tolerance=0.0, clock=clock)
+        validator.join(3, speed, session)
+
+        lobby = session.model_copy(
+            update={"position_x": None, "position_y": None, "position_z": None}
+        )
+        far = session.model_copy(
+            update={
+                "position_x": session.position_x + 2 * speed,
+                "last_heartbeat": session.last_heartbeat + timedelta(seconds=1),
+            }
+        )
+        clock.ms = start + 1000
+        verdict = validator.validate_sessions([lobby, far], {"session-1": 3})
+
+        assert verdict.reason.tolist() == [NOT_CHECKED, TOO_FAST]
+        assert verdict.speed[1] == pytest.approx(2 * speed)
+
+    def test_future_heartbeat_buys_no_distance(self, validator, clock, start):
+        """Test that dt is capped by the server's receive-time gap."""
+        clock.ms = start + 200
+        verdict = validator.validate(
+            [0, 1],
+            [[400.0, 0.0, 0.0], [1.0, 0.0, 0.0]],
+            [100.0, 100.0],
+            [start + 100_000, start + 200],
+        )
+
+        assert verdict.reason.tolist() == [TOO_FAST, OK]
+        assert verdict.allowed[0] == pytest.approx(SPEED * 0.45 + 0.1)
+
+    def test_reported_stamina_cannot_outpace_regeneration(self, validator, clock):
+        """Test that cycling reported stamina 100 -> 0 -> 100 buys no dodges."""
+        reasons = []
+        for n in range(1, 7):
+            clock.ms += 100
+            trusted = validator._position[0, 0]
+            verdict = validator.validate(
+                [0],
+                [[trusted + SPEED * 0.1 + DODGE_DISTANCE, 0.0, 0.0]],
+                [0.0 if n % 2 else 100.0],
+                [clock.ms],
+            )
+            reasons.append(int(verdict.reason[0]))
+
+        # Only the first drop spends stamina the player really had.
+        assert reasons == [OK] + [TOO_FAST] * 5
+        assert validator._stamina[0] == 0.0
+
+    def test_dodges_are_whole_stamina_costs(self, validator, clock, start):
+        """Test that regenerated slivers of stamina do not grant dodges."""
+        clock.ms = start + 100
+        validator.validate([0], [[0.0, 0.0, 0.0]], [0.0], [start + 100])
+        clock.ms = start + 200
+        verdict = validator.validate(
+            [0], [[DODGE_DISTANCE, 0.0, 0.0]], [0.0], [start + 200]
+        )
+
+        assert verdict.reason.tolist() == [TOO_FAST]
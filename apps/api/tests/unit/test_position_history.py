@@ -0,0 +1,91 @@
+"""Unit tests for the per-entity position history buffers."""
+
+import numpy as np
+import pytest
+
+from runtime.position_history import PositionHistory
+
+
+@pytest.fixture
+def history() -> PositionHistory:
+    """Create a history where two entities walk along x at 1 unit per 100 ms."""
+    history = PositionHistory(capacity=4, max_rewind_ms=None, entities=1)
+    for tick in range(6):
+        history.record_many(
+            ["player-1", "enemy-1"],
+            np.full(2, 1000 + tick * 100),
+            [[tick, 0.0, 0.0], [tick, 0.0, 10.0]],
+        )
+    return history
+
+
+class TestPositionHistory:
+    """Tests for PositionHistory."""
+
+    def test_keeps_newest_samples_per_entity(self, history):
+        """Test that each ring keeps only its newest ``capacity`` samples."""
+        times, positions = history.trail("player-1")
+
+        assert times.tolist() == [1200, 1300, 1400, 1500]
+        assert positions[:, 0].tolist() == [2.0, 3.0, 4.0, 5.0]
+        assert len(history) == 2
+        assert history._times.shape == (2, 4)
+
+    def test_interpolates_between_samples(self, history):
+        """Test rewinding to a time between two samples."""
+        assert history.at("player-1", 1250) == pytest.approx((2.5, 0.0, 0.0))
+        assert history.at("enemy-1", 1400) == pytest.approx((4.0, 0.0, 10.0))
+
+    def test_holds_edges_outside_window(self, history):
+        """Test that queries outside the window hold the nearest sample."""
+        rewind = history.lookup(["player-1", "player-1", "player-1"], [900, 1500, 9000])
+
+        np.testing.assert_allclose(rewind.position[:, 0], [2.0, 5.0, 5.0])
+        assert rewind.in_window.tolist() == [False, True, False]
+
+    def test_batch_lookup_matches_scalar(self, history):
+        """Test that one vectorized lookup answers every hit in a tick."""
+        ids = ["enemy-1", "player-1", "ghost", "enemy-1"]
+        at_ms = [1210, 1333, 1300, 1490]
+        rewind = history.lookup(ids, at_ms)
+
+        assert rewind.found.tolist() == [True, True, False, True]
+        assert np.isnan(rewind.position[2]).all()
+        for i in (0, 1, 3):
+            assert tuple(rewind.position[i]) == pytest.approx(
+                history.at(ids[i], at_ms[i])
+            )
+
+    def test_clamps_claimed_time_to_rewind_window(self):
+        """Test that clients cannot rewind further than ``max_rewind_ms``."""
+        history = PositionHistory(capacity=8, max_rewind_ms=200)
+        for tick in range(8):
+            history.record("player-1", tick * 100, (tick, 0.0, 0.0))
+
+        rewind = history.lookup(["player-1", "player-1"], [0, 900], now_ms=700)
+
+        assert rewind.at_ms.tolist() == [500, 700]
+        np.testing.assert_allclose(rewind.position[:, 0], [5.0, 7.0])
+
+    def test_ignores_out_of_order_samples(self, history):
+        """Test that a sample older than the latest is not recorded."""
+        assert not history.record("player-1", 1400, (99.0, 0.0, 0.0))
+        assert history.record("player-1", 1600, (6.0, 0.0, 0.0))
+        assert history.trail("player-1")[0].tolist() == [1300, 1400, 1500, 1600]
+
+    def test_rejects_duplicate_rows(self, history):
+        """Test that one call records at most one sample per entity."""
+        with pytest.raises(ValueError):
+            history.record_many(
+                ["player-1", "player-1"], [2000, 2100], np.zeros((2, 3))
+            )
+
+    def test_forget_reuses_row(self, history):
+        """Test that a forgotten entity's row is cleared and reused."""
+        row = history.row("enemy-1")
+        history.forget("enemy-1")
+
+        assert "enemy-1" not in history
+        assert history.at("enemy-1", 1500) is None
+        assert history.row("enemy-2") == row
+        assert history.trail("enemy-2")[0].tolist() == []
@@ -0,0 +1,194 @@
+"""Unit tests for event-sourced room replay."""
+
+import pytest
+
+from runtime.replay import RoomReplayer
+from runtime.room_engine import EventLogGap, RoomEngine
+from storage.room_table import (
+    DynamoDBRoomEventLog,
+    DynamoDBRoomSnapshotStore,
+    InMemoryRoomCheckpointStore,
+    InMemoryRoomEventLog,
+    InMemoryRoomSnapshotStore,
+)
+
+
+@pytest.fixture
+def snapshots() -> InMemoryRoomSnapshotStore:
+    """Create an in-memory snapshot store."""
+    return InMemoryRoomSnapshotStore()
+
+
+@pytest.fixture
+def log() -> InMemoryRoomEventLog:
+    """Create an in-memory event log."""
+    return InMemoryRoomEventLog()
+
+
+@pytest.fixture
+def engine(snapshots, log) -> RoomEngine:
+    """Create an engine that snapshots every ten events."""
+    return RoomEngine(
+        InMemoryRoomCheckpointStore(), log, snapshots=snapshots, snapshot_every=10
+    )
+
+
+class TestInMemoryRoomSnapshotStore:
+    """Tests for InMemoryRoomSnapshotStore."""
+
+    def test_nearest_at_or_before(self, room):
+        """Test lookups between, on and before stored sequence numbers."""
+        store = InMemoryRoomSnapshotStore()
+        for seq in (20, 0, 10):
+            store.save(room, seq)
+        assert [seq for seq, _ in store.snapshots["room-1"]] == [0, 10, 20]
+        assert store.nearest("room-1", 15)[1] == 10
+        assert store.nearest("room-1", 20)[1] == 20
+        assert store.nearest("room-1", -1) is None
+        assert store.nearest("room-2", 5) is None
+
+
+class TestDynamoDBRoomSnapshotStore:
+    """Tests for DynamoDBRoomSnapshotStore."""
+
+    def test_nearest_queries_newest_at_or_before(self, room):
+        """Test the descending, single-item range query."""
+
+        class Client:
+            def __init__(self):
+                self.items = []
+
+            def put_item(self, TableName, Item):
+                self.items.append(Item)
+
+            def query(self, ExpressionAttributeValues, ScanIndexForward, Limit, **kw):
+                limit = int(ExpressionAttributeValues[":seq"]["N"])
+                found = sorted(
+                    (i for i in self.items if int(i["event_seq"]["N"]) <= limit),
+                    key=lambda i: int(i["event_seq"]["N"]),
+                    reverse=not ScanIndexForward,
+                )
+                return {"Items": found[:Limit]}
+
+        store = DynamoDBRoomSnapshotStore(Client(), "snapshots")
+        store.save(room, 0)
+        store.save(room, 10)
+        assert store.nearest("room-1", 9) == (room, 0)
+        assert store.nearest("room-1", 10) == (room, 10)
+        assert store.nearest("room-1", -1) is None
+
+
+class TestDynamoDBRoomEventLog:
+    """Tests for DynamoDBRoomEventLog."""
+
+    def test_since_reads_only_later_events(self, make_event):
+        """Test that ``since`` bounds the read with a key condition on the index."""
+
+        class Client:
+            def __init__(self):
+                self.items = []
+                self.queries = []
+
+            def put_item(self, TableName, Item):
+                self.items.append(Item)
+
+            def get_paginator(self, name):
+                return self
+
+            def paginate(self, **kw):
+                self.queries.append(kw)
+                after = int(kw["ExpressionAttributeValues"][":seq"]["N"])
+                found = [i for i in self.items if int(i["event_seq"]["N"]) > after]
+                yield {"Items": sorted(found, key=lambda i: int(i["event_seq"]["N"]))}
+
+        client = Client()
+        log = DynamoDBRoomEventLog(client, "events")
+        for n in (3, 1, 2):
+            log.append(make_event(n, damage_amount=1.0), n)
+
+        assert [seq for seq, _ in log.since("room-1", 1)] == [2, 3]
+        query = client.queries[0]
+        assert query["IndexName"] == "event_seq-index"
+        assert query["KeyConditionExpression"] == "room_id = :room AND #seq > :seq"
+        assert "FilterExpression" not in query
+
+
+class TestRoomReplayer:
+    """Tests for RoomReplayer over engine-written snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_engine_writes_snapshots_every_n_events(
+        self, engine, snapshots, room, make_event
+    ):
+        """Test the opening snapshot and one per ``snapshot_every`` events."""
+        engine.open(room)
+        for n in range(1, 26):
+            engine.apply(
+                make_event(
+                    n,
+                    damage_amount=1.0,
+                    target_enemy_id="enemy-1" if n <= 20 else "enemy-2",
+                )
+            )
+        await engine.checkpoint()
+        assert [seq for seq, _ in snapshots.snapshots["room-1"]] == [0, 10, 20]
+        assert engine.snapshots_written == 3
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_any_point_from_nearest_snapshot(
+        self, engine, snapshots, log, room, make_event
+    ):
+        """Test point-in-time rebuilds replay only events after the snapshot."""
+        engine.open(room)
+        states = {}
+        for n in range(1, 26):
+            engine.apply(make_event(n, damage_amount=1.0))
+            states[n] = engine.state("room-1")
+        await engine.checkpoint()
+
+        replayer = RoomReplayer(snapshots, log)
+        assert replayer.state("room-1", 14) == states[14]
+        assert replayer.replayed == 4
+        assert replayer.state("room-1") == states[25]
+        assert replayer.rebuild("room-1", 20).seq == 20
+        assert replayer.replayed == 9
+
+    @pytest.mark.asyncio
+    async def test_replay_steps_through_key_transitions(
+        self, engine, snapshots, log, room, make_event
+    ):
+        """Test stepping through events to find when an enemy died."""
+        engine.open(room)
+        for n in range(1, 36):
+            engine.apply(make_event(n, damage_amount=1.0))
+        await engine.checkpoint()
+
+        steps = RoomReplayer(snapshots, log).replay("room-1", 35)
+        deaths = [seq for seq, _, _, key in steps if key]
+        assert deaths == [31]
+
+    @pytest.mark.asyncio
+    async def test_gaps_in_the_log_are_reported(
+        self, engine, snapshots, log, room, make_event
+    ):
+        """Test that a replay over lost events raises instead of skipping them."""
+        engine.open(room)
+        for n in range(1, 16):
+            engine.apply(make_event(n, damage_amount=1.0))
+        await engine.checkpoint()
+        log.events["room-1"] = [p for p in log.events["room-1"] if p[0] != 13]
+
+        replayer = RoomReplayer(snapshots, log)
+        assert replayer.rebuild("room-1", 12).seq == 12
+        with pytest.raises(EventLogGap) as gap:
+            replayer.rebuild("room-1")
+        assert (gap.value.expected, gap.value.found, gap.value.room.seq) == (13, 14, 12)
+        steps = replayer.replay("room-1")
+        assert [next(steps)[0], next(steps)[0]] == [11, 12]
+        with pytest.raises(EventLogGap):
+            next(steps)
+
+    def test_missing_snapshot(self, snapshots, log):
+        """Test that rooms without snapshots cannot be replayed."""
+        with pytest.raises(LookupError):
+            RoomReplayer(snapshots, log).rebuild("room-1")
@@ -0,0 +1,174 @@
+"""Unit tests for incremental combat rollups."""
+
+import json
+import math
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from analytics.columnar import CombatEventBatch
+from analytics.rollups import CombatRollup, QuantileSketch, Summary
+from models import CombatEvent
+
+ENEMY_TYPES = {"enemy-1": "skeleton", "enemy-2": "skeleton", "enemy-3": "boss"}
+
+
+def died(
+    make_event: Callable[..., CombatEvent], n: int, seconds: float, enemy: str
+) -> CombatEvent:
+    """Return an enemy_died event for an enemy instance."""
+    return make_event(
+        n,
+        seconds,
+        event_type="enemy_died",
+        target_enemy_id=enemy,
+        damage_amount=None,
+        ability_id=None,
+    )
+
+
+@pytest.fixture
+def stream(make_event) -> list:
+    """Create a short fight: two skeletons and a boss, with a miss and a crit."""
+    return [
+        make_event(1, 0.0, target_enemy_id="enemy-1", damage_amount=10.0),
+        make_event(2, 1.0, target_enemy_id="enemy-1", damage_amount=0.0),
+        make_event(
+            3,
+            2.0,
+            target_enemy_id="enemy-1",
+            damage_amount=30.0,
+            ability_id="fireball",
+            is_critical=True,
+        ),
+        died(make_event, 4, 2.5, "enemy-1"),
+        make_event(5, 3.0, target_enemy_id="enemy-2", damage_amount=20.0),
+        make_event(
+            6,
+            4.0,
+            target_enemy_id="enemy-3",
+            damage_amount=40.0,
+            source_player_id="player-2",
+        ),
+        died(make_event, 7, 7.0, "enemy-2"),
+        died(make_event, 8, 12.0, "enemy-3"),
+    ]
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_relative_accuracy(self):
+        """Test quantiles against exact values on a skewed distribution."""
+        values = np.random.default_rng(3).lognormal(mean=3.0, sigma=1.0, size=50_000)
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        sketch.add_many(values)
+        for q in (0.1, 0.5, 0.9, 0.99):
+            exact = np.quantile(values, q, method="lower")
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+    def test_merge_matches_single_sketch(self):
+        """Test that merged partial sketches equal one sketch of all data."""
+        values = np.r_[np.zeros(10), np.random.default_rng(4).exponential(5, 1000)]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        whole.add_many(values)
+        left.add_many(values[:300])
+        right.add_many(values[300:])
+        left.merge(right)
+        assert left.buckets == whole.buckets
+        assert (left.zeros, left.count) == (10, 1010)
+        assert QuantileSketch.from_dict(left.to_dict()).buckets == whole.buckets
+        with pytest.raises(ValueError):
+            left.merge(QuantileSketch(relative_accuracy=0.05))
+
+    def test_empty(self):
+        """Test that empty sketches and summaries report NaN."""
+        assert math.isnan(QuantileSketch().quantile(0.5))
+        assert math.isnan(Summary().report()["mean"])
+
+
+class TestCombatRollup:
+    """Tests for CombatRollup."""
+
+    def test_rollups(self, stream):
+        """Test damage, time-to-kill and rate rollups over one batch."""
+        rollup = CombatRollup(ENEMY_TYPES)
+        rollup.update(CombatEventBatch.from_models(stream))
+        report = rollup.report()
+
+        assert report["damage_by_ability"]["melee_attack"]["sum"] == 70.0
+        assert report["damage_by_ability"]["fireball"]["count"] == 1
+        assert report["damage_by_enemy_type"]["skeleton"]["sum"] == 60.0
+        assert report["damage_by_enemy_type"]["boss"]["max"] == 40.0
+        skeleton_ttk = rollup.time_to_kill["skeleton"]
+        assert (skeleton_ttk.count, skeleton_ttk.total) == (2, 6.5)
+        assert rollup.time_to_kill["boss"].total == 8.0
+        player = report["players"]["player-1"]
+        assert player["attacks"] == 4
+        assert player["hit_rate"] == 0.75
+        assert player["crit_rate"] == pytest.approx(1 / 3)
+        assert rollup.first_hit == {}
+
+    def test_incremental_and_merged_match_single_pass(self, stream):
+        """Test that batch boundaries and worker splits do not change results."""
+        single = CombatRollup(ENEMY_TYPES)
+        single.update(CombatEventBatch.from_models(stream))
+
+        incremental = CombatRollup(ENEMY_TYPES)
+        for start in range(0, len(stream), 3):
+            incremental.update(CombatEventBatch.from_models(stream[start : start + 3]))
+        assert incremental.report() == single.report()
+
+        other_room = [
+            e.model_copy(update={"room_id": "room-2", "event_id": "r2-" + e.event_id})
+            for e in stream
+        ]
+        workers = []
+        for events in (stream, other_room):
+            worker = CombatRollup(ENEMY_TYPES)
+            worker.update(CombatEventBatch.from_models(events))
+            workers.append(
+                CombatRollup.from_dict(json.loads(json.dumps(worker.to_dict())))
+            )
+        both = CombatRollup(ENEMY_TYPES)
+        both.update(CombatEventBatch.from_models(stream + other_room))
+        assert CombatRollup.combine(workers).report() == both.report()
+        assert both.report()["events"] == 16
+
+    def test_unknown_enemies_and_open_kills(self, make_event):
+        """Test untyped enemies and kills whose first hit is still pending."""
+        rollup = CombatRollup()
+        rollup.update(
+            CombatEventBatch.from_models(
+                [make_event(1, 0.0, target_enemy_id="enemy-9", damage_amount=5.0)]
+            )
+        )
+        assert list(rollup.first_hit) == [("room-1", "enemy-9")]
+        rollup.update(
+            CombatEventBatch.from_models([died(make_event, 2, 4.0, "enemy-9")])
+        )
+        assert rollup.time_to_kill[None].total == 4.0
+        assert rollup.damage_by_enemy_type[None].count == 1
+
+    def test_first_hits_expire_relative_to_event_time(self, make_event):
+        """Test that enemies that never die do not keep their first hit forever."""
+        rollup = CombatRollup(max_open_seconds=60.0)
+        hits = [
+            make_event(1, 0.0, target_enemy_id="enemy-1", damage_amount=5.0),
+            make_event(2, 30.0, target_enemy_id="enemy-2", damage_amount=5.0),
+        ]
+        rollup.update(CombatEventBatch.from_models(hits))
+        assert len(rollup.first_hit) == 2
+
+        later = make_event(3, 75.0, target_enemy_id="enemy-3", damage_amount=5.0)
+        rollup.update(CombatEventBatch.from_models([later]))
+        assert set(rollup.first_hit) == {("room-1", "enemy-2"), ("room-1", "enemy-3")}
+        assert rollup.expired_hits == 1
+
+        rollup.update(
+            CombatEventBatch.from_models([died(make_event, 4, 80.0, "enemy-1")])
+        )
+        assert not rollup.time_to_kill
+        restored = CombatRollup.from_dict(json.loads(json.dumps(rollup.to_dict())))
+        assert restored.expired_hits == 1 and restored.max_open_seconds == 60.0
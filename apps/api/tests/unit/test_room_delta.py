@@ -0,0 +1,104 @@
+"""Unit tests for RoomState delta encoding."""
+
+from datetime import timedelta
+
+from models import RoomState
+from storage.dynamodb_codec import decode_entry, encode_entry
+from wire.room_delta import RoomDeltaLog, apply, diff
+
+
+def damage(room: RoomState, enemy_id: str, health: float) -> RoomState:
+    """Return a copy of ``room`` with one enemy's health changed."""
+    enemies = []
+    for raw in room.enemies:
+        entry = decode_entry(raw)
+        if entry["enemy_instance_id"] == enemy_id:
+            entry["current_health"] = health
+            entry["is_alive"] = health > 0
+        enemies.append(encode_entry(entry))
+    return room.model_copy(update={"enemies": enemies})
+
+
+class TestDiff:
+    """Tests for diff and apply."""
+
+    def test_no_change(self, room: RoomState):
+        """Test that identical states produce an empty delta."""
+        assert diff(room, room) == {"room_id": "room-1", "base": 0, "version": 1}
+
+    def test_changed_entry_sends_only_changed_properties(self, room: RoomState):
+        """Test that a damaged enemy produces a minimal patch."""
+        delta = diff(room, damage(room, "enemy-2", 10.0))
+        assert delta["enemies"] == {
+            "upsert": [{"enemy_instance_id": "enemy-2", "current_health": 10.0}]
+        }
+        assert "set" not in delta and "doors" not in delta
+
+    def test_round_trip(self, room: RoomState):
+        """Test that apply(old, diff(old, new)) reproduces new."""
+        new = damage(room, "enemy-1", 0.0).model_copy(
+            update={
+                "is_cleared": True,
+                "updated_at": room.created_at + timedelta(seconds=5),
+                "loot_drops": [],
+                "doors": room.doors
+                + [
+                    encode_entry(
+                        {"door_id": "door-2", "is_open": True, "is_locked": False}
+                    )
+                ],
+            }
+        )
+        delta = diff(room, new)
+        assert delta["loot_drops"] == {"remove": ["loot-1"]}
+        assert delta["set"]["is_cleared"] is True
+        assert apply(room, delta) == new
+
+    def test_removed_property(self, room: RoomState):
+        """Test that a dropped optional property is sent as None and removed."""
+        aggro = encode_entry({**decode_entry(room.enemies[0]), "aggro_player_id": "p1"})
+        old = room.model_copy(update={"enemies": [aggro, room.enemies[1]]})
+        delta = diff(old, room)
+        assert delta["enemies"]["upsert"] == [
+            {"aggro_player_id": None, "enemy_instance_id": "enemy-1"}
+        ]
+        assert apply(old, delta) == room
+
+
+class TestRoomDeltaLog:
+    """Tests for RoomDeltaLog versioning and catch-up."""
+
+    def test_commit_increments_version(self, room: RoomState):
+        """Test that only real changes bump the version."""
+        log = RoomDeltaLog(room)
+        assert log.commit(room) is None
+        delta = log.commit(damage(room, "enemy-1", 5.0))
+        assert (delta["base"], delta["version"], log.version) == (0, 1, 1)
+
+    def test_sync_returns_delta_chain(self, room: RoomState):
+        """Test that a client behind by a few versions gets the chain."""
+        log = RoomDeltaLog(room)
+        state = room
+        for health in (20.0, 10.0, 0.0):
+            state = damage(state, "enemy-1", health)
+            log.commit(state)
+        message = log.sync(1)
+        assert [d["version"] for d in message["deltas"]] == [2, 3]
+        assert log.sync(3)["deltas"] == []
+        client = room
+        for delta in log.sync(0)["deltas"]:
+            client = apply(client, delta)
+        assert client == log.state
+
+    def test_sync_falls_back_to_snapshot(self, room: RoomState):
+        """Test that clients outside the history window get a full snapshot."""
+        log = RoomDeltaLog(room, history=2)
+        state = room
+        for health in (20.0, 10.0, 0.0):
+            state = damage(state, "enemy-1", health)
+            log.commit(state)
+        assert "room_state" in log.sync(0)
+        assert "deltas" in log.sync(1)
+        assert "room_state" in log.sync(None)
+        assert "room_state" in log.sync(99)
+        assert RoomState.model_validate(log.sync(0)["room_state"]) == log.state
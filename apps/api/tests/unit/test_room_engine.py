@@ -0,0 +1,283 @@
+"""Unit tests for the authoritative room engine."""
+
+import asyncio
+import threading
+from datetime import timedelta
+
+import pytest
+
+from models import CombatEvent, RoomState
+from runtime.event_ingest import EventIngest, IngestedEventLog
+from runtime.room_engine import EventLogGap, LiveRoom, RoomEngine
+from storage.event_table import InMemoryEventWriter
+from storage.dynamodb_codec import decode_entry
+from storage.room_table import (
+    DynamoDBRoomCheckpointStore,
+    InMemoryRoomCheckpointStore,
+    InMemoryRoomEventLog,
+)
+
+
+def entries(state: RoomState, field: str) -> dict:
+    """Decode one entry list of a state, keyed by its first value."""
+    return {
+        next(iter(entry.values())): entry
+        for entry in map(decode_entry, getattr(state, field))
+    }
+
+
+@pytest.fixture
+def checkpoints() -> InMemoryRoomCheckpointStore:
+    """Create an in-memory checkpoint store."""
+    return InMemoryRoomCheckpointStore()
+
+
+@pytest.fixture
+def log() -> InMemoryRoomEventLog:
+    """Create an in-memory event log."""
+    return InMemoryRoomEventLog()
+
+
+@pytest.fixture
+def engine(checkpoints, log) -> RoomEngine:
+    """Create an engine over in-memory storage."""
+    return RoomEngine(checkpoints, log, checkpoint_interval=60)
+
+
+class TestLiveRoom:
+    """Tests for LiveRoom event application."""
+
+    def test_round_trips_state(self, room: RoomState):
+        """Test that an untouched live room rebuilds the same state."""
+        assert LiveRoom(room).to_state() == room
+
+    def test_damage_kills_and_clears(
+        self, room: RoomState, event: CombatEvent, make_event
+    ):
+        """Test damage, enemy death and the room-cleared transition."""
+        live = LiveRoom(room)
+        assert live.apply(make_event(1, damage_amount=10.0)) is False
+        assert live.enemies["enemy-1"]["current_health"] == 20.5
+        assert live.apply(make_event(2, damage_amount=50.0)) is True
+        assert live.enemies["enemy-1"]["is_alive"] is False
+        assert live.scalars["is_cleared"] is False
+        assert live.apply(
+            make_event(3, event_type="enemy_died", target_enemy_id="enemy-2")
+        )
+        state = live.to_state()
+        assert state.is_cleared is True
+        assert state.updated_at == event.timestamp + timedelta(seconds=3)
+
+    def test_loot_and_doors(self, room: RoomState, make_event):
+        """Test loot drops, a contested pickup and door changes."""
+        live = LiveRoom(room)
+        live.apply(
+            make_event(
+                1,
+                event_type="loot_dropped",
+                item_id="health_potion",
+                item_quantity=2,
+                metadata={"loot_instance_id": "loot-2", "item_type": "consumable"},
+            )
+        )
+        pickup = {
+            "event_type": "loot_picked_up",
+            "metadata": {"loot_instance_id": "loot-2"},
+        }
+        assert live.apply(make_event(2, source_player_id="p1", **pickup))
+        assert not live.apply(make_event(3, source_player_id="p2", **pickup))
+        assert live.apply(
+            make_event(4, event_type="door_opened", metadata={"door_id": "door-1"})
+        )
+        state = live.to_state()
+        loot = entries(state, "loot_drops")["loot-2"]
+        assert loot["quantity"] == 2
+        assert loot["picked_up_by"] == "p1"
+        assert entries(state, "doors")["door-1"]["is_open"] is True
+
+
+class TestRoomEngine:
+    """Tests for RoomEngine."""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_and_recovers(
+        self, engine, checkpoints, log, room, event, make_event
+    ):
+        """Test that a crash after a checkpoint is recovered from the event log."""
+        engine.open(room)
+        engine.apply(make_event(1, damage_amount=5.0))
+        assert await engine.checkpoint() == 1
+        engine.apply(make_event(2, damage_amount=5.0))
+        engine.apply(make_event(3, damage_amount=5.0))
+        expected = engine.state("room-1")
+
+        restarted = RoomEngine(checkpoints, log)
+        recovered = restarted.recover("room-1")
+        assert recovered.seq == 3
+        assert recovered.to_state() == expected
+        assert restarted.recover("room-unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_recover_detects_missing_events(
+        self, engine, checkpoints, log, room, event, make_event
+    ):
+        """Test that a log with a lost event is not silently folded."""
+        engine.open(room)
+        await engine.checkpoint()
+        for n in range(1, 5):
+            engine.apply(make_event(n, damage_amount=5.0))
+        del log.events["room-1"][2]
+
+        restarted = RoomEngine(checkpoints, log)
+        with pytest.raises(EventLogGap) as gap:
+            restarted.recover("room-1")
+        assert (gap.value.expected, gap.value.found) == (3, 4)
+        assert gap.value.room.seq == 2
+        assert gap.value.room.enemies["enemy-1"]["current_health"] == 20.5
+        assert "room-1" not in restarted
+
+    @pytest.mark.asyncio
+    async def test_recover_in_thread_keeps_a_room_opened_meanwhile(
+        self, engine, checkpoints, log, room, make_event
+    ):
+        """Test that reads run off the loop and never replace a live room."""
+        engine.open(room)
+        engine.apply(make_event(1, damage_amount=5.0))
+        await engine.close("room-1")
+
+        restarted = RoomEngine(checkpoints, log)
+        recovering = asyncio.create_task(restarted.recover_in_thread("room-1"))
+        live = restarted.open(room)
+        assert await recovering is live
+        assert restarted.rooms["room-1"].seq == 0
+        assert (await restarted.recover_in_thread("room-2")) is None
+
+        again = RoomEngine(checkpoints, log)
+        assert (await again.recover_in_thread("room-1")).seq == 1
+
+    @pytest.mark.asyncio
+    async def test_key_transition_triggers_checkpoint(
+        self, engine, checkpoints, room, make_event
+    ):
+        """Test that the run loop checkpoints promptly after a kill."""
+        engine.open(room)
+        await engine.checkpoint()
+        engine.apply(make_event(1, damage_amount=1.0))
+        runner = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.01)
+        assert engine.checkpoints_written == 1
+
+        engine.apply(make_event(2, damage_amount=100.0))
+        await asyncio.sleep(0.01)
+        runner.cancel()
+        assert engine.checkpoints_written == 2
+        assert checkpoints.load("room-1")[1] == 2
+
+    @pytest.mark.asyncio
+    async def test_close_writes_final_checkpoint(
+        self, engine, checkpoints, room, make_event
+    ):
+        """Test that closing a room persists its last state."""
+        engine.open(room)
+        engine.apply(make_event(1, damage_amount=5.0))
+        state = await engine.close("room-1")
+        assert "room-1" not in engine
+        assert checkpoints.load("room-1") == (state, 1)
+
+    @pytest.mark.asyncio
+    async def test_closing_room_rejects_events(
+        self, checkpoints, log, room, make_event
+    ):
+        """Test that events cannot slip in while the final checkpoint is written."""
+        started, release = threading.Event(), threading.Event()
+
+        class SlowCheckpoints(InMemoryRoomCheckpointStore):
+            def save(self, state, seq):
+                started.set()
+                release.wait(1.0)
+                return super().save(state, seq)
+
+        store = SlowCheckpoints()
+        engine = RoomEngine(store, log)
+        engine.open(room)
+        closing = asyncio.create_task(engine.close("room-1"))
+        await asyncio.to_thread(started.wait, 1.0)
+        assert "room-1" not in engine
+        with pytest.raises(KeyError):
+            engine.apply(make_event(1, damage_amount=5.0))
+        assert await engine.close("room-1") is None
+        release.set()
+        state = await closing
+        assert store.load("room-1") == (state, 0)
+        assert log.since("room-1", 0) == []
+
+    @pytest.mark.asyncio
+    async def test_failed_close_keeps_the_room(self, log, room, make_event):
+        """Test that a room whose final checkpoint failed stays open."""
+
+        class FailingCheckpoints(InMemoryRoomCheckpointStore):
+            def save(self, state, seq):
+                raise ConnectionError("table unavailable")
+
+        engine = RoomEngine(FailingCheckpoints(), log)
+        engine.open(room)
+        with pytest.raises(ConnectionError):
+            await engine.close("room-1")
+        assert "room-1" in engine
+        assert engine.apply(make_event(1, damage_amount=5.0)) is False
+
+    @pytest.mark.asyncio
+    async def test_appends_are_batched_off_the_event_path(
+        self, checkpoints, log, room, make_event
+    ):
+        """Test that applying events only buffers them for the ingest."""
+        writer = InMemoryEventWriter()
+        ingest = EventIngest(writer)
+        engine = RoomEngine(checkpoints, IngestedEventLog(ingest, log))
+        engine.open(room)
+        for n in range(1, 4):
+            engine.apply(make_event(n))
+        assert ingest.depth == 3 and writer.items == 0
+
+        assert await ingest.flush() == 3
+        assert list(writer.seqs.values()) == [1, 2, 3]
+        assert len(writer.expires) == 3
+
+    def test_unknown_room_raises(self, engine, event):
+        """Test that events for rooms the engine does not own are rejected."""
+        with pytest.raises(KeyError):
+            engine.apply(event)
+
+
+class TestDynamoDBRoomCheckpointStore:
+    """Tests for DynamoDBRoomCheckpointStore."""
+
+    def test_save_is_conditional_on_sequence(self, room):
+        """Test that stale checkpoints are rejected by the condition."""
+
+        class ConditionalCheckFailedException(Exception):
+            pass
+
+        class Client:
+            class exceptions:
+                pass
+
+            def __init__(self):
+                self.exceptions.ConditionalCheckFailedException = (
+                    ConditionalCheckFailedException
+                )
+                self.item = None
+
+            def put_item(self, TableName, Item, ConditionExpression, **kwargs):
+                seq = int(kwargs["ExpressionAttributeValues"][":seq"]["N"])
+                if self.item and int(self.item["event_seq"]["N"]) >= seq:
+                    raise ConditionalCheckFailedException()
+                self.item = Item
+
+            def get_item(self, TableName, Key, ConsistentRead):
+                return {"Item": self.item}
+
+        store = DynamoDBRoomCheckpointStore(Client(), "rooms")
+        assert store.save(room, 2) is True
+        assert store.save(room, 1) is False
+        assert store.load("room-1") == (room, 2)
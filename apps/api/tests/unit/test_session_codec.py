@@ -0,0 +1,140 @@
+"""Unit tests for the binary PlayerSession wire format."""
+
+from datetime import timedelta
+
+import pytest
+
+from models import PlayerSession
+from runtime.compact import CompactPlayerSession
+from wire.session_codec import (
+    HEADER,
+    MAX_HEARTBEAT_AGE_MS,
+    RECORD,
+    RECORD_DTYPE,
+    SLOT_MASK,
+    SessionBatchView,
+    batch_base,
+    decode_batch,
+    encode_batch,
+    join_batch,
+    pack_records,
+)
+from wire.epoch import to_epoch_ms
+
+
+@pytest.fixture
+def sessions(session: PlayerSession) -> list:
+    """Create two sessions, the second dead and without a position."""
+    return [
+        session,
+        session.model_copy(
+            update={
+                "session_id": "session-2",
+                "is_alive": False,
+                "position_x": None,
+                "last_heartbeat": session.last_heartbeat + timedelta(seconds=3),
+            }
+        ),
+    ]
+
+
+class TestSessionCodec:
+    """Tests for session batch encoding and decoding."""
+
+    def test_layout_sizes(self):
+        """Test the documented sizes and that the NumPy view matches the struct."""
+        assert (HEADER.size, RECORD.size) == (28, 16)
+        assert RECORD_DTYPE.itemsize == RECORD.size
+        offsets = [RECORD_DTYPE.fields[name][1] for name in RECORD_DTYPE.names]
+        assert offsets == [0, 2, 4, 6, 8, 10, 12, 14]
+
+    def test_size_is_fixed_per_record(self, sessions):
+        """Test that a batch is one header plus one fixed record per session."""
+        buffer = encode_batch(sessions, {"session-1": 0, "session-2": 1})
+        assert len(buffer) == HEADER.size + 2 * RECORD.size
+
+    def test_round_trip(self, sessions):
+        """Test that decoded records match the encoded sessions."""
+        buffer = encode_batch(sessions, {"session-1": 0, "session-2": 1})
+        first, second = decode_batch(buffer)
+        step = batch_base(0).step
+        assert first.slot == 0
+        assert first.position_x == pytest.approx(1.5, abs=step / 2)
+        assert first.position_z == pytest.approx(-2.25, abs=step / 2)
+        assert first.current_health == pytest.approx(80.0)
+        assert first.is_alive and first.has_position
+        assert first.last_heartbeat == sessions[0].last_heartbeat
+        assert not second.is_alive and not second.has_position
+        assert second.heartbeat_ms == to_epoch_ms(sessions[1].last_heartbeat)
+
+    def test_joined_records_match_encoded_batch(self, sessions):
+        """Test that batches assembled from packed records decode identically."""
+        slots = {"session-1": 0, "session-2": 1}
+        base, records = pack_records(sessions, slots)
+        joined = join_batch(base, [records["session-1"], records["session-2"]])
+        assert joined == encode_batch(sessions, slots)
+        (only,) = decode_batch(join_batch(base, [records["session-2"]]))
+        assert only.heartbeat_ms == to_epoch_ms(sessions[1].last_heartbeat)
+
+    def test_accepts_compact_sessions(self, session: PlayerSession):
+        """Test that compact runtime sessions encode the same as models."""
+        compact = CompactPlayerSession.from_model(session)
+        slots = {"session-1": 3}
+        assert encode_batch([compact], slots) == encode_batch([session], slots)
+
+    def test_view_is_zero_copy(self, sessions):
+        """Test that the NumPy view shares memory with the buffer."""
+        buffer = bytearray(encode_batch(sessions, {"session-1": 0, "session-2": 1}))
+        view = SessionBatchView(buffer)
+        array = view.as_array()
+        assert (array["slot_flags"] & SLOT_MASK).tolist() == [0, 1]
+        buffer[HEADER.size] = 7
+        assert array["slot_flags"][0] & SLOT_MASK == 7
+        assert view[0].slot == 7
+        assert view[-1].slot == 1
+
+    def test_positions_are_quantized_over_room_bounds(self, sessions):
+        """Test the step of small rooms and clamping outside the bounds."""
+        bounds = ((0.0, 0.0, 0.0), (64.0, 8.0, 64.0))
+        far = sessions[0].model_copy(update={"position_x": 500.0, "position_y": 3.0})
+        view = SessionBatchView(encode_batch([far], {"session-1": 0}, bounds))
+        assert view.base.step == pytest.approx(64.0 / 65534)
+        (update,) = view
+        assert update.position_x == pytest.approx(64.0, abs=view.base.step)
+        assert update.position_y == pytest.approx(3.0, abs=view.base.step / 2)
+        assert view.positions()[0].tolist() == pytest.approx(
+            [update.position_x, update.position_y, update.position_z]
+        )
+
+    def test_heartbeat_ages_saturate(self, sessions):
+        """Test that heartbeats are exact within the age window and clamp past it."""
+        old = sessions[0].model_copy(
+            update={"last_heartbeat": sessions[1].last_heartbeat - timedelta(hours=1)}
+        )
+        fresh, stale = decode_batch(
+            encode_batch([sessions[1], old], {"session-2": 1, "session-1": 0})
+        )
+        assert fresh.heartbeat_ms == to_epoch_ms(sessions[1].last_heartbeat)
+        assert fresh.heartbeat_ms - stale.heartbeat_ms == MAX_HEARTBEAT_AGE_MS
+
+    def test_rejects_slots_beyond_14_bits(self, sessions):
+        """Test that slots cannot spill into the flag bits."""
+        with pytest.raises(ValueError, match="Slot"):
+            encode_batch(sessions[:1], {"session-1": SLOT_MASK + 1})
+
+    def test_empty_batch(self):
+        """Test that an empty batch is just a header."""
+        assert decode_batch(encode_batch([], {})) == []
+
+    def test_rejects_unknown_version(self, sessions):
+        """Test that unknown versions are rejected."""
+        buffer = bytearray(encode_batch(sessions, {"session-1": 0, "session-2": 1}))
+        buffer[0] = 99
+        with pytest.raises(ValueError, match="version"):
+            decode_batch(buffer)
+
+    def test_rejects_truncated_buffer(self, sessions):
+        """Test that truncated buffers are rejected."""
+        buffer = encode_batch(sessions, {"session-1": 0, "session-2": 1})
+        with pytest.raises(ValueError, match="truncated"):
+            decode_batch(buffer[:-1])
@@ -0,0 +1,58 @@
+"""Unit tests for in-memory session and room event stores."""
+
+from models import CombatEvent, PlayerSession
+from runtime.compact import CompactCombatEvent, CompactPlayerSession
+from runtime.stores import RoomEventStore, SessionStore
+
+
+class TestSessionStore:
+    """Tests for SessionStore."""
+
+    def test_put_stores_compact_form(self, session: PlayerSession):
+        """Test that stored sessions are kept in compact form."""
+        store = SessionStore()
+        store.put(session)
+        assert isinstance(store.get("session-1"), CompactPlayerSession)
+        assert store.get_model("session-1") == session
+
+    def test_room_index_follows_moves(self, session: PlayerSession):
+        """Test that moving a session between rooms updates the room index."""
+        store = SessionStore()
+        store.put(session)
+        store.put(session.model_copy(update={"room_id": "room-2"}))
+        assert store.in_room("room-1") == []
+        assert [s.session_id for s in store.in_room("room-2")] == ["session-1"]
+
+    def test_remove(self, session: PlayerSession):
+        """Test that removing a session clears it from the room index."""
+        store = SessionStore()
+        store.put(session)
+        assert store.remove("session-1") is not None
+        assert "session-1" not in store
+        assert store.in_room("room-1") == []
+        assert store.remove("session-1") is None
+
+
+class TestRoomEventStore:
+    """Tests for RoomEventStore."""
+
+    def test_append_and_read_back(self, event: CombatEvent):
+        """Test that events are kept per room in arrival order."""
+        store = RoomEventStore()
+        store.append(event)
+        store.append(event.model_copy(update={"event_id": "event-2"}))
+        store.append(
+            event.model_copy(update={"event_id": "event-3", "room_id": "room-2"})
+        )
+        events = store.events("room-1")
+        assert all(isinstance(e, CompactCombatEvent) for e in events)
+        assert [e.event_id for e in events] == ["event-1", "event-2"]
+        assert store.models("room-1")[0] == event
+        assert len(store) == 3
+
+    def test_drop_room(self, event: CombatEvent):
+        """Test that dropping a room forgets its events."""
+        store = RoomEventStore()
+        store.append(event)
+        assert store.drop_room("room-1") == 1
+        assert store.events("room-1") == []
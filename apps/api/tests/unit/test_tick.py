@@ -0,0 +1,244 @@
+"""Unit tests for the tick loop and room shard."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.hub import RoomHub
+from app.main import create_app
+from app.settings import Settings
+from app.shard import RoomShard
+from models import CombatEvent, PlayerSession, RoomState
+from rules.damage import StatsIndex
+from runtime.room_engine import RoomEngine
+from runtime.tick import TickLoop, TickStats
+from storage.room_table import InMemoryRoomCheckpointStore, InMemoryRoomEventLog
+from wire.tick_frame import decode_tick_frame, encode_tick_frame
+
+
+class TestTickStats:
+    """Tests for TickStats."""
+
+    def test_histogram_and_overruns(self):
+        """Test bucket placement and overrun counting against the budget."""
+        stats = TickStats(budget_ms=50.0, buckets_ms=(1.0, 10.0, 100.0))
+        for duration in (0.5, 1.0, 7.0, 60.0, 250.0):
+            stats.record(duration)
+        snapshot = stats.snapshot()
+        assert snapshot["histogram_ms"] == {"1.0": 2, "10.0": 1, "100.0": 1, "+Inf": 1}
+        assert snapshot["overruns"] == 2
+        assert snapshot["max_ms"] == 250.0
+
+
+class TestTickLoop:
+    """Tests for TickLoop."""
+
+    def test_run_tick_records_duration(self, clock):
+        """Test that each tick is numbered and timed."""
+        seen = []
+
+        def step(tick):
+            seen.append(tick)
+            clock.now += 0.08
+
+        loop = TickLoop(step, rate_hz=20.0, clock=clock)
+        loop.run_tick()
+        loop.run_tick()
+        assert seen == [0, 1]
+        assert loop.stats.overruns == 2
+
+    @pytest.mark.asyncio
+    async def test_skips_missed_ticks(self, clock):
+        """Test that a loop far behind schedule skips instead of bursting."""
+        seen = []
+
+        def step(tick):
+            seen.append(tick)
+            clock.now += 0.35 if tick == 0 else 0.0
+
+        loop = TickLoop(step, rate_hz=10.0, clock=clock)
+        runner = asyncio.create_task(loop.run())
+        await asyncio.sleep(0.01)
+        runner.cancel()
+        assert seen[:2] == [0, 3]
+        assert loop.stats.skipped == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_step_does_not_stop_the_loop(self, clock, caplog):
+        """Test that a step error is logged and counted and ticking continues."""
+        seen = []
+
+        def step(tick):
+            seen.append(tick)
+            clock.now += 0.1
+            if tick == 1:
+                raise RuntimeError("write-through failed")
+
+        loop = TickLoop(step, rate_hz=10.0, clock=clock)
+        runner = asyncio.create_task(loop.run())
+        await asyncio.sleep(0.01)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        assert seen[:4] == [0, 1, 2, 3]
+        assert loop.stats.snapshot()["errors"] == 1
+        assert "Tick 1 failed" in caplog.text
+
+
+class TestTickFrame:
+    """Tests for the merged tick frame format."""
+
+    def test_round_trip(self):
+        """Test that JSON and position parts are recovered."""
+        frame = encode_tick_frame(7, b'{"type":"tick"}', None)
+        assert decode_tick_frame(frame) == (7, {"type": "tick"}, None)
+        with pytest.raises(ValueError):
+            decode_tick_frame(frame[:-1])
+
+
+class TestRoomShard:
+    """Tests for RoomShard."""
+
+    @pytest.fixture
+    def shard(self, room: RoomState) -> RoomShard:
+        """Create a shard owning one room."""
+        engine = RoomEngine(InMemoryRoomCheckpointStore(), InMemoryRoomEventLog())
+        engine.open(room)
+        return RoomShard(engine, RoomHub())
+
+    def test_one_merged_frame_per_client_per_tick(
+        self, shard: RoomShard, session: PlayerSession, event: CombatEvent
+    ):
+        """Test that a tick's events and positions reach each client in one frame."""
+        queues = {
+            sid: shard.hub.join(sid, "room-1", None).queue
+            for sid in ("session-1", "session-2")
+        }
+        other = session.model_copy(update={"session_id": "session-2"})
+        shard.submit_session(session.model_copy(update={"position_x": 0.0}))
+        shard.submit_session(session)
+        shard.submit_session(other)
+        shard.submit_event(event.model_copy(update={"target_enemy_id": "enemy-1"}))
+        second = event.model_copy(
+            update={
+                "event_id": "event-2",
+                "target_enemy_id": "enemy-1",
+                "timestamp": event.timestamp + timedelta(seconds=1),
+            }
+        )
+        shard.submit_event(second)
+        shard.step(0)
+
+        for session_id, queue in queues.items():
+            assert len(queue) == 1
+            frame = queue._frames[0][1]
+            tick, message, positions = decode_tick_frame(frame)
+            assert tick == 0
+            assert [e["event_id"] for e in message["events"]] == ["event-1", "event-2"]
+            assert message["delta"]["version"] == 1
+            assert len(positions) == 1
+        assert shard.engine.rooms["room-1"].enemies["enemy-1"]["current_health"] == 0
+        assert shard.slots("room-1") == {"session-1": 0, "session-2": 1}
+
+    def test_position_only_ticks_coalesce(self, shard: RoomShard, session):
+        """Test that frames without events replace each other when unsent."""
+        queue = shard.hub.join("session-2", "room-1", None).queue
+        for tick in range(3):
+            shard.submit_session(session.model_copy(update={"position_x": 1.0 + tick}))
+            shard.submit_session(session.model_copy(update={"session_id": "session-2"}))
+            shard.step(tick)
+        assert len(queue) == 1
+        assert decode_tick_frame(queue._frames[0][1])[0] == 2
+
+    def test_removed_sessions_leave_batches_and_free_their_slot(
+        self, shard: RoomShard, session
+    ):
+        """Test that a disconnected player is no longer broadcast or tracked."""
+        queue = shard.hub.join("session-2", "room-1", None).queue
+        shard.submit_session(session)
+        shard.submit_session(session.model_copy(update={"session_id": "session-2"}))
+        shard.step(0)
+        assert len(decode_tick_frame(queue._frames.pop()[1])[2]) == 1
+
+        shard.submit_session(session.model_copy(update={"position_x": 3.0}))
+        shard.remove_session("session-1")
+        shard.submit_session(session.model_copy(update={"session_id": "session-2"}))
+        shard.step(1)
+        assert shard.slots("room-1") == {"session-2": 1}
+        assert shard.interest.interest_sets("room-1") == {"session-2": frozenset()}
+        assert not queue._frames
+
+        shard.submit_session(session.model_copy(update={"session_id": "session-3"}))
+        shard.step(2)
+        assert shard.slots("room-1") == {"session-2": 1, "session-3": 0}
+        shard.remove_session("session-2")
+        shard.remove_session("session-3")
+        assert shard.slots("room-1") == {}
+        assert shard.interest.room("room-1") is None
+
+    def test_events_for_unknown_rooms_are_rejected(self, shard, event):
+        """Test that events for rooms outside the shard are counted and skipped."""
+        shard.submit_event(event.model_copy(update={"room_id": "room-9"}))
+        shard.step(0)
+        assert shard.rejected == 1
+
+    def test_rules_reject_bad_damage(
+        self, shard: RoomShard, session, event, config_source
+    ):
+        """Test that claimed damage is checked against the stats before applying."""
+        shard.set_rules(
+            StatsIndex.from_config_source(config_source), {"skeleton": "player_default"}
+        )
+        shard.submit_session(session)
+        shard.step(0)
+        honest = event.model_copy(update={"damage_amount": 10.0})
+        inflated = event.model_copy(update={"event_id": "event-2"})
+        shard.submit_event(honest)
+        shard.submit_event(inflated)
+        shard.step(1)
+        assert shard.rejected == 1
+        assert shard.engine.rooms["room-1"].enemies["enemy-1"]["current_health"] == 20.5
+        assert shard.engine.rooms["room-1"].seq == 1
+
+    def test_rules_clamp_teleports_and_drop_stale_updates(
+        self, shard: RoomShard, session, config_source
+    ):
+        """Test movement validation of session updates between ticks."""
+        shard.set_rules(StatsIndex.from_config_source(config_source), {})
+        shard.submit_session(session)
+        shard.step(0)
+        later = session.last_heartbeat + timedelta(seconds=1)
+        shard.submit_session(
+            session.model_copy(update={"position_x": 101.5, "last_heartbeat": later})
+        )
+        shard.step(1)
+        position = shard._latest["room-1"]["session-1"].position_x
+        assert shard.corrected == 1
+        assert 1.5 < position < 20.0
+
+        shard.submit_session(session.model_copy(update={"position_x": 2.0}))
+        shard.step(2)
+        assert shard.dropped_updates == 1
+        assert shard._latest["room-1"]["session-1"].position_x == position
+
+        shard.submit_session(
+            session.model_copy(
+                update={"session_id": "session-2", "combat_stats_id": "unknown"}
+            )
+        )
+        shard.step(3)
+        assert shard.dropped_updates == 2
+        assert "session-2" not in shard.slots("room-1")
+
+
+def test_tick_stats_endpoint(config_source):
+    """Test that registered tick loops are exposed over HTTP."""
+    app = create_app(Settings(), config_source)
+    loop = TickLoop(lambda tick: None)
+    loop.run_tick()
+    app.state.tick_loops["shard-0"] = loop
+    response = TestClient(app).get("/api/runtime/ticks")
+    assert response.status_code == 200
+    assert response.json()["shard-0"]["ticks"] == 1
+    assert "rooms" in response.json()
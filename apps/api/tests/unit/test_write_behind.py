@@ -0,0 +1,243 @@
+"""Unit tests for the write-behind session store."""
+
+import asyncio
+import threading
+
+import pytest
+
+from runtime.compact import CompactPlayerSession
+from runtime.write_behind import WriteBehindSessionStore
+from storage.session_table import DynamoDBSessionWriter, InMemorySessionWriter
+
+
+@pytest.fixture
+def writer() -> InMemorySessionWriter:
+    """Create an in-memory session writer."""
+    return InMemorySessionWriter()
+
+
+class TestWriteBehindSessionStore:
+    """Tests for WriteBehindSessionStore."""
+
+    def test_new_session_is_queued_for_an_immediate_write(self, session, writer, clock):
+        """Test that the first update is urgent but not written on the caller."""
+        store = WriteBehindSessionStore(writer, flush_interval=1.0, clock=clock)
+        assert store.update(session) is True
+        assert writer.items == 0
+        assert (store.pending, store.urgent) == (1, 1)
+        assert store.flush(urgent_only=True) == 1
+        assert writer.sessions["session-1"].position_x == 1.5
+        assert store.pending == 0
+
+    def test_updates_coalesce_until_interval(
+        self, session, make_session, writer, clock
+    ):
+        """Test that repeated updates become one write at the next flush."""
+        store = WriteBehindSessionStore(writer, flush_interval=1.0, clock=clock)
+        store.update(session)
+        store.flush(urgent_only=True)
+        for i in range(5):
+            clock.now += 0.1
+            assert store.update(make_session(position_x=float(i))) is False
+        assert writer.items == 1
+        assert store.pending == 1
+        assert store.get("session-1").position_x == 4.0
+
+        clock.now = 1.0
+        store.update(make_session(position_x=9.0))
+        assert writer.items == 1
+        assert store.maybe_flush() == 1
+        assert writer.items == 2
+        assert writer.sessions["session-1"].position_x == 9.0
+        assert store.pending == 0
+
+    @pytest.mark.parametrize(
+        "update", [{"is_alive": False}, {"room_id": "room-2"}, {"room_id": None}]
+    )
+    def test_critical_fields_are_urgent(
+        self, session, make_session, writer, clock, update
+    ):
+        """Test that deaths and room changes bypass the buffer."""
+        store = WriteBehindSessionStore(writer, flush_interval=60.0, clock=clock)
+        store.update(session)
+        store.flush(urgent_only=True)
+        other = make_session("session-2")
+        store.update(other)
+        store.flush(urgent_only=True)
+        store.update(make_session("session-2", position_x=2.0))
+        store.update(make_session(position_x=3.0))
+        assert store.urgent == 0
+        assert store.update(session.model_copy(update=update)) is True
+        assert store.flush(urgent_only=True) == 1
+        assert store.pending == 1
+        assert writer.items == 3
+        stored = writer.sessions["session-1"]
+        for name, value in update.items():
+            assert getattr(stored, name) == value
+
+    def test_flush_and_remove_write_pending_state(
+        self, session, make_session, writer, clock
+    ):
+        """Test explicit flushes and removal of a session with pending changes."""
+        store = WriteBehindSessionStore(writer, flush_interval=60.0, clock=clock)
+        other = make_session("session-2")
+        store.update(session)
+        store.update(other)
+        store.update(make_session(position_x=7.0))
+        store.update(make_session("session-2", position_x=8.0))
+        assert store.flush() == 2
+        assert store.flush() == 0
+
+        store.update(make_session(position_x=11.0))
+        assert store.remove("session-1").position_x == 11.0
+        assert store.get("session-1") is None
+        assert len(store) == 1
+        assert store.urgent == 1
+        assert store.flush(urgent_only=True) == 1
+        assert writer.sessions["session-1"].position_x == 11.0
+        assert store.remove("session-2") is not None
+        assert store.urgent == 0
+
+    def test_failed_flush_keeps_sessions_dirty(self, session, make_session, clock):
+        """Test that a failed write leaves the sessions pending for the next flush."""
+
+        class FailingWriter(InMemorySessionWriter):
+            def write(self, sessions):
+                if self.items:
+                    raise ConnectionError("table unavailable")
+                super().write(sessions)
+
+        store = WriteBehindSessionStore(FailingWriter(), clock=clock)
+        store.update(session)
+        store.flush()
+        store.update(make_session(position_x=2.0))
+        with pytest.raises(ConnectionError):
+            store.flush()
+        assert store.pending == 1
+
+    def test_failed_urgent_write_stays_dirty(self, session, clock):
+        """Test that a failed immediate write is retried by the next flush."""
+
+        class FailingWriter(InMemorySessionWriter):
+            def write(self, sessions):
+                raise ConnectionError("table unavailable")
+
+        store = WriteBehindSessionStore(FailingWriter(), clock=clock)
+        store.update(session)
+        with pytest.raises(ConnectionError):
+            store.flush(urgent_only=True)
+        assert (store.pending, store.urgent) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_urgent_writes_leave_the_event_loop_at_once(
+        self, session, make_session, clock
+    ):
+        """Test that run writes urgent sessions off-loop without waiting."""
+        threads = []
+
+        class RecordingWriter(InMemorySessionWriter):
+            def write(self, sessions):
+                threads.append(threading.get_ident())
+                super().write(sessions)
+
+        writer = RecordingWriter()
+        store = WriteBehindSessionStore(writer, flush_interval=60.0, clock=clock)
+        task = asyncio.create_task(store.run())
+        await asyncio.sleep(0)
+        store.update(session)
+        store.update(make_session("session-2"))
+        store.update(make_session(position_x=4.0))
+        assert writer.items == 0
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if writer.items:
+                break
+        assert sorted(writer.sessions) == ["session-1", "session-2"]
+        assert store.pending == 0
+        assert threading.get_ident() not in threads
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_run_survives_failed_flushes(self, session, make_session, clock):
+        """Test that the flush loop logs errors, keeps going and writes off-loop."""
+        threads = []
+
+        class FailingOnceWriter(InMemorySessionWriter):
+            def write(self, sessions):
+                threads.append(threading.get_ident())
+                if len(threads) == 2:
+                    raise ConnectionError("table unavailable")
+                super().write(sessions)
+
+        writer = FailingOnceWriter()
+        store = WriteBehindSessionStore(writer, flush_interval=0.01, clock=clock)
+        store.update(session)
+        store.update(make_session(position_x=6.0))
+        task = asyncio.create_task(store.run())
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if writer.items == 2:
+                break
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert writer.sessions["session-1"].position_x == 6.0
+        assert store.pending == 0
+        assert threading.get_ident() not in threads[1:]
+
+
+class TestDynamoDBSessionWriter:
+    """Tests for DynamoDBSessionWriter."""
+
+    def test_chunks_and_retries_unprocessed(self, session):
+        """Test 25-item chunking and resubmission of unprocessed items."""
+        calls = []
+
+        class Client:
+            def batch_write_item(self, RequestItems):
+                requests = RequestItems["sessions"]
+                calls.append(len(requests))
+                if len(calls) == 1:
+                    return {"UnprocessedItems": {"sessions": requests[:3]}}
+                return {"UnprocessedItems": {}}
+
+        sessions = [
+            session.model_copy(update={"session_id": f"session-{i}"}) for i in range(30)
+        ]
+        delays = []
+        writer = DynamoDBSessionWriter(Client(), "sessions", sleep=delays.append)
+        writer.write(sessions)
+        assert calls == [25, 3, 5]
+        assert writer.items == 30
+        assert writer.retries == 1 and 0.025 <= delays[0] <= 0.05
+
+    def test_items_carry_the_ttl_attribute(self, session):
+        """Test that every session item expires a while after its last heartbeat."""
+        items = []
+
+        class Client:
+            def batch_write_item(self, RequestItems):
+                items.extend(r["PutRequest"]["Item"] for r in RequestItems["sessions"])
+                return {}
+
+        compact = CompactPlayerSession.from_model(session)
+        DynamoDBSessionWriter(Client(), "sessions", ttl_seconds=3600).write(
+            [session, compact]
+        )
+        expected = str(int(session.last_heartbeat.timestamp()) + 3600)
+        assert [item["expires_at"] for item in items] == [{"N": expected}] * 2
+        assert items[0]["session_id"] == {"S": "session-1"}
+
+    def test_gives_up_after_max_attempts(self, session):
+        """Test that persistently unprocessed items raise."""
+
+        class Client:
+            def batch_write_item(self, RequestItems):
+                return {"UnprocessedItems": RequestItems}
+
+        writer = DynamoDBSessionWriter(
+            Client(), "sessions", max_attempts=2, sleep=lambda delay: None
+        )
+        with pytest.raises(RuntimeError, match="unprocessed"):
+            writer.write([session])
@@ -0,0 +1,31 @@
+"""Wire formats for the real-time multiplayer protocol."""
+
+from .epoch import EpochCombatEvent, EpochPlayerSession, from_epoch_ms, to_epoch_ms
+from .room_delta import RoomDeltaLog
+from .session_codec import (
+    WIRE_VERSION,
+    SessionBatchView,
+    SessionUpdate,
+    decode_batch,
+    encode_batch,
+    join_batch,
+    pack_records,
+)
+from .tick_frame import decode_tick_frame, encode_tick_frame
+
+__all__ = [
+    "EpochCombatEvent",
+    "EpochPlayerSession",
+    "RoomDeltaLog",
+    "WIRE_VERSION",
+    "SessionBatchView",
+    "SessionUpdate",
+    "decode_batch",
+    "decode_tick_frame",
+    "encode_batch",
+    "encode_tick_frame",
+    "from_epoch_ms",
+    "join_batch",
+    "pack_records",
+    "to_epoch_ms",
+]
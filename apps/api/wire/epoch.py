@@ -0,0 +1,180 @@
+"""Epoch-millisecond timestamp variants of the high-frequency models.
+
+``CombatEvent.timestamp``/``created_at`` and ``PlayerSession.last_heartbeat``
+are ``datetime`` fields in the generated models, so every event pays for
+ISO-8601 parsing on the way in and formatting on the way out. The opt-in
+variants here store those fields as integer epoch milliseconds and only build
+a ``datetime`` when one is asked for.
+
+The variants are separate models built from the generated ones' fields,
+not subclasses: code that takes a ``CombatEvent`` or ``PlayerSession``
+(storage codecs, columnar export, TTLs) expects datetimes, so an epoch
+variant must be converted with ``to_model()`` before it is handed on.
+
+Accepted inputs for an epoch field:
+
+- a number (or numeric string), whose unit is picked by magnitude: below
+  ``1e11`` it is unix seconds (as sent by the Godot client,
+  ``Time.get_unix_time_from_system()``), below ``1e14`` epoch milliseconds,
+  below ``1e17`` microseconds and above that nanoseconds
+- ``datetime`` (naive values are UTC) or an ISO-8601 string
+"""
+
+from copy import copy
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, Dict, Optional, Tuple, Type, Union
+
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    StrictInt,
+    create_model,
+)
+
+from models import CombatEvent, PlayerSession
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Magnitudes at which a bare number stops being read as seconds, then ms,
+# then microseconds. 1e11 seconds is the year 5138; 1e11 ms is only 1973.
+_SECONDS_BELOW = 1e11
+_MS_BELOW = 1e14
+_US_BELOW = 1e17
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Convert a datetime (naive values are treated as UTC) to epoch milliseconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+def from_epoch_ms(value: int) -> datetime:
+    """Convert epoch milliseconds to an aware UTC datetime."""
+    return _EPOCH + timedelta(milliseconds=value)
+
+
+def _number_to_ms(value: Any) -> int:
+    magnitude = abs(value)
+    if magnitude < _SECONDS_BELOW:
+        return round(value * 1000)
+    if magnitude < _MS_BELOW:
+        return round(value)
+    if magnitude < _US_BELOW:
+        return round(value / 1000)
+    return round(value / 1_000_000)
+
+
+def _coerce_epoch_ms(value: Any) -> Any:
+    if isinstance(value, bool):
+        raise ValueError("Boolean is not a valid timestamp")
+    if isinstance(value, (int, float)):
+        return _number_to_ms(value)
+    if isinstance(value, datetime):
+        return to_epoch_ms(value)
+    if isinstance(value, str):
+        if value.lstrip("-").isdigit():
+            return _number_to_ms(int(value))
+        try:
+            return _number_to_ms(float(value))
+        except ValueError:
+            return to_epoch_ms(datetime.fromisoformat(value))
+    return value
+
+
+# Integers already in the millisecond range stay on pydantic-core's native
+# strict-int path; everything else calls back into Python for conversion.
+EpochMs = Union[
+    Annotated[StrictInt, Field(ge=int(_SECONDS_BELOW), lt=int(_MS_BELOW))],
+    Annotated[int, BeforeValidator(_coerce_epoch_ms)],
+]
+
+
+def _epoch_fields(model: Type[BaseModel], *names: str) -> Dict[str, Tuple[Any, Any]]:
+    """Copy a model's fields, turning ``names`` into ``EpochMs`` fields."""
+    fields: Dict[str, Tuple[Any, Any]] = {}
+    for name, info in model.model_fields.items():
+        info = copy(info)
+        annotation = info.annotation
+        if name in names:
+            annotation = EpochMs
+            info.annotation = EpochMs
+            info.metadata = []
+            info.description = f"{info.description} (epoch milliseconds)"
+        fields[name] = (annotation, info)
+    return fields
+
+
+_EpochCombatEventFields = create_model(  # type: ignore[call-overload]
+    "_EpochCombatEventFields",
+    __config__=ConfigDict(from_attributes=True),
+    **_epoch_fields(CombatEvent, "timestamp", "created_at"),
+)
+
+_EpochPlayerSessionFields = create_model(  # type: ignore[call-overload]
+    "_EpochPlayerSessionFields",
+    __config__=ConfigDict(from_attributes=True),
+    **_epoch_fields(PlayerSession, "last_heartbeat"),
+)
+
+
+class EpochCombatEvent(_EpochCombatEventFields):
+    """``CombatEvent`` fields with ``timestamp`` and ``created_at`` as epoch ms."""
+
+    @property
+    def timestamp_dt(self) -> datetime:
+        """``timestamp`` as an aware UTC datetime."""
+        return from_epoch_ms(self.timestamp)
+
+    @property
+    def created_at_dt(self) -> datetime:
+        """``created_at`` as an aware UTC datetime."""
+        return from_epoch_ms(self.created_at)
+
+    @classmethod
+    def from_model(cls, event: CombatEvent) -> "EpochCombatEvent":
+        """Convert a standard event without re-running validation."""
+        values = dict(event)
+        values["timestamp"] = to_epoch_ms(event.timestamp)
+        values["created_at"] = to_epoch_ms(event.created_at)
+        return cls.model_construct(**values)
+
+    def to_model(self) -> CombatEvent:
+        """Convert to a standard ``CombatEvent`` with datetime fields."""
+        values = dict(self)
+        values["timestamp"] = self.timestamp_dt
+        values["created_at"] = self.created_at_dt
+        return CombatEvent.model_construct(**values)
+
+
+class EpochPlayerSession(_EpochPlayerSessionFields):
+    """``PlayerSession`` fields with ``last_heartbeat`` as epoch milliseconds."""
+
+    @property
+    def last_heartbeat_dt(self) -> datetime:
+        """``last_heartbeat`` as an aware UTC datetime."""
+        return from_epoch_ms(self.last_heartbeat)
+
+    @classmethod
+    def from_model(cls, session: PlayerSession) -> "EpochPlayerSession":
+        """Convert a standard session without re-running validation."""
+        values = dict(session)
+        values["last_heartbeat"] = to_epoch_ms(session.last_heartbeat)
+        return cls.model_construct(**values)
+
+    def to_model(self) -> PlayerSession:
+        """Convert to a standard ``PlayerSession`` with datetime fields."""
+        values = dict(self)
+        values["last_heartbeat"] = self.last_heartbeat_dt
+        return PlayerSession.model_construct(**values)
+
+
+def heartbeat_ms(session: Any) -> Optional[int]:
+    """Return a session's heartbeat in epoch ms whichever representation it uses."""
+    value = session.last_heartbeat
+    if value is None:
+        return None
+    return value if isinstance(value, int) else to_epoch_ms(value)
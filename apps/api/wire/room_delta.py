@@ -0,0 +1,213 @@
+"""Delta encoding of RoomState updates.
+
+Instead of re-broadcasting the whole ``RoomState`` after every combat event,
+the server keeps a version number per room and sends the difference between
+consecutive versions. A delta looks like::
+
+    {
+        "room_id": "room-1",
+        "base": 41,
+        "version": 42,
+        "set": {"is_cleared": true},
+        "enemies": {
+            "upsert": [{"enemy_instance_id": "e-7", "current_health": 12.5}],
+            "remove": ["e-3"]
+        }
+    }
+
+Entries are matched by their instance ID. Changed entries carry only the
+changed properties; new entries are sent in full. A property set to ``None``
+is removed from the entry, matching how the DynamoDB codec drops empty
+properties. Untouched entries keep their order and new entries are appended.
+
+A client that is behind asks ``RoomDeltaLog.sync`` for everything since its
+version and receives either the delta chain or, when it has fallen outside
+the retained history, a full snapshot.
+"""
+
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from models import RoomState
+from storage.dynamodb_codec import decode_entry, encode_entry
+
+ENTRY_KEYS = {
+    "enemies": "enemy_instance_id",
+    "loot_drops": "loot_instance_id",
+    "doors": "door_id",
+}
+SCALAR_FIELDS = (
+    "dungeon_id",
+    "room_type",
+    "max_players",
+    "current_player_count",
+    "is_cleared",
+    "created_at",
+    "updated_at",
+    "expires_at",
+)
+DATETIME_FIELDS = frozenset({"created_at", "updated_at", "expires_at"})
+_HEADER_KEYS = frozenset({"room_id", "base", "version"})
+
+
+def dumps(message: Dict[str, Any]) -> bytes:
+    """Serialize a delta or sync message as compact JSON."""
+    return json.dumps(message, separators=(",", ":")).encode()
+
+
+def _scalar(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _diff_entries(key: str, old: Sequence[str], new: Sequence[str]) -> Dict[str, list]:
+    """Diff two entry lists, parsing only the entries whose JSON changed."""
+    if old == new:
+        return {}
+    new_strings = set(new)
+    old_strings = set(old)
+    gone = {
+        entry[key]: entry
+        for entry in (decode_entry(s) for s in old if s not in new_strings)
+    }
+    upsert = []
+    for entry in (decode_entry(s) for s in new if s not in old_strings):
+        previous = gone.pop(entry[key], None)
+        if previous is None:
+            upsert.append(entry)
+            continue
+        patch = {k: v for k, v in entry.items() if previous.get(k) != v}
+        patch.update({k: None for k in previous.keys() - entry.keys()})
+        patch[key] = entry[key]
+        upsert.append(patch)
+    section = {}
+    if upsert:
+        section["upsert"] = upsert
+    if gone:
+        section["remove"] = list(gone)
+    return section
+
+
+def diff(
+    old: RoomState, new: RoomState, base: int = 0, version: int = 1
+) -> Dict[str, Any]:
+    """Compute the delta that turns ``old`` into ``new``.
+
+    Args:
+        old: Room state the client already has
+        new: Current room state
+        base: Version number of ``old``
+        version: Version number of ``new``
+
+    Returns:
+        The delta; only ``room_id``, ``base`` and ``version`` when nothing changed
+    """
+    delta: Dict[str, Any] = {"room_id": new.room_id, "base": base, "version": version}
+    changed = {
+        name: _scalar(getattr(new, name))
+        for name in SCALAR_FIELDS
+        if getattr(old, name) != getattr(new, name)
+    }
+    if changed:
+        delta["set"] = changed
+    for field, key in ENTRY_KEYS.items():
+        section = _diff_entries(key, getattr(old, field), getattr(new, field))
+        if section:
+            delta[field] = section
+    return delta
+
+
+def _apply_entries(
+    key: str, entries: Sequence[str], section: Dict[str, list]
+) -> List[str]:
+    removed = set(section.get("remove", ()))
+    patches = {patch[key]: patch for patch in section.get("upsert", ())}
+    result = []
+    for raw in entries:
+        entry = decode_entry(raw) if removed or patches else None
+        if entry is None:
+            result.append(raw)
+            continue
+        entry_id = entry[key]
+        if entry_id in removed:
+            removed.discard(entry_id)
+            continue
+        patch = patches.pop(entry_id, None)
+        if patch is None:
+            result.append(raw)
+            continue
+        entry.update(patch)
+        result.append(encode_entry({k: v for k, v in entry.items() if v is not None}))
+    for patch in patches.values():
+        result.append(encode_entry({k: v for k, v in patch.items() if v is not None}))
+    return result
+
+
+def apply(state: RoomState, delta: Dict[str, Any]) -> RoomState:
+    """Return a new state with ``delta`` applied to ``state``."""
+    update: Dict[str, Any] = {}
+    for name, value in delta.get("set", {}).items():
+        if name in DATETIME_FIELDS and value is not None:
+            value = datetime.fromisoformat(value)
+        update[name] = value
+    for field, key in ENTRY_KEYS.items():
+        section = delta.get(field)
+        if section:
+            update[field] = _apply_entries(key, getattr(state, field), section)
+    return state.model_copy(update=update)
+
+
+class RoomDeltaLog:
+    """Versioned state and recent delta history for one room."""
+
+    def __init__(self, state: RoomState, history: int = 64, version: int = 0) -> None:
+        """Start tracking a room.
+
+        Args:
+            state: Initial room state
+            history: Number of deltas retained for catch-up
+            version: Version number of ``state``
+        """
+        self.state = state
+        self.version = version
+        self._deltas: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    def commit(self, new_state: RoomState) -> Optional[Dict[str, Any]]:
+        """Record a new state and return its delta, or None if nothing changed."""
+        delta = diff(self.state, new_state, self.version, self.version + 1)
+        if delta.keys() <= _HEADER_KEYS:
+            return None
+        self.state = new_state
+        self.version += 1
+        self._deltas.append(delta)
+        return delta
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full-state sync message."""
+        return {
+            "type": "room_update",
+            "room_id": self.state.room_id,
+            "version": self.version,
+            "room_state": self.state.model_dump(mode="json"),
+        }
+
+    def sync(self, client_version: Optional[int]) -> Dict[str, Any]:
+        """Bring a client at ``client_version`` up to date.
+
+        Returns a ``room_update`` message carrying either ``deltas`` (the chain
+        since the client's version, possibly empty) or a full ``room_state``
+        when the client is unknown, ahead, or older than the retained history.
+        """
+        if client_version is None or client_version > self.version:
+            return self.snapshot()
+        missing = self.version - client_version
+        if missing > len(self._deltas):
+            return self.snapshot()
+        deltas = list(self._deltas)[len(self._deltas) - missing :] if missing else []
+        return {
+            "type": "room_update",
+            "room_id": self.state.room_id,
+            "version": self.version,
+            "deltas": deltas,
+        }
@@ -0,0 +1,64 @@
+"""Merged per-tick outbound frame.
+
+A room tick produces at most one frame per client, combining the JSON part
+every client in the room shares (room delta, combat events) with that
+client's binary position batch (``wire.session_codec``)::
+
+    header  <BBII   version, flags, tick number, JSON length
+    json    UTF-8 JSON object (absent when the JSON length is 0)
+    batch   session batch (present when FLAG_POSITIONS is set)
+"""
+
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from .session_codec import SessionBatchView
+
+TICK_FRAME_VERSION = 1
+TICK_HEADER = struct.Struct("<BBII")
+
+FLAG_POSITIONS = 0x01
+
+
+def encode_tick_frame(
+    tick: int, message: Optional[bytes], positions: Optional[bytes]
+) -> bytes:
+    """Build a tick frame.
+
+    Args:
+        tick: Tick number
+        message: Serialized JSON shared by the room, or None
+        positions: Encoded session batch for this client, or None
+    """
+    message = message or b""
+    flags = FLAG_POSITIONS if positions else 0
+    return b"".join(
+        (
+            TICK_HEADER.pack(TICK_FRAME_VERSION, flags, tick, len(message)),
+            message,
+            positions or b"",
+        )
+    )
+
+
+def decode_tick_frame(
+    buffer: Any,
+) -> Tuple[int, Optional[Dict[str, Any]], Optional[SessionBatchView]]:
+    """Split a tick frame into ``(tick, message, position batch view)``.
+
+    Raises:
+        ValueError: If the version is unknown or the buffer is truncated
+    """
+    view = memoryview(buffer)
+    if len(view) < TICK_HEADER.size:
+        raise ValueError("Buffer is too short for a tick frame header")
+    version, flags, tick, length = TICK_HEADER.unpack_from(view, 0)
+    if version != TICK_FRAME_VERSION:
+        raise ValueError(f"Unsupported tick frame version {version}")
+    end = TICK_HEADER.size + length
+    if len(view) < end:
+        raise ValueError("Buffer is truncated: tick frame JSON is incomplete")
+    message = json.loads(bytes(view[TICK_HEADER.size : end])) if length else None
+    positions = SessionBatchView(view[end:]) if flags & FLAG_POSITIONS else None
+    return tick, message, positions